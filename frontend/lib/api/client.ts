@@ -248,11 +248,17 @@ export const incidentApi = {
 
   /**
    * 사고 발생 트리거
+   * 기본 응답의 detected_cctv_ids는 null (CCTV 매칭은 백그라운드 보강 후 SSE로 전달)
+   * waitForCctvs가 true이면 CCTV 매칭까지 마친 뒤 응답하여 detected_cctv_ids 포함
    */
-  createIncident: (data: import("./types").CreateIncidentRequest) =>
+  createIncident: (
+    data: import("./types").CreateIncidentRequest,
+    options?: { waitForCctvs?: boolean }
+  ) =>
     apiRequest<import("./types").IncidentResponse>("incident", "/incidents", {
       method: "POST",
       body: data,
+      params: { wait_for_cctvs: options?.waitForCctvs || undefined },
     }),
 
   /**
@@ -79,6 +79,7 @@ export function useCreateIncident() {
 /**
  * 사고 발생 트리거 훅 (CCTV 플래그 연동)
  * 사고 생성 후 자동으로 관련 CCTV에 사고 플래그 설정
+ * (응답에 detected_cctv_ids가 필요하므로 CCTV 매칭까지 기다리는 동기 생성 사용)
  */
 export function useCreateIncidentWithCCTV() {
   const queryClient = useQueryClient();
@@ -86,7 +87,7 @@ export function useCreateIncidentWithCCTV() {
   const { setAccidentFlag } = useCCTVStore();
 
   return useMutation<IncidentResponse, Error, CreateIncidentRequest>({
-    mutationFn: (data) => incidentApi.createIncident(data),
+    mutationFn: (data) => incidentApi.createIncident(data, { waitForCctvs: true }),
     onSuccess: (response) => {
       // 스토어에 사고 추가
       const incident = convertToStoreIncident(response);
@@ -29,6 +29,21 @@ class Settings(BaseSettings):
     UPLOAD_DIR: str = "./uploads"
     MAX_FILE_SIZE: int = 100 * 1024 * 1024  # 100MB
     ALLOWED_EXTENSIONS: List[str] = [".glb", ".gltf", ".png", ".jpg", ".jpeg", ".hdr"]
+    ASSET_BLOB_DIR: str = "blobs"  # 내용 주소(SHA-256) 저장 디렉토리 (UPLOAD_DIR 기준)
+    UPLOAD_WRITE_BUFFER_SIZE: int = 1024 * 1024              # 업로드 스트림을 모아 한 번에 디스크에 쓰는 크기 (바이트)
+    GLTF_METADATA_MAX_JSON_BYTES: int = 32 * 1024 * 1024     # 업로드 중 메타데이터 추출을 위해 보관할 glTF JSON 최대 크기
+    
+    # 재개 가능한(청크) 업로드 설정
+    UPLOAD_CHUNK_SIZE: int = 8 * 1024 * 1024       # 청크 크기 (바이트, 마지막 청크 제외 고정)
+    UPLOAD_SESSION_DIR: str = ".sessions"          # 세션 데이터 파일 디렉토리 (UPLOAD_DIR 기준)
+    UPLOAD_SESSION_TTL_HOURS: int = 24             # 세션 유효 시간 (만료 세션은 새 세션 생성 시 정리)
+    
+    # 파일 다운로드 설정
+    ASSET_DOWNLOAD_CHUNK_SIZE: int = 256 * 1024  # zerocopysend 미지원 서버에서 1회 읽기/전송 크기 (바이트)
+    ASSET_DOWNLOAD_MAX_RANGES: int = 32          # Range 요청 최대 구간 수 (초과 시 전체 응답)
+    
+    # HTTP 조건부 조회 설정 (ETag/If-None-Match)
+    HTTP_CACHE_MAX_AGE: int = 0  # Cache-Control max-age (초, 0이면 매 요청 ETag 재검증)
     
     # CORS 설정
     CORS_ORIGINS: List[str] = ["http://localhost:3000"]
@@ -8,13 +8,13 @@ from pathlib import Path
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.staticfiles import StaticFiles
 from prometheus_fastapi_instrumentator import Instrumentator
 from sqlalchemy import text
 
 from config import settings
 from database import engine, Base
-from routers import asset_router
+from routers import asset_router, upload_router
+from utils.file_response import RangeStaticFiles
 from utils.logging import logger
 
 
@@ -59,10 +59,11 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# 정적 파일 서빙 (업로드된 에셋)
-app.mount("/uploads", StaticFiles(directory=settings.UPLOAD_DIR), name="uploads")
+# 정적 파일 서빙 (업로드된 에셋, Range 부분 요청 지원)
+app.mount("/uploads", RangeStaticFiles(directory=settings.UPLOAD_DIR), name="uploads")
 
 # 라우터 등록
+app.include_router(upload_router, prefix="/assets/uploads", tags=["uploads"])
 app.include_router(asset_router, prefix="/assets", tags=["assets"])
 
 # Prometheus 메트릭 수집 설정
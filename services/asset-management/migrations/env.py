@@ -33,6 +33,9 @@ if config.config_file_name is not None:
 # 메타데이터 타겟 (마이그레이션 대상)
 target_metadata = Base.metadata
 
+# 서비스별 버전 테이블 (같은 DB를 쓰는 다른 서비스의 alembic_version과 분리)
+VERSION_TABLE = "alembic_version_asset_management"
+
 
 def run_migrations_offline() -> None:
     """
@@ -45,6 +48,7 @@ def run_migrations_offline() -> None:
         target_metadata=target_metadata,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
+        version_table=VERSION_TABLE,
     )
 
     with context.begin_transaction():
@@ -53,7 +57,7 @@ def run_migrations_offline() -> None:
 
 def do_run_migrations(connection: Connection) -> None:
     """실제 마이그레이션 실행"""
-    context.configure(connection=connection, target_metadata=target_metadata)
+    context.configure(connection=connection, target_metadata=target_metadata, version_table=VERSION_TABLE)
 
     with context.begin_transaction():
         context.run_migrations()
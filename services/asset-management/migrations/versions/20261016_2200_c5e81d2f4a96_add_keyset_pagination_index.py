@@ -0,0 +1,29 @@
+"""Add keyset pagination index to assets
+
+Revision ID: c5e81d2f4a96
+Revises: None
+Create Date: 2026-10-16 22:00:00.000000+00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'c5e81d2f4a96'
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """마이그레이션 업그레이드"""
+    # 테이블은 서비스 시작 시 create_all로 생성되므로 이미 있는 DB에도 적용되도록 IF NOT EXISTS 사용
+    # 커서 페이지네이션 (created_at, id) 키셋 조회용
+    op.create_index('ix_assets_created_at_id', 'assets', ['created_at', 'id'], if_not_exists=True)
+
+
+def downgrade() -> None:
+    """마이그레이션 다운그레이드"""
+    op.drop_index('ix_assets_created_at_id', table_name='assets', if_exists=True)
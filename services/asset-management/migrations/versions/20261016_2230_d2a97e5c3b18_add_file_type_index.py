@@ -0,0 +1,33 @@
+"""Add file_type/created_at index to assets
+
+Revision ID: d2a97e5c3b18
+Revises: c5e81d2f4a96
+Create Date: 2026-10-16 22:30:00.000000+00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'd2a97e5c3b18'
+down_revision: Union[str, None] = 'c5e81d2f4a96'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """마이그레이션 업그레이드"""
+    # 파일 유형 필터 + 최신순 목록
+    op.create_index(
+        'ix_assets_file_type_created_at',
+        'assets',
+        ['file_type', sa.text('created_at DESC')],
+        if_not_exists=True,
+    )
+
+
+def downgrade() -> None:
+    """마이그레이션 다운그레이드"""
+    op.drop_index('ix_assets_file_type_created_at', table_name='assets', if_exists=True)
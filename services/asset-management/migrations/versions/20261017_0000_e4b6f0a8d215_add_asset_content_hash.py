@@ -0,0 +1,30 @@
+"""Add content_hash column to assets
+
+Revision ID: e4b6f0a8d215
+Revises: d2a97e5c3b18
+Create Date: 2026-10-17 00:00:00.000000+00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'e4b6f0a8d215'
+down_revision: Union[str, None] = 'd2a97e5c3b18'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """마이그레이션 업그레이드"""
+    # 업로드 시 계산한 파일 SHA-256 (기존 행은 NULL)
+    op.add_column('assets', sa.Column('content_hash', sa.String(length=64), nullable=True))
+    op.create_index('ix_assets_content_hash', 'assets', ['content_hash'], if_not_exists=True)
+
+
+def downgrade() -> None:
+    """마이그레이션 다운그레이드"""
+    op.drop_index('ix_assets_content_hash', table_name='assets', if_exists=True)
+    op.drop_column('assets', 'content_hash')
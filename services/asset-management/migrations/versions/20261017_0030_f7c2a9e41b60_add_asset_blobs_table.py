@@ -0,0 +1,35 @@
+"""Add asset_blobs table for content-addressed storage
+
+Revision ID: f7c2a9e41b60
+Revises: e4b6f0a8d215
+Create Date: 2026-10-17 00:30:00.000000+00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'f7c2a9e41b60'
+down_revision: Union[str, None] = 'e4b6f0a8d215'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """마이그레이션 업그레이드"""
+    # 내용 주소(SHA-256) 저장 파일과 참조 수 (기존 uuid 경로 에셋은 blob 없이 그대로 유지)
+    op.create_table(
+        'asset_blobs',
+        sa.Column('content_hash', sa.String(length=64), primary_key=True),
+        sa.Column('file_path', sa.String(length=500), nullable=False),
+        sa.Column('file_size', sa.BigInteger(), nullable=False),
+        sa.Column('ref_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('created_at', sa.DateTime(timezone=True), nullable=True, server_default=sa.func.now()),
+    )
+
+
+def downgrade() -> None:
+    """마이그레이션 다운그레이드"""
+    op.drop_table('asset_blobs')
@@ -0,0 +1,56 @@
+"""Add resumable upload session tables
+
+Revision ID: a3d8e1f6c947
+Revises: f7c2a9e41b60
+Create Date: 2026-10-17 01:00:00.000000+00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = 'a3d8e1f6c947'
+down_revision: Union[str, None] = 'f7c2a9e41b60'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """마이그레이션 업그레이드"""
+    # 청크 업로드 세션
+    op.create_table(
+        'asset_uploads',
+        sa.Column('id', postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column('filename', sa.String(length=255), nullable=False),
+        sa.Column('file_ext', sa.String(length=20), nullable=False),
+        sa.Column('file_size', sa.BigInteger(), nullable=False),
+        sa.Column('chunk_size', sa.Integer(), nullable=False),
+        sa.Column('content_hash', sa.String(length=64), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), nullable=True, server_default=sa.func.now()),
+        sa.Column('expires_at', sa.DateTime(timezone=True), nullable=False),
+    )
+    op.create_index('ix_asset_uploads_expires_at', 'asset_uploads', ['expires_at'])
+    
+    # 검증까지 끝난 청크
+    op.create_table(
+        'asset_upload_chunks',
+        sa.Column(
+            'upload_id',
+            postgresql.UUID(as_uuid=True),
+            sa.ForeignKey('asset_uploads.id', ondelete='CASCADE'),
+            primary_key=True,
+        ),
+        sa.Column('index', sa.Integer(), primary_key=True),
+        sa.Column('sha256', sa.String(length=64), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), nullable=True, server_default=sa.func.now()),
+    )
+
+
+def downgrade() -> None:
+    """마이그레이션 다운그레이드"""
+    op.drop_table('asset_upload_chunks')
+    op.drop_index('ix_asset_uploads_expires_at', table_name='asset_uploads')
+    op.drop_table('asset_uploads')
@@ -2,5 +2,7 @@
 V-Factory - Asset Management ORM 모델
 """
 from .asset import Asset
+from .blob import AssetBlob
+from .upload import AssetUpload, AssetUploadChunk
 
-__all__ = ["Asset"]
+__all__ = ["Asset", "AssetBlob", "AssetUpload", "AssetUploadChunk"]
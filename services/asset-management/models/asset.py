@@ -5,7 +5,7 @@ V-Factory - Asset ORM 모델
 import uuid
 from datetime import datetime
 
-from sqlalchemy import Column, String, BigInteger, DateTime
+from sqlalchemy import Column, String, BigInteger, DateTime, Index
 from sqlalchemy.dialects.postgresql import UUID, JSONB
 
 from database import Base
@@ -24,6 +24,7 @@ class Asset(Base):
     file_path = Column(String(500), nullable=False)
     file_type = Column(String(50), nullable=False)  # glb, gltf, png, jpg 등
     file_size = Column(BigInteger, nullable=False)  # 바이트 단위
+    content_hash = Column(String(64), nullable=True, index=True)  # SHA-256 (16진수, 업로드 시 계산)
     
     # 메타데이터 (JSON) - 'metadata'는 SQLAlchemy 예약어이므로 'asset_metadata' 사용
     asset_metadata = Column(JSONB, default={})
@@ -35,5 +36,12 @@ class Asset(Base):
     created_at = Column(DateTime(timezone=True), default=datetime.utcnow)
     updated_at = Column(DateTime(timezone=True), default=datetime.utcnow, onupdate=datetime.utcnow)
     
+    __table_args__ = (
+        # 커서 페이지네이션 (created_at, id) 키셋 조회용
+        Index("ix_assets_created_at_id", "created_at", "id"),
+        # 파일 유형 필터 + 최신순 목록
+        Index("ix_assets_file_type_created_at", file_type, created_at.desc()),
+    )
+    
     def __repr__(self):
         return f"<Asset(id={self.id}, name={self.name}, type={self.file_type})>"
@@ -0,0 +1,31 @@
+"""
+V-Factory - AssetBlob ORM 모델
+내용 주소(SHA-256) 기반 저장 파일과 참조 수 (같은 내용의 에셋은 파일 하나를 공유)
+"""
+from datetime import datetime
+
+from sqlalchemy import Column, BigInteger, DateTime, Integer, String
+
+from database import Base
+
+
+class AssetBlob(Base):
+    """에셋 파일(blob) 테이블 ORM 모델"""
+    
+    __tablename__ = "asset_blobs"
+    
+    # 내용 해시 (SHA-256 16진수)
+    content_hash = Column(String(64), primary_key=True)
+    
+    # 파일 정보 (업로드 디렉토리 기준 상대 경로)
+    file_path = Column(String(500), nullable=False)
+    file_size = Column(BigInteger, nullable=False)
+    
+    # 이 파일을 가리키는 assets 행 수 (0이 되면 행/파일 삭제)
+    ref_count = Column(Integer, nullable=False, default=0)
+    
+    # 타임스탬프
+    created_at = Column(DateTime(timezone=True), default=datetime.utcnow)
+    
+    def __repr__(self):
+        return f"<AssetBlob(content_hash={self.content_hash}, ref_count={self.ref_count})>"
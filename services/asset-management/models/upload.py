@@ -0,0 +1,60 @@
+"""
+V-Factory - 재개 가능한 업로드 ORM 모델
+청크 업로드 세션과 받은 청크 기록 (청크는 세션 데이터 파일의 해당 위치에 바로 기록)
+"""
+import uuid
+from datetime import datetime
+
+from sqlalchemy import Column, BigInteger, DateTime, ForeignKey, Integer, String
+from sqlalchemy.dialects.postgresql import UUID
+
+from database import Base
+
+
+class AssetUpload(Base):
+    """청크 업로드 세션 테이블 ORM 모델"""
+    
+    __tablename__ = "asset_uploads"
+    
+    # 기본 필드
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    filename = Column(String(255), nullable=False)
+    file_ext = Column(String(20), nullable=False)
+    
+    # 전체 파일 정보
+    file_size = Column(BigInteger, nullable=False)
+    chunk_size = Column(Integer, nullable=False)
+    content_hash = Column(String(64), nullable=True)  # 클라이언트가 알려준 전체 SHA-256 (완료 시 검증)
+    
+    # 타임스탬프
+    created_at = Column(DateTime(timezone=True), default=datetime.utcnow)
+    expires_at = Column(DateTime(timezone=True), nullable=False, index=True)
+    
+    @property
+    def chunk_count(self) -> int:
+        return -(-self.file_size // self.chunk_size)
+    
+    def chunk_length(self, index: int) -> int:
+        """청크 바이트 수 (마지막 청크는 짧을 수 있음)"""
+        return min(self.chunk_size, self.file_size - index * self.chunk_size)
+    
+    def __repr__(self):
+        return f"<AssetUpload(id={self.id}, filename={self.filename}, size={self.file_size})>"
+
+
+class AssetUploadChunk(Base):
+    """받은 청크 테이블 ORM 모델 (검증까지 끝난 청크만 기록)"""
+    
+    __tablename__ = "asset_upload_chunks"
+    
+    upload_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("asset_uploads.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    index = Column(Integer, primary_key=True)
+    sha256 = Column(String(64), nullable=False)
+    created_at = Column(DateTime(timezone=True), default=datetime.utcnow)
+    
+    def __repr__(self):
+        return f"<AssetUploadChunk(upload_id={self.upload_id}, index={self.index})>"
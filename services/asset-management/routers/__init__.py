@@ -2,5 +2,6 @@
 V-Factory - Asset Management API 라우터
 """
 from .asset import router as asset_router
+from .upload import router as upload_router
 
-__all__ = ["asset_router"]
+__all__ = ["asset_router", "upload_router"]
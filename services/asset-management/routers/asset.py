@@ -5,66 +5,103 @@ V-Factory - Asset API 라우터
 import os
 import uuid
 from pathlib import Path
-from typing import List
+from typing import List, Optional, Union
 
-import aiofiles
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, status
-from fastapi.responses import FileResponse
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request, status
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from config import settings
 from database import get_db
 from models import Asset
-from schemas import AssetUpdate, AssetResponse
-from services.file_service import FileService
+from schemas import AssetHashCreate, AssetUpdate, AssetResponse
+from services.blob_service import BlobStore
+from services.file_service import UPLOAD_FIELD, FileService, UploadSink
+from utils.file_response import RangeFileResponse
+from utils.http_cache import conditional_response, rendered
+from utils.pagination import CursorPage, PaginationMode, apply_keyset, build_page, use_cursor
 
 
 router = APIRouter()
 
 
-@router.post("/", response_model=AssetResponse, status_code=status.HTTP_201_CREATED)
+@router.post(
+    "/",
+    response_model=AssetResponse,
+    status_code=status.HTTP_201_CREATED,
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {
+                "multipart/form-data": {
+                    "schema": {
+                        "type": "object",
+                        "required": [UPLOAD_FIELD],
+                        "properties": {UPLOAD_FIELD: {"type": "string", "format": "binary"}},
+                    }
+                }
+            },
+        }
+    },
+)
 async def upload_asset(
-    file: UploadFile = File(...),
+    request: Request,
     db: AsyncSession = Depends(get_db)
 ):
     """
     에셋 업로드 API
-    파일을 저장하고 메타데이터를 데이터베이스에 기록
+    요청 본문을 한 번만 읽으면서 크기 제한/SHA-256/메타데이터를 처리하고 내용 주소 경로에 저장한 뒤
+    데이터베이스에 기록 (크기 초과 시 본문을 다 받기 전에 400, 같은 내용이 이미 있으면 기존 파일 공유)
     """
-    # 파일 확장자 검증
-    file_ext = Path(file.filename).suffix.lower()
+    upload = await FileService().receive_upload(request)
+    return await create_uploaded_asset(db, Path(upload.filename).stem, upload.file_ext, upload.sink)
+
+
+@router.post("/by-hash", response_model=AssetResponse, status_code=status.HTTP_201_CREATED)
+async def create_asset_by_hash(
+    asset_data: AssetHashCreate,
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    즉시 업로드 API
+    클라이언트가 계산한 SHA-256과 같은 파일이 이미 저장되어 있으면 파일 전송 없이 에셋 생성
+    (404이면 일반 업로드로 전송)
+    """
+    file_ext = f".{asset_data.file_type.lstrip('.').lower()}"
     if file_ext not in settings.ALLOWED_EXTENSIONS:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=f"허용되지 않는 파일 형식입니다. 허용: {settings.ALLOWED_EXTENSIONS}"
         )
     
-    # 파일 크기 검증
     file_service = FileService()
-    file_size = await file_service.get_file_size(file)
-    
-    if file_size > settings.MAX_FILE_SIZE:
+    blob = await BlobStore(db, file_service).reference(asset_data.content_hash)
+    if blob is None:
+        await db.rollback()
         raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"파일 크기가 너무 큽니다. 최대: {settings.MAX_FILE_SIZE / 1024 / 1024}MB"
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="같은 내용의 파일이 없습니다. 파일을 업로드하세요."
+        )
+    stored_ext = Path(blob.file_path).suffix.lower()
+    if stored_ext != file_ext:
+        # 다른 형식으로 저장된 내용이면 추가한 참조를 되돌림 (rollback 후 blob 속성은 만료되므로 미리 읽어 둠)
+        await db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"같은 내용의 파일이 다른 형식({stored_ext.lstrip('.')})으로 저장되어 있습니다."
         )
     
-    # 고유 파일명 생성 및 저장
-    unique_filename = f"{uuid.uuid4()}{file_ext}"
-    file_path = await file_service.save_file(file, unique_filename)
-    
-    # GLB/GLTF 파일인 경우 기본 메타데이터 추출 시도
+    # 메타데이터는 저장된 파일에서 추출 (필요한 앞부분만 읽음)
     asset_metadata = {}
     if file_ext in [".glb", ".gltf"]:
-        asset_metadata = await file_service.extract_gltf_metadata(file_path)
+        asset_metadata = await file_service.extract_gltf_metadata(blob.file_path)
     
-    # 데이터베이스에 저장
     asset = Asset(
-        name=Path(file.filename).stem,  # 확장자 제외한 파일명
-        file_path=file_path,
+        name=asset_data.name,
+        file_path=blob.file_path,
         file_type=file_ext.lstrip("."),
-        file_size=file_size,
+        file_size=blob.file_size,
+        content_hash=blob.content_hash,
         asset_metadata=asset_metadata,
     )
     db.add(asset)
@@ -74,19 +111,71 @@ async def upload_asset(
     return asset
 
 
-@router.get("/", response_model=List[AssetResponse])
+async def create_uploaded_asset(db: AsyncSession, name: str, file_ext: str, sink: UploadSink) -> Asset:
+    """
+    받은 업로드 파일로 에셋 생성
+    blob 참조 추가 → (새 내용이면) 임시 파일을 blob 경로로 이동 → assets 행 저장을 한 트랜잭션으로 처리
+    (같은 내용이 다른 확장자로 저장되어 있으면 409)
+    """
+    blobs = BlobStore(db)
+    placed_path = None
+    try:
+        file_path, _ = await blobs.acquire(sink.sha256, file_ext, sink.size)
+        stored_ext = Path(file_path).suffix.lower()
+        if stored_ext != file_ext:
+            # 같은 내용이 다른 형식으로 저장되어 있으면 즉시 업로드와 같이 409 (추가한 참조는 되돌림)
+            await db.rollback()
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail=f"같은 내용의 파일이 다른 형식({stored_ext.lstrip('.')})으로 저장되어 있습니다."
+            )
+        if await blobs.place(sink, file_path):
+            placed_path = file_path
+        
+        # 데이터베이스에 저장
+        asset = Asset(
+            name=name,
+            file_path=file_path,
+            file_type=file_ext.lstrip("."),
+            file_size=sink.size,
+            content_hash=sink.sha256,
+            asset_metadata=sink.metadata,
+        )
+        db.add(asset)
+        await db.commit()
+    except BaseException:
+        await sink.abort()
+        if placed_path:
+            await blobs.file_service.delete_file(placed_path)
+        raise
+    await db.refresh(asset)
+    
+    return asset
+
+
+@router.get("/", response_model=Union[List[AssetResponse], CursorPage[AssetResponse]])
 async def get_assets(
     file_type: str = None,
     skip: int = 0,
     limit: int = 100,
+    pagination: PaginationMode = Query("offset", description="offset: 목록 반환, cursor: {items, next_cursor} 반환"),
+    cursor: Optional[str] = Query(None, description="이전 페이지의 next_cursor (지정 시 커서 모드)"),
     db: AsyncSession = Depends(get_db)
 ):
-    """에셋 목록 조회 API"""
+    """
+    에셋 목록 조회 API (최신순)
+    커서 모드는 (created_at, id) 키셋으로 조회
+    """
     query = select(Asset)
     
     if file_type:
         query = query.where(Asset.file_type == file_type)
     
+    if use_cursor(pagination, cursor):
+        query = apply_keyset(query, Asset.created_at, Asset.id, cursor, limit)
+        result = await db.execute(query)
+        return build_page(result.scalars().all(), limit, "created_at")
+    
     query = query.order_by(Asset.created_at.desc()).offset(skip).limit(limit)
     result = await db.execute(query)
     return result.scalars().all()
@@ -95,9 +184,10 @@ async def get_assets(
 @router.get("/{asset_id}", response_model=AssetResponse)
 async def get_asset(
     asset_id: uuid.UUID,
+    if_none_match: Optional[str] = Header(None),
     db: AsyncSession = Depends(get_db)
 ):
-    """에셋 메타데이터 조회 API"""
+    """에셋 메타데이터 조회 API (ETag 일치 시 304)"""
     result = await db.execute(
         select(Asset).where(Asset.id == asset_id)
     )
@@ -109,15 +199,21 @@ async def get_asset(
             detail="에셋을 찾을 수 없습니다."
         )
     
-    return asset
+    entry = rendered(AssetResponse.model_validate(asset), asset.updated_at or asset.created_at)
+    return conditional_response(entry, if_none_match)
 
 
-@router.get("/{asset_id}/download")
+@router.api_route("/{asset_id}/download", methods=["GET", "HEAD"])
 async def download_asset(
     asset_id: uuid.UUID,
+    request: Request,
     db: AsyncSession = Depends(get_db)
 ):
-    """에셋 파일 다운로드 API"""
+    """
+    에셋 파일 다운로드 API
+    Range/If-Range 부분 다운로드(206, 여러 구간은 multipart/byteranges)와 ETag/Last-Modified 조건부 요청 지원
+    (파일은 청크 단위 또는 서버가 지원하면 sendfile로 전송 - 메모리에 전체를 올리지 않음)
+    """
     result = await db.execute(
         select(Asset).where(Asset.id == asset_id)
     )
@@ -137,19 +233,21 @@ async def download_asset(
             detail="파일을 찾을 수 없습니다."
         )
     
-    return FileResponse(
-        path=file_path,
+    return RangeFileResponse(
+        file_path,
+        request.headers,
         filename=f"{asset.name}.{asset.file_type}",
-        media_type="application/octet-stream"
+        media_type="application/octet-stream",
     )
 
 
 @router.get("/{asset_id}/metadata", response_model=dict)
 async def get_asset_metadata(
     asset_id: uuid.UUID,
+    if_none_match: Optional[str] = Header(None),
     db: AsyncSession = Depends(get_db)
 ):
-    """에셋 상세 메타데이터 조회 API"""
+    """에셋 상세 메타데이터 조회 API (ETag 일치 시 304)"""
     result = await db.execute(
         select(Asset).where(Asset.id == asset_id)
     )
@@ -161,7 +259,8 @@ async def get_asset_metadata(
             detail="에셋을 찾을 수 없습니다."
         )
     
-    return asset.asset_metadata
+    entry = rendered(asset.asset_metadata or {}, asset.updated_at or asset.created_at)
+    return conditional_response(entry, if_none_match)
 
 
 @router.put("/{asset_id}", response_model=AssetResponse)
@@ -196,7 +295,7 @@ async def delete_asset(
     asset_id: uuid.UUID,
     db: AsyncSession = Depends(get_db)
 ):
-    """에셋 삭제 API (파일 포함)"""
+    """에셋 삭제 API (마지막 참조면 파일 포함)"""
     result = await db.execute(
         select(Asset).where(Asset.id == asset_id)
     )
@@ -208,10 +307,8 @@ async def delete_asset(
             detail="에셋을 찾을 수 없습니다."
         )
     
-    # 파일 삭제
-    file_path = Path(settings.UPLOAD_DIR) / asset.file_path
-    if file_path.exists():
-        os.remove(file_path)
+    # 파일 참조 해제 (같은 내용을 쓰는 다른 에셋이 없을 때만 파일 삭제)
+    await BlobStore(db).release(asset)
     
     # 썸네일 삭제 (있는 경우)
     if asset.thumbnail_path:
@@ -0,0 +1,120 @@
+"""
+V-Factory - 재개 가능한 업로드 API 라우터
+세션 생성 → 청크 PUT(병렬 가능, X-Chunk-SHA256 검증) → 상태(오프셋) 조회 → 완료(에셋 생성)
+"""
+import uuid
+from pathlib import Path
+
+from fastapi import APIRouter, Depends, Header, Request, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from database import get_db
+from models import AssetUpload
+from routers.asset import create_uploaded_asset
+from schemas import AssetResponse, UploadSessionCreate, UploadSessionResponse
+from services.chunked_upload import ChunkedUploadService
+from utils.logging import logger
+
+
+router = APIRouter()
+
+
+async def _session_response(uploads: ChunkedUploadService, upload: AssetUpload) -> UploadSessionResponse:
+    received = await uploads.received(upload)
+    return UploadSessionResponse(
+        id=upload.id,
+        filename=upload.filename,
+        file_size=upload.file_size,
+        chunk_size=upload.chunk_size,
+        chunk_count=upload.chunk_count,
+        received_chunks=received,
+        offset=uploads.offset(upload, received),
+        expires_at=upload.expires_at,
+    )
+
+
+@router.post("/", response_model=UploadSessionResponse, status_code=status.HTTP_201_CREATED)
+async def create_upload(
+    upload_data: UploadSessionCreate,
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    업로드 세션 생성 API
+    응답의 chunk_size 단위로 파일을 나눠 청크 번호(0부터)별로 전송
+    """
+    uploads = ChunkedUploadService(db)
+    upload = await uploads.create(upload_data.filename, upload_data.file_size, upload_data.content_hash)
+    return await _session_response(uploads, upload)
+
+
+@router.get("/{upload_id}", response_model=UploadSessionResponse)
+async def get_upload(
+    upload_id: uuid.UUID,
+    db: AsyncSession = Depends(get_db)
+):
+    """업로드 진행 상태 조회 API (받은 청크 목록/재개 오프셋)"""
+    uploads = ChunkedUploadService(db)
+    return await _session_response(uploads, await uploads.get(upload_id))
+
+
+@router.put(
+    "/{upload_id}/chunks/{index}",
+    status_code=status.HTTP_204_NO_CONTENT,
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {"application/octet-stream": {"schema": {"type": "string", "format": "binary"}}},
+        }
+    },
+)
+async def put_chunk(
+    upload_id: uuid.UUID,
+    index: int,
+    request: Request,
+    x_chunk_sha256: str = Header(..., description="청크 본문 SHA-256 (16진수)"),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    청크 업로드 API
+    본문을 스트림으로 받아 파일의 해당 위치에 바로 기록 (실패한 청크는 같은 번호로 다시 전송)
+    """
+    uploads = ChunkedUploadService(db)
+    upload = await uploads.get(upload_id)
+    await uploads.write_chunk(upload, index, request, x_chunk_sha256)
+
+
+@router.post("/{upload_id}/complete", response_model=AssetResponse, status_code=status.HTTP_201_CREATED)
+async def complete_upload(
+    upload_id: uuid.UUID,
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    업로드 완료 API
+    모든 청크 확인 후 전체 파일을 검증하고 일반 업로드와 같은 방식으로 에셋 생성 (받지 않은 청크가 있으면 409)
+    """
+    uploads = ChunkedUploadService(db)
+    upload = await uploads.get(upload_id)
+    sink = await uploads.assemble(upload)
+
+    # 세션 행 삭제와 에셋 생성을 한 트랜잭션으로 커밋
+    await uploads.forget(upload)
+    try:
+        return await create_uploaded_asset(db, Path(upload.filename).stem, upload.file_ext, sink)
+    except Exception:
+        # 데이터 파일은 정리되었으므로 세션도 삭제 (클라이언트는 새 세션으로 재시도)
+        await db.rollback()
+        try:
+            await uploads.discard(await uploads.get(upload_id))
+        except Exception as e:
+            logger.warning(f"업로드 세션 정리 실패 ({upload_id}): {e}")
+        raise
+
+
+@router.delete("/{upload_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def cancel_upload(
+    upload_id: uuid.UUID,
+    db: AsyncSession = Depends(get_db)
+):
+    """업로드 취소 API (받은 데이터 삭제)"""
+    uploads = ChunkedUploadService(db)
+    await uploads.discard(await uploads.get(upload_id))
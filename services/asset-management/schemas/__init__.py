@@ -3,14 +3,19 @@ V-Factory - Asset Management Pydantic 스키마
 """
 from .asset import (
     AssetCreate,
+    AssetHashCreate,
     AssetUpdate,
     AssetResponse,
     AssetMetadata,
 )
+from .upload import UploadSessionCreate, UploadSessionResponse
 
 __all__ = [
     "AssetCreate",
+    "AssetHashCreate",
     "AssetUpdate",
     "AssetResponse",
     "AssetMetadata",
+    "UploadSessionCreate",
+    "UploadSessionResponse",
 ]
@@ -14,6 +14,10 @@ class AssetMetadata(BaseModel):
     # GLB/GLTF 메타데이터
     vertex_count: Optional[int] = Field(None, description="버텍스 수")
     face_count: Optional[int] = Field(None, description="면 수")
+    triangle_count: Optional[int] = Field(None, description="삼각형 수 (메시 정의 기준)")
+    bounding_box: Optional[Dict[str, list[float]]] = Field(None, description="장면 경계 상자 {min, max}")
+    texture_memory_bytes: Optional[int] = Field(None, description="텍스처 GPU 메모리 추정치 (RGBA8 + 밉맵)")
+    extensions_used: Optional[list[str]] = Field(None, description="사용한 glTF 확장")
     material_count: Optional[int] = Field(None, description="머티리얼 수")
     animation_count: Optional[int] = Field(None, description="애니메이션 수")
     
@@ -37,6 +41,12 @@ class AssetCreate(AssetBase):
     thumbnail_path: Optional[str] = Field(None, description="썸네일 경로")
 
 
+class AssetHashCreate(AssetBase):
+    """즉시 업로드 요청 스키마 (이미 저장된 내용의 해시로 에셋 생성)"""
+    content_hash: str = Field(..., pattern=r"^[0-9a-f]{64}$", description="파일 SHA-256 (16진수 소문자)")
+    file_type: str = Field(..., min_length=1, max_length=50, description="파일 타입 (glb, gltf, png 등)")
+
+
 class AssetUpdate(BaseModel):
     """에셋 수정 요청 스키마"""
     name: Optional[str] = Field(None, min_length=1, max_length=255, description="에셋 이름")
@@ -49,6 +59,7 @@ class AssetResponse(AssetBase):
     file_path: str
     file_type: str
     file_size: int
+    content_hash: Optional[str] = None
     asset_metadata: Dict[str, Any]
     thumbnail_path: Optional[str]
     created_at: datetime
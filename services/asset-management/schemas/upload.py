@@ -0,0 +1,30 @@
+"""
+V-Factory - 청크 업로드 Pydantic 스키마
+재개 가능한 업로드 세션 요청/응답
+"""
+from datetime import datetime
+from typing import List, Optional
+from uuid import UUID
+
+from pydantic import BaseModel, Field
+
+
+class UploadSessionCreate(BaseModel):
+    """업로드 세션 생성 요청 스키마"""
+    filename: str = Field(..., min_length=1, max_length=255, description="원본 파일명 (확장자로 형식 판단)")
+    file_size: int = Field(..., ge=1, description="전체 파일 크기 (바이트)")
+    content_hash: Optional[str] = Field(
+        None, pattern=r"^[0-9a-f]{64}$", description="전체 파일 SHA-256 (지정 시 완료 단계에서 검증)"
+    )
+
+
+class UploadSessionResponse(BaseModel):
+    """업로드 세션 상태 응답 스키마"""
+    id: UUID
+    filename: str
+    file_size: int
+    chunk_size: int = Field(..., description="청크 크기 (마지막 청크 제외)")
+    chunk_count: int
+    received_chunks: List[int] = Field(..., description="검증까지 끝난 청크 번호")
+    offset: int = Field(..., description="처음부터 빠짐없이 받은 바이트 수")
+    expires_at: datetime
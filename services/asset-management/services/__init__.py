@@ -2,5 +2,6 @@
 V-Factory - Asset Management 비즈니스 로직 서비스
 """
 from .file_service import FileService
+from .blob_service import BlobStore
 
-__all__ = ["FileService"]
+__all__ = ["FileService", "BlobStore"]
@@ -0,0 +1,107 @@
+"""
+V-Factory - 내용 주소 기반 에셋 파일 저장소
+파일을 SHA-256 경로(blobs/ab/cd/<hash><ext>)에 한 번만 저장하고 asset_blobs.ref_count로 공유 에셋 수를 관리
+- 같은 내용을 다시 업로드하면 기존 파일을 참조 (임시 파일은 삭제)
+- 에셋 삭제 시 참조 수를 줄이고 마지막 참조일 때만 파일 삭제
+"""
+from datetime import datetime
+from typing import Optional, Tuple
+
+from sqlalchemy import delete, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from config import settings
+from models import Asset, AssetBlob
+from services.file_service import FileService, UploadSink
+
+
+def blob_path(content_hash: str, file_ext: str) -> str:
+    """내용 해시의 저장 경로 (업로드 디렉토리 기준, 앞 4자리로 2단계 분산)"""
+    return f"{settings.ASSET_BLOB_DIR}/{content_hash[:2]}/{content_hash[2:4]}/{content_hash}{file_ext}"
+
+
+class BlobStore:
+    """
+    에셋 파일(blob) 참조 관리
+    참조 수 변경은 호출자의 트랜잭션 안에서 수행 (행 잠금으로 같은 해시의 업로드/삭제 직렬화)
+    """
+
+    def __init__(self, db: AsyncSession, file_service: Optional[FileService] = None):
+        self.db = db
+        self.file_service = file_service or FileService()
+
+    async def acquire(self, content_hash: str, file_ext: str, file_size: int) -> Tuple[str, bool]:
+        """
+        내용 해시 참조 추가 (없으면 blob 행 생성)
+
+        Returns:
+            (파일 경로, 새로 생성 여부)
+        """
+        connection = await self.db.connection()
+        insert = postgresql.insert if connection.dialect.name == "postgresql" else sqlite.insert
+        statement = insert(AssetBlob).values(
+            content_hash=content_hash,
+            file_path=blob_path(content_hash, file_ext),
+            file_size=file_size,
+            ref_count=1,
+            created_at=datetime.utcnow(),
+        )
+        statement = statement.on_conflict_do_update(
+            index_elements=["content_hash"],
+            set_={"ref_count": AssetBlob.ref_count + 1},
+        ).returning(AssetBlob.file_path, AssetBlob.ref_count)
+        row = (await self.db.execute(statement)).one()
+        return row.file_path, row.ref_count == 1
+
+    async def reference(self, content_hash: str) -> Optional[AssetBlob]:
+        """
+        이미 저장된 내용이면 참조 추가 후 blob 반환 (즉시 업로드용)
+        파일이 디스크에 없으면 None
+        """
+        result = await self.db.execute(
+            update(AssetBlob)
+            .where(AssetBlob.content_hash == content_hash)
+            .values(ref_count=AssetBlob.ref_count + 1)
+            .returning(AssetBlob)
+        )
+        blob = result.scalar_one_or_none()
+        if blob is None or not (self.file_service.upload_dir / blob.file_path).is_file():
+            return None
+        return blob
+
+    async def place(self, sink: UploadSink, file_path: str) -> bool:
+        """
+        업로드 임시 파일을 blob 경로로 이동 (이미 있으면 임시 파일 삭제)
+
+        Returns:
+            파일을 새로 놓았는지 여부
+        """
+        if (self.file_service.upload_dir / file_path).is_file():
+            await sink.abort()
+            return False
+        await sink.commit(file_path)
+        return True
+
+    async def release(self, asset: Asset) -> bool:
+        """
+        에셋의 파일 참조 해제 (마지막 참조면 blob 행과 파일 삭제)
+        blob으로 관리되지 않는 기존 에셋 파일은 바로 삭제
+
+        Returns:
+            파일 삭제 여부
+        """
+        if asset.content_hash:
+            result = await self.db.execute(
+                update(AssetBlob)
+                .where(AssetBlob.content_hash == asset.content_hash, AssetBlob.file_path == asset.file_path)
+                .values(ref_count=AssetBlob.ref_count - 1)
+                .returning(AssetBlob.ref_count)
+            )
+            remaining = result.scalar_one_or_none()
+            if remaining is not None and remaining > 0:
+                return False
+            if remaining is not None:
+                await self.db.execute(delete(AssetBlob).where(AssetBlob.content_hash == asset.content_hash))
+        # 커밋 전(행 잠금 보유 중)에 삭제해야 같은 해시의 동시 업로드가 파일을 잃지 않음
+        return await self.file_service.delete_file(asset.file_path)
@@ -0,0 +1,246 @@
+"""
+V-Factory - 재개 가능한 청크 업로드 서비스
+세션 생성 → 청크 병렬 PUT(청크별 SHA-256 검증) → 진행 상태 조회 → 완료 순서의 업로드 프로토콜
+- 세션 생성 시 전체 크기의 데이터 파일을 만들고, 각 청크는 받은 즉시 파일의 해당 위치에 기록
+  (완료 시 청크를 다시 합치거나 메모리에 올리지 않음)
+- 완료 시 파일을 한 번 순차로 읽어 전체 SHA-256/메타데이터 계산 후 일반 업로드와 같은 에셋 생성 경로 사용
+"""
+import asyncio
+import hashlib
+import os
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import List, Optional
+from uuid import UUID
+
+from fastapi import HTTPException, Request, status
+from sqlalchemy import delete, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from config import settings
+from models import AssetUpload, AssetUploadChunk
+from services.file_service import FileService, UploadSink, file_too_large
+
+# 새 세션 생성 시 한 번에 정리할 만료 세션 수
+_PURGE_BATCH = 100
+
+
+def _pwrite_all(fd: int, data: bytes, offset: int) -> None:
+    view = memoryview(data)
+    while view:
+        written = os.pwrite(fd, view, offset)
+        view = view[written:]
+        offset += written
+
+
+def _create_sparse(path: Path, size: int) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "wb") as f:
+        f.truncate(size)
+
+
+class ChunkedUploadService:
+    """청크 업로드 세션 관리 (세션/청크 상태는 DB, 데이터는 UPLOAD_DIR 아래 공유 파일)"""
+
+    def __init__(self, db: AsyncSession, file_service: Optional[FileService] = None):
+        self.db = db
+        self.file_service = file_service or FileService()
+        self.session_dir = self.file_service.upload_dir / settings.UPLOAD_SESSION_DIR
+
+    def data_path(self, upload: AssetUpload) -> Path:
+        return self.session_dir / f"{upload.id}{upload.file_ext}.part"
+
+    async def create(self, filename: str, file_size: int, content_hash: Optional[str] = None) -> AssetUpload:
+        """업로드 세션 생성 (만료 세션 정리 포함)"""
+        file_ext = Path(filename).suffix.lower()
+        if file_ext not in settings.ALLOWED_EXTENSIONS:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"허용되지 않는 파일 형식입니다. 허용: {settings.ALLOWED_EXTENSIONS}"
+            )
+        if file_size > settings.MAX_FILE_SIZE:
+            raise file_too_large()
+
+        await self.purge_expired()
+        upload = AssetUpload(
+            filename=filename,
+            file_ext=file_ext,
+            file_size=file_size,
+            chunk_size=settings.UPLOAD_CHUNK_SIZE,
+            content_hash=content_hash,
+            expires_at=datetime.utcnow() + timedelta(hours=settings.UPLOAD_SESSION_TTL_HOURS),
+        )
+        self.db.add(upload)
+        await self.db.flush()
+        await asyncio.get_running_loop().run_in_executor(None, _create_sparse, self.data_path(upload), file_size)
+        await self.db.commit()
+        return upload
+
+    async def get(self, upload_id: UUID) -> AssetUpload:
+        """만료되지 않은 세션 조회 (없으면 404)"""
+        result = await self.db.execute(
+            select(AssetUpload).where(AssetUpload.id == upload_id, AssetUpload.expires_at > datetime.utcnow())
+        )
+        upload = result.scalar_one_or_none()
+        if upload is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="업로드 세션을 찾을 수 없습니다."
+            )
+        return upload
+
+    async def received(self, upload: AssetUpload) -> List[int]:
+        """검증까지 끝난 청크 번호 목록 (오름차순)"""
+        result = await self.db.execute(
+            select(AssetUploadChunk.index)
+            .where(AssetUploadChunk.upload_id == upload.id)
+            .order_by(AssetUploadChunk.index)
+        )
+        return list(result.scalars().all())
+
+    @staticmethod
+    def offset(upload: AssetUpload, received: List[int]) -> int:
+        """처음부터 빠짐없이 받은 바이트 수 (순차 업로드 클라이언트의 재개 위치)"""
+        contiguous = 0
+        for index in received:
+            if index != contiguous:
+                break
+            contiguous += 1
+        return min(contiguous * upload.chunk_size, upload.file_size)
+
+    async def write_chunk(self, upload: AssetUpload, index: int, request: Request, checksum: str) -> None:
+        """
+        청크 본문을 스트림으로 받아 데이터 파일의 해당 위치에 기록
+        크기/SHA-256이 맞을 때만 받은 청크로 기록 (같은 청크 재전송 시 덮어씀)
+        재전송이면 쓰기 전에 받은 청크 기록부터 지워, 검증에 실패하면 그 청크는 다시 받아야 함
+        """
+        if not 0 <= index < upload.chunk_count:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"청크 번호가 범위를 벗어났습니다. (0 ~ {upload.chunk_count - 1})"
+            )
+        expected = upload.chunk_length(index)
+        content_length = request.headers.get("content-length")
+        if content_length and content_length.isdigit() and int(content_length) != expected:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"청크 크기가 맞지 않습니다. 필요: {expected}바이트"
+            )
+
+        # 기존 청크 내용을 덮어쓰기 시작하므로 검증이 끝날 때까지 받지 않은 청크로 표시
+        await self.db.execute(
+            delete(AssetUploadChunk).where(AssetUploadChunk.upload_id == upload.id, AssetUploadChunk.index == index)
+        )
+        await self.db.commit()
+
+        loop = asyncio.get_running_loop()
+        digest = hashlib.sha256()
+        size = 0
+        offset = index * upload.chunk_size
+        pending = bytearray()
+        try:
+            fd = await loop.run_in_executor(None, os.open, self.data_path(upload), os.O_WRONLY)
+        except FileNotFoundError:
+            await self.discard(upload)
+            raise HTTPException(
+                status_code=status.HTTP_410_GONE,
+                detail="업로드 데이터가 없습니다. 새 세션으로 다시 업로드하세요."
+            )
+        try:
+            async for data in request.stream():
+                size += len(data)
+                if size > expected:
+                    raise HTTPException(
+                        status_code=status.HTTP_400_BAD_REQUEST,
+                        detail=f"청크 크기가 맞지 않습니다. 필요: {expected}바이트"
+                    )
+                digest.update(data)
+                pending += data
+                if len(pending) >= settings.UPLOAD_WRITE_BUFFER_SIZE:
+                    await loop.run_in_executor(None, _pwrite_all, fd, bytes(pending), offset)
+                    offset += len(pending)
+                    pending.clear()
+            if pending:
+                await loop.run_in_executor(None, _pwrite_all, fd, bytes(pending), offset)
+            if size != expected:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=f"청크 크기가 맞지 않습니다. 필요: {expected}바이트"
+                )
+            if digest.hexdigest() != checksum.strip().lower():
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="청크 체크섬(SHA-256)이 일치하지 않습니다."
+                )
+            # 받은 청크로 기록하기 전에 디스크에 반영
+            await loop.run_in_executor(None, os.fsync, fd)
+        finally:
+            os.close(fd)
+
+        connection = await self.db.connection()
+        insert = postgresql.insert if connection.dialect.name == "postgresql" else sqlite.insert
+        statement = insert(AssetUploadChunk).values(
+            upload_id=upload.id,
+            index=index,
+            sha256=digest.hexdigest(),
+            created_at=datetime.utcnow(),
+        )
+        statement = statement.on_conflict_do_update(
+            index_elements=["upload_id", "index"],
+            set_={"sha256": statement.excluded.sha256, "created_at": statement.excluded.created_at},
+        )
+        await self.db.execute(statement)
+        await self.db.commit()
+
+    async def assemble(self, upload: AssetUpload) -> UploadSink:
+        """
+        모든 청크 수신 확인 후 데이터 파일을 업로드 임시 파일로 인수
+        (세션 생성 시 전체 SHA-256을 알려줬다면 일치 여부 검증)
+        """
+        received = await self.received(upload)
+        if len(received) != upload.chunk_count:
+            missing = sorted(set(range(upload.chunk_count)) - set(received))
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail={"message": "받지 않은 청크가 있습니다.", "missing_chunks": missing[:1000]}
+            )
+
+        path = self.data_path(upload)
+        try:
+            sink = await UploadSink.adopt(self.file_service.upload_dir, upload.file_ext, path)
+        except FileNotFoundError:
+            await self.discard(upload)
+            raise HTTPException(
+                status_code=status.HTTP_410_GONE,
+                detail="업로드 데이터가 없습니다. 새 세션으로 다시 업로드하세요."
+            )
+        if sink.size != upload.file_size or (upload.content_hash and sink.sha256 != upload.content_hash):
+            await self.discard(upload)
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="업로드된 파일이 선언한 크기/SHA-256과 일치하지 않습니다."
+            )
+        return sink
+
+    async def forget(self, upload: AssetUpload) -> None:
+        """세션/청크 행 삭제 (데이터 파일은 유지, 커밋은 호출자)"""
+        await self.db.execute(delete(AssetUploadChunk).where(AssetUploadChunk.upload_id == upload.id))
+        await self.db.delete(upload)
+
+    async def discard(self, upload: AssetUpload) -> None:
+        """세션 취소 (행과 데이터 파일 삭제)"""
+        await self.forget(upload)
+        await self.db.commit()
+        self.data_path(upload).unlink(missing_ok=True)
+
+    async def purge_expired(self) -> int:
+        """만료 세션 정리 (행과 데이터 파일 삭제, 커밋은 호출자)"""
+        result = await self.db.execute(
+            select(AssetUpload).where(AssetUpload.expires_at <= datetime.utcnow()).limit(_PURGE_BATCH)
+        )
+        expired = result.scalars().all()
+        for upload in expired:
+            await self.forget(upload)
+            self.data_path(upload).unlink(missing_ok=True)
+        return len(expired)
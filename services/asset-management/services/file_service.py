@@ -1,125 +1,292 @@
 """
 V-Factory - 파일 처리 서비스
-파일 저장, 메타데이터 추출 등
+업로드 스트림 저장, 메타데이터 추출 등
+업로드는 요청 본문(multipart)을 한 번만 읽으면서 크기 제한, SHA-256 계산, 임시 파일 기록,
+glTF/GLB 메타데이터 추출을 함께 처리하고 성공 시 임시 파일을 최종 경로로 원자적 이름 변경
 """
-import json
+import asyncio
+import hashlib
+import os
+import uuid
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Dict, Any
+from typing import Any, Dict, List, Optional, Tuple
 
 import aiofiles
-from fastapi import UploadFile
+from fastapi import HTTPException, Request, status
+from multipart.multipart import MultipartParser, parse_options_header
 
 from config import settings
+from utils.gltf_metadata import GltfMetadataParser
+
+# 업로드 파일 폼 필드 이름
+UPLOAD_FIELD = "file"
+
+# multipart 경계/헤더 등 본문 중 파일 외 부분 허용량 (Content-Length 사전 검사용)
+_MULTIPART_OVERHEAD = 64 * 1024
+
+
+def file_too_large() -> HTTPException:
+    """업로드 크기 초과 오류"""
+    return HTTPException(
+        status_code=status.HTTP_400_BAD_REQUEST,
+        detail=f"파일 크기가 너무 큽니다. 최대: {settings.MAX_FILE_SIZE / 1024 / 1024}MB"
+    )
+
+
+class UploadSink:
+    """
+    업로드 파일 기록기
+    크기 제한 검사 → SHA-256/메타데이터 갱신 → 임시 파일 쓰기를 청크마다 한 번에 처리
+    """
+
+    def __init__(self, upload_dir: Path, file_ext: str, max_size: Optional[int] = None):
+        self.upload_dir = upload_dir
+        self.file_ext = file_ext
+        self.max_size = max_size or settings.MAX_FILE_SIZE
+        self.temp_path = upload_dir / f".upload-{uuid.uuid4().hex}{file_ext}.part"
+        self.size = 0
+        self._sha256 = hashlib.sha256()
+        self._metadata = GltfMetadataParser(file_ext) if file_ext in (".glb", ".gltf") else None
+        self._pending = bytearray()
+        self._file = None
+
+    @property
+    def sha256(self) -> str:
+        return self._sha256.hexdigest()
+
+    @property
+    def metadata(self) -> Dict[str, Any]:
+        return self._metadata.result() if self._metadata is not None else {}
+
+    @classmethod
+    async def adopt(cls, upload_dir: Path, file_ext: str, path: Path) -> "UploadSink":
+        """
+        이미 디스크에 기록된 파일(청크 업로드 결과)을 임시 파일로 인수
+        순차로 한 번 읽어 SHA-256/메타데이터만 계산 (파일 내용은 다시 쓰지 않음)
+        """
+        sink = cls(upload_dir, file_ext)
+        sink.temp_path = path
+        async with aiofiles.open(path, "rb") as f:
+            while chunk := await f.read(settings.UPLOAD_WRITE_BUFFER_SIZE):
+                sink._digest(chunk)
+        return sink
+
+    async def open(self) -> None:
+        self._file = await aiofiles.open(self.temp_path, "wb")
+
+    async def write(self, data: bytes) -> None:
+        """청크 기록 (MAX_FILE_SIZE 초과 시 즉시 중단)"""
+        self._digest(data)
+        # 작은 청크마다 스레드 왕복하지 않도록 모아서 기록
+        self._pending += data
+        if len(self._pending) >= settings.UPLOAD_WRITE_BUFFER_SIZE:
+            await self._flush()
+
+    async def commit(self, filename: str) -> str:
+        """
+        디스크에 반영 후 최종 파일명으로 원자적 이름 변경
+
+        Returns:
+            업로드 디렉토리 기준 상대 경로
+        """
+        if self._file is not None:
+            await self._flush()
+            await self._file.flush()
+            await asyncio.get_running_loop().run_in_executor(None, os.fsync, self._file.fileno())
+            await self._file.close()
+            self._file = None
+        target = self.upload_dir / filename
+        target.parent.mkdir(parents=True, exist_ok=True)
+        os.replace(self.temp_path, target)
+        return filename
+
+    async def abort(self) -> None:
+        """임시 파일 삭제 (실패/중단 시)"""
+        if self._file is not None:
+            await self._file.close()
+            self._file = None
+        try:
+            os.unlink(self.temp_path)
+        except FileNotFoundError:
+            pass
+
+    def _digest(self, data: bytes) -> None:
+        self.size += len(data)
+        if self.size > self.max_size:
+            raise file_too_large()
+        self._sha256.update(data)
+        if self._metadata is not None:
+            self._metadata.feed(data)
+
+    async def _flush(self) -> None:
+        if self._pending:
+            await self._file.write(bytes(self._pending))
+            self._pending.clear()
+
+
+@dataclass
+class ReceivedUpload:
+    """스트림으로 받은 업로드 파일 (commit 전에는 임시 파일 상태)"""
+    filename: str
+    file_ext: str
+    sink: UploadSink
+
+
+class _MultipartEvents:
+    """python-multipart 동기 콜백을 이벤트 목록으로 모음 (청크 단위로 비동기 처리)"""
+
+    def __init__(self):
+        self.events: List[Tuple[str, Any]] = []
+        self._field = b""
+        self._value = b""
+        self._headers: Dict[bytes, bytes] = {}
+
+    def callbacks(self) -> Dict[str, Any]:
+        return {
+            "on_part_begin": self._on_part_begin,
+            "on_part_data": self._on_part_data,
+            "on_part_end": lambda: self.events.append(("part_end", None)),
+            "on_header_field": self._on_header_field,
+            "on_header_value": self._on_header_value,
+            "on_header_end": self._on_header_end,
+            "on_headers_finished": lambda: self.events.append(("headers", self._headers)),
+        }
+
+    def _on_part_begin(self) -> None:
+        self._headers = {}
+
+    def _on_part_data(self, data: bytes, start: int, end: int) -> None:
+        self.events.append(("data", data[start:end]))
+
+    def _on_header_field(self, data: bytes, start: int, end: int) -> None:
+        self._field += data[start:end]
+
+    def _on_header_value(self, data: bytes, start: int, end: int) -> None:
+        self._value += data[start:end]
+
+    def _on_header_end(self) -> None:
+        self._headers[self._field.lower()] = self._value
+        self._field = b""
+        self._value = b""
 
 
 class FileService:
     """파일 처리 서비스 클래스"""
-    
+
     def __init__(self):
         self.upload_dir = Path(settings.UPLOAD_DIR)
         self.upload_dir.mkdir(parents=True, exist_ok=True)
-    
-    async def get_file_size(self, file: UploadFile) -> int:
-        """
-        업로드 파일의 크기 계산
-        
-        Args:
-            file: 업로드된 파일
-            
-        Returns:
-            파일 크기 (바이트)
-        """
-        # 파일 포인터를 끝으로 이동하여 크기 계산
-        await file.seek(0, 2)  # SEEK_END
-        size = await file.tell()
-        await file.seek(0)  # 다시 처음으로
-        return size
-    
-    async def save_file(self, file: UploadFile, filename: str) -> str:
+
+    async def receive_upload(self, request: Request) -> ReceivedUpload:
         """
-        파일을 업로드 디렉토리에 저장
-        
+        multipart 요청 본문을 스트림으로 한 번만 읽어 업로드 파일을 임시 파일로 저장
+        (파일 크기 초과/허용되지 않는 확장자는 본문을 다 받기 전에 중단)
+
         Args:
-            file: 업로드된 파일
-            filename: 저장할 파일명
-            
+            request: multipart/form-data 요청 (파일 필드 이름 "file")
+
         Returns:
-            저장된 파일의 상대 경로
+            ReceivedUpload - 호출자가 sink.commit() 또는 sink.abort() 호출
         """
-        file_path = self.upload_dir / filename
-        
-        async with aiofiles.open(file_path, "wb") as f:
-            # 청크 단위로 읽어서 저장 (메모리 효율성)
-            while chunk := await file.read(1024 * 1024):  # 1MB 청크
-                await f.write(chunk)
-        
-        return filename
-    
+        content_type, params = parse_options_header(request.headers.get("content-type", ""))
+        boundary = params.get(b"boundary")
+        if content_type != b"multipart/form-data" or not boundary:
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail="multipart/form-data 요청이 필요합니다."
+            )
+        content_length = request.headers.get("content-length")
+        if content_length and content_length.isdigit() and int(content_length) > settings.MAX_FILE_SIZE + _MULTIPART_OVERHEAD:
+            raise file_too_large()
+
+        events = _MultipartEvents()
+        parser = MultipartParser(boundary, events.callbacks())
+        upload: Optional[ReceivedUpload] = None
+        writing = False  # 업로드 파일 파트 기록 중 여부 (그 외 파트는 무시)
+
+        try:
+            async for chunk in request.stream():
+                parser.write(chunk)
+                for kind, payload in events.events:
+                    if kind == "headers":
+                        _, options = parse_options_header(payload.get(b"content-disposition", b""))
+                        name = options.get(b"name", b"").decode("utf-8", "replace")
+                        filename = options.get(b"filename")
+                        writing = name == UPLOAD_FIELD and filename is not None and upload is None
+                        if writing:
+                            upload = await self._open_upload(filename.decode("utf-8", "replace"))
+                    elif kind == "data":
+                        if writing:
+                            await upload.sink.write(payload)
+                    elif kind == "part_end":
+                        writing = False
+                events.events.clear()
+            parser.finalize()
+        except BaseException:
+            if upload is not None:
+                await upload.sink.abort()
+            raise
+
+        if upload is None:
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail=f"업로드 파일 필드({UPLOAD_FIELD})가 필요합니다."
+            )
+        return upload
+
+    async def _open_upload(self, filename: str) -> ReceivedUpload:
+        """파일 파트 시작 시 확장자 검증 후 임시 파일 열기"""
+        file_ext = Path(filename).suffix.lower()
+        if file_ext not in settings.ALLOWED_EXTENSIONS:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"허용되지 않는 파일 형식입니다. 허용: {settings.ALLOWED_EXTENSIONS}"
+            )
+        sink = UploadSink(self.upload_dir, file_ext)
+        await sink.open()
+        return ReceivedUpload(filename=filename, file_ext=file_ext, sink=sink)
+
     async def extract_gltf_metadata(self, file_path: str) -> Dict[str, Any]:
         """
-        GLB/GLTF 파일에서 기본 메타데이터 추출
-        
+        저장된 GLB/GLTF 파일에서 구조 메타데이터 추출
+        GLB는 JSON 청크와 이미지 앞부분만 seek해서 읽고 BIN 청크 나머지는 읽지 않음
+
         Args:
             file_path: 파일 경로
-            
+
         Returns:
             메타데이터 딕셔너리
         """
-        full_path = self.upload_dir / file_path
-        metadata = {}
-        
+        parser = GltfMetadataParser(Path(file_path).suffix.lower())
         try:
-            # GLB 파일인 경우
-            if file_path.endswith(".glb"):
-                async with aiofiles.open(full_path, "rb") as f:
-                    # GLB 헤더 읽기 (12바이트)
-                    header = await f.read(12)
-                    if len(header) >= 12:
-                        magic = header[0:4]
-                        version = int.from_bytes(header[4:8], "little")
-                        length = int.from_bytes(header[8:12], "little")
-                        
-                        if magic == b"glTF":
-                            metadata["glb_version"] = version
-                            metadata["glb_length"] = length
-            
-            # GLTF 파일인 경우 (JSON)
-            elif file_path.endswith(".gltf"):
-                async with aiofiles.open(full_path, "r", encoding="utf-8") as f:
-                    content = await f.read()
-                    gltf_data = json.loads(content)
-                    
-                    # 기본 정보 추출
-                    if "asset" in gltf_data:
-                        metadata["gltf_version"] = gltf_data["asset"].get("version")
-                        metadata["generator"] = gltf_data["asset"].get("generator")
-                    
-                    # 메시, 머티리얼, 애니메이션 수
-                    metadata["mesh_count"] = len(gltf_data.get("meshes", []))
-                    metadata["material_count"] = len(gltf_data.get("materials", []))
-                    metadata["animation_count"] = len(gltf_data.get("animations", []))
-                    metadata["node_count"] = len(gltf_data.get("nodes", []))
-        
+            async with aiofiles.open(self.upload_dir / file_path, "rb") as f:
+                while (offset := parser.next_offset) is not None:
+                    if offset != parser.position:
+                        await f.seek(offset)
+                        parser.seek(offset)
+                    chunk = await f.read(parser.read_size)
+                    if not chunk:
+                        break
+                    parser.feed(chunk)
         except Exception as e:
-            # 메타데이터 추출 실패해도 에셋 저장은 진행
-            metadata["extraction_error"] = str(e)
-        
-        return metadata
-    
+            return {"extraction_error": str(e)}
+        return parser.result()
+
     async def delete_file(self, file_path: str) -> bool:
         """
         파일 삭제
-        
+
         Args:
             file_path: 삭제할 파일의 상대 경로
-            
+
         Returns:
             삭제 성공 여부
         """
         full_path = self.upload_dir / file_path
-        
+
         if full_path.exists():
             full_path.unlink()
             return True
-        
+
         return False
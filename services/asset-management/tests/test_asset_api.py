@@ -6,6 +6,8 @@ from httpx import AsyncClient
 from uuid import UUID
 import io
 
+from models import Asset
+
 
 @pytest.mark.asyncio
 class TestAssetAPI:
@@ -41,6 +43,30 @@ class TestAssetAPI:
         
         assert response.status_code == 404
     
+    async def test_get_asset_conditional(self, client: AsyncClient, test_session):
+        """에셋/메타데이터 조회 ETag가 같으면 304"""
+        asset = Asset(
+            name="conveyor",
+            file_path="conveyor.glb",
+            file_type="glb",
+            file_size=1024,
+            asset_metadata={"meshes": 3},
+        )
+        test_session.add(asset)
+        await test_session.commit()
+        
+        for path in (f"/assets/{asset.id}", f"/assets/{asset.id}/metadata"):
+            response = await client.get(path)
+            assert response.status_code == 200
+            etag = response.headers["etag"]
+            
+            response = await client.get(path, headers={"If-None-Match": f'"other", {etag}'})
+            assert response.status_code == 304
+            assert response.headers["etag"] == etag
+        
+        response = await client.get(f"/assets/{asset.id}/metadata")
+        assert response.json() == {"meshes": 3}
+    
     async def test_health_check(self, client: AsyncClient):
         """향상된 헬스체크 엔드포인트 테스트"""
         response = await client.get("/health")
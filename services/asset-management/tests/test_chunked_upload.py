@@ -0,0 +1,135 @@
+"""
+재개 가능한 청크 업로드 테스트
+"""
+import hashlib
+import json
+
+import pytest
+from httpx import AsyncClient
+
+from config import settings
+
+CHUNK = 64
+GLTF = json.dumps({
+    "asset": {"version": "2.0", "generator": "chunked"},
+    "meshes": [{}],
+    "extras": "x" * 200,
+}).encode("utf-8")
+
+
+def _sha256(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+@pytest.fixture
+def upload_dir(tmp_path, monkeypatch):
+    """임시 업로드 디렉토리 (작은 청크 크기)"""
+    monkeypatch.setattr(settings, "UPLOAD_DIR", str(tmp_path))
+    monkeypatch.setattr(settings, "UPLOAD_CHUNK_SIZE", CHUNK)
+    return tmp_path
+
+
+async def _put(client: AsyncClient, upload_id: str, index: int, data: bytes, checksum: str = None):
+    return await client.put(
+        f"/assets/uploads/{upload_id}/chunks/{index}",
+        content=data,
+        headers={"X-Chunk-SHA256": checksum or _sha256(data)},
+    )
+
+
+class TestChunkedUpload:
+    """청크 업로드 API 테스트 클래스"""
+
+    async def test_out_of_order_chunks_and_complete(self, client: AsyncClient, upload_dir):
+        response = await client.post(
+            "/assets/uploads/",
+            json={"filename": "line.gltf", "file_size": len(GLTF), "content_hash": _sha256(GLTF)},
+        )
+        assert response.status_code == 201
+        session = response.json()
+        assert session["chunk_size"] == CHUNK
+        assert session["chunk_count"] == -(-len(GLTF) // CHUNK)
+        assert session["offset"] == 0
+
+        chunks = [GLTF[offset:offset + CHUNK] for offset in range(0, len(GLTF), CHUNK)]
+        # 마지막 청크를 빼고 역순으로 전송 (테스트 클라이언트는 DB 세션 하나를 공유하므로 순차 요청)
+        for index in reversed(range(len(chunks) - 1)):
+            assert (await _put(client, session["id"], index, chunks[index])).status_code == 204
+
+        status_response = (await client.get(f"/assets/uploads/{session['id']}")).json()
+        assert status_response["received_chunks"] == list(range(len(chunks) - 1))
+        assert status_response["offset"] == (len(chunks) - 1) * CHUNK
+
+        # 빠진 청크가 있으면 완료 불가
+        response = await client.post(f"/assets/uploads/{session['id']}/complete")
+        assert response.status_code == 409
+        assert response.json()["detail"]["missing_chunks"] == [len(chunks) - 1]
+
+        assert (await _put(client, session["id"], len(chunks) - 1, chunks[-1])).status_code == 204
+        response = await client.post(f"/assets/uploads/{session['id']}/complete")
+        assert response.status_code == 201
+        asset = response.json()
+        assert asset["name"] == "line"
+        assert asset["content_hash"] == _sha256(GLTF)
+        assert asset["asset_metadata"]["mesh_count"] == 1
+        assert (upload_dir / asset["file_path"]).read_bytes() == GLTF
+
+        # 세션과 데이터 파일 정리
+        assert (await client.get(f"/assets/uploads/{session['id']}")).status_code == 404
+        assert list((upload_dir / settings.UPLOAD_SESSION_DIR).iterdir()) == []
+
+    async def test_rejects_bad_chunk(self, client: AsyncClient, upload_dir):
+        session = (await client.post(
+            "/assets/uploads/", json={"filename": "line.gltf", "file_size": len(GLTF)}
+        )).json()
+        chunk = GLTF[:CHUNK]
+
+        response = await _put(client, session["id"], 0, chunk, checksum=_sha256(b"other"))
+        assert response.status_code == 400
+        response = await _put(client, session["id"], 0, chunk[:-1])
+        assert response.status_code == 400
+        response = await _put(client, session["id"], session["chunk_count"], chunk)
+        assert response.status_code == 400
+
+        assert (await client.get(f"/assets/uploads/{session['id']}")).json()["received_chunks"] == []
+
+    async def test_bad_resend_invalidates_received_chunk(self, client: AsyncClient, upload_dir):
+        """이미 받은 청크를 잘못된 내용으로 다시 보내면 그 청크를 다시 받기 전까지 완료할 수 없는지 확인"""
+        session = (await client.post("/assets/uploads/", json={"filename": "line.gltf", "file_size": len(GLTF)})).json()
+        chunks = [GLTF[offset:offset + CHUNK] for offset in range(0, len(GLTF), CHUNK)]
+        for index, chunk in enumerate(chunks):
+            assert (await _put(client, session["id"], index, chunk)).status_code == 204
+
+        bad = b"x" * CHUNK
+        response = await _put(client, session["id"], 0, bad, checksum=_sha256(chunks[0]))
+        assert response.status_code == 400
+        assert (await client.get(f"/assets/uploads/{session['id']}")).json()["received_chunks"] == list(range(1, len(chunks)))
+
+        response = await client.post(f"/assets/uploads/{session['id']}/complete")
+        assert response.status_code == 409
+        assert response.json()["detail"]["missing_chunks"] == [0]
+
+        assert (await _put(client, session["id"], 0, chunks[0])).status_code == 204
+        response = await client.post(f"/assets/uploads/{session['id']}/complete")
+        assert response.status_code == 201
+        assert (upload_dir / response.json()["file_path"]).read_bytes() == GLTF
+
+    async def test_declared_hash_mismatch(self, client: AsyncClient, upload_dir):
+        data = b"x" * 10
+        session = (await client.post(
+            "/assets/uploads/",
+            json={"filename": "tex.png", "file_size": len(data), "content_hash": _sha256(b"y" * 10)},
+        )).json()
+        assert (await _put(client, session["id"], 0, data)).status_code == 204
+
+        response = await client.post(f"/assets/uploads/{session['id']}/complete")
+        assert response.status_code == 400
+        assert (await client.get(f"/assets/uploads/{session['id']}")).status_code == 404
+
+    async def test_create_validation(self, client: AsyncClient, upload_dir):
+        response = await client.post("/assets/uploads/", json={"filename": "a.exe", "file_size": 10})
+        assert response.status_code == 400
+        response = await client.post(
+            "/assets/uploads/", json={"filename": "a.glb", "file_size": settings.MAX_FILE_SIZE + 1}
+        )
+        assert response.status_code == 400
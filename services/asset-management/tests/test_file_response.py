@@ -0,0 +1,102 @@
+"""
+에셋 다운로드 Range/조건부 요청 테스트
+"""
+import pytest
+from httpx import AsyncClient
+
+from config import settings
+from models import Asset
+from utils.file_response import parse_range
+
+CONTENT = bytes(range(256)) * 4  # 1024바이트
+
+
+class TestParseRange:
+    """Range 헤더 해석 테스트 클래스"""
+
+    def test_single_and_suffix(self):
+        assert parse_range("bytes=0-99", 1024, 8) == [(0, 99)]
+        assert parse_range("bytes=1000-", 1024, 8) == [(1000, 1023)]
+        assert parse_range("bytes=-24", 1024, 8) == [(1000, 1023)]
+        assert parse_range("bytes=1000-5000", 1024, 8) == [(1000, 1023)]
+
+    def test_merges_overlapping(self):
+        assert parse_range("bytes=50-99, 0-10, 90-120, 121-130", 1024, 8) == [(0, 10), (50, 130)]
+
+    def test_invalid_or_unsatisfiable(self):
+        assert parse_range(None, 1024, 8) is None
+        assert parse_range("items=0-1", 1024, 8) is None
+        assert parse_range("bytes=5-1", 1024, 8) is None
+        assert parse_range("bytes=abc", 1024, 8) is None
+        assert parse_range("bytes=²-", 1024, 8) is None
+        assert parse_range("bytes=0-²", 1024, 8) is None
+        assert parse_range("bytes=0-1,2-3,4-5", 1024, 2) is None
+        assert parse_range("bytes=2000-", 1024, 8) == []
+
+
+@pytest.fixture
+async def stored_asset(tmp_path, monkeypatch, test_session):
+    """임시 업로드 디렉토리에 파일과 에셋 행 생성"""
+    monkeypatch.setattr(settings, "UPLOAD_DIR", str(tmp_path))
+    (tmp_path / "model.glb").write_bytes(CONTENT)
+    asset = Asset(name="model", file_path="model.glb", file_type="glb", file_size=len(CONTENT))
+    test_session.add(asset)
+    await test_session.commit()
+    return asset
+
+
+class TestDownload:
+    """다운로드 API 테스트 클래스"""
+
+    async def test_full_download(self, client: AsyncClient, stored_asset):
+        response = await client.get(f"/assets/{stored_asset.id}/download")
+
+        assert response.status_code == 200
+        assert response.content == CONTENT
+        assert response.headers["accept-ranges"] == "bytes"
+        assert response.headers["etag"].startswith('"')
+        assert "last-modified" in response.headers
+        assert 'filename="model.glb"' in response.headers["content-disposition"]
+
+    async def test_single_range(self, client: AsyncClient, stored_asset):
+        response = await client.get(f"/assets/{stored_asset.id}/download", headers={"Range": "bytes=10-19"})
+
+        assert response.status_code == 206
+        assert response.content == CONTENT[10:20]
+        assert response.headers["content-range"] == "bytes 10-19/1024"
+        assert response.headers["content-length"] == "10"
+
+    async def test_multi_range(self, client: AsyncClient, stored_asset):
+        response = await client.get(
+            f"/assets/{stored_asset.id}/download", headers={"Range": "bytes=0-3, 100-103"}
+        )
+
+        assert response.status_code == 206
+        content_type = response.headers["content-type"]
+        assert content_type.startswith("multipart/byteranges; boundary=")
+        boundary = content_type.split("boundary=")[1].encode()
+        parts = response.content.split(b"--" + boundary)
+        assert b"Content-Range: bytes 0-3/1024\r\n\r\n" + CONTENT[0:4] + b"\r\n" in parts[1]
+        assert b"Content-Range: bytes 100-103/1024\r\n\r\n" + CONTENT[100:104] + b"\r\n" in parts[2]
+        assert parts[3] == b"--\r\n"
+        assert int(response.headers["content-length"]) == len(response.content)
+
+    async def test_if_range_and_conditional(self, client: AsyncClient, stored_asset):
+        url = f"/assets/{stored_asset.id}/download"
+        etag = (await client.head(url)).headers["etag"]
+
+        # 파일이 바뀌었으면(ETag 불일치) 범위를 무시하고 전체 전송
+        response = await client.get(url, headers={"Range": "bytes=0-9", "If-Range": '"stale"'})
+        assert response.status_code == 200
+        assert response.content == CONTENT
+
+        response = await client.get(url, headers={"Range": "bytes=0-9", "If-Range": etag})
+        assert response.status_code == 206
+
+        response = await client.get(url, headers={"If-None-Match": etag})
+        assert response.status_code == 304
+        assert response.content == b""
+
+        response = await client.get(url, headers={"Range": "bytes=5000-"})
+        assert response.status_code == 416
+        assert response.headers["content-range"] == "bytes */1024"
@@ -0,0 +1,127 @@
+"""
+glTF/GLB 구조 메타데이터 추출 테스트
+"""
+import base64
+import json
+import struct
+
+from utils.gltf_metadata import GltfMetadataParser, image_size
+
+VERTEX_BYTES = 10_000
+PNG_HEAD = b"\x89PNG\r\n\x1a\n" + struct.pack(">I", 13) + b"IHDR" + struct.pack(">II", 128, 64) + b"\x08\x06\x00\x00\x00"
+
+
+def _document(image: dict) -> dict:
+    return {
+        "asset": {"version": "2.0", "generator": "test"},
+        "scene": 0,
+        "scenes": [{"nodes": [0]}],
+        "nodes": [
+            {"children": [1], "translation": [10, 0, 0]},
+            {"mesh": 0, "scale": [2, 2, 2]},
+        ],
+        "meshes": [{"primitives": [{"attributes": {"POSITION": 0}, "indices": 1}]}],
+        "accessors": [
+            {"count": 24, "componentType": 5126, "type": "VEC3", "min": [-1, -1, -1], "max": [1, 1, 1]},
+            {"count": 36, "componentType": 5123, "type": "SCALAR"},
+        ],
+        "images": [image],
+        "textures": [{"source": 0}],
+        "materials": [{}],
+        "extensionsUsed": ["KHR_materials_unlit"],
+    }
+
+
+def _glb() -> bytes:
+    document = _document({"bufferView": 0, "mimeType": "image/png"})
+    document["buffers"] = [{"byteLength": VERTEX_BYTES + len(PNG_HEAD)}]
+    document["bufferViews"] = [{"buffer": 0, "byteOffset": VERTEX_BYTES, "byteLength": len(PNG_HEAD)}]
+    json_chunk = json.dumps(document).encode("utf-8")
+    json_chunk += b" " * (-len(json_chunk) % 4)
+    bin_chunk = b"\x00" * VERTEX_BYTES + PNG_HEAD
+    bin_chunk += b"\x00" * (-len(bin_chunk) % 4)
+    length = 12 + 8 + len(json_chunk) + 8 + len(bin_chunk)
+    return (
+        b"glTF" + struct.pack("<II", 2, length)
+        + struct.pack("<II", len(json_chunk), 0x4E4F534A) + json_chunk
+        + struct.pack("<II", len(bin_chunk), 0x004E4942) + bin_chunk
+    )
+
+
+def _read_like_file(parser: GltfMetadataParser, data: bytes) -> int:
+    """FileService.extract_gltf_metadata와 같은 방식으로 필요한 구간만 읽고 읽은 바이트 수 반환"""
+    read = 0
+    while (offset := parser.next_offset) is not None:
+        parser.seek(offset)
+        chunk = data[offset:offset + parser.read_size]
+        if not chunk:
+            break
+        read += len(chunk)
+        parser.feed(chunk)
+    return read
+
+
+def _assert_structure(result: dict) -> None:
+    assert result["gltf_version"] == "2.0"
+    assert (result["mesh_count"], result["node_count"], result["material_count"]) == (1, 2, 1)
+    assert (result["vertex_count"], result["triangle_count"]) == (24, 12)
+    assert result["geometry_bytes"] == 24 * 12 + 36 * 2
+    # 노드 변환(부모 이동 10, 자식 배율 2) 적용
+    assert result["bounding_box"] == {"min": [8, -2, -2], "max": [12, 2, 2]}
+    assert result["images"][0]["width"] == 128 and result["images"][0]["height"] == 64
+    assert result["texture_memory_bytes"] == 128 * 64 * 4 * 4 // 3
+    assert result["extensions_used"] == ["KHR_materials_unlit"]
+    assert "extraction_error" not in result
+
+
+class TestGltfMetadataParser:
+    """메타데이터 점진 추출 테스트 클래스"""
+
+    def test_glb_stream(self):
+        data = _glb()
+        parser = GltfMetadataParser(".glb")
+        for index in range(0, len(data), 5):
+            parser.feed(data[index:index + 5])
+        result = parser.result()
+
+        _assert_structure(result)
+        assert result["glb_version"] == 2
+        assert result["glb_length"] == len(data)
+        assert result["bin_chunk_length"] >= VERTEX_BYTES
+
+    def test_glb_file_skips_binary_chunk(self):
+        data = _glb()
+        parser = GltfMetadataParser(".glb")
+        read = _read_like_file(parser, data)
+
+        _assert_structure(parser.result())
+        # 버텍스 데이터 구간은 읽지 않음
+        assert read < len(data) - VERTEX_BYTES
+
+    def test_gltf_data_uri(self):
+        uri = "data:image/png;base64," + base64.b64encode(PNG_HEAD + b"\x00" * 100).decode()
+        data = json.dumps(_document({"uri": uri})).encode("utf-8")
+        parser = GltfMetadataParser(".gltf")
+        for index in range(0, len(data), 7):
+            parser.feed(data[index:index + 7])
+
+        _assert_structure(parser.result())
+
+    def test_too_large_or_invalid_is_reported(self):
+        parser = GltfMetadataParser(".gltf", max_json_bytes=16)
+        parser.feed(b"{" * 32)
+        assert parser.done
+        assert "extraction_error" in parser.result()
+
+        parser = GltfMetadataParser(".glb")
+        parser.feed(b"nope" + b"\x00" * 20)
+        assert parser.done
+        assert "extraction_error" in parser.result()
+
+    def test_image_size(self):
+        jpeg = b"\xff\xd8" + b"\xff\xe0" + struct.pack(">H", 4) + b"\x00\x00" + b"\xff\xc0" + struct.pack(">HBHH", 11, 8, 48, 96)
+        ktx2 = b"\xabKTX 20\xbb\r\n\x1a\n" + b"\x00" * 8 + struct.pack("<II", 256, 512)
+        assert image_size(PNG_HEAD) == (128, 64)
+        assert image_size(jpeg) == (96, 48)
+        assert image_size(ktx2) == (256, 512)
+        assert image_size(b"unknown") is None
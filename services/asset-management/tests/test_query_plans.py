@@ -0,0 +1,59 @@
+"""
+에셋 핫 쿼리 실행 계획 회귀 테스트
+시드 데이터에서 목록/파일 유형 필터 쿼리가 순차 스캔으로 떨어지지 않는지 확인
+"""
+import random
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import insert, select, text
+
+from models import Asset
+from tests.query_plan import assert_index_scan
+
+ASSET_COUNT = 2000
+FILE_TYPES = ["glb", "gltf", "png", "jpg", "fbx", "obj"]
+
+
+@pytest.fixture
+async def seeded_session(test_session):
+    """여러 파일 유형의 에셋을 저장하고 통계를 갱신한 세션"""
+    rng = random.Random(0)
+    base = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    await test_session.execute(
+        insert(Asset),
+        [
+            {
+                "id": uuid.uuid4(),
+                "name": f"asset-{index}",
+                "file_path": f"/uploads/asset-{index}",
+                "file_type": rng.choice(FILE_TYPES),
+                "file_size": 1024,
+                "created_at": base + timedelta(minutes=index),
+            }
+            for index in range(ASSET_COUNT)
+        ],
+    )
+    await test_session.commit()
+    await test_session.execute(text("ANALYZE"))
+    return test_session
+
+
+class TestAssetQueryPlans:
+    """에셋 조회 실행 계획 테스트 클래스"""
+
+    async def test_file_type_list(self, seeded_session):
+        """파일 유형별 최신순 목록"""
+        query = (
+            select(Asset)
+            .where(Asset.file_type == "glb")
+            .order_by(Asset.created_at.desc())
+            .limit(100)
+        )
+        await assert_index_scan(seeded_session, query)
+
+    async def test_latest_list(self, seeded_session):
+        """전체 최신순 목록"""
+        query = select(Asset).order_by(Asset.created_at.desc()).limit(100)
+        await assert_index_scan(seeded_session, query)
@@ -0,0 +1,119 @@
+"""
+에셋 스트리밍 업로드 테스트
+"""
+import hashlib
+import json
+
+import pytest
+from httpx import AsyncClient
+
+from config import settings
+
+GLTF = json.dumps({
+    "asset": {"version": "2.0", "generator": "test"},
+    "meshes": [{}, {}],
+    "nodes": [{}],
+}).encode("utf-8")
+
+
+@pytest.fixture
+def upload_dir(tmp_path, monkeypatch):
+    """임시 업로드 디렉토리"""
+    monkeypatch.setattr(settings, "UPLOAD_DIR", str(tmp_path))
+    return tmp_path
+
+
+class TestUpload:
+    """업로드 API 테스트 클래스"""
+
+    async def test_upload_single_pass(self, client: AsyncClient, upload_dir):
+        response = await client.post("/assets/", files={"file": ("model.gltf", GLTF, "model/gltf+json")})
+
+        assert response.status_code == 201
+        data = response.json()
+        assert data["name"] == "model"
+        assert data["file_size"] == len(GLTF)
+        assert data["content_hash"] == hashlib.sha256(GLTF).hexdigest()
+        assert data["asset_metadata"]["mesh_count"] == 2
+        digest = data["content_hash"]
+        assert data["file_path"] == f"blobs/{digest[:2]}/{digest[2:4]}/{digest}.gltf"
+        assert (upload_dir / data["file_path"]).read_bytes() == GLTF
+        # 임시 파일이 남지 않음
+        assert [path for path in upload_dir.rglob("*") if path.is_file()] == [upload_dir / data["file_path"]]
+
+    async def test_oversized_upload_is_aborted(self, client: AsyncClient, upload_dir, monkeypatch):
+        monkeypatch.setattr(settings, "MAX_FILE_SIZE", 1024)
+        response = await client.post("/assets/", files={"file": ("big.glb", b"x" * 4096, "model/gltf-binary")})
+
+        assert response.status_code == 400
+        assert "파일 크기가 너무 큽니다" in response.json()["detail"]
+        assert list(upload_dir.iterdir()) == []
+
+    async def test_rejects_extension_and_missing_file(self, client: AsyncClient, upload_dir):
+        response = await client.post("/assets/", files={"file": ("script.exe", b"MZ", "application/octet-stream")})
+        assert response.status_code == 400
+
+        response = await client.post("/assets/", files={"other": ("model.glb", b"glTF", "model/gltf-binary")})
+        assert response.status_code == 422
+        assert list(upload_dir.iterdir()) == []
+
+
+class TestContentAddressedStorage:
+    """내용 주소 저장/참조 수 테스트 클래스"""
+
+    async def test_duplicate_upload_shares_file(self, client: AsyncClient, upload_dir):
+        first = (await client.post("/assets/", files={"file": ("a.gltf", GLTF, "model/gltf+json")})).json()
+        second = (await client.post("/assets/", files={"file": ("b.gltf", GLTF, "model/gltf+json")})).json()
+
+        assert first["id"] != second["id"]
+        assert first["file_path"] == second["file_path"]
+        assert len([path for path in upload_dir.rglob("*") if path.is_file()]) == 1
+
+        # 마지막 참조가 삭제될 때만 파일 삭제
+        assert (await client.delete(f"/assets/{first['id']}")).status_code == 204
+        assert (upload_dir / second["file_path"]).exists()
+        assert (await client.delete(f"/assets/{second['id']}")).status_code == 204
+        assert not (upload_dir / second["file_path"]).exists()
+
+    async def test_upload_by_hash(self, client: AsyncClient, upload_dir):
+        digest = hashlib.sha256(GLTF).hexdigest()
+        request = {"name": "shortcut", "content_hash": digest, "file_type": "gltf"}
+
+        response = await client.post("/assets/by-hash", json=request)
+        assert response.status_code == 404
+
+        uploaded = (await client.post("/assets/", files={"file": ("model.gltf", GLTF, "model/gltf+json")})).json()
+        response = await client.post("/assets/by-hash", json=request)
+        assert response.status_code == 201
+        data = response.json()
+        assert data["name"] == "shortcut"
+        assert data["file_path"] == uploaded["file_path"]
+        assert data["file_size"] == len(GLTF)
+        assert data["asset_metadata"]["mesh_count"] == 2
+
+        # 즉시 업로드 에셋도 참조로 계산
+        await client.delete(f"/assets/{uploaded['id']}")
+        assert (upload_dir / data["file_path"]).exists()
+
+    async def test_upload_by_hash_type_mismatch(self, client: AsyncClient, upload_dir):
+        """저장된 파일과 형식이 다르면 409를 반환하고 참조를 추가하지 않는지 확인"""
+        digest = hashlib.sha256(GLTF).hexdigest()
+        uploaded = (await client.post("/assets/", files={"file": ("model.gltf", GLTF, "model/gltf+json")})).json()
+
+        response = await client.post("/assets/by-hash", json={"name": "wrong", "content_hash": digest, "file_type": "glb"})
+        assert response.status_code == 409
+
+        assert (await client.delete(f"/assets/{uploaded['id']}")).status_code == 204
+        assert not (upload_dir / uploaded["file_path"]).exists()
+
+    async def test_upload_same_content_other_type(self, client: AsyncClient, upload_dir):
+        """같은 내용을 다른 확장자로 업로드하면 409를 반환하고 기존 blob만 남는지 확인"""
+        image = b"\x89PNG\r\n\x1a\n" + b"\x00" * 64
+        uploaded = (await client.post("/assets/", files={"file": ("texture.png", image, "image/png")})).json()
+
+        response = await client.post("/assets/", files={"file": ("texture.jpg", image, "image/jpeg")})
+        assert response.status_code == 409
+        assert [path for path in upload_dir.rglob("*") if path.is_file()] == [upload_dir / uploaded["file_path"]]
+
+        assert (await client.delete(f"/assets/{uploaded['id']}")).status_code == 204
+        assert not (upload_dir / uploaded["file_path"]).exists()
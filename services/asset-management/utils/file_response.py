@@ -0,0 +1,303 @@
+"""
+V-Factory - 범위 요청(Range) 지원 파일 응답
+대용량 GLB의 점진적 로딩을 위해 Range/If-Range(206, multipart/byteranges)와
+강한 ETag/Last-Modified 조건부 요청(304)을 처리
+
+- 서버가 ASGI zerocopysend 확장을 제공하면 os.sendfile 기반 무복사 전송
+- 아니면 파일을 청크 단위로 읽어 전송 (응답당 청크 하나만 메모리에 유지, 클라이언트 연결 종료 시 중단)
+"""
+import os
+import secrets
+import stat
+from email.utils import formatdate, parsedate_to_datetime
+from mimetypes import guess_type
+from typing import BinaryIO, List, Mapping, Optional, Tuple
+from urllib.parse import quote
+
+import anyio
+from starlette.datastructures import Headers
+from starlette.responses import PlainTextResponse, Response
+from starlette.staticfiles import StaticFiles
+from starlette.types import Receive, Scope, Send
+
+from config import settings
+
+ZEROCOPY_EXTENSION = "http.response.zerocopysend"
+
+# (구간 앞에 보낼 바이트, 파일 시작 위치, 길이)
+Segment = Tuple[bytes, int, int]
+
+
+def file_etag(stat_result: os.stat_result) -> str:
+    """파일 강한 ETag (크기 + 수정 시각 나노초, 저장 후 수정하지 않는 에셋 파일 기준)"""
+    return f'"{stat_result.st_size:x}-{stat_result.st_mtime_ns:x}"'
+
+
+def _is_digits(value: str) -> bool:
+    """ASCII 숫자로만 이루어졌는지 (str.isdigit은 "²" 같은 유니코드 숫자도 허용하여 int 변환이 실패함)"""
+    return value.isascii() and value.isdigit()
+
+
+def parse_range(header: Optional[str], size: int, max_ranges: int) -> Optional[List[Tuple[int, int]]]:
+    """
+    Range 헤더 해석
+
+    Args:
+        header: Range 헤더 값 (bytes=0-99,200-)
+        size: 파일 크기
+        max_ranges: 허용 구간 수 (초과 시 범위 무시)
+
+    Returns:
+        None: 범위 요청이 아니거나 형식 오류 → 전체 응답
+        []: 만족할 수 있는 구간 없음 → 416
+        [(시작, 끝)]: 포함 구간 목록 (정렬 후 겹치거나 맞닿은 구간 병합)
+    """
+    if not header:
+        return None
+    unit, _, spec = header.partition("=")
+    if unit.strip().lower() != "bytes" or not spec.strip():
+        return None
+
+    parts = [part.strip() for part in spec.split(",") if part.strip()]
+    if not parts or len(parts) > max_ranges:
+        return None
+
+    ranges: List[Tuple[int, int]] = []
+    for part in parts:
+        first, separator, last = part.partition("-")
+        first, last = first.strip(), last.strip()
+        if not separator or not (_is_digits(first) or (not first and _is_digits(last))):
+            return None
+        if last and not _is_digits(last):
+            return None
+        if not first:
+            # 접미 구간 (마지막 N바이트)
+            suffix = int(last)
+            if suffix == 0 or size == 0:
+                continue
+            ranges.append((max(size - suffix, 0), size - 1))
+            continue
+        start = int(first)
+        if last and int(last) < start:
+            return None
+        if start >= size:
+            continue
+        end = int(last) if last else size - 1
+        ranges.append((start, min(end, size - 1)))
+
+    ranges.sort()
+    merged: List[Tuple[int, int]] = []
+    for start, end in ranges:
+        if merged and start <= merged[-1][1] + 1:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def content_disposition(filename: str) -> str:
+    """다운로드 파일명 헤더 (비ASCII 파일명은 RFC 5987 형식)"""
+    quoted = quote(filename)
+    if quoted != filename:
+        return f"attachment; filename*=utf-8''{quoted}"
+    return f'attachment; filename="{filename}"'
+
+
+def _read_at(file: BinaryIO, offset: int, size: int) -> bytes:
+    file.seek(offset)
+    return file.read(size)
+
+
+class RangeFileResponse(Response):
+    """
+    Range 요청 지원 파일 응답
+
+    - Range 구간 1개: 206 + Content-Range, 여러 개: 206 multipart/byteranges
+    - If-Range가 현재 ETag/Last-Modified와 다르면 전체(200) 응답
+    - If-None-Match/If-Modified-Since 일치 시 304
+    """
+
+    def __init__(
+        self,
+        path: "os.PathLike[str] | str",
+        request_headers: Mapping[str, str],
+        filename: Optional[str] = None,
+        media_type: Optional[str] = None,
+        stat_result: Optional[os.stat_result] = None,
+    ):
+        self.path = path
+        self.request_headers = request_headers
+        self.filename = filename
+        self.media_type = media_type or guess_type(filename or str(path))[0] or "application/octet-stream"
+        self.stat_result = stat_result
+        self.status_code = 200
+        self.background = None
+        self.raw_headers = []
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        try:
+            stat_result = self.stat_result or await anyio.to_thread.run_sync(os.stat, self.path)
+        except FileNotFoundError:
+            stat_result = None
+        if stat_result is None or not stat.S_ISREG(stat_result.st_mode):
+            await PlainTextResponse("파일을 찾을 수 없습니다.", status_code=404)(scope, receive, send)
+            return
+
+        size = stat_result.st_size
+        etag = file_etag(stat_result)
+        last_modified = formatdate(stat_result.st_mtime, usegmt=True)
+        headers = {"accept-ranges": "bytes", "etag": etag, "last-modified": last_modified}
+        if self.filename:
+            headers["content-disposition"] = content_disposition(self.filename)
+
+        if self._not_modified(etag, stat_result):
+            await self._send_empty(send, 304, headers)
+            return
+
+        ranges = None
+        if self._if_range_matches(etag, last_modified):
+            ranges = parse_range(self.request_headers.get("range"), size, settings.ASSET_DOWNLOAD_MAX_RANGES)
+        if ranges == []:
+            headers["content-range"] = f"bytes */{size}"
+            await self._send_empty(send, 416, headers)
+            return
+
+        status_code, segments, trailer = self._plan(ranges, size, headers)
+        headers["content-length"] = str(sum(len(prefix) + length for prefix, _, length in segments) + len(trailer))
+        await send({
+            "type": "http.response.start",
+            "status": status_code,
+            "headers": [(key.encode("latin-1"), value.encode("latin-1")) for key, value in headers.items()],
+        })
+        if scope["method"].upper() == "HEAD":
+            await send({"type": "http.response.body", "body": b"", "more_body": False})
+            return
+
+        file = await anyio.to_thread.run_sync(open, self.path, "rb")
+        try:
+            zerocopy = ZEROCOPY_EXTENSION in scope.get("extensions", {})
+            async with anyio.create_task_group() as task_group:
+                async def stream() -> None:
+                    await self._stream(send, file, segments, trailer, zerocopy)
+                    task_group.cancel_scope.cancel()
+
+                task_group.start_soon(stream)
+                await self._wait_disconnect(receive)
+                task_group.cancel_scope.cancel()
+        finally:
+            file.close()
+
+    def _plan(
+        self,
+        ranges: Optional[List[Tuple[int, int]]],
+        size: int,
+        headers: dict,
+    ) -> Tuple[int, List[Segment], bytes]:
+        """응답 상태 코드, 전송 구간, 마지막 바이트 결정 (헤더에 Content-Type/Range 추가)"""
+        if ranges is None:
+            headers["content-type"] = self.media_type
+            return 200, [(b"", 0, size)] if size else [], b""
+        if len(ranges) == 1:
+            start, end = ranges[0]
+            headers["content-type"] = self.media_type
+            headers["content-range"] = f"bytes {start}-{end}/{size}"
+            return 206, [(b"", start, end - start + 1)], b""
+
+        boundary = secrets.token_hex(16)
+        headers["content-type"] = f"multipart/byteranges; boundary={boundary}"
+        segments = []
+        for index, (start, end) in enumerate(ranges):
+            prefix = (
+                ("\r\n" if index else "")
+                + f"--{boundary}\r\n"
+                + f"Content-Type: {self.media_type}\r\n"
+                + f"Content-Range: bytes {start}-{end}/{size}\r\n\r\n"
+            ).encode("latin-1")
+            segments.append((prefix, start, end - start + 1))
+        return 206, segments, f"\r\n--{boundary}--\r\n".encode("latin-1")
+
+    async def _stream(
+        self,
+        send: Send,
+        file: BinaryIO,
+        segments: List[Segment],
+        trailer: bytes,
+        zerocopy: bool,
+    ) -> None:
+        """구간별 파일 내용 전송"""
+        for prefix, offset, length in segments:
+            if prefix:
+                await send({"type": "http.response.body", "body": prefix, "more_body": True})
+            if zerocopy:
+                await send({
+                    "type": ZEROCOPY_EXTENSION,
+                    "file": file,
+                    "offset": offset,
+                    "count": length,
+                    "more_body": True,
+                })
+                continue
+            while length > 0:
+                chunk = await anyio.to_thread.run_sync(
+                    _read_at, file, offset, min(settings.ASSET_DOWNLOAD_CHUNK_SIZE, length)
+                )
+                if not chunk:
+                    # 전송 중 파일이 줄어들면 Content-Length를 맞출 수 없으므로 연결 중단
+                    raise RuntimeError(f"파일이 전송 중 변경되었습니다: {self.path}")
+                offset += len(chunk)
+                length -= len(chunk)
+                await send({"type": "http.response.body", "body": chunk, "more_body": True})
+        await send({"type": "http.response.body", "body": trailer, "more_body": False})
+
+    @staticmethod
+    async def _wait_disconnect(receive: Receive) -> None:
+        while True:
+            message = await receive()
+            if message["type"] == "http.disconnect":
+                return
+
+    @staticmethod
+    async def _send_empty(send: Send, status_code: int, headers: dict) -> None:
+        await send({
+            "type": "http.response.start",
+            "status": status_code,
+            "headers": [(key.encode("latin-1"), value.encode("latin-1")) for key, value in headers.items()],
+        })
+        await send({"type": "http.response.body", "body": b"", "more_body": False})
+
+    def _not_modified(self, etag: str, stat_result: os.stat_result) -> bool:
+        """If-None-Match(우선) 또는 If-Modified-Since 기준 304 여부"""
+        if_none_match = self.request_headers.get("if-none-match")
+        if if_none_match is not None:
+            candidates = [candidate.strip() for candidate in if_none_match.split(",")]
+            return "*" in candidates or etag in candidates or f"W/{etag}" in candidates
+        if_modified_since = self.request_headers.get("if-modified-since")
+        if if_modified_since:
+            try:
+                return int(stat_result.st_mtime) <= parsedate_to_datetime(if_modified_since).timestamp()
+            except (TypeError, ValueError):
+                return False
+        return False
+
+    def _if_range_matches(self, etag: str, last_modified: str) -> bool:
+        """If-Range가 없거나 현재 파일과 같으면 True (ETag는 강한 비교, 날짜는 정확히 일치)"""
+        if_range = self.request_headers.get("if-range")
+        if not if_range:
+            return True
+        if_range = if_range.strip()
+        if if_range.startswith(("\"", "W/")):
+            return if_range == etag
+        return if_range == last_modified
+
+
+class RangeStaticFiles(StaticFiles):
+    """/uploads 정적 파일 서빙에 Range/강한 ETag 적용"""
+
+    def file_response(
+        self,
+        full_path: "os.PathLike[str] | str",
+        stat_result: os.stat_result,
+        scope: Scope,
+        status_code: int = 200,
+    ) -> Response:
+        return RangeFileResponse(full_path, Headers(scope=scope), stat_result=stat_result)
@@ -0,0 +1,434 @@
+"""
+V-Factory - glTF/GLB 구조 메타데이터 점진 추출
+업로드 스트림이나 파일 바이트를 feed()로 받으면서 필요한 구간만 보관
+- GLB: 헤더 → JSON 청크 헤더 → JSON 청크 → BIN 청크 헤더, 이미지 앞부분(크기 판별용)만 읽고 나머지 BIN은 건너뜀
+  (파일에서 읽을 때는 next_offset으로 seek해 필요한 구간만 읽음)
+- glTF: JSON 전체 (data URI 이미지는 앞부분만 디코딩)
+JSON의 accessor/mesh/node 정보로 버텍스·삼각형 수, 장면 경계 상자, 텍스처 크기, 확장 사용 여부를 계산해
+씬 로더가 다운로드 전에 GPU 메모리를 예산할 수 있게 함
+"""
+import base64
+import json
+import struct
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from config import settings
+
+_GLB_MAGIC = b"glTF"
+_GLB_HEADER_SIZE = 12
+_CHUNK_HEADER_SIZE = 8
+_CHUNK_JSON = 0x4E4F534A
+_CHUNK_BIN = 0x004E4942
+
+# 이미지 크기 판별에 읽는 앞부분 (PNG/KTX2는 수십 바이트, JPEG는 SOF 마커까지)
+_IMAGE_HEAD_BYTES = 64 * 1024
+# 파일에서 한 번에 읽는 최대 크기
+_READ_SIZE = 1024 * 1024
+# 응답에 담는 이미지 항목 최대 수
+_MAX_IMAGES = 256
+# 노드 계층 순회 제한 (순환 참조/비정상 파일 보호)
+_MAX_NODE_VISITS = 100_000
+
+_COMPONENT_SIZES = {5120: 1, 5121: 1, 5122: 2, 5123: 2, 5125: 4, 5126: 4}
+_TYPE_COMPONENTS = {"SCALAR": 1, "VEC2": 2, "VEC3": 3, "VEC4": 4, "MAT2": 4, "MAT3": 9, "MAT4": 16}
+
+# primitive mode (기본 4 = TRIANGLES)
+_TRIANGLES, _TRIANGLE_STRIP, _TRIANGLE_FAN = 4, 5, 6
+
+Matrix = List[float]  # 4x4 열 우선(column-major), glTF와 같은 배치
+_IDENTITY: Matrix = [1.0, 0.0, 0.0, 0.0, 0.0, 1.0, 0.0, 0.0, 0.0, 0.0, 1.0, 0.0, 0.0, 0.0, 0.0, 1.0]
+
+
+class _Region:
+    """보관할 바이트 구간 [start, end)와 다 받았을 때 호출할 콜백"""
+
+    __slots__ = ("start", "end", "data", "callback")
+
+    def __init__(self, start: int, end: int, callback: Callable[[bytes], None]):
+        self.start = start
+        self.end = end
+        self.data = bytearray()
+        self.callback = callback
+
+    @property
+    def filled_to(self) -> int:
+        return self.start + len(self.data)
+
+
+class GltfMetadataParser:
+    """
+    glTF/GLB 메타데이터 점진 추출기
+    바이트를 순서대로 feed()하거나, 파일이면 next_offset 위치로 seek()한 뒤 read_size만큼 읽어 feed()
+    """
+
+    def __init__(self, file_ext: str, max_json_bytes: Optional[int] = None):
+        self.file_ext = file_ext
+        self.max_json_bytes = max_json_bytes or settings.GLTF_METADATA_MAX_JSON_BYTES
+        self.position = 0
+        self._metadata: Dict[str, Any] = {}
+        self._document: Optional[Dict[str, Any]] = None
+        self._image_heads: Dict[int, bytes] = {}
+        self._regions: List[_Region] = []
+        self._buffer = bytearray()  # glTF JSON
+        self._error: Optional[str] = None
+        self._bin_data_offset: Optional[int] = None
+        if file_ext == ".glb":
+            self._add_region(0, _GLB_HEADER_SIZE, self._on_header)
+
+    @property
+    def done(self) -> bool:
+        """더 이상 바이트가 필요 없는지"""
+        if self._error is not None:
+            return True
+        if self.file_ext == ".glb":
+            return not self._regions
+        return False
+
+    @property
+    def next_offset(self) -> Optional[int]:
+        """다음에 필요한 바이트 위치 (None이면 완료)"""
+        if self.done:
+            return None
+        if self.file_ext == ".glb":
+            return min(region.filled_to for region in self._regions)
+        return self.position
+
+    @property
+    def read_size(self) -> int:
+        """next_offset부터 읽을 크기"""
+        if self.file_ext == ".glb" and self._regions:
+            offset = self.next_offset
+            region = next(region for region in self._regions if region.filled_to == offset)
+            return max(1, min(region.end - offset, _READ_SIZE))
+        return _READ_SIZE
+
+    def seek(self, offset: int) -> None:
+        """다음 feed() 바이트의 파일 내 위치 지정 (파일에서 건너뛰어 읽을 때)"""
+        self.position = offset
+
+    def feed(self, data: bytes) -> None:
+        start = self.position
+        self.position += len(data)
+        if self.done or not data:
+            return
+        if self.file_ext != ".glb":
+            if len(self._buffer) + len(data) > self.max_json_bytes:
+                # 메모리 보호를 위해 큰 glTF(JSON)는 추출 생략
+                self._error = f"glTF JSON이 {self.max_json_bytes}바이트를 넘어 추출을 생략했습니다."
+                self._buffer = bytearray()
+                return
+            self._buffer += data
+            return
+
+        index = 0
+        while index < len(self._regions) and self._error is None:
+            region = self._regions[index]
+            if region.start >= self.position:
+                break
+            low, high = max(region.filled_to, start), min(region.end, self.position)
+            if low == region.filled_to and low < high:
+                region.data += data[low - start:high - start]
+            if region.filled_to < region.end:
+                index += 1
+                continue
+            # 구간 완료 - 콜백이 새 구간을 추가할 수 있으므로 처음부터 다시 확인
+            self._regions.pop(index)
+            try:
+                region.callback(bytes(region.data))
+            except Exception as e:
+                self._error = str(e)
+            index = 0
+
+    def result(self) -> Dict[str, Any]:
+        """추출한 메타데이터 (실패해도 예외 없이 extraction_error 기록)"""
+        metadata = dict(self._metadata)
+        try:
+            if self.file_ext == ".gltf" and self._error is None:
+                self._document = json.loads(self._buffer.decode("utf-8"))
+                self._image_heads = _data_uri_heads(self._document)
+            if self._document is not None:
+                metadata.update(summarize(self._document, self._image_heads))
+        except Exception as e:
+            self._error = str(e)
+        if self._error is not None:
+            # 메타데이터 추출 실패해도 에셋 저장은 진행
+            metadata["extraction_error"] = self._error
+        return metadata
+
+    def _add_region(self, start: int, end: int, callback: Callable[[bytes], None]) -> None:
+        self._regions.append(_Region(start, end, callback))
+        self._regions.sort(key=lambda region: region.start)
+
+    def _on_header(self, header: bytes) -> None:
+        if header[0:4] != _GLB_MAGIC:
+            raise ValueError("GLB 헤더(magic)가 올바르지 않습니다.")
+        version, length = struct.unpack_from("<II", header, 4)
+        self._metadata["glb_version"] = version
+        self._metadata["glb_length"] = length
+        self._add_region(_GLB_HEADER_SIZE, _GLB_HEADER_SIZE + _CHUNK_HEADER_SIZE, self._on_json_header)
+
+    def _on_json_header(self, header: bytes) -> None:
+        length, chunk_type = struct.unpack("<II", header)
+        if chunk_type != _CHUNK_JSON:
+            raise ValueError("GLB 첫 청크가 JSON이 아닙니다.")
+        if length > self.max_json_bytes:
+            raise ValueError(f"GLB JSON 청크가 {self.max_json_bytes}바이트를 넘어 추출을 생략했습니다.")
+        json_start = _GLB_HEADER_SIZE + _CHUNK_HEADER_SIZE
+        self._bin_data_offset = json_start + length + _CHUNK_HEADER_SIZE
+        self._add_region(json_start, json_start + length, self._on_json)
+
+    def _on_json(self, chunk: bytes) -> None:
+        self._document = json.loads(chunk.decode("utf-8"))
+        bin_header = self._bin_data_offset - _CHUNK_HEADER_SIZE
+        if self._metadata["glb_length"] >= self._bin_data_offset:
+            self._add_region(bin_header, self._bin_data_offset, self._on_bin_header)
+
+    def _on_bin_header(self, header: bytes) -> None:
+        length, chunk_type = struct.unpack("<II", header)
+        if chunk_type != _CHUNK_BIN:
+            return
+        self._metadata["bin_chunk_length"] = length
+        # BIN에 들어 있는 이미지는 크기 판별용 앞부분만 읽음
+        for image_index, (offset, byte_length) in _embedded_images(self._document).items():
+            if offset + byte_length > length:
+                continue
+            start = self._bin_data_offset + offset
+            self._add_region(
+                start,
+                start + min(byte_length, _IMAGE_HEAD_BYTES),
+                lambda head, image_index=image_index: self._image_heads.__setitem__(image_index, head),
+            )
+
+
+def _embedded_images(document: Dict[str, Any]) -> Dict[int, Tuple[int, int]]:
+    """GLB BIN 버퍼(buffer 0, uri 없음)에 든 이미지의 (BIN 내 오프셋, 길이)"""
+    buffers = document.get("buffers") or []
+    if not buffers or "uri" in buffers[0]:
+        return {}
+    views = document.get("bufferViews") or []
+    images = {}
+    for index, image in enumerate((document.get("images") or [])[:_MAX_IMAGES]):
+        view_index = image.get("bufferView")
+        if not isinstance(view_index, int) or not 0 <= view_index < len(views):
+            continue
+        view = views[view_index]
+        if view.get("buffer", 0) != 0:
+            continue
+        images[index] = (int(view.get("byteOffset", 0)), int(view.get("byteLength", 0)))
+    return images
+
+
+def _data_uri_heads(document: Dict[str, Any]) -> Dict[int, bytes]:
+    """glTF data URI 이미지의 앞부분 디코딩"""
+    heads = {}
+    for index, image in enumerate((document.get("images") or [])[:_MAX_IMAGES]):
+        uri = image.get("uri") or ""
+        if not uri.startswith("data:") or ";base64," not in uri:
+            continue
+        encoded = uri.split(";base64,", 1)[1]
+        prefix = encoded[:(_IMAGE_HEAD_BYTES // 3 + 1) * 4]
+        try:
+            heads[index] = base64.b64decode(prefix[:len(prefix) // 4 * 4])
+        except ValueError:
+            continue
+    return heads
+
+
+def image_size(head: bytes) -> Optional[Tuple[int, int]]:
+    """이미지 앞부분에서 (너비, 높이) 판별 (PNG, JPEG, KTX2)"""
+    if head[:8] == b"\x89PNG\r\n\x1a\n" and len(head) >= 24:
+        return struct.unpack(">II", head[16:24])
+    if head[:12] == b"\xabKTX 20\xbb\r\n\x1a\n" and len(head) >= 28:
+        return struct.unpack("<II", head[20:28])
+    if head[:2] == b"\xff\xd8":
+        offset = 2
+        while offset + 9 <= len(head):
+            if head[offset] != 0xFF:
+                return None
+            marker = head[offset + 1]
+            if marker == 0xFF:
+                # 채움 바이트
+                offset += 1
+                continue
+            if marker in (0xD8, 0x01) or 0xD0 <= marker <= 0xD7:
+                offset += 2
+                continue
+            length = struct.unpack(">H", head[offset + 2:offset + 4])[0]
+            # SOF0~SOF15 (DHT/JPG/DAC 제외)
+            if 0xC0 <= marker <= 0xCF and marker not in (0xC4, 0xC8, 0xCC):
+                height, width = struct.unpack(">HH", head[offset + 5:offset + 9])
+                return width, height
+            offset += 2 + length
+    return None
+
+
+def _node_matrix(node: Dict[str, Any]) -> Matrix:
+    """노드 로컬 변환 행렬 (matrix 또는 TRS)"""
+    if "matrix" in node:
+        return [float(value) for value in node["matrix"]]
+    tx, ty, tz = node.get("translation", (0.0, 0.0, 0.0))
+    x, y, z, w = node.get("rotation", (0.0, 0.0, 0.0, 1.0))
+    sx, sy, sz = node.get("scale", (1.0, 1.0, 1.0))
+    return [
+        sx * (1 - 2 * (y * y + z * z)), sx * 2 * (x * y + z * w), sx * 2 * (x * z - y * w), 0.0,
+        sy * 2 * (x * y - z * w), sy * (1 - 2 * (x * x + z * z)), sy * 2 * (y * z + x * w), 0.0,
+        sz * 2 * (x * z + y * w), sz * 2 * (y * z - x * w), sz * (1 - 2 * (x * x + y * y)), 0.0,
+        tx, ty, tz, 1.0,
+    ]
+
+
+def _multiply(a: Matrix, b: Matrix) -> Matrix:
+    return [
+        sum(a[k * 4 + row] * b[column * 4 + k] for k in range(4))
+        for column in range(4)
+        for row in range(4)
+    ]
+
+
+def _transform_box(matrix: Matrix, low: Sequence[float], high: Sequence[float]) -> Tuple[List[float], List[float]]:
+    """경계 상자 8개 꼭짓점을 변환한 뒤의 축 정렬 경계 상자"""
+    new_low, new_high = [float("inf")] * 3, [float("-inf")] * 3
+    for corner in range(8):
+        point = [high[axis] if corner >> axis & 1 else low[axis] for axis in range(3)]
+        for axis in range(3):
+            value = (
+                matrix[axis] * point[0] + matrix[4 + axis] * point[1]
+                + matrix[8 + axis] * point[2] + matrix[12 + axis]
+            )
+            new_low[axis] = min(new_low[axis], value)
+            new_high[axis] = max(new_high[axis], value)
+    return new_low, new_high
+
+
+def _merge_box(box: Optional[List[List[float]]], low: Sequence[float], high: Sequence[float]) -> List[List[float]]:
+    if box is None:
+        return [list(low), list(high)]
+    return [
+        [min(box[0][axis], low[axis]) for axis in range(3)],
+        [max(box[1][axis], high[axis]) for axis in range(3)],
+    ]
+
+
+def _accessor_bytes(accessor: Dict[str, Any]) -> int:
+    return (
+        int(accessor.get("count", 0))
+        * _COMPONENT_SIZES.get(accessor.get("componentType"), 0)
+        * _TYPE_COMPONENTS.get(accessor.get("type"), 0)
+    )
+
+
+def summarize(document: Dict[str, Any], image_heads: Optional[Dict[int, bytes]] = None) -> Dict[str, Any]:
+    """
+    glTF JSON 구조 요약
+
+    - vertex_count/triangle_count: 메시 정의 기준 (노드 인스턴스 중복 제외)
+    - bounding_box: 기본 장면 노드 변환을 적용한 경계 상자 (장면이 없으면 메시 로컬 경계 합)
+    - images: 이미지별 형식/바이트 수/픽셀 크기, texture_memory_bytes: RGBA8 + 밉맵 기준 추정치
+    """
+    image_heads = image_heads or {}
+    accessors = document.get("accessors") or []
+    meshes = document.get("meshes") or []
+    nodes = document.get("nodes") or []
+
+    def accessor(index: Any) -> Dict[str, Any]:
+        if isinstance(index, int) and 0 <= index < len(accessors):
+            return accessors[index]
+        return {}
+
+    vertex_count = triangle_count = primitive_count = 0
+    geometry_accessors = set()
+    mesh_boxes: Dict[int, List[List[float]]] = {}
+    for mesh_index, mesh in enumerate(meshes):
+        for primitive in mesh.get("primitives") or []:
+            primitive_count += 1
+            attributes = primitive.get("attributes") or {}
+            geometry_accessors.update(index for index in attributes.values() if isinstance(index, int))
+            position = accessor(attributes.get("POSITION"))
+            vertices = int(position.get("count", 0))
+            vertex_count += vertices
+
+            indices = primitive.get("indices")
+            if isinstance(indices, int):
+                geometry_accessors.add(indices)
+            elements = int(accessor(indices).get("count", 0)) if indices is not None else vertices
+            mode = primitive.get("mode", _TRIANGLES)
+            if mode == _TRIANGLES:
+                triangle_count += elements // 3
+            elif mode in (_TRIANGLE_STRIP, _TRIANGLE_FAN):
+                triangle_count += max(elements - 2, 0)
+
+            low, high = position.get("min"), position.get("max")
+            if isinstance(low, list) and isinstance(high, list) and len(low) >= 3 and len(high) >= 3:
+                mesh_boxes[mesh_index] = _merge_box(mesh_boxes.get(mesh_index), low[:3], high[:3])
+
+    metadata: Dict[str, Any] = {}
+    asset = document.get("asset") or {}
+    metadata["gltf_version"] = asset.get("version")
+    metadata["generator"] = asset.get("generator")
+    metadata["mesh_count"] = len(meshes)
+    metadata["material_count"] = len(document.get("materials") or [])
+    metadata["animation_count"] = len(document.get("animations") or [])
+    metadata["node_count"] = len(nodes)
+    metadata["texture_count"] = len(document.get("textures") or [])
+    metadata["primitive_count"] = primitive_count
+    metadata["vertex_count"] = vertex_count
+    metadata["triangle_count"] = triangle_count
+    metadata["geometry_bytes"] = sum(_accessor_bytes(accessor(index)) for index in geometry_accessors)
+    metadata["bounding_box"] = _scene_box(document, nodes, mesh_boxes)
+
+    views = document.get("bufferViews") or []
+    images = []
+    texture_memory = 0
+    for index, image in enumerate((document.get("images") or [])[:_MAX_IMAGES]):
+        entry: Dict[str, Any] = {"index": index, "mime_type": image.get("mimeType")}
+        view_index = image.get("bufferView")
+        if isinstance(view_index, int) and 0 <= view_index < len(views):
+            entry["byte_length"] = views[view_index].get("byteLength")
+        elif str(image.get("uri", "")).startswith("data:") and ";base64," in image["uri"]:
+            entry["byte_length"] = len(image["uri"].split(";base64,", 1)[1]) * 3 // 4
+        size = image_size(image_heads[index]) if index in image_heads else None
+        if size:
+            entry["width"], entry["height"] = size
+            texture_memory += size[0] * size[1] * 4 * 4 // 3
+        images.append(entry)
+    metadata["images"] = images
+    metadata["texture_memory_bytes"] = texture_memory
+
+    metadata["extensions_used"] = list(document.get("extensionsUsed") or [])
+    metadata["extensions_required"] = list(document.get("extensionsRequired") or [])
+    return metadata
+
+
+def _scene_box(
+    document: Dict[str, Any],
+    nodes: List[Dict[str, Any]],
+    mesh_boxes: Dict[int, List[List[float]]],
+) -> Optional[Dict[str, List[float]]]:
+    """기본 장면의 노드 계층을 따라 메시 경계 상자를 변환해 합침"""
+    scenes = document.get("scenes") or []
+    scene_index = document.get("scene", 0)
+    roots: List[Any] = []
+    if isinstance(scene_index, int) and 0 <= scene_index < len(scenes):
+        roots = scenes[scene_index].get("nodes") or []
+
+    box = None
+    stack = [(index, _IDENTITY) for index in roots]
+    visits = 0
+    while stack and visits < _MAX_NODE_VISITS:
+        node_index, parent = stack.pop()
+        if not isinstance(node_index, int) or not 0 <= node_index < len(nodes):
+            continue
+        visits += 1
+        node = nodes[node_index]
+        matrix = _multiply(parent, _node_matrix(node))
+        mesh_index = node.get("mesh")
+        if mesh_index in mesh_boxes:
+            box = _merge_box(box, *_transform_box(matrix, *mesh_boxes[mesh_index]))
+        stack.extend((child, matrix) for child in node.get("children") or [])
+
+    if box is None:
+        for low, high in mesh_boxes.values():
+            box = _merge_box(box, low, high)
+    if box is None:
+        return None
+    return {"min": [round(value, 6) for value in box[0]], "max": [round(value, 6) for value in box[1]]}
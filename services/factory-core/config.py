@@ -24,6 +24,51 @@ class Settings(BaseSettings):
     
     # Redis 설정
     REDIS_URL: str = "redis://localhost:6379/0"
+    REDIS_POOL_MAX_CONNECTIONS: int = 20       # 명령용 연결 풀 최대 연결 수
+    REDIS_STREAM_MAX_CONNECTIONS: int = 10     # 스트림 대기 읽기용 연결 풀 최대 연결 수 (이벤트 허브가 스트림당 1개 사용)
+    REDIS_POOL_TIMEOUT: float = 5.0            # 풀이 가득 찼을 때 연결 대기 시간 (초)
+    REDIS_SOCKET_TIMEOUT: float = 5.0          # 명령 응답 대기 시간 (초)
+    REDIS_SOCKET_CONNECT_TIMEOUT: float = 2.0  # 연결 수립 대기 시간 (초)
+    REDIS_HEALTH_CHECK_INTERVAL: int = 30      # 유휴 연결 헬스체크 주기 (초)
+    REDIS_STREAM_MAXLEN: int = 10000           # 이벤트 스트림 보존 항목 수 (근사 MAXLEN 트리밍)
+    REDIS_STREAM_BLOCK_MS: int = 5000          # XREAD 대기 시간 (밀리초)
+    REDIS_STREAM_READ_COUNT: int = 100         # XREAD 1회 최대 항목 수
+    
+    # 공간 인덱스 설정
+    SPATIAL_INDEX_TOMBSTONE_TTL: float = 300.0  # 삭제 기록 보존 시간 (초, 늦게 도착한 이전 스냅샷 무시용)
+    
+    # CCTV 커버리지 그리드 설정 (복셀 단위 사전 계산)
+    COVERAGE_GRID_ENABLED: bool = True
+    COVERAGE_GRID_VOXEL_SIZE: float = 2.0      # 복셀 한 변 길이 (m)
+    COVERAGE_GRID_MAX_DISTANCE: float = 50.0   # 래스터화 시 CCTV 최대 감지 거리 (m)
+    COVERAGE_GRID_MIN_Y: float = -5.0          # 그리드 높이 범위 하한 (m)
+    COVERAGE_GRID_MAX_Y: float = 20.0          # 그리드 높이 범위 상한 (m)
+    COVERAGE_GRID_MAX_MEMORY_MB: int = 64      # 공장별 비트셋 메모리 상한 (초과 시 그리드 미사용)
+    
+    # 설비 가려짐(가시선) 판정 설정
+    OCCLUSION_ENABLED: bool = True
+    
+    # Outbox 릴레이 설정 (DB에 기록된 이벤트를 Redis Stream으로 전달)
+    OUTBOX_BATCH_SIZE: int = 100               # 1회 전달 최대 이벤트 수 (파이프라인 XADD)
+    OUTBOX_POLL_INTERVAL: float = 1.0          # 새 이벤트 알림이 없을 때 조회 주기 (초)
+    OUTBOX_RETRY_MIN_DELAY: float = 0.5        # 전달 실패 시 재시도 대기 (초, 지수 백오프 시작값)
+    OUTBOX_RETRY_MAX_DELAY: float = 30.0       # 재시도 대기 상한 (초)
+    OUTBOX_RETENTION: float = 86400.0          # 전달 완료 행 보존 시간 (초, 이후 삭제)
+    OUTBOX_PURGE_INTERVAL: float = 600.0       # 전달 완료 행 정리 주기 (초)
+    
+    # 조회 결과 캐시 설정 (메모리 LRU + Redis 2단)
+    QUERY_CACHE_ENABLED: bool = True
+    QUERY_CACHE_TTL: int = 300                 # Redis 캐시 TTL (초)
+    QUERY_CACHE_LOCAL_TTL: float = 10.0        # 메모리 캐시 TTL (초, 이벤트 유실 시 다른 인스턴스 반영 지연 상한)
+    QUERY_CACHE_LOCAL_MAX_ENTRIES: int = 2048  # 메모리 캐시 최대 항목 수 (초과 시 LRU 제거)
+    QUERY_CACHE_REDIS_RETRY_INTERVAL: float = 10.0  # Redis 오류 후 Redis 단계를 건너뛰는 시간 (초)
+    
+    # HTTP 조건부 조회 설정 (ETag/If-None-Match)
+    HTTP_CACHE_MAX_AGE: int = 0                # Cache-Control max-age (초, 0이면 매 요청 ETag 재검증)
+    
+    # SSE 스트림 설정
+    SSE_QUEUE_SIZE: int = 256                  # 클라이언트별 대기 메시지 상한 (초과 시 오래된 메시지부터 버림)
+    SSE_REPLAY_BUFFER_SIZE: int = 1000         # 재접속 재전송용 스트림별 최근 이벤트 메모리 보관 수
     
     # CORS 설정
     CORS_ORIGINS: List[str] = ["http://localhost:3000"]
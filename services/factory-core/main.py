@@ -13,7 +13,11 @@ from sqlalchemy import text
 from config import settings
 from database import engine, Base
 from routers import factory_router, cctv_router, equipment_router, spatial_router, stream_router
-from services.redis_service import RedisService
+from services.event_hub import event_hub
+from services.outbox import close_outbox_relay, get_outbox_relay
+from services.query_optimizer import close_query_cache, get_query_cache
+from services.redis_service import close_redis_service, get_redis_service
+from services.spatial_index import spatial_index_manager
 from utils.logging import logger
 
 
@@ -27,11 +31,25 @@ async def lifespan(app: FastAPI):
             await conn.run_sync(Base.metadata.create_all)
         logger.info("데이터베이스 테이블 생성 완료")
     
+    # 프로세스 전역 Redis 연결 풀 준비 (연결은 첫 사용 시 수립)
+    get_redis_service()
+    # Outbox 릴레이 시작 (재시작 전 미전달 이벤트도 이어서 전달)
+    get_outbox_relay().start()
+    # 조회 캐시: 다른 인스턴스의 공장/CCTV 변경 이벤트로 메모리 캐시 무효화
+    get_query_cache().start()
+    # 공간 인덱스: 다른 인스턴스의 공장 삭제/CCTV 변경 이벤트로 메모리 인덱스 무효화
+    spatial_index_manager.start()
+    
     logger.info("Factory Core Service 시작 완료")
     yield
     
     # 종료 시: 리소스 정리
     logger.info("Factory Core Service 종료 중...")
+    await close_outbox_relay()
+    await close_query_cache()
+    await spatial_index_manager.close()
+    await event_hub.close()
+    await close_redis_service()
     await engine.dispose()
     logger.info("Factory Core Service 종료 완료")
 
@@ -95,11 +113,9 @@ async def health_check():
     
     # Redis 연결 상태 확인
     try:
-        redis_service = RedisService()
-        client = await redis_service._get_client()
+        client = await get_redis_service()._get_client()
         await client.ping()
         health_status["redis"] = "connected"
-        await redis_service.close()
     except Exception as e:
         health_status["status"] = "unhealthy"
         health_status["redis"] = "disconnected"
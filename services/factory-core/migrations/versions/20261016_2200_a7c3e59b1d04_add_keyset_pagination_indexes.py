@@ -0,0 +1,45 @@
+"""Add keyset pagination indexes to cctv_configs and equipment
+
+Revision ID: a7c3e59b1d04
+Revises: None
+Create Date: 2026-10-16 22:00:00.000000+00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'a7c3e59b1d04'
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """마이그레이션 업그레이드"""
+    # 테이블은 서비스 시작 시 create_all로 생성되므로 이미 있는 DB에도 적용되도록 IF NOT EXISTS 사용
+    # 커서 페이지네이션 (created_at, id) 키셋 조회용
+    op.create_index('ix_cctv_configs_created_at_id', 'cctv_configs', ['created_at', 'id'], if_not_exists=True)
+    op.create_index(
+        'ix_cctv_configs_factory_id_created_at_id',
+        'cctv_configs',
+        ['factory_id', 'created_at', 'id'],
+        if_not_exists=True,
+    )
+    op.create_index('ix_equipment_created_at_id', 'equipment', ['created_at', 'id'], if_not_exists=True)
+    op.create_index(
+        'ix_equipment_factory_id_created_at_id',
+        'equipment',
+        ['factory_id', 'created_at', 'id'],
+        if_not_exists=True,
+    )
+
+
+def downgrade() -> None:
+    """마이그레이션 다운그레이드"""
+    op.drop_index('ix_equipment_factory_id_created_at_id', table_name='equipment', if_exists=True)
+    op.drop_index('ix_equipment_created_at_id', table_name='equipment', if_exists=True)
+    op.drop_index('ix_cctv_configs_factory_id_created_at_id', table_name='cctv_configs', if_exists=True)
+    op.drop_index('ix_cctv_configs_created_at_id', table_name='cctv_configs', if_exists=True)
@@ -0,0 +1,41 @@
+"""Add composite indexes for cctv_configs and equipment filters
+
+Revision ID: b18f4d6a9c27
+Revises: a7c3e59b1d04
+Create Date: 2026-10-16 22:30:00.000000+00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'b18f4d6a9c27'
+down_revision: Union[str, None] = 'a7c3e59b1d04'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """마이그레이션 업그레이드"""
+    # 공장별 활성 CCTV 조회 (시야 매칭)
+    op.create_index(
+        'ix_cctv_configs_factory_id_is_active',
+        'cctv_configs',
+        ['factory_id', 'is_active'],
+        if_not_exists=True,
+    )
+    # 공장별 유형/상태/활성 필터 목록
+    op.create_index(
+        'ix_equipment_factory_id_type_status_is_active',
+        'equipment',
+        ['factory_id', 'type', 'status', 'is_active'],
+        if_not_exists=True,
+    )
+
+
+def downgrade() -> None:
+    """마이그레이션 다운그레이드"""
+    op.drop_index('ix_equipment_factory_id_type_status_is_active', table_name='equipment', if_exists=True)
+    op.drop_index('ix_cctv_configs_factory_id_is_active', table_name='cctv_configs', if_exists=True)
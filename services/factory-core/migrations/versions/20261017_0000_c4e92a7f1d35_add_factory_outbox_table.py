@@ -0,0 +1,44 @@
+"""Add factory_outbox table
+
+Revision ID: c4e92a7f1d35
+Revises: b18f4d6a9c27
+Create Date: 2026-10-17 00:00:00.000000+00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4e92a7f1d35'
+down_revision: Union[str, None] = 'b18f4d6a9c27'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """마이그레이션 업그레이드"""
+    # 공장/CCTV 이벤트 Outbox 테이블 (엔티티 변경과 같은 트랜잭션에 기록, 릴레이가 Redis로 전달)
+    op.create_table(
+        'factory_outbox',
+        sa.Column('id', sa.BigInteger(), primary_key=True, autoincrement=True),
+        sa.Column('stream', sa.String(length=100), nullable=False),
+        sa.Column('payload', sa.Text(), nullable=False),
+        sa.Column('attempts', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('created_at', sa.DateTime(timezone=True), nullable=False, server_default=sa.func.now()),
+        sa.Column('delivered_at', sa.DateTime(timezone=True), nullable=True),
+    )
+    # 릴레이 조회용 부분 인덱스 (미전달 행만)
+    op.create_index(
+        'ix_factory_outbox_pending',
+        'factory_outbox',
+        ['id'],
+        postgresql_where=sa.text('delivered_at IS NULL'),
+    )
+
+
+def downgrade() -> None:
+    """마이그레이션 다운그레이드"""
+    op.drop_index('ix_factory_outbox_pending', table_name='factory_outbox')
+    op.drop_table('factory_outbox')
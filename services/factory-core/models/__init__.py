@@ -4,5 +4,6 @@ V-Factory - Factory Core ORM 모델
 from .factory import Factory
 from .cctv import CCTVConfig
 from .equipment import Equipment, EquipmentType, EquipmentStatus
+from .outbox import OutboxEvent
 
-__all__ = ["Factory", "CCTVConfig", "Equipment", "EquipmentType", "EquipmentStatus"]
+__all__ = ["Factory", "CCTVConfig", "Equipment", "EquipmentType", "EquipmentStatus", "OutboxEvent"]
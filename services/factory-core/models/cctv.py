@@ -5,7 +5,7 @@ CCTV 설정 엔티티 정의
 import uuid
 from datetime import datetime
 
-from sqlalchemy import Column, String, Float, Boolean, DateTime, ForeignKey
+from sqlalchemy import Column, String, Float, Boolean, DateTime, ForeignKey, Index
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 
@@ -43,5 +43,13 @@ class CCTVConfig(Base):
     # 관계 설정
     factory = relationship("Factory", back_populates="cctv_configs")
     
+    __table_args__ = (
+        # 커서 페이지네이션 (created_at, id) 키셋 조회용
+        Index("ix_cctv_configs_created_at_id", "created_at", "id"),
+        Index("ix_cctv_configs_factory_id_created_at_id", "factory_id", "created_at", "id"),
+        # 공장별 활성 CCTV 조회 (시야 매칭)
+        Index("ix_cctv_configs_factory_id_is_active", "factory_id", "is_active"),
+    )
+    
     def __repr__(self):
         return f"<CCTVConfig(id={self.id}, name={self.name})>"
@@ -6,7 +6,7 @@ import enum
 import uuid
 from datetime import datetime
 
-from sqlalchemy import Column, String, Text, Float, Boolean, DateTime, Enum, ForeignKey
+from sqlalchemy import Column, String, Text, Float, Boolean, DateTime, Enum, ForeignKey, Index
 from sqlalchemy.dialects.postgresql import UUID, JSONB
 from sqlalchemy.orm import relationship
 
@@ -83,5 +83,13 @@ class Equipment(Base):
     # 관계 설정
     factory = relationship("Factory", back_populates="equipment")
     
+    __table_args__ = (
+        # 커서 페이지네이션 (created_at, id) 키셋 조회용
+        Index("ix_equipment_created_at_id", "created_at", "id"),
+        Index("ix_equipment_factory_id_created_at_id", "factory_id", "created_at", "id"),
+        # 공장별 유형/상태/활성 필터 목록
+        Index("ix_equipment_factory_id_type_status_is_active", "factory_id", "type", "status", "is_active"),
+    )
+    
     def __repr__(self):
         return f"<Equipment(id={self.id}, name={self.name}, type={self.type})>"
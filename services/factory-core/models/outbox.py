@@ -0,0 +1,35 @@
+"""
+V-Factory - Outbox ORM 모델
+엔티티 변경과 같은 트랜잭션에 기록되는 발행 대기 이벤트 (Outbox 릴레이가 Redis로 전달)
+"""
+from datetime import datetime
+
+from sqlalchemy import BigInteger, Column, DateTime, Index, Integer, String, Text, text
+
+from database import Base
+
+
+class OutboxEvent(Base):
+    """공장/CCTV 이벤트 Outbox 테이블 ORM 모델"""
+    
+    __tablename__ = "factory_outbox"
+    
+    # 기본 필드 (증가하는 ID = 발행 순서)
+    id = Column(BigInteger().with_variant(Integer, "sqlite"), primary_key=True, autoincrement=True)
+    stream = Column(String(100), nullable=False)  # 대상 Redis Stream 키
+    payload = Column(Text, nullable=False)        # 이벤트 JSON 문자열
+    
+    # 전달 상태
+    attempts = Column(Integer, nullable=False, default=0)
+    
+    # 타임스탬프
+    created_at = Column(DateTime(timezone=True), nullable=False, default=datetime.utcnow)
+    delivered_at = Column(DateTime(timezone=True), nullable=True)
+    
+    __table_args__ = (
+        # 릴레이 조회용 부분 인덱스 (미전달 행만)
+        Index("ix_factory_outbox_pending", "id", postgresql_where=text("delivered_at IS NULL")),
+    )
+    
+    def __repr__(self):
+        return f"<OutboxEvent(id={self.id}, stream={self.stream})>"
@@ -2,10 +2,10 @@
 V-Factory - CCTV Config API 라우터
 CCTV 설정 CRUD 엔드포인트
 """
-from typing import List
+from typing import List, Optional, Union
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, status
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -13,6 +13,11 @@ from database import get_db
 from models import CCTVConfig, Factory
 from schemas import CCTVConfigCreate, CCTVConfigUpdate, CCTVConfigResponse
 from services import RedisService, CCTVEventType, cctv_to_dict
+from services.outbox import add_outbox_event, get_outbox_relay
+from services.query_optimizer import get_query_cache
+from services.spatial_index import spatial_index_manager
+from utils.http_cache import conditional_response, render_rows
+from utils.pagination import CursorPage, PaginationMode, apply_keyset, use_cursor
 
 
 router = APIRouter()
@@ -38,38 +43,49 @@ async def create_cctv_config(
     
     cctv_config = CCTVConfig(**cctv_data.model_dump())
     db.add(cctv_config)
+    await db.flush()
+    
+    # CCTV 생성 이벤트를 같은 트랜잭션의 Outbox에 기록 (릴레이가 Redis로 전달)
+    add_outbox_event(db, RedisService.CCTV_CHANNEL, CCTVEventType.CCTV_CREATED, cctv_to_dict(cctv_config))
     await db.commit()
     await db.refresh(cctv_config)
+    get_outbox_relay().notify()
+    await get_query_cache().invalidate_event(CCTVEventType.CCTV_CREATED, cctv_config.factory_id)
     
-    # Redis로 CCTV 생성 이벤트 발행
-    try:
-        redis_service = RedisService()
-        await redis_service.publish_cctv_event(
-            CCTVEventType.CCTV_CREATED,
-            cctv_to_dict(cctv_config)
-        )
-    except Exception as e:
-        print(f"[Redis] CCTV 생성 이벤트 발행 실패: {e}")
+    # 인메모리 공간 인덱스 동기화
+    spatial_index_manager.apply_upsert(cctv_config)
     
     return cctv_config
 
 
-@router.get("/", response_model=List[CCTVConfigResponse])
+@router.get("/", response_model=Union[List[CCTVConfigResponse], CursorPage[CCTVConfigResponse]])
 async def get_cctv_configs(
     factory_id: UUID = None,
     skip: int = 0,
     limit: int = 100,
+    pagination: PaginationMode = Query("offset", description="offset: 목록 반환, cursor: {items, next_cursor} 반환"),
+    cursor: Optional[str] = Query(None, description="이전 페이지의 next_cursor (지정 시 커서 모드)"),
+    if_none_match: Optional[str] = Header(None),
     db: AsyncSession = Depends(get_db)
 ):
-    """CCTV 설정 목록 조회 API"""
+    """
+    CCTV 설정 목록 조회 API
+    커서 모드는 (created_at, id) 등록순 키셋으로 조회
+    ETag(목록 최신 수정 시각 + 본문 해시)가 If-None-Match와 같으면 304
+    """
     query = select(CCTVConfig)
     
     if factory_id:
         query = query.where(CCTVConfig.factory_id == factory_id)
     
+    if use_cursor(pagination, cursor):
+        query = apply_keyset(query, CCTVConfig.created_at, CCTVConfig.id, cursor, limit, descending=False)
+        result = await db.execute(query)
+        return conditional_response(render_rows(result.scalars().all(), CCTVConfigResponse, limit), if_none_match)
+    
     query = query.offset(skip).limit(limit)
     result = await db.execute(query)
-    return result.scalars().all()
+    return conditional_response(render_rows(result.scalars().all(), CCTVConfigResponse), if_none_match)
 
 
 @router.get("/{cctv_id}", response_model=CCTVConfigResponse)
@@ -114,19 +130,17 @@ async def update_cctv_config(
     update_data = cctv_data.model_dump(exclude_unset=True)
     for field, value in update_data.items():
         setattr(cctv_config, field, value)
+    await db.flush()
     
+    # CCTV 수정 이벤트를 같은 트랜잭션의 Outbox에 기록
+    add_outbox_event(db, RedisService.CCTV_CHANNEL, CCTVEventType.CCTV_UPDATED, cctv_to_dict(cctv_config))
     await db.commit()
     await db.refresh(cctv_config)
+    get_outbox_relay().notify()
+    await get_query_cache().invalidate_event(CCTVEventType.CCTV_UPDATED, cctv_config.factory_id)
     
-    # Redis로 CCTV 수정 이벤트 발행
-    try:
-        redis_service = RedisService()
-        await redis_service.publish_cctv_event(
-            CCTVEventType.CCTV_UPDATED,
-            cctv_to_dict(cctv_config)
-        )
-    except Exception as e:
-        print(f"[Redis] CCTV 수정 이벤트 발행 실패: {e}")
+    # 인메모리 공간 인덱스 동기화
+    spatial_index_manager.apply_upsert(cctv_config)
     
     return cctv_config
 
@@ -148,18 +162,13 @@ async def delete_cctv_config(
             detail="CCTV 설정을 찾을 수 없습니다."
         )
     
-    # 삭제 전 데이터 저장 (이벤트 발행용)
-    cctv_data = cctv_to_dict(cctv_config)
+    # 삭제 이벤트를 같은 트랜잭션의 Outbox에 기록 (삭제 전 데이터 사용)
+    add_outbox_event(db, RedisService.CCTV_CHANNEL, CCTVEventType.CCTV_DELETED, cctv_to_dict(cctv_config))
     
     await db.delete(cctv_config)
     await db.commit()
+    get_outbox_relay().notify()
+    await get_query_cache().invalidate_event(CCTVEventType.CCTV_DELETED, cctv_config.factory_id)
     
-    # Redis로 CCTV 삭제 이벤트 발행
-    try:
-        redis_service = RedisService()
-        await redis_service.publish_cctv_event(
-            CCTVEventType.CCTV_DELETED,
-            cctv_data
-        )
-    except Exception as e:
-        print(f"[Redis] CCTV 삭제 이벤트 발행 실패: {e}")
\ No newline at end of file
+    # 인메모리 공간 인덱스 동기화
+    spatial_index_manager.apply_delete(cctv_config.factory_id, cctv_config.id)
\ No newline at end of file
@@ -2,10 +2,10 @@
 V-Factory - Equipment API 라우터
 설비 CRUD 엔드포인트
 """
-from typing import List
+from typing import List, Optional, Union
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, Header, HTTPException, status, Query
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -13,6 +13,12 @@ from database import get_db
 from models import Equipment, Factory
 from schemas import EquipmentCreate, EquipmentUpdate, EquipmentResponse
 from schemas.equipment import EquipmentStatusEnum, EquipmentTypeEnum
+from services.outbox import add_outbox_event, get_outbox_relay
+from services.query_optimizer import get_query_cache
+from services.redis_service import EquipmentEventType, RedisService, equipment_to_dict
+from services.spatial_index import spatial_index_manager
+from utils.http_cache import conditional_response, render_rows
+from utils.pagination import CursorPage, PaginationMode, apply_keyset, use_cursor
 
 
 router = APIRouter()
@@ -38,12 +44,21 @@ async def create_equipment(
     
     equipment = Equipment(**equipment_data.model_dump())
     db.add(equipment)
+    await db.flush()
+    
+    # 설비 생성 이벤트를 같은 트랜잭션의 Outbox에 기록 (다른 인스턴스의 캐시/공간 인덱스 동기화)
+    add_outbox_event(db, RedisService.EQUIPMENT_CHANNEL, EquipmentEventType.EQUIPMENT_CREATED, equipment_to_dict(equipment))
     await db.commit()
     await db.refresh(equipment)
+    get_outbox_relay().notify()
+    await get_query_cache().invalidate_event(EquipmentEventType.EQUIPMENT_CREATED, equipment.factory_id)
+    
+    # 공간 인덱스 설비 BVH 동기화
+    spatial_index_manager.apply_equipment_upsert(equipment)
     return equipment
 
 
-@router.get("/", response_model=List[EquipmentResponse])
+@router.get("/", response_model=Union[List[EquipmentResponse], CursorPage[EquipmentResponse]])
 async def get_equipment_list(
     factory_id: UUID = Query(None, description="공장 ID로 필터링"),
     equipment_type: EquipmentTypeEnum = Query(None, description="설비 유형으로 필터링"),
@@ -51,9 +66,16 @@ async def get_equipment_list(
     is_active: bool = Query(None, description="활성화 여부로 필터링"),
     skip: int = 0,
     limit: int = 100,
+    pagination: PaginationMode = Query("offset", description="offset: 목록 반환, cursor: {items, next_cursor} 반환"),
+    cursor: Optional[str] = Query(None, description="이전 페이지의 next_cursor (지정 시 커서 모드)"),
+    if_none_match: Optional[str] = Header(None),
     db: AsyncSession = Depends(get_db)
 ):
-    """설비 목록 조회 API"""
+    """
+    설비 목록 조회 API
+    커서 모드는 (created_at, id) 등록순 키셋으로 조회
+    ETag(목록 최신 수정 시각 + 본문 해시)가 If-None-Match와 같으면 304
+    """
     query = select(Equipment)
     
     if factory_id:
@@ -65,9 +87,14 @@ async def get_equipment_list(
     if is_active is not None:
         query = query.where(Equipment.is_active == is_active)
     
+    if use_cursor(pagination, cursor):
+        query = apply_keyset(query, Equipment.created_at, Equipment.id, cursor, limit, descending=False)
+        result = await db.execute(query)
+        return conditional_response(render_rows(result.scalars().all(), EquipmentResponse, limit), if_none_match)
+    
     query = query.offset(skip).limit(limit)
     result = await db.execute(query)
-    return result.scalars().all()
+    return conditional_response(render_rows(result.scalars().all(), EquipmentResponse), if_none_match)
 
 
 @router.get("/{equipment_id}", response_model=EquipmentResponse)
@@ -113,8 +140,14 @@ async def update_equipment(
     for field, value in update_data.items():
         setattr(equipment, field, value)
     
+    add_outbox_event(db, RedisService.EQUIPMENT_CHANNEL, EquipmentEventType.EQUIPMENT_UPDATED, equipment_to_dict(equipment))
     await db.commit()
     await db.refresh(equipment)
+    get_outbox_relay().notify()
+    await get_query_cache().invalidate_event(EquipmentEventType.EQUIPMENT_UPDATED, equipment.factory_id)
+    
+    # 공간 인덱스 설비 BVH 동기화 (위치/회전/크기 변경 시 refit)
+    spatial_index_manager.apply_equipment_upsert(equipment)
     return equipment
 
 
@@ -137,8 +170,11 @@ async def update_equipment_status(
         )
     
     equipment.status = new_status
+    add_outbox_event(db, RedisService.EQUIPMENT_CHANNEL, EquipmentEventType.EQUIPMENT_UPDATED, equipment_to_dict(equipment))
     await db.commit()
     await db.refresh(equipment)
+    get_outbox_relay().notify()
+    await get_query_cache().invalidate_event(EquipmentEventType.EQUIPMENT_UPDATED, equipment.factory_id)
     return equipment
 
 
@@ -159,5 +195,13 @@ async def delete_equipment(
             detail="설비를 찾을 수 없습니다."
         )
     
+    # 삭제 이벤트를 같은 트랜잭션의 Outbox에 기록 (삭제 전 데이터 사용)
+    add_outbox_event(db, RedisService.EQUIPMENT_CHANNEL, EquipmentEventType.EQUIPMENT_DELETED, equipment_to_dict(equipment))
+    
     await db.delete(equipment)
     await db.commit()
+    get_outbox_relay().notify()
+    await get_query_cache().invalidate_event(EquipmentEventType.EQUIPMENT_DELETED, equipment.factory_id)
+    
+    # 공간 인덱스 설비 BVH 동기화
+    spatial_index_manager.apply_equipment_delete(equipment.factory_id, equipment.id)
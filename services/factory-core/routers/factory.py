@@ -2,10 +2,10 @@
 V-Factory - Factory API 라우터
 공장 CRUD 엔드포인트
 """
-from typing import List
+from typing import List, Optional, Union
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, status
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -16,11 +16,37 @@ from schemas import (
     CCTVConfigResponse, EquipmentResponse
 )
 from services import RedisService, FactoryEventType, factory_to_dict
+from services.outbox import add_outbox_event, get_outbox_relay
+from services.query_optimizer import CCTV, EQUIPMENT, FACTORY, get_query_cache
+from services.spatial_index import spatial_index_manager
+from utils.http_cache import conditional_response, render_rows, rendered
+from utils.pagination import CursorPage, PaginationMode, apply_keyset, use_cursor
 
 
 router = APIRouter()
 
 
+async def fetch_factory(db: AsyncSession, factory_id: UUID) -> dict:
+    """
+    공장 조회 (조회 캐시 경유, 직렬화된 FactoryResponse 본문과 ETag - utils.http_cache.rendered)
+    공장이 없으면 404 (캐시하지 않음)
+    """
+    async def load() -> dict:
+        result = await db.execute(
+            select(Factory).where(Factory.id == factory_id)
+        )
+        factory = result.scalar_one_or_none()
+        
+        if not factory:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="공장을 찾을 수 없습니다."
+            )
+        return rendered(FactoryResponse.model_validate(factory), factory.updated_at or factory.created_at)
+    
+    return await get_query_cache().get_or_load(FACTORY, factory_id, {}, load)
+
+
 @router.post("/", response_model=FactoryResponse, status_code=status.HTTP_201_CREATED)
 async def create_factory(
     factory_data: FactoryCreate,
@@ -33,18 +59,13 @@ async def create_factory(
         layout_json=factory_data.layout_json,
     )
     db.add(factory)
+    await db.flush()
+    
+    # 공장 생성 이벤트를 같은 트랜잭션의 Outbox에 기록 (릴레이가 Redis로 전달)
+    add_outbox_event(db, RedisService.FACTORY_CHANNEL, FactoryEventType.FACTORY_CREATED, factory_to_dict(factory))
     await db.commit()
     await db.refresh(factory)
-    
-    # Redis로 공장 생성 이벤트 발행
-    try:
-        redis_service = RedisService()
-        await redis_service.publish_factory_event(
-            FactoryEventType.FACTORY_CREATED,
-            factory_to_dict(factory)
-        )
-    except Exception as e:
-        print(f"[Redis] 공장 생성 이벤트 발행 실패: {e}")
+    get_outbox_relay().notify()
     
     return factory
 
@@ -65,21 +86,14 @@ async def get_factories(
 @router.get("/{factory_id}", response_model=FactoryResponse)
 async def get_factory(
     factory_id: UUID,
+    if_none_match: Optional[str] = Header(None),
     db: AsyncSession = Depends(get_db)
 ):
-    """공장 상세 조회 API"""
-    result = await db.execute(
-        select(Factory).where(Factory.id == factory_id)
-    )
-    factory = result.scalar_one_or_none()
-    
-    if not factory:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="공장을 찾을 수 없습니다."
-        )
-    
-    return factory
+    """
+    공장 상세 조회 API (조회 캐시 사용)
+    If-None-Match가 ETag와 같으면 304 (레이아웃 폴링 시 본문 생략)
+    """
+    return conditional_response(await fetch_factory(db, factory_id), if_none_match)
 
 
 @router.put("/{factory_id}", response_model=FactoryResponse)
@@ -104,19 +118,14 @@ async def update_factory(
     update_data = factory_data.model_dump(exclude_unset=True)
     for field, value in update_data.items():
         setattr(factory, field, value)
+    await db.flush()
     
+    # 공장 수정 이벤트를 같은 트랜잭션의 Outbox에 기록
+    add_outbox_event(db, RedisService.FACTORY_CHANNEL, FactoryEventType.FACTORY_UPDATED, factory_to_dict(factory))
     await db.commit()
     await db.refresh(factory)
-    
-    # Redis로 공장 수정 이벤트 발행
-    try:
-        redis_service = RedisService()
-        await redis_service.publish_factory_event(
-            FactoryEventType.FACTORY_UPDATED,
-            factory_to_dict(factory)
-        )
-    except Exception as e:
-        print(f"[Redis] 공장 수정 이벤트 발행 실패: {e}")
+    get_outbox_relay().notify()
+    await get_query_cache().invalidate_event(FactoryEventType.FACTORY_UPDATED, factory.id)
     
     return factory
 
@@ -140,18 +149,14 @@ async def update_factory_layout(
         )
     
     factory.layout_json = layout_data.layout_json
+    await db.flush()
+    
+    # 레이아웃 수정 이벤트를 같은 트랜잭션의 Outbox에 기록
+    add_outbox_event(db, RedisService.FACTORY_CHANNEL, FactoryEventType.LAYOUT_UPDATED, factory_to_dict(factory))
     await db.commit()
     await db.refresh(factory)
-    
-    # Redis로 레이아웃 수정 이벤트 발행
-    try:
-        redis_service = RedisService()
-        await redis_service.publish_factory_event(
-            FactoryEventType.LAYOUT_UPDATED,
-            factory_to_dict(factory)
-        )
-    except Exception as e:
-        print(f"[Redis] 레이아웃 수정 이벤트 발행 실패: {e}")
+    get_outbox_relay().notify()
+    await get_query_cache().invalidate_event(FactoryEventType.LAYOUT_UPDATED, factory.id)
     
     return factory
 
@@ -173,78 +178,85 @@ async def delete_factory(
             detail="공장을 찾을 수 없습니다."
         )
     
-    # 삭제 전 데이터 저장 (이벤트 발행용)
-    factory_data = factory_to_dict(factory)
+    # 삭제 이벤트를 같은 트랜잭션의 Outbox에 기록 (삭제 전 데이터 사용)
+    add_outbox_event(db, RedisService.FACTORY_CHANNEL, FactoryEventType.FACTORY_DELETED, factory_to_dict(factory))
     
     await db.delete(factory)
     await db.commit()
+    get_outbox_relay().notify()
+    await get_query_cache().invalidate_event(FactoryEventType.FACTORY_DELETED, factory.id)
     
-    # Redis로 공장 삭제 이벤트 발행
-    try:
-        redis_service = RedisService()
-        await redis_service.publish_factory_event(
-            FactoryEventType.FACTORY_DELETED,
-            factory_data
-        )
-    except Exception as e:
-        print(f"[Redis] 공장 삭제 이벤트 발행 실패: {e}")
+    # 공장 CCTV 공간 인덱스 제거
+    spatial_index_manager.drop_factory(factory.id)
 
 
-@router.get("/{factory_id}/cctv-configs", response_model=List[CCTVConfigResponse])
+@router.get("/{factory_id}/cctv-configs", response_model=Union[List[CCTVConfigResponse], CursorPage[CCTVConfigResponse]])
 async def get_factory_cctv_configs(
     factory_id: UUID,
     skip: int = 0,
     limit: int = 100,
+    pagination: PaginationMode = Query("offset", description="offset: 목록 반환, cursor: {items, next_cursor} 반환"),
+    cursor: Optional[str] = Query(None, description="이전 페이지의 next_cursor (지정 시 커서 모드)"),
+    if_none_match: Optional[str] = Header(None),
     db: AsyncSession = Depends(get_db)
 ):
-    """공장별 CCTV 설정 목록 조회 API"""
-    # 공장 존재 여부 확인
-    result = await db.execute(
-        select(Factory).where(Factory.id == factory_id)
-    )
-    factory = result.scalar_one_or_none()
-    
-    if not factory:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="공장을 찾을 수 없습니다."
+    """공장별 CCTV 설정 목록 조회 API (조회 캐시 사용, ETag 조건부 조회)"""
+    async def load():
+        # 공장 존재 여부 확인
+        result = await db.execute(
+            select(Factory.id).where(Factory.id == factory_id)
         )
+        if result.scalar_one_or_none() is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="공장을 찾을 수 없습니다."
+            )
+        
+        # CCTV 목록 조회
+        query = select(CCTVConfig).where(CCTVConfig.factory_id == factory_id)
+        if use_cursor(pagination, cursor):
+            query = apply_keyset(query, CCTVConfig.created_at, CCTVConfig.id, cursor, limit, descending=False)
+            result = await db.execute(query)
+            return render_rows(result.scalars().all(), CCTVConfigResponse, limit)
+        
+        result = await db.execute(query.offset(skip).limit(limit))
+        return render_rows(result.scalars().all(), CCTVConfigResponse)
     
-    # CCTV 목록 조회
-    result = await db.execute(
-        select(CCTVConfig)
-        .where(CCTVConfig.factory_id == factory_id)
-        .offset(skip)
-        .limit(limit)
-    )
-    return result.scalars().all()
+    params = {"skip": skip, "limit": limit, "pagination": pagination, "cursor": cursor}
+    return conditional_response(await get_query_cache().get_or_load(CCTV, factory_id, params, load), if_none_match)
 
 
-@router.get("/{factory_id}/equipment", response_model=List[EquipmentResponse])
+@router.get("/{factory_id}/equipment", response_model=Union[List[EquipmentResponse], CursorPage[EquipmentResponse]])
 async def get_factory_equipment(
     factory_id: UUID,
     skip: int = 0,
     limit: int = 100,
+    pagination: PaginationMode = Query("offset", description="offset: 목록 반환, cursor: {items, next_cursor} 반환"),
+    cursor: Optional[str] = Query(None, description="이전 페이지의 next_cursor (지정 시 커서 모드)"),
+    if_none_match: Optional[str] = Header(None),
     db: AsyncSession = Depends(get_db)
 ):
-    """공장별 설비 목록 조회 API"""
-    # 공장 존재 여부 확인
-    result = await db.execute(
-        select(Factory).where(Factory.id == factory_id)
-    )
-    factory = result.scalar_one_or_none()
-    
-    if not factory:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="공장을 찾을 수 없습니다."
+    """공장별 설비 목록 조회 API (조회 캐시 사용, ETag 조건부 조회)"""
+    async def load():
+        # 공장 존재 여부 확인
+        result = await db.execute(
+            select(Factory.id).where(Factory.id == factory_id)
         )
+        if result.scalar_one_or_none() is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="공장을 찾을 수 없습니다."
+            )
+        
+        # 설비 목록 조회
+        query = select(Equipment).where(Equipment.factory_id == factory_id)
+        if use_cursor(pagination, cursor):
+            query = apply_keyset(query, Equipment.created_at, Equipment.id, cursor, limit, descending=False)
+            result = await db.execute(query)
+            return render_rows(result.scalars().all(), EquipmentResponse, limit)
+        
+        result = await db.execute(query.offset(skip).limit(limit))
+        return render_rows(result.scalars().all(), EquipmentResponse)
     
-    # 설비 목록 조회
-    result = await db.execute(
-        select(Equipment)
-        .where(Equipment.factory_id == factory_id)
-        .offset(skip)
-        .limit(limit)
-    )
-    return result.scalars().all()
\ No newline at end of file
+    params = {"skip": skip, "limit": limit, "pagination": pagination, "cursor": cursor}
+    return conditional_response(await get_query_cache().get_or_load(EQUIPMENT, factory_id, params, load), if_none_match)
\ No newline at end of file
@@ -2,22 +2,25 @@
 V-Factory - 공간 쿼리 API 라우터
 R-Tree 기반 공간 인덱스 쿼리 엔드포인트
 """
-from typing import List, Optional
+from typing import Dict, List, Optional
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Depends, Query
 from pydantic import BaseModel, Field
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from database import get_db
-from models import Factory
+from routers.factory import fetch_factory
 from schemas import CCTVConfigResponse
+from services.spatial_index import CCTVEntry, spatial_index_manager
 from services.spatial_service import SpatialService
-from sqlalchemy import select
 
 
 router = APIRouter()
 
+# 배치 요청당 최대 지점/영역 수
+MAX_BATCH_SIZE = 1000
+
 
 # ===== Pydantic 스키마 =====
 
@@ -52,6 +55,67 @@ class BoundingBoxRequest(BaseModel):
     max_point: Position3D = Field(..., description="영역 최대 좌표")
 
 
+class BoundingBox(BaseModel):
+    """Bounding Box 스키마"""
+    min_point: Position3D = Field(..., description="영역 최소 좌표")
+    max_point: Position3D = Field(..., description="영역 최대 좌표")
+
+
+class BatchNearestCCTVRequest(BaseModel):
+    """여러 지점의 가장 가까운 CCTV 일괄 검색 요청 스키마"""
+    factory_id: UUID = Field(..., description="공장 ID")
+    positions: List[Position3D] = Field(
+        ..., min_length=1, max_length=MAX_BATCH_SIZE, description="검색 기준 위치 목록"
+    )
+    limit: int = Field(default=5, ge=1, le=20, description="지점별 반환할 CCTV 수")
+    max_distance: Optional[float] = Field(None, ge=0, description="최대 검색 거리")
+
+
+class BatchCoveringCCTVRequest(BaseModel):
+    """여러 지점을 촬영 중인 CCTV 일괄 검색 요청 스키마"""
+    factory_id: UUID = Field(..., description="공장 ID")
+    positions: List[Position3D] = Field(
+        ..., min_length=1, max_length=MAX_BATCH_SIZE, description="검색 기준 위치 목록"
+    )
+    max_distance: float = Field(default=50.0, ge=0, description="최대 감지 거리")
+    check_occlusion: bool = Field(default=True, description="설비에 가려진 CCTV 제외 여부")
+
+
+class BatchBoundingBoxRequest(BaseModel):
+    """여러 영역 내 CCTV 일괄 검색 요청 스키마"""
+    factory_id: UUID = Field(..., description="공장 ID")
+    boxes: List[BoundingBox] = Field(
+        ..., min_length=1, max_length=MAX_BATCH_SIZE, description="검색 영역 목록"
+    )
+
+
+# ===== 공통 헬퍼 =====
+
+async def ensure_factory_exists(db: AsyncSession, factory_id: UUID) -> None:
+    """
+    공장 존재 여부 확인
+    공간 인덱스가 이미 로드된 공장은 DB 조회 생략, 그 외에는 조회 캐시 경유 (없으면 404)
+    """
+    if spatial_index_manager.is_loaded(factory_id):
+        return
+    
+    await fetch_factory(db, factory_id)
+
+
+class _ResponseCache:
+    """요청 내 CCTV 응답 변환 결과 재사용 (여러 지점에서 같은 CCTV가 반복될 때)"""
+    
+    def __init__(self):
+        self._responses: Dict[UUID, CCTVConfigResponse] = {}
+    
+    def get(self, cctv: CCTVEntry) -> CCTVConfigResponse:
+        response = self._responses.get(cctv.id)
+        if response is None:
+            response = CCTVConfigResponse.model_validate(cctv)
+            self._responses[cctv.id] = response
+        return response
+
+
 # ===== API 엔드포인트 =====
 
 @router.post("/nearest-cctvs", response_model=List[CCTVWithDistance])
@@ -64,16 +128,7 @@ async def find_nearest_cctvs(
     사고 발생 시 가장 가까운 CCTV를 빠르게 찾기 위해 사용
     """
     # 공장 존재 여부 확인
-    result = await db.execute(
-        select(Factory).where(Factory.id == request.factory_id)
-    )
-    factory = result.scalar_one_or_none()
-    
-    if not factory:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="공장을 찾을 수 없습니다."
-        )
+    await ensure_factory_exists(db, request.factory_id)
     
     # 공간 검색 서비스 호출
     spatial_service = SpatialService(db)
@@ -101,23 +156,16 @@ async def find_cctvs_covering_point(
     factory_id: UUID,
     position: Position3D,
     max_distance: float = Query(default=50.0, ge=0, description="최대 감지 거리"),
+    check_occlusion: bool = Query(default=True, description="설비에 가려진 CCTV 제외 여부"),
     db: AsyncSession = Depends(get_db)
 ):
     """
     특정 위치를 시야각 내에서 볼 수 있는 CCTV들을 찾는 API
     사고 발생 시 해당 지점을 촬영 중인 CCTV를 찾기 위해 사용
+    (설비 OBB에 시야가 가려진 CCTV는 기본적으로 제외)
     """
     # 공장 존재 여부 확인
-    result = await db.execute(
-        select(Factory).where(Factory.id == factory_id)
-    )
-    factory = result.scalar_one_or_none()
-    
-    if not factory:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="공장을 찾을 수 없습니다."
-        )
+    await ensure_factory_exists(db, factory_id)
     
     # 공간 검색 서비스 호출
     spatial_service = SpatialService(db)
@@ -126,7 +174,8 @@ async def find_cctvs_covering_point(
     cctv_distances = await spatial_service.find_cctvs_covering_point(
         factory_id=factory_id,
         position=pos,
-        max_distance=max_distance
+        max_distance=max_distance,
+        check_occlusion=check_occlusion
     )
     
     # 응답 형식으로 변환
@@ -149,16 +198,7 @@ async def find_cctvs_in_bounding_box(
     특정 구역 내 CCTV를 일괄 조회할 때 사용
     """
     # 공장 존재 여부 확인
-    result = await db.execute(
-        select(Factory).where(Factory.id == request.factory_id)
-    )
-    factory = result.scalar_one_or_none()
-    
-    if not factory:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="공장을 찾을 수 없습니다."
-        )
+    await ensure_factory_exists(db, request.factory_id)
     
     # 공간 검색 서비스 호출
     spatial_service = SpatialService(db)
@@ -171,4 +211,88 @@ async def find_cctvs_in_bounding_box(
         max_point=max_point
     )
     
-    return cctvs
+    return [CCTVConfigResponse.model_validate(cctv) for cctv in cctvs]
+
+
+@router.post("/batch/nearest-cctvs", response_model=List[List[CCTVWithDistance]])
+async def find_nearest_cctvs_batch(
+    request: BatchNearestCCTVRequest,
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    여러 위치에서 가장 가까운 CCTV들을 한 번에 찾는 API
+    시뮬레이터가 틱마다 NPC 위치를 일괄 전송할 때 사용 (결과는 입력 순서와 동일)
+    """
+    await ensure_factory_exists(db, request.factory_id)
+    
+    spatial_service = SpatialService(db)
+    positions = [(p.x, p.y, p.z) for p in request.positions]
+    
+    batch_results = await spatial_service.find_nearest_cctvs_batch(
+        factory_id=request.factory_id,
+        positions=positions,
+        limit=request.limit,
+        max_distance=request.max_distance
+    )
+    
+    responses = _ResponseCache()
+    return [
+        [CCTVWithDistance(cctv=responses.get(cctv), distance=distance) for cctv, distance in results]
+        for results in batch_results
+    ]
+
+
+@router.post("/batch/covering-cctvs", response_model=List[List[CCTVWithDistance]])
+async def find_cctvs_covering_points_batch(
+    request: BatchCoveringCCTVRequest,
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    여러 위치를 시야각 내에서 볼 수 있는 CCTV들을 한 번에 찾는 API
+    (지점 × CCTV) 전체를 한 번의 배치 연산으로 판정 (결과는 입력 순서와 동일)
+    """
+    await ensure_factory_exists(db, request.factory_id)
+    
+    spatial_service = SpatialService(db)
+    positions = [(p.x, p.y, p.z) for p in request.positions]
+    
+    batch_results = await spatial_service.find_cctvs_covering_points(
+        factory_id=request.factory_id,
+        positions=positions,
+        max_distance=request.max_distance,
+        check_occlusion=request.check_occlusion
+    )
+    
+    responses = _ResponseCache()
+    return [
+        [CCTVWithDistance(cctv=responses.get(cctv), distance=distance) for cctv, distance in results]
+        for results in batch_results
+    ]
+
+
+@router.post("/batch/cctvs-in-area", response_model=List[List[CCTVConfigResponse]])
+async def find_cctvs_in_bounding_boxes_batch(
+    request: BatchBoundingBoxRequest,
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    여러 영역(Bounding Box) 내 CCTV들을 한 번에 찾는 API (결과는 입력 순서와 동일)
+    """
+    await ensure_factory_exists(db, request.factory_id)
+    
+    spatial_service = SpatialService(db)
+    boxes = [
+        (
+            (box.min_point.x, box.min_point.y, box.min_point.z),
+            (box.max_point.x, box.max_point.y, box.max_point.z),
+        )
+        for box in request.boxes
+    ]
+    
+    batch_results = await spatial_service.find_cctvs_in_bounding_boxes(
+        factory_id=request.factory_id,
+        boxes=boxes
+    )
+    
+    responses = _ResponseCache()
+    return [[responses.get(cctv) for cctv in cctvs] for cctvs in batch_results]
@@ -1,26 +1,39 @@
 """
 V-Factory - Factory Core SSE 스트림 라우터
-실시간 이벤트 스트림 엔드포인트
+실시간 이벤트 스트림 엔드포인트 (프로세스 공유 이벤트 허브에서 수신)
+모든 프레임에 id를 포함하며, 재접속 시 Last-Event-ID 이후 이벤트를 재전송
 """
-from fastapi import APIRouter
+from typing import Optional
+
+from fastapi import APIRouter, Header
 from fastapi.responses import StreamingResponse
 
 from services import RedisService
+from services.event_hub import SSE_RESET_FRAME, event_hub, format_sse
 
 
 router = APIRouter()
 
 
 @router.get("/factory")
-async def stream_factory_events():
+async def stream_factory_events(
+    last_event_id: Optional[str] = Header(None, alias="Last-Event-ID"),
+):
     """
     공장 이벤트 SSE 스트림 엔드포인트
     공장 생성/수정/삭제 및 레이아웃 변경 이벤트 실시간 수신
     """
     async def event_generator():
-        redis_service = RedisService()
-        async for message in redis_service.subscribe_factory_events():
-            yield f"data: {message}\n\n"
+        async with event_hub.subscribe(RedisService.FACTORY_CHANNEL, last_event_id=last_event_id) as subscription:
+            if subscription.reset_required:
+                subscription.reset_required = False
+                yield SSE_RESET_FRAME
+            async for event_id, message in subscription:
+                if subscription.reset_required:
+                    # 느린 클라이언트 버퍼에서 버린 이벤트가 있으면 전체 상태를 다시 조회하도록 알림
+                    subscription.reset_required = False
+                    yield SSE_RESET_FRAME
+                yield format_sse(event_id, message)
     
     return StreamingResponse(
         event_generator(),
@@ -34,15 +47,24 @@ async def stream_factory_events():
 
 
 @router.get("/cctv")
-async def stream_cctv_events():
+async def stream_cctv_events(
+    last_event_id: Optional[str] = Header(None, alias="Last-Event-ID"),
+):
     """
     CCTV 이벤트 SSE 스트림 엔드포인트
     CCTV 생성/수정/삭제 이벤트 실시간 수신
     """
     async def event_generator():
-        redis_service = RedisService()
-        async for message in redis_service.subscribe_cctv_events():
-            yield f"data: {message}\n\n"
+        async with event_hub.subscribe(RedisService.CCTV_CHANNEL, last_event_id=last_event_id) as subscription:
+            if subscription.reset_required:
+                subscription.reset_required = False
+                yield SSE_RESET_FRAME
+            async for event_id, message in subscription:
+                if subscription.reset_required:
+                    # 느린 클라이언트 버퍼에서 버린 이벤트가 있으면 전체 상태를 다시 조회하도록 알림
+                    subscription.reset_required = False
+                    yield SSE_RESET_FRAME
+                yield format_sse(event_id, message)
     
     return StreamingResponse(
         event_generator(),
@@ -56,15 +78,24 @@ async def stream_cctv_events():
 
 
 @router.get("/all")
-async def stream_all_events():
+async def stream_all_events(
+    last_event_id: Optional[str] = Header(None, alias="Last-Event-ID"),
+):
     """
     모든 이벤트 SSE 스트림 엔드포인트
     공장 및 CCTV 관련 모든 이벤트 실시간 수신
     """
     async def event_generator():
-        redis_service = RedisService()
-        async for message in redis_service.subscribe_all_events():
-            yield f"data: {message}\n\n"
+        async with event_hub.subscribe(RedisService.FACTORY_CHANNEL, RedisService.CCTV_CHANNEL, last_event_id=last_event_id) as subscription:
+            if subscription.reset_required:
+                subscription.reset_required = False
+                yield SSE_RESET_FRAME
+            async for event_id, message in subscription:
+                if subscription.reset_required:
+                    # 느린 클라이언트 버퍼에서 버린 이벤트가 있으면 전체 상태를 다시 조회하도록 알림
+                    subscription.reset_required = False
+                    yield SSE_RESET_FRAME
+                yield format_sse(event_id, message)
     
     return StreamingResponse(
         event_generator(),
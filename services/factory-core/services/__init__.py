@@ -3,6 +3,7 @@ V-Factory - Factory Core 鍮꾩쫰?덉뒪 濡쒖쭅 ?쒕퉬??"""
 from .spatial_service import SpatialService
 from .redis_service import (
     RedisService,
+    get_redis_service,
     FactoryEventType,
     CCTVEventType,
     factory_to_dict,
@@ -12,6 +13,7 @@ from .redis_service import (
 __all__ = [
     "SpatialService",
     "RedisService",
+    "get_redis_service",
     "FactoryEventType",
     "CCTVEventType",
     "factory_to_dict",
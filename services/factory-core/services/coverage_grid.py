@@ -0,0 +1,312 @@
+"""
+V-Factory - CCTV 커버리지 복셀 그리드
+공장 CCTV 시야(FOV + 최대 감지 거리)를 복셀 그리드에 미리 래스터화하여
+"이 지점을 볼 수 있는 CCTV 후보"를 복셀 조회 한 번으로 구함
+"""
+import math
+import time
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+from uuid import UUID
+
+import numpy as np
+
+from utils.metrics import (
+    COVERAGE_GRID_CELLS,
+    COVERAGE_GRID_MEMORY_BYTES,
+    COVERAGE_GRID_REBUILD_SECONDS,
+    COVERAGE_GRID_VOXEL_SIZE,
+)
+
+# 비트셋 워드 크기 (np.uint64)
+_WORD_BITS = 64
+
+
+def _wrap_angle_diff(diff: np.ndarray) -> np.ndarray:
+    """SpatialService.is_point_in_fov와 동일한 단일 각도 보정"""
+    return np.where(diff > math.pi, 2 * math.pi - diff, diff)
+
+
+class CoverageGrid:
+    """
+    공장 단위 CCTV 커버리지 그리드
+
+    - 복셀마다 CCTV 슬롯 비트셋((셀 수, 워드 수) uint64 배열)을 유지
+    - 래스터화는 보수적(복셀 외접구 기준)이므로 후보 집합은 실제 결과의 상위 집합
+    - CCTV 변경 시 해당 CCTV가 덮던 셀만 갱신 (그리드 범위를 벗어나면 전체 재구성)
+    - 비트셋이 메모리 상한을 넘으면 그리드를 비활성화하고 전체 판정으로 대체
+    """
+
+    def __init__(
+        self,
+        factory_id: UUID,
+        voxel_size: float,
+        max_distance: float,
+        min_y: float,
+        max_y: float,
+        max_bytes: Optional[int] = None,
+    ):
+        self.factory_id = factory_id
+        self.voxel_size = float(voxel_size)
+        self.max_distance = float(max_distance)
+        self.min_y = float(min_y)
+        self.max_y = float(max_y)
+        self.max_bytes = max_bytes
+        # 메모리 상한 초과로 그리드를 사용하지 않는 상태
+        self.oversized = False
+        # 복셀 외접구 반지름 (보수적 판정용)
+        self._voxel_radius = self.voxel_size * math.sqrt(3.0) / 2.0
+
+        self.origin: Optional[np.ndarray] = None
+        self.dims: Tuple[int, int, int] = (0, 0, 0)
+        self.bits = np.zeros((0, 1), dtype=np.uint64)
+        self.last_rebuild_seconds = 0.0
+
+        self._slots: Dict[UUID, int] = {}
+        self._slot_ids: List[Optional[UUID]] = []
+        self._free_slots: List[int] = []
+        self._cells_of: Dict[UUID, np.ndarray] = {}
+        self._tracked: Dict[UUID, object] = {}
+
+    # ===== 구성 =====
+
+    def rebuild(self, cctvs: Iterable) -> None:
+        """전체 CCTV로 그리드 범위 및 비트셋 재구성"""
+        started = time.perf_counter()
+        cctvs = list(cctvs)
+
+        self._slots.clear()
+        self._slot_ids = []
+        self._free_slots = []
+        self._cells_of.clear()
+        self._tracked.clear()
+
+        if not cctvs:
+            self.origin = None
+            self.dims = (0, 0, 0)
+            self.bits = np.zeros((0, 1), dtype=np.uint64)
+        else:
+            positions = np.array([cctv.position for cctv in cctvs], dtype=np.float64)
+            low = positions.min(axis=0) - self.max_distance
+            high = positions.max(axis=0) + self.max_distance
+            low[1] = max(low[1], self.min_y)
+            high[1] = max(min(high[1], self.max_y), low[1] + self.voxel_size)
+
+            dims = np.maximum(1, np.ceil((high - low) / self.voxel_size)).astype(np.int64)
+            self.origin = low
+            self.dims = (int(dims[0]), int(dims[1]), int(dims[2]))
+            words = max(1, math.ceil(len(cctvs) / _WORD_BITS))
+            required = int(dims.prod()) * words * np.dtype(np.uint64).itemsize
+
+            self.oversized = self.max_bytes is not None and required > self.max_bytes
+            if self.oversized:
+                # 상한 초과 - CCTV 목록만 추적하고 조회는 전체 판정으로 위임
+                self.origin = None
+                self.dims = (0, 0, 0)
+                self.bits = np.zeros((0, 1), dtype=np.uint64)
+                self._tracked = {cctv.id: cctv for cctv in cctvs}
+            else:
+                self.bits = np.zeros((int(dims.prod()), words), dtype=np.uint64)
+                for cctv in cctvs:
+                    self._rasterize(cctv)
+
+        self.last_rebuild_seconds = time.perf_counter() - started
+        COVERAGE_GRID_REBUILD_SECONDS.labels(mode="full").observe(self.last_rebuild_seconds)
+        self._export_metrics()
+
+    def upsert(self, cctv) -> None:
+        """CCTV 추가/갱신 - 해당 CCTV가 덮는 셀만 다시 래스터화"""
+        if self.oversized:
+            self._tracked[cctv.id] = cctv
+            return
+        if self.origin is None or not self._fits(cctv):
+            # 그리드 범위를 벗어나는 경우 범위를 다시 잡아 전체 재구성
+            others = [c for c in self._tracked.values() if c.id != cctv.id]
+            self.rebuild(others + [cctv])
+            return
+
+        started = time.perf_counter()
+        self._clear_slot(cctv.id)
+        self._rasterize(cctv)
+        if self.max_bytes is not None and self.bits.nbytes > self.max_bytes:
+            # 슬롯 확장으로 상한을 넘은 경우 재구성 과정에서 비활성화
+            self.rebuild(self._tracked.values())
+            return
+        COVERAGE_GRID_REBUILD_SECONDS.labels(mode="incremental").observe(
+            time.perf_counter() - started
+        )
+        self._export_metrics()
+
+    def remove(self, cctv_id: UUID) -> None:
+        """CCTV 제거 - 해당 CCTV 비트만 해제"""
+        if self.oversized:
+            self._tracked.pop(cctv_id, None)
+            return
+        started = time.perf_counter()
+        if self._clear_slot(cctv_id):
+            COVERAGE_GRID_REBUILD_SECONDS.labels(mode="incremental").observe(
+                time.perf_counter() - started
+            )
+            self._export_metrics()
+
+    def close(self) -> None:
+        """공장 제거 시 메트릭 레이블 정리"""
+        labels = str(self.factory_id)
+        for gauge in (COVERAGE_GRID_VOXEL_SIZE, COVERAGE_GRID_CELLS, COVERAGE_GRID_MEMORY_BYTES):
+            try:
+                gauge.remove(labels)
+            except KeyError:
+                pass
+
+    # ===== 조회 =====
+
+    def candidates(self, point: Sequence[float], max_distance: float) -> Optional[List[UUID]]:
+        """
+        지점을 볼 수 있는 CCTV 후보 조회
+
+        Args:
+            point: 대상 좌표 (x, y, z)
+            max_distance: 쿼리 최대 감지 거리
+
+        Returns:
+            후보 CCTV ID 리스트 (그리드로 판단할 수 없으면 None - 전체 판정 필요)
+        """
+        if self.oversized or max_distance > self.max_distance:
+            return None
+        if self.origin is None:
+            return []
+
+        offset = (np.asarray(point, dtype=np.float64) - self.origin) / self.voxel_size
+        if offset[1] < 0 or offset[1] > self.dims[1]:
+            # 높이 범위 밖은 래스터화하지 않았으므로 판단 불가
+            return None
+        if offset[0] < 0 or offset[0] > self.dims[0] or offset[2] < 0 or offset[2] > self.dims[2]:
+            # 수평 범위는 모든 CCTV 위치 ± 최대 거리를 포함하므로 범위 밖은 후보 없음
+            return []
+
+        ix = min(int(offset[0]), self.dims[0] - 1)
+        iy = min(int(offset[1]), self.dims[1] - 1)
+        iz = min(int(offset[2]), self.dims[2] - 1)
+        row = self.bits[(ix * self.dims[1] + iy) * self.dims[2] + iz]
+        slots = np.flatnonzero(np.unpackbits(row.view(np.uint8), bitorder="little"))
+        return [self._slot_ids[slot] for slot in slots.tolist()]
+
+    @property
+    def cell_count(self) -> int:
+        return self.dims[0] * self.dims[1] * self.dims[2]
+
+    @property
+    def memory_bytes(self) -> int:
+        """비트셋 및 CCTV별 복셀 목록 메모리 사용량"""
+        return int(self.bits.nbytes + sum(cells.nbytes for cells in self._cells_of.values()))
+
+    # ===== 내부 구현 =====
+
+    def _fits(self, cctv) -> bool:
+        """CCTV 시야 범위(수평)가 현재 그리드 안에 들어가는지 확인"""
+        upper = self.origin + np.array(self.dims, dtype=np.float64) * self.voxel_size
+        x, _, z = cctv.position
+        return (
+            x - self.max_distance >= self.origin[0]
+            and x + self.max_distance <= upper[0]
+            and z - self.max_distance >= self.origin[2]
+            and z + self.max_distance <= upper[2]
+        )
+
+    def _allocate_slot(self, cctv_id: UUID) -> int:
+        """비트셋 슬롯 할당 (필요 시 워드 수 확장)"""
+        if self._free_slots:
+            slot = self._free_slots.pop()
+            self._slot_ids[slot] = cctv_id
+        else:
+            slot = len(self._slot_ids)
+            self._slot_ids.append(cctv_id)
+        if slot >= self.bits.shape[1] * _WORD_BITS:
+            extra = self.bits.shape[1]
+            self.bits = np.concatenate(
+                [self.bits, np.zeros((self.bits.shape[0], extra), dtype=np.uint64)], axis=1
+            )
+        self._slots[cctv_id] = slot
+        return slot
+
+    def _clear_slot(self, cctv_id: UUID) -> bool:
+        """CCTV 비트 해제 및 슬롯 반환"""
+        slot = self._slots.pop(cctv_id, None)
+        if slot is None:
+            return False
+        cells = self._cells_of.pop(cctv_id)
+        word, bit = divmod(slot, _WORD_BITS)
+        self.bits[cells, word] &= ~np.uint64(1 << bit)
+        self._slot_ids[slot] = None
+        self._free_slots.append(slot)
+        self._tracked.pop(cctv_id, None)
+        return True
+
+    def _rasterize(self, cctv) -> None:
+        """CCTV 시야를 복셀에 기록"""
+        slot = self._allocate_slot(cctv.id)
+        cells = self._covered_cells(cctv)
+        word, bit = divmod(slot, _WORD_BITS)
+        self.bits[cells, word] |= np.uint64(1 << bit)
+        self._cells_of[cctv.id] = cells
+        self._tracked[cctv.id] = cctv
+
+    def _covered_cells(self, cctv) -> np.ndarray:
+        """
+        CCTV가 볼 수 있는 점을 하나라도 포함할 수 있는 복셀의 선형 인덱스
+
+        복셀 외접구(반지름 r)를 기준으로 거리 및 각도 조건을 r만큼 완화하여 판정
+        (각도 차이 함수는 1-립시츠이므로 외접구의 각반경만큼 완화하면 상위 집합이 보장됨)
+        """
+        position = np.asarray(cctv.position, dtype=np.float64)
+        dims = np.array(self.dims)
+        low_idx = np.floor((position - self.max_distance - self.origin) / self.voxel_size)
+        high_idx = np.floor((position + self.max_distance - self.origin) / self.voxel_size)
+        low_idx = np.clip(low_idx, 0, dims - 1).astype(np.int64)
+        high_idx = np.clip(high_idx, 0, dims - 1).astype(np.int64)
+
+        ix, iy, iz = np.meshgrid(
+            np.arange(low_idx[0], high_idx[0] + 1),
+            np.arange(low_idx[1], high_idx[1] + 1),
+            np.arange(low_idx[2], high_idx[2] + 1),
+            indexing="ij",
+        )
+        dx = self.origin[0] + (ix + 0.5) * self.voxel_size - position[0]
+        dy = self.origin[1] + (iy + 0.5) * self.voxel_size - position[1]
+        dz = self.origin[2] + (iz + 0.5) * self.voxel_size - position[2]
+
+        radius = self._voxel_radius
+        distance = np.sqrt(dx * dx + dy * dy + dz * dz)
+        horizontal_dist = np.sqrt(dx * dx + dz * dz)
+        horizontal_angle = np.arctan2(dx, dz)
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            vertical_angle = np.where(horizontal_dist > 0, np.arctan2(dy, horizontal_dist), 0.0)
+            # 복셀 외접구의 수평/전체 각반경
+            delta_h = np.arcsin(np.minimum(1.0, radius / horizontal_dist))
+            delta_v = np.arcsin(np.minimum(1.0, radius / distance))
+
+        half_fov = math.radians(cctv.fov / 2)
+        angle_diff_h = _wrap_angle_diff(np.abs(horizontal_angle - cctv.rotation[1]))
+        angle_diff_v = _wrap_angle_diff(np.abs(vertical_angle - cctv.rotation[0]))
+
+        # 카메라 바로 위/아래 또는 카메라를 포함하는 복셀은 각도 판정 불가 → 포함
+        near_axis = horizontal_dist <= radius
+        # atan2 분기선(±π)을 걸치는 복셀은 각도 차이가 불연속 → 포함
+        crosses_branch = np.abs(horizontal_angle) + delta_h >= math.pi
+
+        covered = (distance - radius <= self.max_distance) & (
+            near_axis
+            | (
+                ((angle_diff_h <= half_fov + delta_h) | crosses_branch)
+                & (angle_diff_v <= half_fov + delta_v)
+            )
+        )
+        linear = (ix * self.dims[1] + iy) * self.dims[2] + iz
+        return linear[covered].astype(np.int64)
+
+    def _export_metrics(self) -> None:
+        """그리드 해상도/메모리 메트릭 갱신"""
+        labels = str(self.factory_id)
+        COVERAGE_GRID_VOXEL_SIZE.labels(labels).set(self.voxel_size)
+        COVERAGE_GRID_CELLS.labels(labels).set(self.cell_count)
+        COVERAGE_GRID_MEMORY_BYTES.labels(labels).set(self.memory_bytes)
@@ -0,0 +1,391 @@
+"""
+V-Factory - SSE 이벤트 팬아웃 허브
+워커 프로세스당 Redis Stream별 대기 읽기를 하나만 유지하고
+수신한 이벤트를 SSE 클라이언트별 크기 제한 버퍼로 분배
+재접속 클라이언트(Last-Event-ID)에는 메모리 이력 또는 XRANGE로 누락 구간을 재전송
+"""
+import asyncio
+import json
+from collections import OrderedDict, deque
+from contextlib import asynccontextmanager
+from typing import (
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Deque,
+    Dict,
+    Hashable,
+    List,
+    Optional,
+    Set,
+    Tuple,
+)
+
+from config import settings
+from services.redis_service import get_redis_service, parse_stream_id
+from utils.logging import logger
+from utils.metrics import (
+    SSE_MESSAGES_COALESCED,
+    SSE_MESSAGES_DROPPED,
+    SSE_MESSAGES_RECEIVED,
+    SSE_QUEUE_DEPTH,
+    SSE_REPLAYS,
+    SSE_SUBSCRIBERS,
+)
+
+# 스트림 읽기 재연결 대기 시간 (초, 지수 백오프 상한)
+_RECONNECT_MIN_DELAY = 0.5
+_RECONNECT_MAX_DELAY = 10.0
+
+# SSE 이벤트 ID에서 아직 위치를 모르는 스트림 표기 (재접속 시 해당 스트림은 재전송 생략)
+_UNKNOWN_POSITION = "-"
+
+StreamEntry = Tuple[str, str]
+
+# 메시지 소스: (스트림, 마지막 ID)를 받아 (항목 ID, 메시지)를 내보내는 비동기 반복자
+# 메시지가 None인 항목은 시작 위치 알림
+MessageSource = Callable[[str, Optional[str]], AsyncIterator[Tuple[str, Optional[str]]]]
+
+# 재전송 소스: (스트림, 마지막 수신 ID)를 받아 (이후 항목 리스트, 누락 구간 여부) 반환
+ReplaySource = Callable[[str, str], Awaitable[Tuple[List[StreamEntry], bool]]]
+
+
+def update_coalesce_key(channel: str, message: str) -> Optional[Hashable]:
+    """
+    병합 키 계산 - 같은 엔티티의 *_updated 이벤트는 마지막 상태만 전달하면 충분
+    생성/삭제 등 나머지 이벤트는 병합하지 않음 (None)
+    """
+    try:
+        payload = json.loads(message)
+    except ValueError:
+        return None
+    if not isinstance(payload, dict):
+        return None
+    event = payload.get("event")
+    data = payload.get("data")
+    if isinstance(event, str) and event.endswith("_updated") and isinstance(data, dict) and data.get("id"):
+        return (channel, event, data["id"])
+    return None
+
+
+def format_sse(event_id: str, message: str) -> str:
+    """SSE 프레임 생성 (id 필드 포함 - 브라우저가 재접속 시 Last-Event-ID로 전송)"""
+    return f"id: {event_id}\ndata: {message}\n\n"
+
+
+# 누락 구간을 재전송할 수 없을 때 보내는 프레임 (클라이언트는 REST로 전체 상태를 다시 조회)
+SSE_RESET_FRAME = "event: reset\ndata: {}\n\n"
+
+
+def _redis_source(channel: str, last_id: Optional[str]) -> AsyncIterator[Tuple[str, Optional[str]]]:
+    """기본 메시지 소스 - 프로세스 전역 RedisService 스트림 대기 읽기"""
+    return get_redis_service().read_stream(channel, last_id)
+
+
+async def _redis_replay(channel: str, after_id: str) -> Tuple[List[StreamEntry], bool]:
+    """기본 재전송 소스 - XRANGE로 마지막 수신 ID 이후 항목 조회"""
+    return await get_redis_service().range_stream(channel, after_id, settings.REDIS_STREAM_MAXLEN)
+
+
+class Subscription:
+    """
+    SSE 클라이언트 하나의 수신 버퍼
+
+    - 버퍼가 가득 차면 가장 오래된 메시지를 버림 (느린 클라이언트가 허브를 막지 않도록)
+    - 병합 키가 같은 대기 메시지는 최신 메시지로 교체하고 버퍼 끝으로 이동 (스트림 ID 순서 유지)
+    - 버퍼 초과로 메시지를 버리면 reset_required 설정 (SSE 클라이언트에 reset 프레임 전송)
+    - 스트림별 전달 위치를 기록하여 SSE 이벤트 ID로 내보내고,
+      이미 받은 항목(스트림 ID가 마지막 적재 ID 이하)은 다시 적재하지 않음
+    """
+
+    def __init__(self, channels: Tuple[str, ...], maxsize: int, positions: Dict[str, Optional[str]]):
+        self.channels = channels
+        self.maxsize = maxsize
+        self.dropped = 0
+        self.coalesced = 0
+        self.reset_required = False
+        self.positions: Dict[str, Optional[str]] = {channel: positions.get(channel) for channel in channels}
+        # 스트림별 마지막 적재 ID (재전송과 실시간 수신이 겹칠 때 중복 제거 기준)
+        self._latest: Dict[str, Tuple[int, int]] = {
+            channel: parse_stream_id(entry_id) for channel, entry_id in self.positions.items() if entry_id
+        }
+        self._buffer: "OrderedDict[Hashable, Tuple[str, str, str]]" = OrderedDict()
+        self._ready = asyncio.Event()
+        self._sequence = 0
+
+    def __len__(self) -> int:
+        return len(self._buffer)
+
+    @property
+    def event_id(self) -> str:
+        """현재 전달 위치를 SSE 이벤트 ID로 인코딩 (스트림 순서대로 쉼표 구분)"""
+        return ",".join(self.positions[channel] or _UNKNOWN_POSITION for channel in self.channels)
+
+    def put(
+        self,
+        channel: str,
+        entry_id: str,
+        message: str,
+        coalesce_key: Optional[Hashable] = None,
+    ) -> None:
+        """메시지 적재 (허브 디스패치에서 호출, 대기 없음)"""
+        if self._seen(channel, entry_id):
+            return
+        self._latest[channel] = parse_stream_id(entry_id)
+
+        if coalesce_key is not None and coalesce_key in self._buffer:
+            # 옛 위치에 새 ID를 두면 ID가 역순으로 전달되어 재접속 시 사이 항목이 누락됨
+            self._buffer[coalesce_key] = (channel, entry_id, message)
+            self._buffer.move_to_end(coalesce_key)
+            self.coalesced += 1
+            SSE_MESSAGES_COALESCED.labels(channel=channel).inc()
+            return
+
+        if len(self._buffer) >= self.maxsize:
+            _, (dropped_channel, _, _) = self._buffer.popitem(last=False)
+            self.dropped += 1
+            # 버린 이벤트는 재전송할 수 없으므로 클라이언트가 전체 상태를 다시 조회해야 함
+            self.reset_required = True
+            SSE_MESSAGES_DROPPED.labels(channel=dropped_channel).inc()
+
+        self._buffer[self._key(coalesce_key)] = (channel, entry_id, message)
+        self._ready.set()
+
+    def prepend(self, channel: str, entries: List[StreamEntry]) -> None:
+        """재전송 항목을 대기 중인 실시간 메시지 앞에 배치 (중복 항목 제거)"""
+        position = self.positions.get(channel)
+        if position is not None:
+            delivered = parse_stream_id(position)
+            entries = [entry for entry in entries if parse_stream_id(entry[0]) > delivered]
+        if not entries:
+            return
+        replayed_until = parse_stream_id(entries[-1][0])
+        self._latest[channel] = max(self._latest.get(channel, replayed_until), replayed_until)
+
+        buffer: "OrderedDict[Hashable, Tuple[str, str, str]]" = OrderedDict()
+        for entry_id, message in entries:
+            buffer[self._key(None)] = (channel, entry_id, message)
+        for key, item in self._buffer.items():
+            if item[0] == channel and parse_stream_id(item[1]) <= replayed_until:
+                continue
+            buffer[key] = item
+        self._buffer = buffer
+        self._ready.set()
+
+    async def get(self) -> Tuple[str, str, str]:
+        """다음 (스트림, 항목 ID, 메시지) 대기 후 반환 (전달 위치 갱신)"""
+        while not self._buffer:
+            self._ready.clear()
+            await self._ready.wait()
+        channel, entry_id, message = self._buffer.popitem(last=False)[1]
+        self.positions[channel] = entry_id
+        return channel, entry_id, message
+
+    def __aiter__(self) -> "Subscription":
+        return self
+
+    async def __anext__(self) -> Tuple[str, str]:
+        """(SSE 이벤트 ID, 메시지) 반환"""
+        _, _, message = await self.get()
+        return self.event_id, message
+
+    def _seen(self, channel: str, entry_id: str) -> bool:
+        latest = self._latest.get(channel)
+        return latest is not None and parse_stream_id(entry_id) <= latest
+
+    def _key(self, coalesce_key: Optional[Hashable]) -> Hashable:
+        if coalesce_key is not None:
+            return coalesce_key
+        self._sequence += 1
+        return ("seq", self._sequence)
+
+
+class EventHub:
+    """
+    스트림별 Redis 대기 읽기 팬아웃 허브
+
+    - 첫 구독자가 생길 때 스트림 펌프 태스크를 시작하고 프로세스 종료 시까지 유지
+    - 메시지는 펌프에서 한 번만 디코딩/병합 키 계산 후 구독자 버퍼로 복사
+    - 최근 이벤트를 메모리에 보관하여 재접속 재전송은 대부분 Redis 조회 없이 처리하고,
+      메모리 밖 구간은 같은 위치를 요청한 재접속끼리 XRANGE 한 번을 공유
+    """
+
+    def __init__(
+        self,
+        source: MessageSource = _redis_source,
+        replay_source: ReplaySource = _redis_replay,
+        queue_size: Optional[int] = None,
+        history_size: Optional[int] = None,
+        coalesce_key: Callable[[str, str], Optional[Hashable]] = update_coalesce_key,
+    ):
+        self._source = source
+        self._replay_source = replay_source
+        self._queue_size = queue_size
+        self._history_size = history_size
+        self._coalesce_key = coalesce_key
+        self._subscribers: Dict[str, Set[Subscription]] = {}
+        self._pumps: Dict[str, asyncio.Task] = {}
+        self._positions: Dict[str, Optional[str]] = {}
+        self._history: Dict[str, Deque[StreamEntry]] = {}
+        self._replays: Dict[Tuple[str, str], asyncio.Future] = {}
+
+    def subscriber_count(self, channel: str) -> int:
+        return len(self._subscribers.get(channel, ()))
+
+    def queue_depth(self, channel: str) -> int:
+        return sum(len(subscription) for subscription in self._subscribers.get(channel, ()))
+
+    @asynccontextmanager
+    async def subscribe(
+        self,
+        *channels: str,
+        last_event_id: Optional[str] = None,
+    ) -> AsyncIterator[Subscription]:
+        """
+        스트림 구독 (컨텍스트 종료 시 자동 해제)
+
+        Args:
+            channels: 구독할 스트림 목록
+            last_event_id: 재접속 클라이언트가 보낸 Last-Event-ID (있으면 이후 항목 재전송)
+
+        Yields:
+            Subscription - async for로 (SSE 이벤트 ID, 메시지) 수신
+        """
+        maxsize = self._queue_size or settings.SSE_QUEUE_SIZE
+        resume_from = self._parse_event_id(channels, last_event_id)
+        positions = dict(self._positions)
+        positions.update({channel: entry_id for channel, entry_id in resume_from.items() if entry_id})
+
+        subscription = Subscription(tuple(channels), maxsize, positions)
+        for channel in channels:
+            self._register_channel(channel)
+            self._subscribers[channel].add(subscription)
+            self._ensure_pump(channel)
+        try:
+            # 실시간 수신을 먼저 등록한 뒤 재전송하므로 그 사이 이벤트도 누락되지 않음
+            for channel, entry_id in resume_from.items():
+                if entry_id:
+                    await self._replay(subscription, channel, entry_id)
+            yield subscription
+        finally:
+            for channel in channels:
+                self._subscribers[channel].discard(subscription)
+
+    def dispatch(self, channel: str, entry_id: str, message: Optional[str]) -> None:
+        """수신 메시지를 스트림 구독자 전체에 분배 (message가 None이면 위치만 갱신)"""
+        self._positions[channel] = entry_id
+        if message is None:
+            return
+
+        SSE_MESSAGES_RECEIVED.labels(channel=channel).inc()
+        self._history_of(channel).append((entry_id, message))
+        subscribers = self._subscribers.get(channel)
+        if not subscribers:
+            return
+        key = self._coalesce_key(channel, message)
+        for subscription in subscribers:
+            subscription.put(channel, entry_id, message, key)
+
+    async def close(self) -> None:
+        """모든 스트림 펌프 종료 (애플리케이션 종료 시)"""
+        pumps = list(self._pumps.values())
+        self._pumps.clear()
+        for task in pumps:
+            task.cancel()
+        await asyncio.gather(*pumps, return_exceptions=True)
+
+    # ===== 재전송 =====
+
+    @staticmethod
+    def _parse_event_id(channels: Tuple[str, ...], last_event_id: Optional[str]) -> Dict[str, Optional[str]]:
+        """Last-Event-ID를 스트림별 위치로 해석 (형식이 맞지 않으면 재전송 없음)"""
+        if not last_event_id:
+            return {}
+        parts = last_event_id.split(",")
+        if len(parts) != len(channels):
+            return {}
+        resume_from: Dict[str, Optional[str]] = {}
+        for channel, part in zip(channels, parts):
+            part = part.strip()
+            if part == _UNKNOWN_POSITION:
+                resume_from[channel] = None
+                continue
+            try:
+                parse_stream_id(part)
+            except ValueError:
+                return {}
+            resume_from[channel] = part
+        return resume_from
+
+    async def _replay(self, subscription: Subscription, channel: str, after_id: str) -> None:
+        """마지막 수신 ID 이후 항목을 구독 버퍼 앞에 채움"""
+        history = self._history.get(channel)
+        after = parse_stream_id(after_id)
+        if history and parse_stream_id(history[0][0]) <= after:
+            SSE_REPLAYS.labels(channel=channel, source="memory").inc()
+            subscription.prepend(
+                channel, [entry for entry in history if parse_stream_id(entry[0]) > after]
+            )
+            return
+
+        SSE_REPLAYS.labels(channel=channel, source="redis").inc()
+        entries, gap = await self._shared_range(channel, after_id)
+        if gap:
+            subscription.reset_required = True
+        subscription.prepend(channel, entries)
+
+    async def _shared_range(self, channel: str, after_id: str) -> Tuple[List[StreamEntry], bool]:
+        """같은 위치에서 동시에 재접속한 클라이언트들이 XRANGE 결과 하나를 공유"""
+        key = (channel, after_id)
+        future = self._replays.get(key)
+        if future is None:
+            future = asyncio.ensure_future(self._replay_source(channel, after_id))
+            self._replays[key] = future
+            future.add_done_callback(lambda _: self._replays.pop(key, None))
+        return await asyncio.shield(future)
+
+    # ===== 내부 구현 =====
+
+    def _history_of(self, channel: str) -> Deque[StreamEntry]:
+        history = self._history.get(channel)
+        if history is None:
+            history = deque(maxlen=self._history_size or settings.SSE_REPLAY_BUFFER_SIZE)
+            self._history[channel] = history
+        return history
+
+    def _register_channel(self, channel: str) -> None:
+        """스트림 최초 등록 시 구독자 수/대기 메시지 게이지 연결"""
+        if channel in self._subscribers:
+            return
+        self._subscribers[channel] = set()
+        SSE_SUBSCRIBERS.labels(channel=channel).set_function(
+            lambda: self.subscriber_count(channel)
+        )
+        SSE_QUEUE_DEPTH.labels(channel=channel).set_function(
+            lambda: self.queue_depth(channel)
+        )
+
+    def _ensure_pump(self, channel: str) -> None:
+        """스트림 펌프 태스크 시작 (이미 실행 중이면 무시)"""
+        task = self._pumps.get(channel)
+        if task is None or task.done():
+            self._pumps[channel] = asyncio.create_task(self._pump(channel))
+
+    async def _pump(self, channel: str) -> None:
+        """스트림 읽기 루프 - 연결이 끊기면 마지막 위치부터 백오프 후 재개"""
+        delay = _RECONNECT_MIN_DELAY
+        while True:
+            try:
+                async for entry_id, message in self._source(channel, self._positions.get(channel)):
+                    delay = _RECONNECT_MIN_DELAY
+                    self.dispatch(channel, entry_id, message)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"[EventHub] {channel} 스트림 읽기 오류, {delay:.1f}초 후 재연결: {e}")
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, _RECONNECT_MAX_DELAY)
+
+
+# 프로세스 전역 이벤트 허브
+event_hub = EventHub()
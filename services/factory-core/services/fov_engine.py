@@ -0,0 +1,165 @@
+"""
+V-Factory - 벡터화 FOV 판정 엔진
+공장 CCTV의 위치/회전/화각을 연속 NumPy 배열로 유지하고
+여러 지점 × 전체 CCTV의 시야 포함 여부를 한 번의 배치 연산으로 계산
+"""
+import math
+from typing import Hashable, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+# 한 번에 계산할 (지점 × CCTV) 원소 수 상한 - 중간 배열 메모리 사용량 제한
+_MAX_BATCH_ELEMENTS = 1_000_000
+
+
+class CameraArrays:
+    """
+    CCTV 배열 묶음 (Structure of Arrays)
+
+    SpatialService.is_point_in_fov와 동일한 결과를 보장하기 위해
+    좌표/각도는 float64로 유지하고 계산 순서도 스칼라 경로와 맞춤
+    """
+
+    def __init__(self, cctvs: Sequence):
+        self.cctvs = list(cctvs)
+        self.index_of = {cctv.id: idx for idx, cctv in enumerate(self.cctvs)}
+        count = len(self.cctvs)
+
+        self.positions = np.empty((count, 3), dtype=np.float64)
+        self.rotations = np.empty((count, 3), dtype=np.float64)
+        fovs = np.empty(count, dtype=np.float64)
+        for idx, cctv in enumerate(self.cctvs):
+            self.positions[idx] = cctv.position
+            self.rotations[idx] = cctv.rotation
+            fovs[idx] = cctv.fov
+
+        # 축별 연속 배열 (브로드캐스팅 시 스트라이드 접근 방지)
+        self.pos_x = np.ascontiguousarray(self.positions[:, 0])
+        self.pos_y = np.ascontiguousarray(self.positions[:, 1])
+        self.pos_z = np.ascontiguousarray(self.positions[:, 2])
+        self.pitch = np.ascontiguousarray(self.rotations[:, 0])
+        self.yaw = np.ascontiguousarray(self.rotations[:, 1])
+        self.half_fov_rad = np.radians(fovs / 2)
+
+    def __len__(self) -> int:
+        return len(self.cctvs)
+
+    def evaluate(
+        self,
+        points: np.ndarray,
+        max_distance: float,
+        indices: Optional[np.ndarray] = None,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        지점들 × CCTV FOV 판정
+
+        Args:
+            points: (P, 3) 형태의 대상 좌표 배열
+            max_distance: 최대 감지 거리
+            indices: 판정할 CCTV 인덱스 (None이면 전체)
+
+        Returns:
+            (포함 여부 (P, N) bool 배열, 거리 (P, N) float64 배열)
+        """
+        pos_x, pos_y, pos_z = self.pos_x, self.pos_y, self.pos_z
+        pitch, yaw, half_fov_rad = self.pitch, self.yaw, self.half_fov_rad
+        if indices is not None:
+            pos_x, pos_y, pos_z = pos_x[indices], pos_y[indices], pos_z[indices]
+            pitch, yaw, half_fov_rad = pitch[indices], yaw[indices], half_fov_rad[indices]
+
+        points = np.asarray(points, dtype=np.float64).reshape(-1, 3)
+        dx = points[:, 0:1] - pos_x
+        dy = points[:, 1:2] - pos_y
+        dz = points[:, 2:3] - pos_z
+
+        distances = np.sqrt(dx * dx + dy * dy + dz * dz)
+
+        # XZ 평면 수평각 / 수직각 (수평 거리가 0이면 수직각 0 - 스칼라 경로와 동일)
+        horizontal_angle = np.arctan2(dx, dz)
+        horizontal_dist = np.sqrt(dx * dx + dz * dz)
+        with np.errstate(invalid="ignore"):
+            vertical_angle = np.where(
+                horizontal_dist > 0, np.arctan2(dy, horizontal_dist), 0.0
+            )
+
+        # 각도 차이 계산 및 스칼라 경로와 동일한 단일 보정 (2π - diff)
+        angle_diff_h = np.abs(horizontal_angle - yaw)
+        angle_diff_v = np.abs(vertical_angle - pitch)
+        angle_diff_h = np.where(angle_diff_h > math.pi, 2 * math.pi - angle_diff_h, angle_diff_h)
+        angle_diff_v = np.where(angle_diff_v > math.pi, 2 * math.pi - angle_diff_v, angle_diff_v)
+
+        mask = (
+            (distances <= max_distance)
+            & (angle_diff_h <= half_fov_rad)
+            & (angle_diff_v <= half_fov_rad)
+        )
+        return mask, distances
+
+    def covering(
+        self,
+        points: Sequence[Tuple[float, float, float]],
+        max_distance: float,
+    ) -> List[List[Tuple[object, float]]]:
+        """
+        지점별로 해당 지점을 시야에 담는 CCTV 목록 계산
+
+        Args:
+            points: 대상 좌표 리스트
+            max_distance: 최대 감지 거리
+
+        Returns:
+            지점별 (CCTV, 거리) 튜플 리스트 (거리순 정렬)
+        """
+        results: List[List[Tuple[object, float]]] = []
+        if not points:
+            return results
+        if not self.cctvs:
+            return [[] for _ in points]
+
+        point_array = np.asarray(points, dtype=np.float64).reshape(-1, 3)
+        chunk_size = max(1, _MAX_BATCH_ELEMENTS // len(self.cctvs))
+        for start in range(0, len(point_array), chunk_size):
+            mask, distances = self.evaluate(point_array[start:start + chunk_size], max_distance)
+            for row_mask, row_dist in zip(mask, distances):
+                hit_idx = np.flatnonzero(row_mask)
+                hit_dist = row_dist[hit_idx]
+                order = np.argsort(hit_dist, kind="stable")
+                results.append([
+                    (self.cctvs[idx], float(dist))
+                    for idx, dist in zip(hit_idx[order].tolist(), hit_dist[order].tolist())
+                ])
+        return results
+
+    def covering_candidates(
+        self,
+        point: Tuple[float, float, float],
+        candidate_ids: Iterable[Hashable],
+        max_distance: float,
+    ) -> List[Tuple[object, float]]:
+        """
+        후보 CCTV만 대상으로 단일 지점 FOV 정밀 판정
+
+        Args:
+            point: 대상 좌표
+            candidate_ids: 후보 CCTV ID 목록 (커버리지 그리드 조회 결과)
+            max_distance: 최대 감지 거리
+
+        Returns:
+            (CCTV, 거리) 튜플 리스트 (거리순 정렬)
+        """
+        indices = np.fromiter(
+            (self.index_of[cctv_id] for cctv_id in candidate_ids if cctv_id in self.index_of),
+            dtype=np.intp,
+        )
+        if indices.size == 0:
+            return []
+        # 입력 순서와 무관하게 전체 판정과 같은 동점 순서를 유지
+        indices.sort()
+        mask, distances = self.evaluate(np.asarray(point), max_distance, indices)
+        hit = np.flatnonzero(mask[0])
+        hit_dist = distances[0][hit]
+        order = np.argsort(hit_dist, kind="stable")
+        return [
+            (self.cctvs[idx], float(dist))
+            for idx, dist in zip(indices[hit[order]].tolist(), hit_dist[order].tolist())
+        ]
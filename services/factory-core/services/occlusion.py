@@ -0,0 +1,404 @@
+"""
+V-Factory - 설비 기반 CCTV 가시선(Line-of-Sight) 판정
+공장 설비의 방향성 경계 상자(OBB)로 BVH를 구성하고
+CCTV → 대상 지점 선분을 배치 레이 캐스팅하여 가려짐 여부를 계산
+"""
+import math
+import time
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Tuple
+from uuid import UUID
+
+import numpy as np
+
+from models import Equipment
+from utils.metrics import OCCLUSION_BVH_UPDATE_SECONDS, OCCLUSION_RAYCAST_SECONDS
+
+# BVH 리프당 최대 설비 수
+_LEAF_SIZE = 4
+
+# 한 번에 순회할 레이 수 (프런티어 배열 메모리 사용량 제한)
+_RAY_CHUNK = 4096
+
+# 선분 양 끝 판정 여유 (매개변수 t 기준)
+_T_EPSILON = 1e-6
+
+# 0 방향 성분 대체값 (슬랩 테스트에서 0 나눗셈 방지)
+_MIN_DIRECTION = 1e-12
+
+
+@dataclass(slots=True)
+class EquipmentEntry:
+    """
+    가려짐 판정에 사용하는 설비 스냅샷
+    설비 형상은 위치를 중심으로 하고 스케일을 각 변의 길이(m)로 하는 박스로 근사
+    """
+    id: UUID
+    factory_id: UUID
+    position_x: float
+    position_y: float
+    position_z: float
+    rotation_x: float
+    rotation_y: float
+    rotation_z: float
+    scale_x: float
+    scale_y: float
+    scale_z: float
+    is_active: bool
+
+    @property
+    def position(self) -> Tuple[float, float, float]:
+        return (self.position_x, self.position_y, self.position_z)
+
+    @classmethod
+    def from_model(cls, equipment: Equipment) -> "EquipmentEntry":
+        """Equipment ORM 모델로부터 스냅샷 생성"""
+        return cls(
+            id=equipment.id,
+            factory_id=equipment.factory_id,
+            position_x=equipment.position_x,
+            position_y=equipment.position_y,
+            position_z=equipment.position_z,
+            rotation_x=equipment.rotation_x or 0.0,
+            rotation_y=equipment.rotation_y or 0.0,
+            rotation_z=equipment.rotation_z or 0.0,
+            scale_x=equipment.scale_x if equipment.scale_x is not None else 1.0,
+            scale_y=equipment.scale_y if equipment.scale_y is not None else 1.0,
+            scale_z=equipment.scale_z if equipment.scale_z is not None else 1.0,
+            is_active=equipment.is_active if equipment.is_active is not None else True,
+        )
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "EquipmentEntry":
+        """설비 이벤트 데이터(equipment_to_dict)로부터 스냅샷 생성"""
+        return cls(
+            id=UUID(data["id"]),
+            factory_id=UUID(data["factory_id"]),
+            position_x=float(data["position_x"]),
+            position_y=float(data["position_y"]),
+            position_z=float(data["position_z"]),
+            rotation_x=data.get("rotation_x") or 0.0,
+            rotation_y=data.get("rotation_y") or 0.0,
+            rotation_z=data.get("rotation_z") or 0.0,
+            scale_x=data["scale_x"] if data.get("scale_x") is not None else 1.0,
+            scale_y=data["scale_y"] if data.get("scale_y") is not None else 1.0,
+            scale_z=data["scale_z"] if data.get("scale_z") is not None else 1.0,
+            is_active=data["is_active"] if data.get("is_active") is not None else True,
+        )
+
+    def rotation_matrix(self) -> np.ndarray:
+        """로컬 → 월드 회전 행렬 (Three.js 기본 Euler 순서 'XYZ')"""
+        cx, sx = math.cos(self.rotation_x), math.sin(self.rotation_x)
+        cy, sy = math.cos(self.rotation_y), math.sin(self.rotation_y)
+        cz, sz = math.cos(self.rotation_z), math.sin(self.rotation_z)
+        rx = np.array([[1.0, 0.0, 0.0], [0.0, cx, -sx], [0.0, sx, cx]])
+        ry = np.array([[cy, 0.0, sy], [0.0, 1.0, 0.0], [-sy, 0.0, cy]])
+        rz = np.array([[cz, -sz, 0.0], [sz, cz, 0.0], [0.0, 0.0, 1.0]])
+        return rx @ ry @ rz
+
+    def half_extents(self) -> Tuple[float, float, float]:
+        return (abs(self.scale_x) / 2, abs(self.scale_y) / 2, abs(self.scale_z) / 2)
+
+
+def _slab_interval(
+    origins: np.ndarray,
+    inv_dirs: np.ndarray,
+    box_min: np.ndarray,
+    box_max: np.ndarray,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """축 정렬 슬랩 테스트 - 선분 매개변수 진입/이탈 t 계산 (배열 단위)"""
+    t1 = (box_min - origins) * inv_dirs
+    t2 = (box_max - origins) * inv_dirs
+    t_near = np.minimum(t1, t2).max(axis=1)
+    t_far = np.maximum(t1, t2).min(axis=1)
+    return t_near, t_far
+
+
+def _safe_inverse(directions: np.ndarray) -> np.ndarray:
+    """방향 벡터 역수 (0 성분은 부호를 유지한 아주 작은 값으로 대체)"""
+    safe = np.where(
+        np.abs(directions) < _MIN_DIRECTION,
+        np.where(directions < 0, -_MIN_DIRECTION, _MIN_DIRECTION),
+        directions,
+    )
+    return 1.0 / safe
+
+
+class EquipmentBVH:
+    """
+    설비 OBB 경계 볼륨 계층 (배열 기반)
+
+    - 노드는 설비 OBB의 AABB를 감싸는 AABB, 리프는 설비 OBB 목록을 가짐
+    - 설비 이동/삭제는 리프부터 루트까지 경계만 다시 맞추는 refit으로 반영
+    - 새 설비는 보류 목록에 두고 전수 판정, 변경이 누적되면 전체 재구성
+    """
+
+    def __init__(self, equipment: Iterable[EquipmentEntry] = ()):
+        self.entries: Dict[UUID, EquipmentEntry] = {
+            entry.id: entry for entry in equipment if entry.is_active
+        }
+        self.build()
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    # ===== 구성 =====
+
+    def build(self) -> None:
+        """전체 설비로 OBB 배열 및 BVH 재구성 (중앙값 분할)"""
+        started = time.perf_counter()
+        entries = list(self.entries.values())
+        count = len(entries)
+
+        self._slots: Dict[UUID, int] = {entry.id: slot for slot, entry in enumerate(entries)}
+        self.centers = np.zeros((count, 3), dtype=np.float64)
+        self.axes = np.zeros((count, 3, 3), dtype=np.float64)
+        self.half = np.zeros((count, 3), dtype=np.float64)
+        self.aabb_min = np.zeros((count, 3), dtype=np.float64)
+        self.aabb_max = np.zeros((count, 3), dtype=np.float64)
+        for slot, entry in enumerate(entries):
+            self._write_slot(slot, entry)
+
+        self._pending: List[int] = []
+        self._changes = 0
+        self._build_tree()
+
+        OCCLUSION_BVH_UPDATE_SECONDS.labels(mode="full").observe(time.perf_counter() - started)
+
+    def upsert(self, entry: EquipmentEntry) -> None:
+        """설비 추가/이동 반영 (비활성화된 경우 제거)"""
+        if not entry.is_active:
+            self.remove(entry.id)
+            return
+
+        started = time.perf_counter()
+        self.entries[entry.id] = entry
+        slot = self._slots.get(entry.id)
+        if slot is None:
+            slot = self._append_slot(entry)
+            self._pending.append(slot)
+        else:
+            self._write_slot(slot, entry)
+            if self.leaf_of[slot] >= 0:
+                self._refit(self.leaf_of[slot])
+
+        self._changes += 1
+        if self._needs_rebuild():
+            self.build()
+            return
+        OCCLUSION_BVH_UPDATE_SECONDS.labels(mode="refit").observe(time.perf_counter() - started)
+
+    def remove(self, equipment_id: UUID) -> None:
+        """설비 제거 - 슬롯 경계를 비워 다음 재구성까지 판정에서 제외"""
+        if self.entries.pop(equipment_id, None) is None:
+            return
+
+        started = time.perf_counter()
+        slot = self._slots.pop(equipment_id)
+        self.half[slot] = -1.0
+        self.aabb_min[slot] = np.inf
+        self.aabb_max[slot] = -np.inf
+        if slot in self._pending:
+            self._pending.remove(slot)
+        elif self.leaf_of[slot] >= 0:
+            self._refit(self.leaf_of[slot])
+
+        self._changes += 1
+        if self._needs_rebuild():
+            self.build()
+            return
+        OCCLUSION_BVH_UPDATE_SECONDS.labels(mode="refit").observe(time.perf_counter() - started)
+
+    @property
+    def node_count(self) -> int:
+        return len(self.node_left)
+
+    # ===== 조회 =====
+
+    def occluded(self, origins: np.ndarray, targets: np.ndarray) -> np.ndarray:
+        """
+        선분(origin → target)별 설비 가려짐 여부 배치 판정
+
+        대상 지점이나 CCTV가 설비 내부에 있는 경우 해당 설비는 가림으로 보지 않음
+        (선분이 설비를 완전히 통과해야 가려진 것으로 판정)
+
+        Args:
+            origins: (R, 3) 레이 시작점 (CCTV 위치)
+            targets: (R, 3) 레이 끝점 (대상 지점)
+
+        Returns:
+            (R,) bool 배열 - True면 가려짐
+        """
+        started = time.perf_counter()
+        origins = np.asarray(origins, dtype=np.float64).reshape(-1, 3)
+        targets = np.asarray(targets, dtype=np.float64).reshape(-1, 3)
+        blocked = np.zeros(len(origins), dtype=bool)
+        if not self.entries or len(origins) == 0:
+            return blocked
+
+        for start in range(0, len(origins), _RAY_CHUNK):
+            stop = start + _RAY_CHUNK
+            blocked[start:stop] = self._occluded_chunk(origins[start:stop], targets[start:stop])
+
+        OCCLUSION_RAYCAST_SECONDS.observe(time.perf_counter() - started)
+        return blocked
+
+    # ===== 내부 구현 =====
+
+    def _write_slot(self, slot: int, entry: EquipmentEntry) -> None:
+        """설비 OBB 및 AABB를 슬롯에 기록"""
+        rotation = entry.rotation_matrix()
+        half = np.array(entry.half_extents(), dtype=np.float64)
+        center = np.array(entry.position, dtype=np.float64)
+        extent = np.abs(rotation) @ half
+        self.centers[slot] = center
+        self.axes[slot] = rotation
+        self.half[slot] = half
+        self.aabb_min[slot] = center - extent
+        self.aabb_max[slot] = center + extent
+
+    def _append_slot(self, entry: EquipmentEntry) -> int:
+        """재구성 없이 슬롯 하나를 추가 (보류 목록용)"""
+        slot = len(self.centers)
+        self.centers = np.concatenate([self.centers, np.zeros((1, 3))])
+        self.axes = np.concatenate([self.axes, np.zeros((1, 3, 3))])
+        self.half = np.concatenate([self.half, np.zeros((1, 3))])
+        self.aabb_min = np.concatenate([self.aabb_min, np.zeros((1, 3))])
+        self.aabb_max = np.concatenate([self.aabb_max, np.zeros((1, 3))])
+        self.leaf_of = np.append(self.leaf_of, -1)
+        self._slots[entry.id] = slot
+        self._write_slot(slot, entry)
+        return slot
+
+    def _needs_rebuild(self) -> bool:
+        """보류 설비나 refit 누적으로 트리 품질이 떨어졌는지 확인"""
+        threshold = max(16, len(self.entries) // 4)
+        return len(self._pending) > max(8, len(self.entries) // 16) or self._changes > threshold
+
+    def _build_tree(self) -> None:
+        """슬롯 AABB 중심 기준 중앙값 분할로 BVH 노드 배열 구성"""
+        count = len(self.centers)
+        order = np.arange(count, dtype=np.intp)
+        centroids = (self.aabb_min + self.aabb_max) / 2
+
+        node_min: List[np.ndarray] = []
+        node_max: List[np.ndarray] = []
+        left: List[int] = []
+        right: List[int] = []
+        first: List[int] = []
+        size: List[int] = []
+        parent: List[int] = []
+
+        def new_node(lo: int, hi: int, parent_idx: int) -> int:
+            prims = order[lo:hi]
+            node_min.append(self.aabb_min[prims].min(axis=0))
+            node_max.append(self.aabb_max[prims].max(axis=0))
+            left.append(-1)
+            right.append(-1)
+            first.append(lo)
+            size.append(hi - lo)
+            parent.append(parent_idx)
+            return len(left) - 1
+
+        if count:
+            stack = [new_node(0, count, -1)]
+            while stack:
+                node = stack.pop()
+                lo, hi = first[node], first[node] + size[node]
+                if hi - lo <= _LEAF_SIZE:
+                    continue
+                prims = order[lo:hi]
+                spread = centroids[prims].max(axis=0) - centroids[prims].min(axis=0)
+                axis = int(np.argmax(spread))
+                mid = (hi - lo) // 2
+                split = np.argpartition(centroids[prims, axis], mid)
+                order[lo:hi] = prims[split]
+                left[node] = new_node(lo, lo + mid, node)
+                right[node] = new_node(lo + mid, hi, node)
+                size[node] = 0
+                stack.extend((left[node], right[node]))
+
+        self.prim_order = order
+        self.node_min = np.array(node_min, dtype=np.float64).reshape(-1, 3)
+        self.node_max = np.array(node_max, dtype=np.float64).reshape(-1, 3)
+        self.node_left = np.array(left, dtype=np.intp)
+        self.node_right = np.array(right, dtype=np.intp)
+        self.node_first = np.array(first, dtype=np.intp)
+        self.node_size = np.array(size, dtype=np.intp)
+        self.node_parent = np.array(parent, dtype=np.intp)
+
+        self.leaf_of = np.full(count, -1, dtype=np.intp)
+        for node in np.flatnonzero(self.node_size > 0).tolist():
+            start = self.node_first[node]
+            self.leaf_of[order[start:start + self.node_size[node]]] = node
+
+    def _refit(self, leaf: int) -> None:
+        """리프 경계 재계산 후 루트까지 부모 경계 갱신"""
+        start = self.node_first[leaf]
+        prims = self.prim_order[start:start + self.node_size[leaf]]
+        self.node_min[leaf] = self.aabb_min[prims].min(axis=0)
+        self.node_max[leaf] = self.aabb_max[prims].max(axis=0)
+
+        node = self.node_parent[leaf]
+        while node >= 0:
+            children = [self.node_left[node], self.node_right[node]]
+            self.node_min[node] = self.node_min[children].min(axis=0)
+            self.node_max[node] = self.node_max[children].max(axis=0)
+            node = self.node_parent[node]
+
+    def _occluded_chunk(self, origins: np.ndarray, targets: np.ndarray) -> np.ndarray:
+        """레이 묶음 BVH 동시 순회 - (레이, 노드) 프런티어를 배열로 확장"""
+        directions = targets - origins
+        inv_dirs = _safe_inverse(directions)
+        blocked = np.zeros(len(origins), dtype=bool)
+
+        if self.node_count:
+            rays = np.arange(len(origins), dtype=np.intp)
+            nodes = np.zeros(len(origins), dtype=np.intp)
+            while rays.size:
+                # 선분 구간 [0, 1]과 노드 AABB가 겹치는 쌍만 유지
+                t_near, t_far = _slab_interval(
+                    origins[rays], inv_dirs[rays], self.node_min[nodes], self.node_max[nodes]
+                )
+                keep = (t_near <= t_far) & (t_far >= 0.0) & (t_near <= 1.0) & ~blocked[rays]
+                rays, nodes = rays[keep], nodes[keep]
+
+                leaf = self.node_size[nodes] > 0
+                if leaf.any():
+                    leaf_rays, leaf_nodes = rays[leaf], nodes[leaf]
+                    counts = self.node_size[leaf_nodes]
+                    offsets = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+                    prims = self.prim_order[np.repeat(self.node_first[leaf_nodes], counts) + offsets]
+                    pair_rays = np.repeat(leaf_rays, counts)
+                    hits = self._obb_blocks(origins[pair_rays], directions[pair_rays], prims)
+                    blocked[pair_rays[hits]] = True
+
+                inner_rays, inner_nodes = rays[~leaf], nodes[~leaf]
+                rays = np.concatenate([inner_rays, inner_rays])
+                nodes = np.concatenate([self.node_left[inner_nodes], self.node_right[inner_nodes]])
+
+        if self._pending:
+            # 재구성 전 추가된 설비는 전수 판정
+            pending = np.array(self._pending, dtype=np.intp)
+            pair_rays = np.repeat(np.arange(len(origins), dtype=np.intp), len(pending))
+            prims = np.tile(pending, len(origins))
+            hits = self._obb_blocks(origins[pair_rays], directions[pair_rays], prims)
+            blocked[pair_rays[hits]] = True
+
+        return blocked
+
+    def _obb_blocks(self, origins: np.ndarray, directions: np.ndarray, prims: np.ndarray) -> np.ndarray:
+        """(선분, 설비) 쌍별 OBB 완전 통과 여부 - 설비 로컬 좌표계 슬랩 테스트"""
+        if prims.size == 0:
+            return np.zeros(0, dtype=bool)
+        axes = self.axes[prims]
+        local_origins = np.einsum("ni,nij->nj", origins - self.centers[prims], axes)
+        local_dirs = np.einsum("ni,nij->nj", directions, axes)
+        half = self.half[prims]
+        t_near, t_far = _slab_interval(local_origins, _safe_inverse(local_dirs), -half, half)
+        return (
+            (half[:, 0] >= 0.0)
+            & (t_near <= t_far)
+            & (t_near > _T_EPSILON)
+            & (t_far < 1.0 - _T_EPSILON)
+        )
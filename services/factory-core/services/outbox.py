@@ -0,0 +1,205 @@
+"""
+V-Factory - Factory Core Outbox 릴레이
+라우터는 엔티티 변경과 같은 트랜잭션에 이벤트를 factory_outbox 테이블로 기록하고,
+백그라운드 릴레이가 미전달 이벤트를 묶어 Redis Stream에 파이프라인으로 추가한 뒤 전달 완료로 표시
+(전달 후 표시 전에 실패하면 재전달될 수 있음 - at-least-once)
+이벤트에는 기록한 프로세스의 INSTANCE_ID(origin)가 담겨, 구독자가 자기 변경 이벤트를 구분할 수 있음
+"""
+import asyncio
+import json
+import uuid
+from datetime import datetime, timedelta, timezone
+from enum import Enum
+from typing import Any, Callable, Optional
+
+from sqlalchemy import delete, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from config import settings
+from database import async_session
+from models import OutboxEvent
+from services.redis_service import RedisService, get_redis_service
+from utils.logging import logger
+from utils.metrics import (
+    OUTBOX_BATCH_SIZE,
+    OUTBOX_DELIVERY_FAILURES,
+    OUTBOX_LAG_SECONDS,
+    OUTBOX_OLDEST_PENDING_SECONDS,
+)
+
+# 프로세스 인스턴스 ID (이벤트 origin - 이미 로컬에 반영한 자기 변경 이벤트 식별용)
+INSTANCE_ID = uuid.uuid4().hex
+
+
+def add_outbox_event(
+    session: AsyncSession,
+    stream: str,
+    event_type: Enum,
+    data: dict[str, Any],
+) -> OutboxEvent:
+    """
+    Outbox 이벤트 기록 (호출자의 commit과 함께 저장됨)
+
+    Args:
+        session: 엔티티 변경을 담은 세션
+        stream: 대상 Redis Stream 키
+        event_type: 이벤트 유형 (FactoryEventType/CCTVEventType/EquipmentEventType)
+        data: 엔티티 데이터 딕셔너리
+    """
+    event = OutboxEvent(
+        stream=stream,
+        payload=json.dumps({"event": event_type.value, "data": data, "origin": INSTANCE_ID}),
+    )
+    session.add(event)
+    return event
+
+
+def _utc(value: datetime) -> datetime:
+    """DB 드라이버에 따라 naive/aware로 돌아오는 시각을 UTC aware로 통일"""
+    return value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value.astimezone(timezone.utc)
+
+
+class OutboxRelay:
+    """
+    Outbox 릴레이 클래스
+
+    - 커밋 직후 notify()로 깨우고, 알림이 없으면 poll_interval마다 조회
+    - 미전달 행은 FOR UPDATE SKIP LOCKED로 잠가 여러 워커 프로세스가 나눠 전달
+      (프로세스 하나의 묶음 안에서는 기록 순서이지만, 프로세스 간 전달 순서는 보장하지 않음 -
+      구독자는 순서가 뒤바뀐 이벤트를 스스로 걸러야 함)
+    - Redis 오류 시 시도 횟수를 기록하고 지수 백오프 후 같은 행부터 재시도
+    """
+
+    def __init__(
+        self,
+        session_factory: Optional[async_sessionmaker] = None,
+        redis_service: Optional[Callable[[], RedisService]] = None,
+        batch_size: Optional[int] = None,
+        poll_interval: Optional[float] = None,
+    ):
+        self._session_factory = session_factory or async_session
+        self._redis_service = redis_service or get_redis_service
+        self.batch_size = batch_size or settings.OUTBOX_BATCH_SIZE
+        self.poll_interval = poll_interval if poll_interval is not None else settings.OUTBOX_POLL_INTERVAL
+        self._wake = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self._last_purge = 0.0
+
+    def start(self) -> None:
+        """릴레이 태스크 시작 (lifespan에서 호출)"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    def notify(self) -> None:
+        """새 Outbox 이벤트 커밋 알림 (대기 중인 릴레이를 즉시 깨움)"""
+        self._wake.set()
+
+    async def relay_once(self) -> int:
+        """
+        미전달 이벤트 1묶음 전달
+
+        Returns:
+            전달한 이벤트 수
+
+        Raises:
+            Exception: Redis 전달 실패 (행은 미전달 상태로 남음)
+        """
+        async with self._session_factory() as session:
+            result = await session.execute(
+                select(OutboxEvent)
+                .where(OutboxEvent.delivered_at.is_(None))
+                .order_by(OutboxEvent.id)
+                .limit(self.batch_size)
+                .with_for_update(skip_locked=True)
+            )
+            events = result.scalars().all()
+            now = datetime.now(timezone.utc)
+            if not events:
+                OUTBOX_OLDEST_PENDING_SECONDS.set(0)
+                return 0
+            OUTBOX_OLDEST_PENDING_SECONDS.set((now - _utc(events[0].created_at)).total_seconds())
+
+            try:
+                await self._redis_service().append_events([(event.stream, event.payload) for event in events])
+            except Exception:
+                for event in events:
+                    event.attempts += 1
+                await session.commit()
+                raise
+
+            delivered_at = datetime.now(timezone.utc)
+            for event in events:
+                event.delivered_at = delivered_at
+                OUTBOX_LAG_SECONDS.observe((delivered_at - _utc(event.created_at)).total_seconds())
+            await session.commit()
+
+        OUTBOX_BATCH_SIZE.observe(len(events))
+        return len(events)
+
+    async def purge_delivered(self) -> int:
+        """보존 시간이 지난 전달 완료 행 삭제 (삭제 행 수 반환)"""
+        cutoff = datetime.now(timezone.utc) - timedelta(seconds=settings.OUTBOX_RETENTION)
+        async with self._session_factory() as session:
+            result = await session.execute(
+                delete(OutboxEvent).where(
+                    OutboxEvent.delivered_at.is_not(None),
+                    OutboxEvent.delivered_at < cutoff,
+                )
+            )
+            await session.commit()
+        return result.rowcount or 0
+
+    async def close(self) -> None:
+        """릴레이 태스크 종료 (미전달 행은 다음 시작 시 전달)"""
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def _run(self) -> None:
+        """전달 루프 - 묶음이 가득 차면 바로 다음 묶음, 비었으면 알림/주기 대기, 실패 시 백오프"""
+        delay = settings.OUTBOX_RETRY_MIN_DELAY
+        loop = asyncio.get_running_loop()
+        while True:
+            self._wake.clear()
+            try:
+                delivered = await self.relay_once()
+                delay = settings.OUTBOX_RETRY_MIN_DELAY
+                if loop.time() - self._last_purge >= settings.OUTBOX_PURGE_INTERVAL:
+                    self._last_purge = loop.time()
+                    await self.purge_delivered()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                OUTBOX_DELIVERY_FAILURES.inc()
+                logger.warning(f"[Outbox] 이벤트 전달 실패, {delay:.1f}초 후 재시도: {e!r}")
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, settings.OUTBOX_RETRY_MAX_DELAY)
+                continue
+
+            if delivered >= self.batch_size:
+                continue
+            try:
+                await asyncio.wait_for(self._wake.wait(), self.poll_interval)
+            except asyncio.TimeoutError:
+                pass
+
+
+# 프로세스 전역 Outbox 릴레이 인스턴스
+_outbox_relay: Optional[OutboxRelay] = None
+
+
+def get_outbox_relay() -> OutboxRelay:
+    """프로세스 전역 OutboxRelay 반환 (최초 호출 시 생성)"""
+    global _outbox_relay
+    if _outbox_relay is None:
+        _outbox_relay = OutboxRelay()
+    return _outbox_relay
+
+
+async def close_outbox_relay() -> None:
+    """전역 OutboxRelay 종료 (애플리케이션 종료 시)"""
+    global _outbox_relay
+    if _outbox_relay is not None:
+        await _outbox_relay.close()
+        _outbox_relay = None
@@ -1,76 +1,367 @@
 """
-데이터베이스 쿼리 최적화 유틸리티
-캐싱 및 쿼리 최적화 로직
+V-Factory - 조회 결과 2단 캐시
+프로세스 메모리 LRU(1단) 앞단 + Redis(2단) 공유 캐시로 공장/CCTV/설비 조회 결과를 재사용
+
+- 캐시 항목은 (공장 ID, 네임스페이스) 태그에 묶이며, 변경 시 해당 태그만 무효화
+  (Redis는 태그 집합 SMEMBERS + UNLINK, KEYS 미사용 / 전체 비우기만 SCAN)
+- 태그마다 세대 번호를 두어, 무효화 전에 시작한 조회가 무효화 후에 옛 결과를 저장하지 못하게 함
+- 변경한 인스턴스는 commit 직후 두 단계를 모두 무효화하고,
+  다른 인스턴스는 공장/CCTV/설비 이벤트 스트림을 구독해 자기 메모리 캐시를 무효화
+- Redis 장애 시 일정 시간 Redis 단계를 건너뛰고 DB 조회로 동작
 """
-from functools import wraps
-from typing import Any, Callable, Optional
-import json
+import asyncio
 import hashlib
+import json
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Iterable, Optional, Set, Tuple
+from uuid import UUID
+
+from config import settings
+from services.event_hub import EventHub, event_hub as default_event_hub
+from services.redis_service import (
+    CCTVEventType,
+    EquipmentEventType,
+    FactoryEventType,
+    RedisService,
+    get_redis_service,
+)
+from utils.logging import logger
+from utils.metrics import (
+    QUERY_CACHE_ERRORS,
+    QUERY_CACHE_EVICTIONS,
+    QUERY_CACHE_LOCAL_ENTRIES,
+    QUERY_CACHE_REQUESTS,
+)
+
+# 캐시 네임스페이스 (무효화 단위)
+FACTORY = "factory"
+CCTV = "cctv"
+EQUIPMENT = "equipment"
+ALL_NAMESPACES = (FACTORY, CCTV, EQUIPMENT)
+
+KEY_PREFIX = "query_cache"
+
+# 이벤트 유형별 무효화 네임스페이스 (공장 삭제는 CCTV/설비도 함께 삭제됨)
+EVENT_NAMESPACES: Dict[str, Tuple[str, ...]] = {
+    FactoryEventType.FACTORY_CREATED.value: (),
+    FactoryEventType.FACTORY_UPDATED.value: (FACTORY,),
+    FactoryEventType.LAYOUT_UPDATED.value: (FACTORY,),
+    FactoryEventType.FACTORY_DELETED.value: ALL_NAMESPACES,
+    CCTVEventType.CCTV_CREATED.value: (CCTV,),
+    CCTVEventType.CCTV_UPDATED.value: (CCTV,),
+    CCTVEventType.CCTV_DELETED.value: (CCTV,),
+    EquipmentEventType.EQUIPMENT_CREATED.value: (EQUIPMENT,),
+    EquipmentEventType.EQUIPMENT_UPDATED.value: (EQUIPMENT,),
+    EquipmentEventType.EQUIPMENT_DELETED.value: (EQUIPMENT,),
+}
+
+Loader = Callable[[], Awaitable[Any]]
+Tag = Tuple[str, str]
+
+
+def cache_key(namespace: str, factory_id: UUID, params: Dict[str, Any]) -> str:
+    """
+    캐시 키 생성 (조회 파라미터는 정렬된 JSON의 해시)
+    공장 ID를 해시 태그({...})로 감싸 같은 공장의 키/태그/세대가 한 슬롯에 모이게 함
+    """
+    digest = hashlib.blake2b(
+        json.dumps(params, sort_keys=True, default=str).encode("utf-8"), digest_size=12
+    ).hexdigest()
+    return f"{KEY_PREFIX}:{{{factory_id}}}:{namespace}:{digest}"
+
+
+def tag_key(factory_id: str, namespace: str) -> str:
+    """태그 집합 키 (해당 태그에 속한 캐시 키 목록)"""
+    return f"{KEY_PREFIX}:{{{factory_id}}}:tag:{namespace}"
+
+
+def generation_key(factory_id: str, namespace: str) -> str:
+    """태그 세대 번호 키 (무효화마다 증가)"""
+    return f"{KEY_PREFIX}:{{{factory_id}}}:gen:{namespace}"
+
+
+class _LocalCache:
+    """
+    프로세스 메모리 LRU 캐시 (TTL + 최대 항목 수)
+    태그별 키 목록과 세대 번호를 함께 관리
+    """
+
+    def __init__(self, max_entries: int, ttl: float):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, Tuple[float, Tag, Any]]" = OrderedDict()
+        self._tags: Dict[Tag, Set[str]] = {}
+        self._generations: Dict[Tag, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def generation(self, tag: Tag) -> int:
+        return self._generations.get(tag, 0)
+
+    def get(self, key: str) -> Tuple[bool, Any]:
+        """(적중 여부, 값) 반환 (만료 항목은 제거)"""
+        entry = self._entries.get(key)
+        if entry is None:
+            return False, None
+        expires_at, tag, value = entry
+        if expires_at <= time.monotonic():
+            self._remove(key, tag)
+            QUERY_CACHE_EVICTIONS.labels(tier="local", reason="expired").inc()
+            return False, None
+        self._entries.move_to_end(key)
+        return True, value
+
+    def set(self, key: str, tag: Tag, value: Any, generation: int) -> None:
+        """값 저장 (조회 시작 후 태그가 무효화되었으면 저장하지 않음)"""
+        if self.max_entries <= 0 or self._generations.get(tag, 0) != generation:
+            return
+        if key in self._entries:
+            self._remove(key, self._entries[key][1])
+        self._entries[key] = (time.monotonic() + self.ttl, tag, value)
+        self._tags.setdefault(tag, set()).add(key)
+        while len(self._entries) > self.max_entries:
+            oldest, (_, oldest_tag, _) = next(iter(self._entries.items()))
+            self._remove(oldest, oldest_tag)
+            QUERY_CACHE_EVICTIONS.labels(tier="local", reason="capacity").inc()
+
+    def invalidate(self, tag: Tag) -> int:
+        """태그에 속한 항목 제거 후 세대 증가 (제거 항목 수 반환)"""
+        self._generations[tag] = self._generations.get(tag, 0) + 1
+        keys = self._tags.pop(tag, set())
+        for key in keys:
+            self._entries.pop(key, None)
+        return len(keys)
+
+    def clear(self) -> int:
+        """전체 항목 제거 (모든 태그 세대 증가)"""
+        count = len(self._entries)
+        for tag in list(self._tags):
+            self._generations[tag] = self._generations.get(tag, 0) + 1
+        self._entries.clear()
+        self._tags.clear()
+        return count
 
-from services.redis_service import RedisService
+    def _remove(self, key: str, tag: Tag) -> None:
+        self._entries.pop(key, None)
+        keys = self._tags.get(tag)
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._tags[tag]
 
 
-def cache_query_result(ttl: int = 300):
+class QueryCache:
     """
-    쿼리 결과 캐싱 데코레이터
-    Redis를 사용하여 쿼리 결과를 캐싱
-    
-    Args:
-        ttl: 캐시 TTL (초), 기본값 5분
+    조회 결과 2단 캐시 클래스
+
+    - get_or_load(): 메모리 → Redis → loader(DB) 순으로 조회하고 결과를 두 단계에 저장
+    - 값은 JSON 직렬화 가능한 응답 데이터(dict/list)만 저장 (ORM 객체 불가)
+    - start()는 다른 인스턴스의 변경 이벤트를 구독해 메모리 캐시를 무효화
     """
-    def decorator(func: Callable) -> Callable:
-        @wraps(func)
-        async def wrapper(*args, **kwargs):
-            # 캐시 키 생성 (함수명 + 인자 해시)
-            cache_key_parts = [func.__name__]
-            cache_key_parts.extend(str(arg) for arg in args)
-            cache_key_parts.extend(f"{k}:{v}" for k, v in sorted(kwargs.items()))
-            cache_key = f"query_cache:{hashlib.md5('|'.join(cache_key_parts).encode()).hexdigest()}"
-            
-            # Redis에서 캐시 확인
+
+    def __init__(
+        self,
+        redis_service: Optional[RedisService] = None,
+        hub: Optional[EventHub] = None,
+        ttl: Optional[int] = None,
+        local_ttl: Optional[float] = None,
+        local_max_entries: Optional[int] = None,
+        enabled: Optional[bool] = None,
+    ):
+        self._redis = redis_service
+        self._hub = hub or default_event_hub
+        self.ttl = ttl or settings.QUERY_CACHE_TTL
+        self.enabled = settings.QUERY_CACHE_ENABLED if enabled is None else enabled
+        self._local = _LocalCache(
+            local_max_entries if local_max_entries is not None else settings.QUERY_CACHE_LOCAL_MAX_ENTRIES,
+            local_ttl or settings.QUERY_CACHE_LOCAL_TTL,
+        )
+        self._redis_retry_at = 0.0
+        self._task: Optional[asyncio.Task] = None
+        QUERY_CACHE_LOCAL_ENTRIES.set_function(lambda: len(self._local))
+
+    @property
+    def redis(self) -> RedisService:
+        return self._redis or get_redis_service()
+
+    async def get_or_load(
+        self,
+        namespace: str,
+        factory_id: UUID,
+        params: Dict[str, Any],
+        loader: Loader,
+    ) -> Any:
+        """
+        캐시 조회 후 없으면 loader 실행 결과를 저장하여 반환
+
+        Args:
+            namespace: 캐시 네임스페이스 (FACTORY/CCTV/EQUIPMENT)
+            factory_id: 공장 ID (무효화 태그)
+            params: 결과를 구분하는 조회 파라미터
+            loader: DB 조회 함수 (예외는 그대로 전파되고 캐시하지 않음)
+        """
+        if not self.enabled:
+            return await loader()
+
+        key = cache_key(namespace, factory_id, params)
+        tag = (str(factory_id), namespace)
+        hit, value = self._local.get(key)
+        if hit:
+            QUERY_CACHE_REQUESTS.labels(namespace=namespace, tier="local", result="hit").inc()
+            return value
+        QUERY_CACHE_REQUESTS.labels(namespace=namespace, tier="local", result="miss").inc()
+        local_generation = self._local.generation(tag)
+
+        redis_generation: Optional[str] = None
+        use_redis = self._redis_available()
+        if use_redis:
             try:
-                redis_service = RedisService()
-                cached_result = await redis_service.get(cache_key)
-                if cached_result:
-                    return json.loads(cached_result)
+                cached, redis_generation = await self.redis.cache_get(key, generation_key(*tag))
             except Exception as e:
-                print(f"[Cache] 캐시 조회 실패: {e}")
-            
-            # 캐시 미스 - 실제 쿼리 실행
-            result = await func(*args, **kwargs)
-            
-            # 결과 캐싱
+                self._redis_failed("조회", e)
+                use_redis = False
+            else:
+                if cached is not None:
+                    QUERY_CACHE_REQUESTS.labels(namespace=namespace, tier="redis", result="hit").inc()
+                    value = json.loads(cached)
+                    self._local.set(key, tag, value, local_generation)
+                    return value
+                QUERY_CACHE_REQUESTS.labels(namespace=namespace, tier="redis", result="miss").inc()
+
+        value = await loader()
+        self._local.set(key, tag, value, local_generation)
+        if use_redis:
             try:
-                redis_service = RedisService()
-                await redis_service.set(
-                    cache_key,
-                    json.dumps(result, default=str),
-                    ttl=ttl
+                await self.redis.cache_set(
+                    key,
+                    json.dumps(value, default=str),
+                    self.ttl,
+                    tag_key(*tag),
+                    generation_key(*tag),
+                    redis_generation,
                 )
             except Exception as e:
-                print(f"[Cache] 캐시 저장 실패: {e}")
-            
-            return result
-        
-        return wrapper
-    return decorator
+                self._redis_failed("저장", e)
+        return value
 
+    async def invalidate(self, factory_id: UUID, namespaces: Iterable[str] = ALL_NAMESPACES) -> None:
+        """공장의 네임스페이스별 캐시를 메모리/Redis 모두 무효화 (변경 API의 commit 직후 호출)"""
+        namespaces = tuple(namespaces)
+        if not namespaces:
+            return
+        self.invalidate_local(factory_id, namespaces)
+        if not self.enabled or not self._redis_available():
+            return
+        tags = [
+            (tag_key(str(factory_id), namespace), generation_key(str(factory_id), namespace))
+            for namespace in namespaces
+        ]
+        try:
+            removed = await self.redis.cache_invalidate(tags, self.ttl)
+        except Exception as e:
+            self._redis_failed("무효화", e)
+            return
+        if removed:
+            QUERY_CACHE_EVICTIONS.labels(tier="redis", reason="invalidated").inc(removed)
 
-def invalidate_cache_pattern(pattern: str):
-    """
-    캐시 무효화 (패턴 기반)
-    
-    Args:
-        pattern: 무효화할 캐시 키 패턴
-    """
-    async def invalidate():
+    async def invalidate_event(self, event_type: str, factory_id: UUID) -> None:
+        """이벤트 유형(FactoryEventType/CCTVEventType/EquipmentEventType)에 해당하는 네임스페이스 무효화"""
+        await self.invalidate(factory_id, EVENT_NAMESPACES.get(event_type, ()))
+
+    def invalidate_local(self, factory_id: UUID, namespaces: Iterable[str] = ALL_NAMESPACES) -> None:
+        """메모리 캐시만 무효화 (다른 인스턴스의 변경 이벤트 수신 시)"""
+        removed = sum(self._local.invalidate((str(factory_id), namespace)) for namespace in namespaces)
+        if removed:
+            QUERY_CACHE_EVICTIONS.labels(tier="local", reason="invalidated").inc(removed)
+
+    def apply_event(self, channel: str, message: str) -> None:
+        """공장/CCTV/설비 스트림 이벤트 메시지로 메모리 캐시 무효화"""
         try:
-            redis_service = RedisService()
-            # Redis KEYS 명령 사용 (프로덕션에서는 SCAN 사용 권장)
-            keys = await redis_service.keys(f"query_cache:*{pattern}*")
-            if keys:
-                await redis_service.delete_many(keys)
+            payload = json.loads(message)
+            data = payload["data"]
+            namespaces = EVENT_NAMESPACES.get(payload["event"], ())
+            factory_id = data["id"] if channel == RedisService.FACTORY_CHANNEL else data["factory_id"]
+        except (ValueError, KeyError, TypeError):
+            return
+        if namespaces and factory_id:
+            self.invalidate_local(factory_id, namespaces)
+
+    async def clear(self) -> None:
+        """전체 캐시 비우기 (Redis는 SCAN으로 키를 나눠 삭제)"""
+        removed = self._local.clear()
+        if removed:
+            QUERY_CACHE_EVICTIONS.labels(tier="local", reason="invalidated").inc(removed)
+        if not self.enabled:
+            return
+        try:
+            removed = await self.redis.delete_pattern(f"{KEY_PREFIX}:*")
         except Exception as e:
-            print(f"[Cache] 캐시 무효화 실패: {e}")
-    
-    return invalidate
+            self._redis_failed("전체 삭제", e)
+            return
+        if removed:
+            QUERY_CACHE_EVICTIONS.labels(tier="redis", reason="invalidated").inc(removed)
+
+    def start(self) -> None:
+        """변경 이벤트 구독 시작 (lifespan에서 호출)"""
+        if not self.enabled:
+            return
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._follow_events())
+
+    async def close(self) -> None:
+        """이벤트 구독 종료"""
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def _follow_events(self) -> None:
+        """공장/CCTV/설비 스트림을 구독해 메모리 캐시 무효화 (이벤트 허브가 재연결 처리)"""
+        async with self._hub.subscribe(
+            RedisService.FACTORY_CHANNEL, RedisService.CCTV_CHANNEL, RedisService.EQUIPMENT_CHANNEL
+        ) as subscription:
+            dropped = 0
+            while True:
+                channel, _, message = await subscription.get()
+                if subscription.dropped != dropped or subscription.reset_required:
+                    # 버퍼 초과/재전송 누락으로 이벤트를 놓쳤으면 어떤 공장이 바뀌었는지 알 수 없음
+                    dropped = subscription.dropped
+                    subscription.reset_required = False
+                    removed = self._local.clear()
+                    if removed:
+                        QUERY_CACHE_EVICTIONS.labels(tier="local", reason="invalidated").inc(removed)
+                self.apply_event(channel, message)
+
+    def _redis_available(self) -> bool:
+        return time.monotonic() >= self._redis_retry_at
+
+    def _redis_failed(self, action: str, error: Exception) -> None:
+        """Redis 오류 시 재시도 간격 동안 Redis 단계를 건너뜀"""
+        QUERY_CACHE_ERRORS.inc()
+        self._redis_retry_at = time.monotonic() + settings.QUERY_CACHE_REDIS_RETRY_INTERVAL
+        logger.warning(
+            f"[QueryCache] Redis 캐시 {action} 실패, "
+            f"{settings.QUERY_CACHE_REDIS_RETRY_INTERVAL:.0f}초간 DB 직접 조회: {error!r}"
+        )
+
+
+# 프로세스 전역 조회 캐시 인스턴스
+_query_cache: Optional[QueryCache] = None
+
+
+def get_query_cache() -> QueryCache:
+    """프로세스 전역 QueryCache 반환 (최초 호출 시 생성)"""
+    global _query_cache
+    if _query_cache is None:
+        _query_cache = QueryCache()
+    return _query_cache
+
+
+async def close_query_cache() -> None:
+    """전역 QueryCache 이벤트 구독 종료 (애플리케이션 종료 시)"""
+    global _query_cache
+    if _query_cache is not None:
+        await _query_cache.close()
+        _query_cache = None
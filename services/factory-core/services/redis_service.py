@@ -1,14 +1,17 @@
 """
-V-Factory - Factory Core Redis Pub/Sub 서비스
-공장 및 CCTV 실시간 이벤트 발행/구독
+V-Factory - Factory Core Redis 이벤트 서비스
+공장/CCTV/설비 실시간 이벤트 전달/구독 (Redis Streams, MAXLEN 제한)
+이벤트는 라우터가 Outbox 테이블에 기록하고 Outbox 릴레이가 일괄 전달
+조회 결과 캐시(query_optimizer)용 키/태그 명령도 같은 명령용 풀 사용
+프로세스 전역 단일 인스턴스가 크기 제한된 연결 풀을 공유 (lifespan에서 종료)
 """
-import json
-from typing import AsyncGenerator, Optional, Any
+from typing import Any, AsyncGenerator, List, Optional, Tuple
 from enum import Enum
 
 import redis.asyncio as redis
 
 from config import settings
+from utils.metrics import REDIS_POOL_CONNECTIONS, REDIS_POOL_MAX_CONNECTIONS
 
 
 class FactoryEventType(str, Enum):
@@ -26,131 +29,305 @@ class CCTVEventType(str, Enum):
     CCTV_DELETED = "cctv_deleted"
 
 
+class EquipmentEventType(str, Enum):
+    """설비 이벤트 유형"""
+    EQUIPMENT_CREATED = "equipment_created"
+    EQUIPMENT_UPDATED = "equipment_updated"
+    EQUIPMENT_DELETED = "equipment_deleted"
+
+
+# 캐시 저장: KEYS = [캐시 키, 태그 집합, 세대 번호], ARGV = [값, TTL, 조회 시점 세대 번호("" = 없음)]
+# 태그 집합 TTL은 항목 TTL 이상으로 유지
+_CACHE_SET_SCRIPT = """
+local current = redis.call('GET', KEYS[3]) or ''
+if current ~= ARGV[3] then
+    return 0
+end
+redis.call('SET', KEYS[1], ARGV[1], 'EX', ARGV[2])
+redis.call('SADD', KEYS[2], KEYS[1])
+if redis.call('TTL', KEYS[2]) < tonumber(ARGV[2]) then
+    redis.call('EXPIRE', KEYS[2], ARGV[2])
+end
+return 1
+"""
+
+# 태그 무효화: KEYS = [태그 집합, 세대 번호, ...] 쌍, ARGV = [세대 번호 TTL]
+# 태그 집합의 캐시 키는 같은 해시 슬롯({공장 ID})에 있음
+_CACHE_INVALIDATE_SCRIPT = """
+local removed = 0
+for i = 1, #KEYS, 2 do
+    redis.call('INCR', KEYS[i + 1])
+    redis.call('EXPIRE', KEYS[i + 1], ARGV[1])
+    local members = redis.call('SMEMBERS', KEYS[i])
+    for j = 1, #members, 500 do
+        removed = removed + redis.call('UNLINK', unpack(members, j, math.min(j + 499, #members)))
+    end
+    redis.call('UNLINK', KEYS[i])
+end
+return removed
+"""
+
+
 class RedisService:
-    """Factory Core Redis Pub/Sub 서비스 클래스"""
+    """Factory Core Redis 이벤트 서비스 클래스"""
     
-    # Redis 채널 정의
+    # Redis 이벤트 스트림 키 정의
     FACTORY_CHANNEL = "factory:events"
     CCTV_CHANNEL = "factory:cctv:events"
+    EQUIPMENT_CHANNEL = "factory:equipment:events"
     
     def __init__(self):
         self.redis_url = settings.REDIS_URL
         self._client: Optional[redis.Redis] = None
+        self._pool: Optional[redis.BlockingConnectionPool] = None
+        # 스트림 대기 읽기는 연결을 장시간 점유하므로 명령용 풀과 분리 (발행을 막지 않도록)
+        self._stream_client: Optional[redis.Redis] = None
+        self._stream_pool: Optional[redis.BlockingConnectionPool] = None
+        self._cache_set_script = None
+        self._cache_invalidate_script = None
     
     async def _get_client(self) -> redis.Redis:
-        """Redis 클라이언트 가져오기 (지연 초기화)"""
+        """Redis 명령용 클라이언트 가져오기 (공유 풀 지연 초기화)"""
         if self._client is None:
-            self._client = redis.from_url(self.redis_url)
+            self._pool = redis.BlockingConnectionPool.from_url(
+                self.redis_url,
+                max_connections=settings.REDIS_POOL_MAX_CONNECTIONS,
+                timeout=settings.REDIS_POOL_TIMEOUT,
+                socket_timeout=settings.REDIS_SOCKET_TIMEOUT,
+                socket_connect_timeout=settings.REDIS_SOCKET_CONNECT_TIMEOUT,
+                health_check_interval=settings.REDIS_HEALTH_CHECK_INTERVAL,
+            )
+            self._client = redis.Redis(connection_pool=self._pool)
+            _register_pool_metrics("command", self._pool)
         return self._client
     
-    async def publish_factory_event(
-        self,
-        event_type: FactoryEventType,
-        factory_data: dict[str, Any]
-    ) -> None:
+    async def _get_stream_client(self) -> redis.Redis:
+        """Redis 스트림 대기 읽기(XREAD BLOCK)용 클라이언트 가져오기 (읽기 타임아웃 없음)"""
+        if self._stream_client is None:
+            self._stream_pool = redis.BlockingConnectionPool.from_url(
+                self.redis_url,
+                max_connections=settings.REDIS_STREAM_MAX_CONNECTIONS,
+                timeout=settings.REDIS_POOL_TIMEOUT,
+                socket_connect_timeout=settings.REDIS_SOCKET_CONNECT_TIMEOUT,
+                health_check_interval=settings.REDIS_HEALTH_CHECK_INTERVAL,
+            )
+            self._stream_client = redis.Redis(connection_pool=self._stream_pool)
+            _register_pool_metrics("stream", self._stream_pool)
+        return self._stream_client
+    
+    async def append_events(self, events: List[Tuple[str, str]]) -> List[str]:
         """
-        공장 이벤트 Redis 채널로 발행
+        이벤트 여러 건을 Redis Stream에 추가 (파이프라인 1회 왕복, MAXLEN으로 길이 제한)
+        Outbox 릴레이가 DB에 기록된 이벤트를 전달할 때 사용
         
         Args:
-            event_type: 이벤트 유형
-            factory_data: 공장 데이터 딕셔너리
+            events: (스트림 키, 이벤트 JSON 문자열) 리스트 (기록 순서대로)
+            
+        Returns:
+            스트림 항목 ID 리스트 (SSE 이벤트 ID)
         """
         client = await self._get_client()
-        
-        # 이벤트 데이터 구성
-        event_data = {
-            "event": event_type.value,
-            "data": factory_data,
-        }
-        
-        await client.publish(self.FACTORY_CHANNEL, json.dumps(event_data))
-        print(f"[Redis] Factory 이벤트 발행: {event_type.value}")
+        async with client.pipeline(transaction=False) as pipe:
+            for stream, payload in events:
+                pipe.xadd(
+                    stream,
+                    {"data": payload},
+                    maxlen=settings.REDIS_STREAM_MAXLEN,
+                    approximate=True,
+                )
+            entry_ids = await pipe.execute()
+        return [entry_id.decode("utf-8") for entry_id in entry_ids]
     
-    async def publish_cctv_event(
+    async def read_stream(
         self,
-        event_type: CCTVEventType,
-        cctv_data: dict[str, Any]
-    ) -> None:
+        stream: str,
+        last_id: Optional[str] = None
+    ) -> AsyncGenerator[Tuple[str, Optional[str]], None]:
         """
-        CCTV 이벤트 Redis 채널로 발행
+        Redis Stream 신규 항목 대기 읽기 (이벤트 허브가 스트림당 하나씩 사용)
         
         Args:
-            event_type: 이벤트 유형
-            cctv_data: CCTV 데이터 딕셔너리
+            stream: 스트림 키
+            last_id: 이 ID 이후 항목부터 읽음 (None이면 현재 마지막 항목 이후)
+            
+        Yields:
+            (항목 ID, 이벤트 데이터 JSON 문자열)
+            시작 위치를 알리기 위해 처음 한 번 (시작 ID, None)을 내보냄
         """
-        client = await self._get_client()
+        client = await self._get_stream_client()
         
-        # 이벤트 데이터 구성
-        event_data = {
-            "event": event_type.value,
-            "data": cctv_data,
-        }
+        if last_id is None:
+            # "$"를 그대로 반복 사용하면 XREAD 호출 사이의 항목을 놓치므로 실제 ID로 고정
+            latest = await client.xrevrange(stream, count=1)
+            last_id = latest[0][0].decode("utf-8") if latest else "0-0"
+        yield last_id, None
         
-        await client.publish(self.CCTV_CHANNEL, json.dumps(event_data))
-        print(f"[Redis] CCTV 이벤트 발행: {event_type.value}")
+        while True:
+            response = await client.xread(
+                {stream: last_id},
+                count=settings.REDIS_STREAM_READ_COUNT,
+                block=settings.REDIS_STREAM_BLOCK_MS,
+            )
+            for _, entries in response:
+                for entry_id, fields in entries:
+                    last_id = entry_id.decode("utf-8")
+                    yield last_id, fields[b"data"].decode("utf-8")
     
-    async def subscribe_factory_events(self) -> AsyncGenerator[str, None]:
+    async def range_stream(
+        self,
+        stream: str,
+        after_id: str,
+        count: int
+    ) -> Tuple[List[Tuple[str, str]], bool]:
         """
-        공장 이벤트 Redis 채널 구독
+        특정 ID 이후의 스트림 항목 조회 (SSE Last-Event-ID 재전송용)
         
-        Yields:
-            이벤트 데이터 JSON 문자열
+        Args:
+            stream: 스트림 키
+            after_id: 마지막으로 수신한 항목 ID (이 ID는 제외)
+            count: 최대 조회 항목 수
+            
+        Returns:
+            ((항목 ID, 이벤트 데이터) 리스트, MAXLEN 트리밍으로 누락 구간이 있는지 여부)
         """
         client = await self._get_client()
-        pubsub = client.pubsub()
-        await pubsub.subscribe(self.FACTORY_CHANNEL)
+        entries = await client.xrange(stream, min=f"({after_id}", count=count)
+        oldest = await client.xrange(stream, count=1)
         
-        try:
-            async for message in pubsub.listen():
-                if message["type"] == "message":
-                    yield message["data"].decode("utf-8")
-        finally:
-            await pubsub.unsubscribe(self.FACTORY_CHANNEL)
-            await pubsub.close()
+        # 클라이언트가 마지막으로 본 항목이 이미 잘려나갔다면 그 사이 항목도 유실된 것
+        gap = bool(oldest) and parse_stream_id(oldest[0][0].decode("utf-8")) > parse_stream_id(after_id)
+        return (
+            [(entry_id.decode("utf-8"), fields[b"data"].decode("utf-8")) for entry_id, fields in entries],
+            gap,
+        )
+    
+    # ===== 조회 결과 캐시 (services.query_optimizer) =====
     
-    async def subscribe_cctv_events(self) -> AsyncGenerator[str, None]:
+    async def cache_get(self, key: str, generation_key: str) -> Tuple[Optional[str], Optional[str]]:
         """
-        CCTV 이벤트 Redis 채널 구독
+        캐시 값과 태그 세대 번호를 한 번에 조회 (MGET 1회 왕복)
         
-        Yields:
-            이벤트 데이터 JSON 문자열
+        Returns:
+            (캐시 JSON 문자열 또는 None, 세대 번호 또는 None)
         """
         client = await self._get_client()
-        pubsub = client.pubsub()
-        await pubsub.subscribe(self.CCTV_CHANNEL)
+        value, generation = await client.mget(key, generation_key)
+        return (
+            value.decode("utf-8") if value is not None else None,
+            generation.decode("utf-8") if generation is not None else None,
+        )
+    
+    async def cache_set(
+        self,
+        key: str,
+        value: str,
+        ttl: int,
+        tag_key: str,
+        generation_key: str,
+        generation: Optional[str],
+    ) -> bool:
+        """
+        조회 시점의 세대 번호가 그대로일 때만 캐시 저장 후 태그 집합에 키 추가 (Lua 원자 실행)
         
-        try:
-            async for message in pubsub.listen():
-                if message["type"] == "message":
-                    yield message["data"].decode("utf-8")
-        finally:
-            await pubsub.unsubscribe(self.CCTV_CHANNEL)
-            await pubsub.close()
+        Returns:
+            저장 여부 (조회 중 무효화되었으면 False)
+        """
+        client = await self._get_client()
+        if self._cache_set_script is None:
+            self._cache_set_script = client.register_script(_CACHE_SET_SCRIPT)
+        stored = await self._cache_set_script(
+            keys=[key, tag_key, generation_key],
+            args=[value, ttl, generation or ""],
+        )
+        return bool(stored)
     
-    async def subscribe_all_events(self) -> AsyncGenerator[str, None]:
+    async def cache_invalidate(self, tags: List[Tuple[str, str]], ttl: int) -> int:
         """
-        모든 Factory Core 이벤트 채널 구독
+        태그 집합에 속한 캐시 키 삭제 + 세대 번호 증가 (Lua 원자 실행, 1회 왕복)
         
-        Yields:
-            이벤트 데이터 JSON 문자열
+        Args:
+            tags: (태그 집합 키, 세대 번호 키) 리스트
+            ttl: 세대 번호 키 보존 시간 (초, 캐시 TTL 이상)
+            
+        Returns:
+            삭제한 캐시 키 수
         """
         client = await self._get_client()
-        pubsub = client.pubsub()
-        await pubsub.subscribe(self.FACTORY_CHANNEL, self.CCTV_CHANNEL)
+        if self._cache_invalidate_script is None:
+            self._cache_invalidate_script = client.register_script(_CACHE_INVALIDATE_SCRIPT)
+        keys = [key for pair in tags for key in pair]
+        return int(await self._cache_invalidate_script(keys=keys, args=[ttl]))
+    
+    async def delete_pattern(self, pattern: str, batch_size: int = 500) -> int:
+        """
+        패턴에 맞는 키를 SCAN으로 나눠 찾아 UNLINK (KEYS처럼 서버를 막지 않음)
         
-        try:
-            async for message in pubsub.listen():
-                if message["type"] == "message":
-                    yield message["data"].decode("utf-8")
-        finally:
-            await pubsub.unsubscribe(self.FACTORY_CHANNEL, self.CCTV_CHANNEL)
-            await pubsub.close()
+        Returns:
+            삭제한 키 수
+        """
+        client = await self._get_client()
+        removed = 0
+        batch: List[bytes] = []
+        async for key in client.scan_iter(match=pattern, count=batch_size):
+            batch.append(key)
+            if len(batch) >= batch_size:
+                removed += await client.unlink(*batch)
+                batch = []
+        if batch:
+            removed += await client.unlink(*batch)
+        return removed
     
     async def close(self) -> None:
-        """Redis 연결 종료"""
+        """Redis 연결 종료 (공유 풀의 모든 연결 해제)"""
         if self._client:
-            await self._client.close()
+            await self._client.aclose()
+            await self._pool.disconnect()
             self._client = None
+            self._pool = None
+            self._cache_set_script = None
+            self._cache_invalidate_script = None
+        if self._stream_client:
+            await self._stream_client.aclose()
+            await self._stream_pool.disconnect()
+            self._stream_client = None
+            self._stream_pool = None
+
+
+# 프로세스 전역 Redis 서비스 인스턴스
+_redis_service: Optional[RedisService] = None
+
+
+def get_redis_service() -> RedisService:
+    """프로세스 전역 RedisService 반환 (최초 호출 시 생성)"""
+    global _redis_service
+    if _redis_service is None:
+        _redis_service = RedisService()
+    return _redis_service
+
+
+async def close_redis_service() -> None:
+    """전역 RedisService 연결 풀 종료 (애플리케이션 종료 시)"""
+    global _redis_service
+    if _redis_service is not None:
+        await _redis_service.close()
+        _redis_service = None
+
+
+def _register_pool_metrics(pool_name: str, pool: redis.BlockingConnectionPool) -> None:
+    """연결 풀 사용량 게이지 등록 (스크레이프 시점에 풀 상태를 읽음)"""
+    REDIS_POOL_MAX_CONNECTIONS.labels(pool=pool_name).set(pool.max_connections)
+    REDIS_POOL_CONNECTIONS.labels(pool=pool_name, state="in_use").set_function(
+        lambda: len(pool._in_use_connections)
+    )
+    REDIS_POOL_CONNECTIONS.labels(pool=pool_name, state="idle").set_function(
+        lambda: len(pool._available_connections)
+    )
+
+
+def parse_stream_id(entry_id: str) -> Tuple[int, int]:
+    """Redis Stream 항목 ID("밀리초-순번")를 비교 가능한 튜플로 변환"""
+    milliseconds, _, sequence = entry_id.partition("-")
+    return int(milliseconds), int(sequence or 0)
 
 
 def factory_to_dict(factory) -> dict[str, Any]:
@@ -182,3 +359,24 @@ def cctv_to_dict(cctv) -> dict[str, Any]:
         "created_at": cctv.created_at.isoformat() if cctv.created_at else None,
         "updated_at": cctv.updated_at.isoformat() if cctv.updated_at else None,
     }
+
+
+def equipment_to_dict(equipment) -> dict[str, Any]:
+    """Equipment ORM 모델을 딕셔너리로 변환 (배치/형상 정보)"""
+    return {
+        "id": str(equipment.id),
+        "factory_id": str(equipment.factory_id),
+        "name": equipment.name,
+        "type": equipment.type.value if equipment.type is not None else None,
+        "status": equipment.status.value if equipment.status is not None else None,
+        "position_x": equipment.position_x,
+        "position_y": equipment.position_y,
+        "position_z": equipment.position_z,
+        "rotation_x": equipment.rotation_x,
+        "rotation_y": equipment.rotation_y,
+        "rotation_z": equipment.rotation_z,
+        "scale_x": equipment.scale_x,
+        "scale_y": equipment.scale_y,
+        "scale_z": equipment.scale_z,
+        "is_active": equipment.is_active,
+    }
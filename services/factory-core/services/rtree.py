@@ -0,0 +1,477 @@
+"""
+V-Factory - 3D R-Tree 공간 인덱스
+STR(Sort-Tile-Recursive) 벌크 로딩과 삽입/삭제를 지원하는 인메모리 R-Tree
+"""
+import heapq
+import itertools
+import math
+from typing import Dict, Hashable, Iterable, List, Optional, Sequence, Tuple
+
+# 3D 좌표 (x, y, z)
+Point3D = Tuple[float, float, float]
+# 3D 경계 상자 (min_x, min_y, min_z, max_x, max_y, max_z)
+Box3D = Tuple[float, float, float, float, float, float]
+
+# 부피 계산 시 두께가 0인 축(예: 같은 높이에 설치된 CCTV)을 보정하기 위한 값
+_CONTENT_EPSILON = 1e-3
+
+
+def point_box(point: Sequence[float]) -> Box3D:
+    """점을 크기가 0인 경계 상자로 변환"""
+    return (point[0], point[1], point[2], point[0], point[1], point[2])
+
+
+def _union(a: Box3D, b: Box3D) -> Box3D:
+    """두 경계 상자를 모두 포함하는 최소 경계 상자"""
+    return (
+        a[0] if a[0] < b[0] else b[0],
+        a[1] if a[1] < b[1] else b[1],
+        a[2] if a[2] < b[2] else b[2],
+        a[3] if a[3] > b[3] else b[3],
+        a[4] if a[4] > b[4] else b[4],
+        a[5] if a[5] > b[5] else b[5],
+    )
+
+
+def _content(box: Box3D) -> float:
+    """경계 상자의 부피 (두께 0 보정 포함)"""
+    return (
+        (box[3] - box[0] + _CONTENT_EPSILON)
+        * (box[4] - box[1] + _CONTENT_EPSILON)
+        * (box[5] - box[2] + _CONTENT_EPSILON)
+    )
+
+
+def _intersects(a: Box3D, b: Box3D) -> bool:
+    """두 경계 상자의 교차 여부"""
+    return (
+        a[0] <= b[3] and a[3] >= b[0]
+        and a[1] <= b[4] and a[4] >= b[1]
+        and a[2] <= b[5] and a[5] >= b[2]
+    )
+
+
+def _min_dist_sq(box: Box3D, point: Sequence[float]) -> float:
+    """점에서 경계 상자까지의 최소 거리 제곱"""
+    total = 0.0
+    for axis in range(3):
+        value = point[axis]
+        if value < box[axis]:
+            diff = box[axis] - value
+            total += diff * diff
+        elif value > box[axis + 3]:
+            diff = value - box[axis + 3]
+            total += diff * diff
+    return total
+
+
+def _center(box: Box3D, axis: int) -> float:
+    """경계 상자의 축별 중심 좌표"""
+    return (box[axis] + box[axis + 3]) * 0.5
+
+
+class _Entry:
+    """리프 노드에 저장되는 데이터 항목"""
+
+    __slots__ = ("key", "box")
+
+    def __init__(self, key: Hashable, box: Box3D):
+        self.key = key
+        self.box = box
+
+
+class _Node:
+    """R-Tree 노드 (리프는 _Entry, 내부 노드는 _Node를 자식으로 가짐)"""
+
+    __slots__ = ("leaf", "box", "children", "parent")
+
+    def __init__(self, leaf: bool, children: Optional[list] = None):
+        self.leaf = leaf
+        self.children: list = children if children is not None else []
+        self.parent: Optional["_Node"] = None
+        self.box: Optional[Box3D] = None
+        self.recompute_box()
+
+    def recompute_box(self) -> None:
+        """자식 항목으로부터 경계 상자 재계산"""
+        if not self.children:
+            self.box = None
+            return
+        box = self.children[0].box
+        for child in self.children[1:]:
+            box = _union(box, child.box)
+        self.box = box
+
+
+class RTree3D:
+    """
+    3D R-Tree
+
+    - STR 벌크 로딩으로 초기 트리 구성
+    - Guttman 방식 삽입(이차 분할) 및 삭제(트리 축약 후 재삽입)
+    - k-최근접 이웃, 반경, 경계 상자 쿼리 지원
+    """
+
+    def __init__(self, max_entries: int = 16, min_entries: Optional[int] = None):
+        if max_entries < 4:
+            raise ValueError("max_entries는 4 이상이어야 합니다.")
+        self.max_entries = max_entries
+        self.min_entries = min_entries or max(2, int(max_entries * 0.4))
+        self._root = _Node(leaf=True)
+        self._leaf_of: Dict[Hashable, _Node] = {}
+
+    # ===== 생성 =====
+
+    @classmethod
+    def bulk_load(
+        cls,
+        items: Iterable[Tuple[Hashable, Box3D]],
+        max_entries: int = 16,
+    ) -> "RTree3D":
+        """
+        STR(Sort-Tile-Recursive) 알고리즘으로 트리 일괄 구성
+
+        Args:
+            items: (키, 경계 상자) 목록
+            max_entries: 노드당 최대 자식 수
+
+        Returns:
+            구성된 RTree3D
+        """
+        tree = cls(max_entries=max_entries)
+        entries: Dict[Hashable, _Entry] = {}
+        for key, box in items:
+            entries[key] = _Entry(key, tuple(box))
+        if not entries:
+            return tree
+
+        nodes = tree._str_pack(list(entries.values()), leaf=True)
+        while len(nodes) > 1:
+            nodes = tree._str_pack(nodes, leaf=False)
+        tree._root = nodes[0]
+        return tree
+
+    def _str_pack(self, items: list, leaf: bool) -> List[_Node]:
+        """한 레벨의 항목들을 STR 방식으로 노드에 묶음"""
+        capacity = self.max_entries
+        node_count = math.ceil(len(items) / capacity)
+        slices = max(1, math.ceil(node_count ** (1.0 / 3.0)))
+        slab_size = capacity * slices * slices
+        run_size = capacity * slices
+
+        nodes: List[_Node] = []
+        items = sorted(items, key=lambda item: _center(item.box, 0))
+        for slab_start in range(0, len(items), slab_size):
+            slab = sorted(
+                items[slab_start:slab_start + slab_size],
+                key=lambda item: _center(item.box, 1),
+            )
+            for run_start in range(0, len(slab), run_size):
+                run = sorted(
+                    slab[run_start:run_start + run_size],
+                    key=lambda item: _center(item.box, 2),
+                )
+                for group_start in range(0, len(run), capacity):
+                    node = _Node(leaf=leaf, children=run[group_start:group_start + capacity])
+                    self._adopt(node)
+                    nodes.append(node)
+        return nodes
+
+    def _adopt(self, node: _Node) -> None:
+        """자식 항목의 부모 참조(리프는 키 → 리프 매핑) 갱신"""
+        if node.leaf:
+            for entry in node.children:
+                self._leaf_of[entry.key] = node
+        else:
+            for child in node.children:
+                child.parent = node
+
+    # ===== 기본 정보 =====
+
+    def __len__(self) -> int:
+        return len(self._leaf_of)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._leaf_of
+
+    @property
+    def height(self) -> int:
+        """트리 높이 (리프만 있으면 1)"""
+        height = 1
+        node = self._root
+        while not node.leaf:
+            node = node.children[0]
+            height += 1
+        return height
+
+    @property
+    def bounds(self) -> Optional[Box3D]:
+        """전체 항목을 포함하는 경계 상자"""
+        return self._root.box
+
+    # ===== 삽입 / 삭제 =====
+
+    def insert(self, key: Hashable, box: Sequence[float]) -> None:
+        """
+        항목 삽입 (같은 키가 이미 있으면 위치 갱신)
+
+        Args:
+            key: 항목 식별자
+            box: 경계 상자 (점은 point_box로 변환하여 전달)
+        """
+        if key in self._leaf_of:
+            self.delete(key)
+        self._insert_entry(_Entry(key, tuple(box)))
+
+    def insert_point(self, key: Hashable, point: Sequence[float]) -> None:
+        """점 항목 삽입"""
+        self.insert(key, point_box(point))
+
+    def delete(self, key: Hashable) -> bool:
+        """
+        항목 삭제
+
+        Returns:
+            삭제 여부 (키가 없으면 False)
+        """
+        leaf = self._leaf_of.pop(key, None)
+        if leaf is None:
+            return False
+        leaf.children = [entry for entry in leaf.children if entry.key != key]
+        self._condense(leaf)
+        return True
+
+    def _choose_leaf(self, box: Box3D) -> _Node:
+        """부피 증가량이 가장 작은 경로를 따라 삽입할 리프 선택"""
+        node = self._root
+        while not node.leaf:
+            best = None
+            best_key = None
+            for child in node.children:
+                child_content = _content(child.box)
+                enlargement = _content(_union(child.box, box)) - child_content
+                candidate_key = (enlargement, child_content)
+                if best_key is None or candidate_key < best_key:
+                    best = child
+                    best_key = candidate_key
+            node = best
+        return node
+
+    def _insert_entry(self, entry: _Entry) -> None:
+        """항목을 리프에 추가하고 필요 시 분할을 상위로 전파"""
+        leaf = self._choose_leaf(entry.box)
+        leaf.children.append(entry)
+        self._leaf_of[entry.key] = leaf
+
+        node = leaf
+        while True:
+            sibling = None
+            if len(node.children) > self.max_entries:
+                sibling = self._split(node)
+            else:
+                node.recompute_box()
+
+            parent = node.parent
+            if parent is None:
+                if sibling is not None:
+                    # 루트 분할 시 새 루트 생성
+                    new_root = _Node(leaf=False, children=[node, sibling])
+                    self._adopt(new_root)
+                    self._root = new_root
+                break
+
+            if sibling is not None:
+                parent.children.append(sibling)
+                sibling.parent = parent
+            node = parent
+
+    def _split(self, node: _Node) -> _Node:
+        """이차(Quadratic) 분할 - node는 첫 번째 그룹을 유지하고 새 형제 노드를 반환"""
+        items = node.children
+
+        # 함께 두면 낭비가 가장 큰 두 항목을 시드로 선택
+        seed_a, seed_b, worst = 0, 1, None
+        for i in range(len(items)):
+            for j in range(i + 1, len(items)):
+                waste = (
+                    _content(_union(items[i].box, items[j].box))
+                    - _content(items[i].box)
+                    - _content(items[j].box)
+                )
+                if worst is None or waste > worst:
+                    seed_a, seed_b, worst = i, j, waste
+
+        group_a = [items[seed_a]]
+        group_b = [items[seed_b]]
+        box_a = items[seed_a].box
+        box_b = items[seed_b].box
+        remaining = [item for idx, item in enumerate(items) if idx not in (seed_a, seed_b)]
+
+        while remaining:
+            # 최소 채움 조건을 만족시키기 위해 남은 항목을 한쪽에 몰아줌
+            if len(group_a) + len(remaining) == self.min_entries:
+                group_a.extend(remaining)
+                break
+            if len(group_b) + len(remaining) == self.min_entries:
+                group_b.extend(remaining)
+                break
+
+            # 두 그룹 간 선호도 차이가 가장 큰 항목부터 배정
+            pick_idx, pick_diff = 0, -1.0
+            content_a = _content(box_a)
+            content_b = _content(box_b)
+            for idx, item in enumerate(remaining):
+                grow_a = _content(_union(box_a, item.box)) - content_a
+                grow_b = _content(_union(box_b, item.box)) - content_b
+                diff = abs(grow_a - grow_b)
+                if diff > pick_diff:
+                    pick_idx, pick_diff = idx, diff
+            item = remaining.pop(pick_idx)
+
+            grow_a = _content(_union(box_a, item.box)) - content_a
+            grow_b = _content(_union(box_b, item.box)) - content_b
+            if (grow_a, content_a, len(group_a)) <= (grow_b, content_b, len(group_b)):
+                group_a.append(item)
+                box_a = _union(box_a, item.box)
+            else:
+                group_b.append(item)
+                box_b = _union(box_b, item.box)
+
+        node.children = group_a
+        node.recompute_box()
+        sibling = _Node(leaf=node.leaf, children=group_b)
+        self._adopt(sibling)
+        return sibling
+
+    def _condense(self, node: _Node) -> None:
+        """삭제 후 최소 채움 미달 노드를 제거하고 고아 항목을 재삽입"""
+        orphans: List[_Entry] = []
+        while node.parent is not None:
+            parent = node.parent
+            if len(node.children) < self.min_entries:
+                parent.children.remove(node)
+                orphans.extend(self._collect_entries(node))
+            else:
+                node.recompute_box()
+            node = parent
+        node.recompute_box()
+
+        # 자식이 하나뿐인 내부 루트 축약
+        while not self._root.leaf and len(self._root.children) == 1:
+            self._root = self._root.children[0]
+            self._root.parent = None
+        if not self._root.leaf and not self._root.children:
+            self._root = _Node(leaf=True)
+
+        for entry in orphans:
+            self._insert_entry(entry)
+
+    def _collect_entries(self, node: _Node) -> List[_Entry]:
+        """서브트리의 모든 리프 항목 수집"""
+        if node.leaf:
+            return list(node.children)
+        entries: List[_Entry] = []
+        for child in node.children:
+            entries.extend(self._collect_entries(child))
+        return entries
+
+    # ===== 쿼리 =====
+
+    def search_box(
+        self,
+        min_point: Sequence[float],
+        max_point: Sequence[float],
+    ) -> List[Hashable]:
+        """
+        경계 상자와 교차하는 항목 검색
+
+        Args:
+            min_point: 영역의 최소 좌표 (x, y, z)
+            max_point: 영역의 최대 좌표 (x, y, z)
+
+        Returns:
+            키 리스트
+        """
+        if self._root.box is None:
+            return []
+        query = (min_point[0], min_point[1], min_point[2], max_point[0], max_point[1], max_point[2])
+        results: List[Hashable] = []
+        stack = [self._root]
+        while stack:
+            node = stack.pop()
+            for child in node.children:
+                if _intersects(child.box, query):
+                    if node.leaf:
+                        results.append(child.key)
+                    else:
+                        stack.append(child)
+        return results
+
+    def search_radius(
+        self,
+        center: Sequence[float],
+        radius: float,
+    ) -> List[Tuple[Hashable, float]]:
+        """
+        중심점으로부터 반경 내 항목 검색
+
+        Args:
+            center: 중심 좌표 (x, y, z)
+            radius: 검색 반경
+
+        Returns:
+            (키, 거리) 튜플 리스트 (거리순 정렬)
+        """
+        if self._root.box is None or radius < 0:
+            return []
+        radius_sq = radius * radius
+        results: List[Tuple[Hashable, float]] = []
+        stack = [self._root]
+        while stack:
+            node = stack.pop()
+            for child in node.children:
+                dist_sq = _min_dist_sq(child.box, center)
+                if dist_sq <= radius_sq:
+                    if node.leaf:
+                        results.append((child.key, math.sqrt(dist_sq)))
+                    else:
+                        stack.append(child)
+        results.sort(key=lambda item: item[1])
+        return results
+
+    def nearest(
+        self,
+        point: Sequence[float],
+        k: int = 1,
+        max_distance: Optional[float] = None,
+    ) -> List[Tuple[Hashable, float]]:
+        """
+        Best-First 탐색 기반 k-최근접 이웃 검색
+
+        Args:
+            point: 기준 좌표 (x, y, z)
+            k: 반환할 최대 항목 수
+            max_distance: 최대 검색 거리 (None이면 제한 없음)
+
+        Returns:
+            (키, 거리) 튜플 리스트 (거리순 정렬)
+        """
+        if k <= 0 or self._root.box is None:
+            return []
+        limit_sq = math.inf if max_distance is None else max_distance * max_distance
+
+        counter = itertools.count()
+        heap = [(_min_dist_sq(self._root.box, point), next(counter), False, self._root)]
+        results: List[Tuple[Hashable, float]] = []
+        while heap and len(results) < k:
+            dist_sq, _, is_entry, item = heapq.heappop(heap)
+            if dist_sq > limit_sq:
+                break
+            if is_entry:
+                results.append((item.key, math.sqrt(dist_sq)))
+                continue
+            for child in item.children:
+                child_dist_sq = _min_dist_sq(child.box, point)
+                if child_dist_sq <= limit_sq:
+                    heapq.heappush(heap, (child_dist_sq, next(counter), item.leaf, child))
+        return results
@@ -0,0 +1,530 @@
+"""
+V-Factory - 공장별 인메모리 CCTV 공간 인덱스
+공장 단위 3D R-Tree(CCTV)와 설비 BVH를 프로세스 메모리에 유지하여 DB 조회 없이 공간 쿼리 처리
+
+- 변경한 인스턴스는 CRUD API가 commit 직후 인덱스를 직접 갱신하고,
+  다른 인스턴스는 공장/CCTV/설비 이벤트 스트림의 페이로드로 같은 증분 갱신을 적용 (자기 이벤트는 무시)
+- 이벤트를 놓치면 백그라운드에서 인덱스를 새로 만들어 교체 (구성하는 동안 기존 인덱스로 응답)
+- 여러 프로세스의 Outbox 릴레이가 이벤트를 나눠 전달하므로 순서가 뒤바뀔 수 있음:
+  같은 CCTV의 수정은 updated_at으로, 삭제 후 도착한 이전 스냅샷은 삭제 기록(tombstone)으로 걸러냄
+"""
+import asyncio
+import json
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+from uuid import UUID
+
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from config import settings
+from database import async_session
+from models import CCTVConfig, Equipment
+from services.coverage_grid import CoverageGrid
+from services.event_hub import EventHub, event_hub as default_event_hub
+from services.fov_engine import CameraArrays
+from services.occlusion import EquipmentBVH, EquipmentEntry
+from services.outbox import INSTANCE_ID
+from services.redis_service import CCTVEventType, EquipmentEventType, FactoryEventType, RedisService
+from services.rtree import RTree3D, point_box
+from utils.logging import logger
+
+
+@dataclass(slots=True)
+class CCTVEntry:
+    """
+    인덱스에 보관되는 CCTV 스냅샷
+    CCTVConfigResponse.model_validate()로 바로 응답 변환 가능
+    """
+    id: UUID
+    factory_id: UUID
+    name: str
+    position_x: float
+    position_y: float
+    position_z: float
+    rotation_x: float
+    rotation_y: float
+    rotation_z: float
+    fov: float
+    is_active: bool
+    created_at: Optional[datetime]
+    updated_at: Optional[datetime]
+
+    @property
+    def position(self) -> Tuple[float, float, float]:
+        return (self.position_x, self.position_y, self.position_z)
+
+    @property
+    def rotation(self) -> Tuple[float, float, float]:
+        return (self.rotation_x, self.rotation_y, self.rotation_z)
+
+    @classmethod
+    def from_model(cls, cctv: CCTVConfig) -> "CCTVEntry":
+        """CCTVConfig ORM 모델로부터 스냅샷 생성"""
+        return cls(
+            id=cctv.id,
+            factory_id=cctv.factory_id,
+            name=cctv.name,
+            position_x=cctv.position_x,
+            position_y=cctv.position_y,
+            position_z=cctv.position_z,
+            rotation_x=cctv.rotation_x or 0.0,
+            rotation_y=cctv.rotation_y or 0.0,
+            rotation_z=cctv.rotation_z or 0.0,
+            fov=cctv.fov if cctv.fov is not None else 75.0,
+            is_active=cctv.is_active if cctv.is_active is not None else True,
+            created_at=cctv.created_at,
+            updated_at=cctv.updated_at,
+        )
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "CCTVEntry":
+        """CCTV 이벤트 데이터(cctv_to_dict)로부터 스냅샷 생성"""
+        return cls(
+            id=UUID(data["id"]),
+            factory_id=UUID(data["factory_id"]),
+            name=data["name"],
+            position_x=float(data["position_x"]),
+            position_y=float(data["position_y"]),
+            position_z=float(data["position_z"]),
+            rotation_x=data.get("rotation_x") or 0.0,
+            rotation_y=data.get("rotation_y") or 0.0,
+            rotation_z=data.get("rotation_z") or 0.0,
+            fov=data["fov"] if data.get("fov") is not None else 75.0,
+            is_active=data["is_active"] if data.get("is_active") is not None else True,
+            created_at=_parse_datetime(data.get("created_at")),
+            updated_at=_parse_datetime(data.get("updated_at")),
+        )
+
+
+def _parse_datetime(value: Optional[str]) -> Optional[datetime]:
+    return datetime.fromisoformat(value) if value else None
+
+
+def _is_older(entry: CCTVEntry, current: Optional[CCTVEntry]) -> bool:
+    """이벤트 스냅샷이 인덱스에 있는 스냅샷보다 오래되었는지 (순서가 뒤바뀐 이벤트 무시용)"""
+    if current is None or entry.updated_at is None or current.updated_at is None:
+        return False
+    try:
+        return entry.updated_at < current.updated_at
+    except TypeError:
+        return False
+
+
+def _build_index(
+    factory_id: UUID,
+    cctvs: List[CCTVEntry],
+    equipment: List[EquipmentEntry],
+    warm_grid: bool,
+) -> "FactorySpatialIndex":
+    """인덱스 구성 (R-Tree 벌크 로딩/BVH, warm_grid면 커버리지 그리드까지 - 스레드에서 실행)"""
+    index = FactorySpatialIndex(factory_id, cctvs, equipment)
+    if warm_grid:
+        index.coverage_grid
+    return index
+
+
+class FactorySpatialIndex:
+    """공장 하나의 활성 CCTV를 담는 R-Tree 인덱스 (설비 가림 판정용 BVH 포함)"""
+
+    def __init__(
+        self,
+        factory_id: UUID,
+        cctvs: Iterable[CCTVEntry],
+        equipment: Iterable[EquipmentEntry] = (),
+    ):
+        self.factory_id = factory_id
+        self.cctvs: Dict[UUID, CCTVEntry] = {
+            cctv.id: cctv for cctv in cctvs if cctv.is_active
+        }
+        self.tree = RTree3D.bulk_load(
+            (cctv.id, point_box(cctv.position)) for cctv in self.cctvs.values()
+        )
+        self._camera_arrays: Optional[CameraArrays] = None
+        self._coverage_grid: Optional[CoverageGrid] = None
+        self.occluders = EquipmentBVH(equipment)
+
+    def __len__(self) -> int:
+        return len(self.cctvs)
+
+    @property
+    def camera_arrays(self) -> CameraArrays:
+        """FOV 배치 판정용 CCTV 배열 (변경 시 다음 접근에서 재구성)"""
+        if self._camera_arrays is None:
+            self._camera_arrays = CameraArrays(list(self.cctvs.values()))
+        return self._camera_arrays
+
+    @property
+    def coverage_grid(self) -> Optional[CoverageGrid]:
+        """CCTV 커버리지 복셀 그리드 (최초 커버리지 조회 시 구성, 비활성화 설정이면 None)"""
+        if not settings.COVERAGE_GRID_ENABLED:
+            return None
+        if self._coverage_grid is None:
+            self._coverage_grid = CoverageGrid(
+                self.factory_id,
+                voxel_size=settings.COVERAGE_GRID_VOXEL_SIZE,
+                max_distance=settings.COVERAGE_GRID_MAX_DISTANCE,
+                min_y=settings.COVERAGE_GRID_MIN_Y,
+                max_y=settings.COVERAGE_GRID_MAX_Y,
+                max_bytes=settings.COVERAGE_GRID_MAX_MEMORY_MB * 1024 * 1024,
+            )
+            self._coverage_grid.rebuild(self.cctvs.values())
+        return self._coverage_grid
+
+    def close(self) -> None:
+        """인덱스 폐기 시 부가 자원 정리"""
+        if self._coverage_grid is not None:
+            self._coverage_grid.close()
+
+    def upsert(self, cctv: CCTVEntry) -> None:
+        """CCTV 추가/갱신 (비활성화된 경우 인덱스에서 제거)"""
+        if not cctv.is_active:
+            self.remove(cctv.id)
+            return
+        self.cctvs[cctv.id] = cctv
+        self.tree.insert(cctv.id, point_box(cctv.position))
+        self._camera_arrays = None
+        if self._coverage_grid is not None:
+            self._coverage_grid.upsert(cctv)
+
+    def remove(self, cctv_id: UUID) -> None:
+        """CCTV 제거"""
+        if self.cctvs.pop(cctv_id, None) is not None:
+            self.tree.delete(cctv_id)
+            self._camera_arrays = None
+            if self._coverage_grid is not None:
+                self._coverage_grid.remove(cctv_id)
+
+    def upsert_equipment(self, equipment: EquipmentEntry) -> None:
+        """설비 추가/이동 반영 (BVH refit)"""
+        self.occluders.upsert(equipment)
+
+    def remove_equipment(self, equipment_id: UUID) -> None:
+        """설비 제거 반영"""
+        self.occluders.remove(equipment_id)
+
+    def nearest(
+        self,
+        position: Tuple[float, float, float],
+        limit: int,
+        max_distance: Optional[float] = None,
+    ) -> List[Tuple[CCTVEntry, float]]:
+        """k-최근접 CCTV 검색"""
+        return [
+            (self.cctvs[cctv_id], distance)
+            for cctv_id, distance in self.tree.nearest(position, limit, max_distance)
+        ]
+
+    def within_radius(
+        self,
+        position: Tuple[float, float, float],
+        radius: float,
+    ) -> List[Tuple[CCTVEntry, float]]:
+        """반경 내 CCTV 검색 (거리순)"""
+        return [
+            (self.cctvs[cctv_id], distance)
+            for cctv_id, distance in self.tree.search_radius(position, radius)
+        ]
+
+    def covering(
+        self,
+        positions: List[Tuple[float, float, float]],
+        max_distance: float,
+        check_occlusion: bool = False,
+    ) -> List[List[Tuple[CCTVEntry, float]]]:
+        """
+        지점별 시야 포함 CCTV 검색 (거리순)
+        커버리지 그리드로 후보를 좁힌 뒤 후보만 정밀 판정하고,
+        그리드로 판단할 수 없는 지점은 전체 CCTV를 NumPy 배치 판정
+        check_occlusion이면 설비에 가려진 CCTV를 가시선 판정으로 제외
+        """
+        arrays = self.camera_arrays
+        grid = self.coverage_grid
+        if grid is None or max_distance > grid.max_distance:
+            results = arrays.covering(positions, max_distance)
+        else:
+            results = []
+            for position in positions:
+                candidates = grid.candidates(position, max_distance)
+                if candidates is None:
+                    results.append(arrays.covering([position], max_distance)[0])
+                elif not candidates:
+                    results.append([])
+                else:
+                    results.append(arrays.covering_candidates(position, candidates, max_distance))
+
+        if check_occlusion and len(self.occluders):
+            results = self._filter_occluded(positions, results)
+        return results
+
+    def _filter_occluded(
+        self,
+        positions: List[Tuple[float, float, float]],
+        results: List[List[Tuple[CCTVEntry, float]]],
+    ) -> List[List[Tuple[CCTVEntry, float]]]:
+        """모든 (지점, CCTV) 쌍을 한 번의 배치 레이 캐스팅으로 가시선 판정"""
+        counts = [len(hits) for hits in results]
+        if not sum(counts):
+            return results
+
+        origins = np.array(
+            [cctv.position for hits in results for cctv, _ in hits], dtype=np.float64
+        )
+        targets = np.repeat(np.asarray(positions, dtype=np.float64).reshape(-1, 3), counts, axis=0)
+        blocked = iter(self.occluders.occluded(origins, targets).tolist())
+        return [[hit for hit in hits if not next(blocked)] for hits in results]
+
+    def in_box(
+        self,
+        min_point: Tuple[float, float, float],
+        max_point: Tuple[float, float, float],
+    ) -> List[CCTVEntry]:
+        """경계 상자 내 CCTV 검색"""
+        return [self.cctvs[cctv_id] for cctv_id in self.tree.search_box(min_point, max_point)]
+
+
+class SpatialIndexManager:
+    """
+    공장별 공간 인덱스 레지스트리
+    최초 조회 시 DB에서 한 번 로드하고, 이후에는 CCTV/설비 변경 API와 변경 이벤트가 증분 동기화
+    (인덱스 구성은 스레드 풀에서 수행하여 이벤트 루프를 막지 않음)
+    """
+
+    def __init__(
+        self,
+        hub: Optional[EventHub] = None,
+        session_factory: Optional[async_sessionmaker] = None,
+    ):
+        self._hub = hub or default_event_hub
+        self._session_factory = session_factory or async_session
+        self._indexes: Dict[UUID, FactorySpatialIndex] = {}
+        self._locks: Dict[UUID, asyncio.Lock] = {}
+        # 로드 도중 발생한 변경을 감지하기 위한 공장별 변경 세대 번호
+        self._generations: Dict[UUID, int] = {}
+        # 삭제된 CCTV/설비 ID별 삭제 기록 만료 시각 (삭제는 행 삭제이고 ID는 재사용되지 않으므로
+        # 기록이 남아 있는 동안 도착한 같은 ID의 스냅샷은 모두 삭제 이전 상태)
+        self._tombstones: Dict[UUID, float] = {}
+        self._task: Optional[asyncio.Task] = None
+        self._rebuild_task: Optional[asyncio.Task] = None
+
+    def is_loaded(self, factory_id: UUID) -> bool:
+        """공장 인덱스 로드 여부"""
+        return factory_id in self._indexes
+
+    async def get_index(self, db: AsyncSession, factory_id: UUID) -> FactorySpatialIndex:
+        """
+        공장 인덱스 조회 (없으면 DB에서 활성 CCTV를 읽어 STR 벌크 로딩)
+
+        Args:
+            db: 데이터베이스 세션
+            factory_id: 공장 ID
+
+        Returns:
+            FactorySpatialIndex
+        """
+        index = self._indexes.get(factory_id)
+        if index is not None:
+            return index
+
+        lock = self._locks.setdefault(factory_id, asyncio.Lock())
+        async with lock:
+            index = self._indexes.get(factory_id)
+            if index is not None:
+                return index
+
+            generation = self._generations.get(factory_id, 0)
+            index = await self._load(db, factory_id, warm_grid=False)
+
+            # 로드 중 변경이 있었다면 이번 결과는 캐싱하지 않음 (다음 조회 시 재로드)
+            if self._generations.get(factory_id, 0) == generation:
+                self._indexes[factory_id] = index
+            return index
+
+    async def rebuild(self, factory_id: UUID, attempts: int = 3) -> bool:
+        """
+        로드된 공장 인덱스를 DB에서 새로 구성해 교체 (구성하는 동안 기존 인덱스로 응답)
+        구성 중 변경이 반영되면 다시 시도하고, 끝내 맞추지 못하면 인덱스를 버려 다음 조회 시 재로드
+
+        Returns:
+            교체했으면 True
+        """
+        for _ in range(attempts):
+            current = self._indexes.get(factory_id)
+            if current is None:
+                return False
+            generation = self._generations.get(factory_id, 0)
+            async with self._session_factory() as db:
+                index = await self._load(db, factory_id, warm_grid=current._coverage_grid is not None)
+            if self._generations.get(factory_id, 0) == generation and self._indexes.get(factory_id) is current:
+                self._indexes[factory_id] = index
+                current.close()
+                return True
+            index.close()
+        self.drop_factory(factory_id)
+        return False
+
+    async def _load(self, db: AsyncSession, factory_id: UUID, warm_grid: bool) -> FactorySpatialIndex:
+        """활성 CCTV/설비 조회 후 스레드 풀에서 인덱스 구성"""
+        cctv_result = await db.execute(
+            select(CCTVConfig)
+            .where(CCTVConfig.factory_id == factory_id)
+            .where(CCTVConfig.is_active == True)
+        )
+        equipment_result = await db.execute(
+            select(Equipment)
+            .where(Equipment.factory_id == factory_id)
+            .where(Equipment.is_active == True)
+        )
+        cctvs = [CCTVEntry.from_model(cctv) for cctv in cctv_result.scalars().all()]
+        equipment = [EquipmentEntry.from_model(item) for item in equipment_result.scalars().all()]
+        return await asyncio.get_running_loop().run_in_executor(
+            None, _build_index, factory_id, cctvs, equipment, warm_grid
+        )
+
+    def _bump(self, factory_id: UUID) -> Optional[FactorySpatialIndex]:
+        """변경 세대 증가 후 로드된 인덱스 반환"""
+        self._generations[factory_id] = self._generations.get(factory_id, 0) + 1
+        return self._indexes.get(factory_id)
+
+    def apply_upsert(self, cctv: CCTVConfig) -> None:
+        """CCTV 생성/수정 반영"""
+        self.apply_cctv_entry(CCTVEntry.from_model(cctv))
+
+    def _add_tombstone(self, entity_id: UUID) -> None:
+        """삭제 기록 추가 (만료된 기록은 이때 정리)"""
+        now = time.monotonic()
+        for key in [key for key, expires_at in self._tombstones.items() if expires_at <= now]:
+            del self._tombstones[key]
+        self._tombstones[entity_id] = now + settings.SPATIAL_INDEX_TOMBSTONE_TTL
+
+    def _is_deleted(self, entity_id: UUID) -> bool:
+        """삭제 기록이 남아 있는지 (삭제 이벤트보다 늦게 도착한 스냅샷 무시용)"""
+        expires_at = self._tombstones.get(entity_id)
+        if expires_at is None:
+            return False
+        if expires_at <= time.monotonic():
+            del self._tombstones[entity_id]
+            return False
+        return True
+
+    def apply_cctv_entry(self, entry: CCTVEntry) -> None:
+        """CCTV 스냅샷 반영 (인덱스에 있는 것보다 오래되었거나 이미 삭제된 CCTV의 스냅샷은 무시)"""
+        index = self._bump(entry.factory_id)
+        if index is None or self._is_deleted(entry.id):
+            return
+        if not _is_older(entry, index.cctvs.get(entry.id)):
+            index.upsert(entry)
+
+    def apply_delete(self, factory_id: UUID, cctv_id: UUID) -> None:
+        """CCTV 삭제 반영"""
+        self._add_tombstone(cctv_id)
+        index = self._bump(factory_id)
+        if index is not None:
+            index.remove(cctv_id)
+
+    def apply_equipment_upsert(self, equipment: Equipment) -> None:
+        """설비 생성/수정 반영 (위치/회전/크기 변경 시 BVH 갱신)"""
+        self.apply_equipment_entry(EquipmentEntry.from_model(equipment))
+
+    def apply_equipment_entry(self, entry: EquipmentEntry) -> None:
+        """설비 스냅샷 반영 (BVH refit, 이미 삭제된 설비의 스냅샷은 무시)"""
+        index = self._bump(entry.factory_id)
+        if index is not None and not self._is_deleted(entry.id):
+            index.upsert_equipment(entry)
+
+    def apply_equipment_delete(self, factory_id: UUID, equipment_id: UUID) -> None:
+        """설비 삭제 반영"""
+        self._add_tombstone(equipment_id)
+        index = self._bump(factory_id)
+        if index is not None:
+            index.remove_equipment(equipment_id)
+
+    def drop_factory(self, factory_id: UUID) -> None:
+        """공장 인덱스 제거 (공장 삭제 시)"""
+        self._bump(factory_id)
+        index = self._indexes.pop(factory_id, None)
+        if index is not None:
+            index.close()
+
+    def clear(self) -> None:
+        """전체 인덱스 초기화"""
+        for factory_id in list(self._indexes):
+            self.drop_factory(factory_id)
+
+    def apply_event(self, channel: str, message: str) -> None:
+        """
+        다른 인스턴스의 공장/CCTV/설비 이벤트를 인덱스에 증분 반영
+        이 프로세스가 기록한 이벤트(origin)는 라우터가 commit 직후 이미 반영했으므로 무시
+        """
+        try:
+            payload = json.loads(message)
+            if payload.get("origin") == INSTANCE_ID:
+                return
+            event, data = payload["event"], payload["data"]
+            if channel == RedisService.FACTORY_CHANNEL:
+                if event == FactoryEventType.FACTORY_DELETED.value:
+                    self.drop_factory(UUID(data["id"]))
+            elif channel == RedisService.CCTV_CHANNEL:
+                if event == CCTVEventType.CCTV_DELETED.value:
+                    self.apply_delete(UUID(data["factory_id"]), UUID(data["id"]))
+                else:
+                    self.apply_cctv_entry(CCTVEntry.from_dict(data))
+            elif channel == RedisService.EQUIPMENT_CHANNEL:
+                if event == EquipmentEventType.EQUIPMENT_DELETED.value:
+                    self.apply_equipment_delete(UUID(data["factory_id"]), UUID(data["id"]))
+                else:
+                    self.apply_equipment_entry(EquipmentEntry.from_dict(data))
+        except (ValueError, KeyError, TypeError) as e:
+            logger.warning(f"[SpatialIndex] 변경 이벤트 해석 실패 ({channel}): {e!r}")
+
+    def start(self) -> None:
+        """변경 이벤트 구독 시작 (lifespan에서 호출)"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._follow_events())
+
+    async def close(self) -> None:
+        """이벤트 구독/재구성 종료 및 인덱스 정리"""
+        for task in (self._task, self._rebuild_task):
+            if task is not None:
+                task.cancel()
+                await asyncio.gather(task, return_exceptions=True)
+        self._task = self._rebuild_task = None
+        self.clear()
+
+    async def _follow_events(self) -> None:
+        """공장/CCTV/설비 스트림을 구독해 인덱스 동기화 (이벤트 허브가 재연결 처리)"""
+        async with self._hub.subscribe(
+            RedisService.FACTORY_CHANNEL, RedisService.CCTV_CHANNEL, RedisService.EQUIPMENT_CHANNEL
+        ) as subscription:
+            dropped = 0
+            while True:
+                channel, _, message = await subscription.get()
+                if subscription.dropped != dropped or subscription.reset_required:
+                    # 버퍼 초과/재전송 누락으로 이벤트를 놓쳤으면 어떤 공장이 바뀌었는지 알 수 없음
+                    dropped = subscription.dropped
+                    subscription.reset_required = False
+                    logger.warning("[SpatialIndex] 변경 이벤트 누락, 로드된 인덱스를 백그라운드에서 재구성")
+                    self._schedule_rebuild()
+                self.apply_event(channel, message)
+
+    def _schedule_rebuild(self) -> None:
+        """로드된 전체 인덱스 재구성 태스크 시작 (진행 중이면 끝난 뒤 다시 한 번)"""
+        previous = self._rebuild_task
+        self._rebuild_task = asyncio.create_task(self._rebuild_all(previous))
+
+    async def _rebuild_all(self, previous: Optional[asyncio.Task]) -> None:
+        if previous is not None:
+            await asyncio.gather(previous, return_exceptions=True)
+        for factory_id in list(self._indexes):
+            try:
+                await self.rebuild(factory_id)
+            except Exception as e:
+                logger.warning(f"[SpatialIndex] 인덱스 재구성 실패, 다음 조회 시 재로드: {factory_id} - {e!r}")
+                self.drop_factory(factory_id)
+
+
+# 프로세스 전역 인덱스 레지스트리
+spatial_index_manager = SpatialIndexManager()
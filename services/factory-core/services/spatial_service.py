@@ -6,10 +6,10 @@ import math
 from typing import List, Optional, Tuple
 from uuid import UUID
 
-from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from models import CCTVConfig
+from config import settings
+from services.spatial_index import CCTVEntry, spatial_index_manager
 
 
 class SpatialService:
@@ -101,9 +101,10 @@ class SpatialService:
         position: Tuple[float, float, float],
         limit: int = 5,
         max_distance: Optional[float] = None
-    ) -> List[Tuple[CCTVConfig, float]]:
+    ) -> List[Tuple[CCTVEntry, float]]:
         """
         특정 위치에서 가장 가까운 CCTV들을 찾음
+        공장별 R-Tree에서 Best-First k-NN 탐색
         
         Args:
             factory_id: 공장 ID
@@ -112,80 +113,45 @@ class SpatialService:
             max_distance: 최대 검색 거리 (None이면 제한 없음)
             
         Returns:
-            (CCTVConfig, 거리) 튜플 리스트 (거리순 정렬)
+            (CCTVEntry, 거리) 튜플 리스트 (거리순 정렬)
         """
-        # 공장 내 모든 활성 CCTV 조회
-        result = await self.db.execute(
-            select(CCTVConfig)
-            .where(CCTVConfig.factory_id == factory_id)
-            .where(CCTVConfig.is_active == True)
-        )
-        cctvs = result.scalars().all()
-        
-        # 각 CCTV와의 거리 계산
-        cctv_distances: List[Tuple[CCTVConfig, float]] = []
-        for cctv in cctvs:
-            cctv_pos = (cctv.position_x, cctv.position_y, cctv.position_z)
-            distance = self.calculate_distance(position, cctv_pos)
-            
-            # 최대 거리 필터링
-            if max_distance is None or distance <= max_distance:
-                cctv_distances.append((cctv, distance))
-        
-        # 거리순 정렬
-        cctv_distances.sort(key=lambda x: x[1])
-        
-        return cctv_distances[:limit]
+        index = await spatial_index_manager.get_index(self.db, factory_id)
+        return index.nearest(position, limit, max_distance)
     
     async def find_cctvs_covering_point(
         self,
         factory_id: UUID,
         position: Tuple[float, float, float],
-        max_distance: float = 50.0
-    ) -> List[Tuple[CCTVConfig, float]]:
+        max_distance: float = 50.0,
+        check_occlusion: bool = True
+    ) -> List[Tuple[CCTVEntry, float]]:
         """
         특정 위치를 시야각 내에서 볼 수 있는 CCTV들을 찾음
+        공장 전체 CCTV를 NumPy 배열로 한 번에 판정 (is_point_in_fov와 동일한 결과)
+        후 설비 BVH 레이 캐스팅으로 설비에 가려진 CCTV 제외
         
         Args:
             factory_id: 공장 ID
             position: 검색 기준 위치 (x, y, z)
             max_distance: 최대 감지 거리
+            check_occlusion: 설비 가려짐 판정 여부 (OCCLUSION_ENABLED 설정이 우선)
             
         Returns:
-            (CCTVConfig, 거리) 튜플 리스트
+            (CCTVEntry, 거리) 튜플 리스트 (거리순 정렬)
         """
-        # 공장 내 모든 활성 CCTV 조회
-        result = await self.db.execute(
-            select(CCTVConfig)
-            .where(CCTVConfig.factory_id == factory_id)
-            .where(CCTVConfig.is_active == True)
-        )
-        cctvs = result.scalars().all()
-        
-        covering_cctvs: List[Tuple[CCTVConfig, float]] = []
-        
-        for cctv in cctvs:
-            cctv_pos = (cctv.position_x, cctv.position_y, cctv.position_z)
-            cctv_rotation = (cctv.rotation_x, cctv.rotation_y, cctv.rotation_z)
-            
-            # FOV 내에 있는지 확인
-            if self.is_point_in_fov(
-                cctv_pos, cctv_rotation, cctv.fov, position, max_distance
-            ):
-                distance = self.calculate_distance(position, cctv_pos)
-                covering_cctvs.append((cctv, distance))
-        
-        # 거리순 정렬
-        covering_cctvs.sort(key=lambda x: x[1])
-        
-        return covering_cctvs
+        index = await spatial_index_manager.get_index(self.db, factory_id)
+        return index.covering(
+            [position],
+            max_distance,
+            check_occlusion=check_occlusion and settings.OCCLUSION_ENABLED,
+        )[0]
     
     async def find_cctvs_in_bounding_box(
         self,
         factory_id: UUID,
         min_point: Tuple[float, float, float],
         max_point: Tuple[float, float, float]
-    ) -> List[CCTVConfig]:
+    ) -> List[CCTVEntry]:
         """
         특정 영역(Bounding Box) 내에 있는 CCTV들을 찾음
         R-Tree 기반 범위 쿼리
@@ -196,18 +162,75 @@ class SpatialService:
             max_point: 영역의 최대 좌표 (x, y, z)
             
         Returns:
-            영역 내 CCTVConfig 리스트
-        """
-        result = await self.db.execute(
-            select(CCTVConfig)
-            .where(CCTVConfig.factory_id == factory_id)
-            .where(CCTVConfig.is_active == True)
-            .where(CCTVConfig.position_x >= min_point[0])
-            .where(CCTVConfig.position_x <= max_point[0])
-            .where(CCTVConfig.position_y >= min_point[1])
-            .where(CCTVConfig.position_y <= max_point[1])
-            .where(CCTVConfig.position_z >= min_point[2])
-            .where(CCTVConfig.position_z <= max_point[2])
+            영역 내 CCTVEntry 리스트
+        """
+        index = await spatial_index_manager.get_index(self.db, factory_id)
+        return index.in_box(min_point, max_point)
+    
+    async def find_nearest_cctvs_batch(
+        self,
+        factory_id: UUID,
+        positions: List[Tuple[float, float, float]],
+        limit: int = 5,
+        max_distance: Optional[float] = None
+    ) -> List[List[Tuple[CCTVEntry, float]]]:
+        """
+        여러 위치에 대해 가장 가까운 CCTV들을 한 번에 찾음
+        공장 인덱스는 한 번만 조회하고 지점별 k-NN만 반복
+        
+        Args:
+            factory_id: 공장 ID
+            positions: 검색 기준 위치 리스트
+            limit: 지점별 반환할 최대 CCTV 수
+            max_distance: 최대 검색 거리 (None이면 제한 없음)
+            
+        Returns:
+            지점별 (CCTVEntry, 거리) 튜플 리스트 (입력 순서 유지)
+        """
+        index = await spatial_index_manager.get_index(self.db, factory_id)
+        return [index.nearest(position, limit, max_distance) for position in positions]
+    
+    async def find_cctvs_covering_points(
+        self,
+        factory_id: UUID,
+        positions: List[Tuple[float, float, float]],
+        max_distance: float = 50.0,
+        check_occlusion: bool = True
+    ) -> List[List[Tuple[CCTVEntry, float]]]:
+        """
+        여러 위치에 대해 시야각 내에서 볼 수 있는 CCTV들을 한 번에 찾음
+        (지점 × CCTV) 전체를 NumPy 배치 연산으로 판정하고 가시선도 한 번에 레이 캐스팅
+        
+        Args:
+            factory_id: 공장 ID
+            positions: 검색 기준 위치 리스트
+            max_distance: 최대 감지 거리
+            check_occlusion: 설비 가려짐 판정 여부 (OCCLUSION_ENABLED 설정이 우선)
+            
+        Returns:
+            지점별 (CCTVEntry, 거리) 튜플 리스트 (입력 순서 유지)
+        """
+        index = await spatial_index_manager.get_index(self.db, factory_id)
+        return index.covering(
+            positions,
+            max_distance,
+            check_occlusion=check_occlusion and settings.OCCLUSION_ENABLED,
         )
+    
+    async def find_cctvs_in_bounding_boxes(
+        self,
+        factory_id: UUID,
+        boxes: List[Tuple[Tuple[float, float, float], Tuple[float, float, float]]]
+    ) -> List[List[CCTVEntry]]:
+        """
+        여러 영역(Bounding Box)에 대해 영역 내 CCTV들을 한 번에 찾음
         
-        return result.scalars().all()
+        Args:
+            factory_id: 공장 ID
+            boxes: (최소 좌표, 최대 좌표) 튜플 리스트
+            
+        Returns:
+            영역별 CCTVEntry 리스트 (입력 순서 유지)
+        """
+        index = await spatial_index_manager.get_index(self.db, factory_id)
+        return [index.in_box(min_point, max_point) for min_point, max_point in boxes]
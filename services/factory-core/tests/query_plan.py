@@ -0,0 +1,50 @@
+"""
+쿼리 실행 계획 검사 헬퍼
+핫 쿼리를 EXPLAIN 하여 인덱스 없이 테이블 전체를 읽는(순차 스캔) 계획이면 실패
+(서비스마다 테스트를 따로 실행하므로 각 서비스 tests/에 같은 파일을 둠)
+"""
+import json
+import re
+from typing import List
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+# SQLite: 인덱스 없는 전체 스캔 / 인덱스로 해결되지 않은 정렬
+_SQLITE_FULL_SCAN = re.compile(r"^SCAN (TABLE )?\w+$")
+_SQLITE_SORT = "USE TEMP B-TREE FOR ORDER BY"
+
+
+async def explain(session: AsyncSession, statement) -> List[str]:
+    """실행 계획 노드 목록 (SQLite: detail 문자열, PostgreSQL: Node Type + 대상 테이블)"""
+    connection = await session.connection()
+    if connection.dialect.name != "sqlite":
+        # 데이터가 적어도 순차 스캔을 고르지 않도록 - 쓸 수 있는 인덱스가 없을 때만 Seq Scan이 남음
+        await session.execute(text("SET LOCAL enable_seqscan = off"))
+    # 조회 쿼리의 결과 컬럼 타입으로 계획 행을 해석하지 않도록 값을 SQL에 넣어 드라이버로 직접 실행
+    sql = statement.compile(dialect=connection.dialect, compile_kwargs={"literal_binds": True})
+    prefix = "EXPLAIN QUERY PLAN " if connection.dialect.name == "sqlite" else "EXPLAIN (FORMAT JSON) "
+    rows = (await connection.exec_driver_sql(prefix + str(sql))).all()
+    if connection.dialect.name == "sqlite":
+        return [row[-1] for row in rows]
+
+    plan = rows[0][0]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    nodes: List[str] = []
+    pending = [plan[0]["Plan"]]
+    while pending:
+        node = pending.pop()
+        nodes.append(f"{node['Node Type']} {node.get('Relation Name', '')}".strip())
+        pending.extend(node.get("Plans", []))
+    return nodes
+
+
+async def assert_index_scan(session: AsyncSession, statement) -> None:
+    """핫 쿼리가 순차 스캔/전체 정렬로 떨어지면 실행 계획과 함께 실패"""
+    nodes = await explain(session, statement)
+    regressions = [
+        node for node in nodes
+        if _SQLITE_FULL_SCAN.match(node) or node == _SQLITE_SORT or node.startswith("Seq Scan")
+    ]
+    assert not regressions, "인덱스를 사용하지 않는 실행 계획:\n" + "\n".join(nodes)
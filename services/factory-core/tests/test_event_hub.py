@@ -0,0 +1,164 @@
+"""
+SSE 이벤트 허브 단위 테스트
+"""
+import asyncio
+import json
+
+from services.event_hub import EventHub, Subscription, update_coalesce_key
+
+
+def _event(event: str, entity_id: str, value: int = 0) -> str:
+    """테스트용 이벤트 메시지 생성"""
+    return json.dumps({"event": event, "data": {"id": entity_id, "value": value}})
+
+
+class _FakeStreams:
+    """스트림별 큐와 항목 목록으로 Redis Streams를 대신하는 소스 (호출 횟수 기록)"""
+
+    def __init__(self):
+        self.queues = {}
+        self.entries = {}
+        self.read_calls = {}
+        self.range_calls = 0
+
+    def __call__(self, channel: str, last_id):
+        self.read_calls[channel] = self.read_calls.get(channel, 0) + 1
+        queue = self.queues.setdefault(channel, asyncio.Queue())
+
+        async def iterate():
+            yield (self.entries[channel][-1][0] if self.entries.get(channel) else "0-0"), None
+            while True:
+                yield await queue.get()
+
+        return iterate()
+
+    async def replay(self, channel: str, after_id: str):
+        self.range_calls += 1
+        await asyncio.sleep(0)
+        after = tuple(int(part) for part in after_id.split("-"))
+        return [
+            entry for entry in self.entries.get(channel, [])
+            if tuple(int(part) for part in entry[0].split("-")) > after
+        ], False
+
+    async def publish(self, channel: str, entry_id: str, message: str) -> None:
+        self.entries.setdefault(channel, []).append((entry_id, message))
+        await self.queues.setdefault(channel, asyncio.Queue()).put((entry_id, message))
+
+
+class TestSubscription:
+    """클라이언트 버퍼 테스트 클래스"""
+
+    def test_drops_oldest_when_full(self):
+        """버퍼 초과 시 가장 오래된 메시지부터 버리는지 확인"""
+        subscription = Subscription(("ch",), maxsize=3, positions={})
+        for value in range(5):
+            subscription.put("ch", f"{value + 1}-0", str(value))
+
+        assert len(subscription) == 3
+        assert subscription.dropped == 2
+        assert subscription.reset_required
+        assert [item[2] for item in subscription._buffer.values()] == ["2", "3", "4"]
+
+    def test_coalesces_updates_for_same_entity(self):
+        """같은 엔티티 갱신 이벤트는 최신 상태로 교체되고 스트림 ID 순서가 유지되는지 확인"""
+        subscription = Subscription(("ch",), maxsize=10, positions={})
+        messages = [
+            _event("factory_created", "a"),
+            _event("factory_updated", "a", 1),
+            _event("factory_updated", "b", 1),
+            _event("factory_updated", "a", 2),
+        ]
+        for seq, message in enumerate(messages, start=1):
+            subscription.put("ch", f"{seq}-0", message, update_coalesce_key("ch", message))
+
+        assert subscription.coalesced == 1
+        pending = [json.loads(item[2]) for item in subscription._buffer.values()]
+        assert [(p["event"], p["data"]["id"], p["data"]["value"]) for p in pending] == [
+            ("factory_created", "a", 0),
+            ("factory_updated", "b", 1),
+            ("factory_updated", "a", 2),
+        ]
+        assert [item[1] for item in subscription._buffer.values()] == ["1-0", "3-0", "4-0"]
+        assert not subscription.reset_required
+
+    async def test_event_id_tracks_each_stream(self):
+        """여러 스트림 구독 시 이벤트 ID가 스트림별 위치를 모두 담는지 확인"""
+        subscription = Subscription(("factory", "cctv"), maxsize=10, positions={"factory": "5-0"})
+        subscription.put("cctv", "7-0", "c")
+        subscription.put("factory", "4-0", "old")
+
+        assert await subscription.__anext__() == ("5-0,7-0", "c")
+        assert len(subscription) == 0
+
+
+class TestEventHub:
+    """팬아웃 허브 테스트 클래스"""
+
+    async def test_single_upstream_read_per_stream(self):
+        """구독자가 여러 명이어도 스트림 읽기는 하나이고 모든 구독자가 수신하는지 확인"""
+        streams = _FakeStreams()
+        hub = EventHub(source=streams, replay_source=streams.replay, queue_size=16)
+
+        async with hub.subscribe("factory") as first, hub.subscribe("factory", "cctv") as second:
+            assert hub.subscriber_count("factory") == 2
+            await streams.publish("factory", "1-0", "f1")
+            await streams.publish("cctv", "2-0", "c1")
+
+            assert await asyncio.wait_for(first.__anext__(), 1) == ("1-0", "f1")
+            received = {(await asyncio.wait_for(second.__anext__(), 1))[1] for _ in range(2)}
+            assert received == {"f1", "c1"}
+
+        assert streams.read_calls == {"factory": 1, "cctv": 1}
+        assert hub.subscriber_count("factory") == 0
+        await hub.close()
+
+    async def test_slow_consumer_does_not_block_others(self):
+        """느린 구독자 버퍼가 가득 차도 다른 구독자는 모든 메시지를 받는지 확인"""
+        streams = _FakeStreams()
+        hub = EventHub(source=streams, replay_source=streams.replay, queue_size=4)
+
+        async with hub.subscribe("incidents") as slow, hub.subscribe("incidents") as fast:
+            received = []
+            for value in range(10):
+                hub.dispatch("incidents", f"{value + 1}-0", str(value))
+                received.append((await fast.__anext__())[1])
+
+            assert received == [str(value) for value in range(10)]
+            assert slow.dropped == 6
+            assert hub.queue_depth("incidents") == 4
+        await hub.close()
+
+    async def test_replay_from_memory_history(self):
+        """최근 이력 범위 안의 Last-Event-ID는 Redis 조회 없이 재전송되는지 확인"""
+        streams = _FakeStreams()
+        hub = EventHub(source=streams, replay_source=streams.replay, queue_size=16)
+        for seq in range(1, 6):
+            hub.dispatch("factory", f"{seq}-0", f"m{seq}")
+
+        async with hub.subscribe("factory", last_event_id="3-0") as subscription:
+            hub.dispatch("factory", "6-0", "m6")
+            received = [await subscription.__anext__() for _ in range(3)]
+
+        assert received == [("4-0", "m4"), ("5-0", "m5"), ("6-0", "m6")]
+        assert streams.range_calls == 0
+        await hub.close()
+
+    async def test_concurrent_reconnects_share_one_range_query(self):
+        """같은 위치로 동시에 재접속한 클라이언트들이 XRANGE 한 번을 공유하고 중복 없이 받는지 확인"""
+        streams = _FakeStreams()
+        for seq in range(1, 5):
+            streams.entries.setdefault("factory", []).append((f"{seq}-0", f"m{seq}"))
+        hub = EventHub(source=streams, replay_source=streams.replay, queue_size=16)
+
+        async def reconnect():
+            async with hub.subscribe("factory", last_event_id="2-0") as subscription:
+                # 재전송 구간과 겹치는 실시간 메시지는 한 번만 전달
+                subscription.put("factory", "4-0", "m4")
+                return [await subscription.__anext__() for _ in range(2)], len(subscription)
+
+        results = await asyncio.gather(*(reconnect() for _ in range(20)))
+
+        assert streams.range_calls == 1
+        assert results == [([("3-0", "m3"), ("4-0", "m4")], 0)] * 20
+        await hub.close()
@@ -154,6 +154,36 @@ class TestFactoryAPI:
         data = response.json()
         assert isinstance(data, list)
     
+    async def test_get_factory_conditional(self, client: AsyncClient):
+        """ETag가 같으면 304, 레이아웃 수정 후에는 새 ETag로 200"""
+        create_response = await client.post(
+            "/factories/", json={"name": "ETag 테스트", "layout_json": {"zones": [1, 2]}}
+        )
+        factory_id = create_response.json()["id"]
+        
+        response = await client.get(f"/factories/{factory_id}")
+        etag = response.headers["etag"]
+        assert response.status_code == 200
+        assert "must-revalidate" in response.headers["cache-control"]
+        
+        response = await client.get(f"/factories/{factory_id}", headers={"If-None-Match": etag})
+        assert response.status_code == 304
+        assert response.content == b""
+        assert response.headers["etag"] == etag
+        
+        await client.put(f"/factories/{factory_id}/layout", json={"layout_json": {"zones": [1, 2, 3]}})
+        response = await client.get(f"/factories/{factory_id}", headers={"If-None-Match": etag})
+        assert response.status_code == 200
+        assert response.headers["etag"] != etag
+        assert response.json()["layout_json"] == {"zones": [1, 2, 3]}
+        
+        # CCTV 목록도 같은 방식으로 조건부 조회
+        response = await client.get(f"/factories/{factory_id}/cctv-configs")
+        response = await client.get(
+            f"/factories/{factory_id}/cctv-configs", headers={"If-None-Match": response.headers["etag"]}
+        )
+        assert response.status_code == 304
+    
     async def test_health_check(self, client: AsyncClient):
         """향상된 헬스체크 엔드포인트 테스트"""
         response = await client.get("/health")
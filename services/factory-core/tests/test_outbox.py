@@ -0,0 +1,146 @@
+"""
+Outbox 릴레이 단위 테스트
+"""
+import asyncio
+import json
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from models import CCTVConfig, Factory, OutboxEvent
+from services import CCTVEventType, FactoryEventType, RedisService
+from services.outbox import OutboxRelay, add_outbox_event
+from services.redis_service import cctv_to_dict
+from services.spatial_index import SpatialIndexManager
+
+
+class _FakeRedis:
+    """append_events 호출을 기록하고, 지정 횟수만큼 연결 오류를 내는 Redis 대역"""
+
+    def __init__(self, failures: int = 0):
+        self.failures = failures
+        self.batches = []
+
+    async def append_events(self, events):
+        if self.failures:
+            self.failures -= 1
+            raise ConnectionError("redis unavailable")
+        self.batches.append(list(events))
+        return [f"{len(self.batches)}-{index}" for index in range(len(events))]
+
+
+class _SubscriberRedis:
+    """전달한 이벤트를 구독자(공간 인덱스)에 바로 적용하고, gate가 열릴 때까지 전달을 미루는 Redis 대역"""
+
+    def __init__(self, manager: SpatialIndexManager, gate: asyncio.Event = None):
+        self.manager = manager
+        self.gate = gate
+        self.started = asyncio.Event()
+
+    async def append_events(self, events):
+        self.started.set()
+        if self.gate is not None:
+            await self.gate.wait()
+        for stream, payload in events:
+            self.manager.apply_event(stream, payload)
+        return [f"0-{index}" for index in range(len(events))]
+
+
+@pytest.fixture
+def session_factory(test_engine):
+    return async_sessionmaker(test_engine, class_=AsyncSession, expire_on_commit=False)
+
+
+async def _add_events(session_factory, count: int) -> None:
+    async with session_factory() as session:
+        for index in range(count):
+            add_outbox_event(
+                session,
+                RedisService.FACTORY_CHANNEL,
+                FactoryEventType.FACTORY_CREATED,
+                {"id": str(index)},
+            )
+        await session.commit()
+
+
+class TestOutboxRelay:
+    """Outbox 릴레이 테스트 클래스"""
+
+    async def test_relays_in_batches_and_marks_delivered(self, session_factory):
+        """미전달 이벤트를 기록 순서대로 묶어 전달하고 전달 완료로 표시하는지 확인"""
+        redis = _FakeRedis()
+        relay = OutboxRelay(session_factory=session_factory, redis_service=lambda: redis, batch_size=2)
+        await _add_events(session_factory, 3)
+
+        assert await relay.relay_once() == 2
+        assert await relay.relay_once() == 1
+        assert await relay.relay_once() == 0
+
+        payloads = [json.loads(payload) for batch in redis.batches for _, payload in batch]
+        assert [payload["data"]["id"] for payload in payloads] == ["0", "1", "2"]
+        assert payloads[0]["event"] == FactoryEventType.FACTORY_CREATED.value
+        async with session_factory() as session:
+            events = (await session.execute(select(OutboxEvent))).scalars().all()
+        assert all(event.delivered_at is not None for event in events)
+
+    async def test_failure_keeps_events_pending(self, session_factory):
+        """Redis 전달이 실패하면 이벤트를 잃지 않고 다음 시도에서 전달하는지 확인"""
+        redis = _FakeRedis(failures=1)
+        relay = OutboxRelay(session_factory=session_factory, redis_service=lambda: redis, batch_size=10)
+        await _add_events(session_factory, 2)
+
+        with pytest.raises(ConnectionError):
+            await relay.relay_once()
+        async with session_factory() as session:
+            events = (await session.execute(select(OutboxEvent))).scalars().all()
+        assert [event.attempts for event in events] == [1, 1]
+        assert all(event.delivered_at is None for event in events)
+
+        assert await relay.relay_once() == 2
+        assert len(redis.batches) == 1
+
+    async def test_concurrent_relays_keep_index_consistent(self, session_factory):
+        """두 프로세스의 릴레이가 수정/삭제 이벤트를 뒤바뀐 순서로 전달해도 삭제된 CCTV가 인덱스에 되살아나지 않는지 확인"""
+        async with session_factory() as session:
+            factory = Factory(name="공장")
+            session.add(factory)
+            await session.flush()
+            cctv = CCTVConfig(factory_id=factory.id, name="CCTV", position_x=0.0, position_y=3.0, position_z=0.0)
+            session.add(cctv)
+            await session.commit()
+
+        # 다른 인스턴스가 보는 인덱스 (이벤트 origin이 이 프로세스가 아니어야 반영됨)
+        manager = SpatialIndexManager(session_factory=session_factory)
+        async with session_factory() as session:
+            index = await manager.get_index(session, factory.id)
+        assert cctv.id in index.cctvs
+
+        async def record(event_type):
+            async with session_factory() as session:
+                session.add(OutboxEvent(
+                    stream=RedisService.CCTV_CHANNEL,
+                    payload=json.dumps({"event": event_type.value, "data": cctv_to_dict(cctv), "origin": "writer"}),
+                ))
+                await session.commit()
+
+        gate = asyncio.Event()
+        first = _SubscriberRedis(manager, gate)
+        second = _SubscriberRedis(manager)
+        relay_a = OutboxRelay(session_factory=session_factory, redis_service=lambda: first, batch_size=10)
+        relay_b = OutboxRelay(session_factory=session_factory, redis_service=lambda: second, batch_size=10)
+
+        # A가 수정 이벤트를 잠근 채 전달하는 동안 삭제가 커밋되고, B가 먼저 삭제까지 전달
+        await record(CCTVEventType.CCTV_UPDATED)
+        task_a = asyncio.create_task(relay_a.relay_once())
+        await first.started.wait()
+        await record(CCTVEventType.CCTV_DELETED)
+        assert await relay_b.relay_once() >= 1
+        assert cctv.id not in index.cctvs
+
+        gate.set()
+        assert await task_a == 1
+        assert await relay_a.relay_once() == 0
+        assert await relay_b.relay_once() == 0
+        assert cctv.id not in index.cctvs
+        assert index.within_radius((0.0, 3.0, 0.0), 1.0) == []
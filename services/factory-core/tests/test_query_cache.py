@@ -0,0 +1,178 @@
+"""
+조회 결과 2단 캐시 테스트
+"""
+import json
+from uuid import uuid4
+
+from httpx import AsyncClient
+
+from services.query_optimizer import CCTV, EQUIPMENT, FACTORY, QueryCache
+
+
+class _FakeRedis:
+    """RedisService 캐시 명령을 딕셔너리로 대신하는 저장소 (Lua 스크립트와 같은 규칙)"""
+
+    def __init__(self):
+        self.values = {}
+        self.tags = {}
+        self.generations = {}
+        self.fail = False
+
+    async def cache_get(self, key, generation_key):
+        if self.fail:
+            raise ConnectionError("redis down")
+        return self.values.get(key), self.generations.get(generation_key)
+
+    async def cache_set(self, key, value, ttl, tag_key, generation_key, generation):
+        if (self.generations.get(generation_key) or "") != (generation or ""):
+            return False
+        self.values[key] = value
+        self.tags.setdefault(tag_key, set()).add(key)
+        return True
+
+    async def cache_invalidate(self, tags, ttl):
+        removed = 0
+        for tag_key, generation_key in tags:
+            self.generations[generation_key] = str(int(self.generations.get(generation_key) or 0) + 1)
+            for key in self.tags.pop(tag_key, set()):
+                removed += self.values.pop(key, None) is not None
+        return removed
+
+    async def delete_pattern(self, pattern):
+        removed = len(self.values)
+        self.values.clear()
+        self.tags.clear()
+        return removed
+
+
+class _Loader:
+    """호출 횟수를 세는 loader"""
+
+    def __init__(self, value):
+        self.value = value
+        self.calls = 0
+
+    async def __call__(self):
+        self.calls += 1
+        return self.value
+
+
+def _cache(redis, **kwargs) -> QueryCache:
+    return QueryCache(redis_service=redis, enabled=True, **kwargs)
+
+
+class TestQueryCache:
+    """QueryCache 단위 테스트 클래스"""
+
+    async def test_local_then_redis_hit(self):
+        """같은 인스턴스는 메모리, 다른 인스턴스는 Redis에서 적중"""
+        redis = _FakeRedis()
+        factory_id = uuid4()
+        loader = _Loader({"name": "A"})
+
+        first, second = _cache(redis), _cache(redis)
+        assert await first.get_or_load(FACTORY, factory_id, {}, loader) == {"name": "A"}
+        assert await first.get_or_load(FACTORY, factory_id, {}, loader) == {"name": "A"}
+        assert await second.get_or_load(FACTORY, factory_id, {}, loader) == {"name": "A"}
+        assert loader.calls == 1
+
+        # 파라미터가 다르면 다른 항목
+        await first.get_or_load(FACTORY, factory_id, {"limit": 10}, loader)
+        assert loader.calls == 2
+
+    async def test_invalidate_is_scoped_to_factory_and_namespace(self):
+        """무효화는 해당 공장/네임스페이스 항목만 제거"""
+        redis = _FakeRedis()
+        cache = _cache(redis)
+        factory_id, other_id = uuid4(), uuid4()
+        cctvs, equipment, other = _Loader([1]), _Loader([2]), _Loader([3])
+        await cache.get_or_load(CCTV, factory_id, {}, cctvs)
+        await cache.get_or_load(EQUIPMENT, factory_id, {}, equipment)
+        await cache.get_or_load(CCTV, other_id, {}, other)
+
+        await cache.invalidate(factory_id, (CCTV,))
+        await cache.get_or_load(CCTV, factory_id, {}, cctvs)
+        await cache.get_or_load(EQUIPMENT, factory_id, {}, equipment)
+        await cache.get_or_load(CCTV, other_id, {}, other)
+
+        assert (cctvs.calls, equipment.calls, other.calls) == (2, 1, 1)
+
+    async def test_event_invalidates_other_instance_memory(self):
+        """다른 인스턴스의 변경 이벤트 수신 시 메모리 캐시 무효화"""
+        redis = _FakeRedis()
+        writer, reader = _cache(redis), _cache(redis)
+        factory_id = uuid4()
+        await reader.get_or_load(FACTORY, factory_id, {}, _Loader({"name": "old"}))
+
+        await writer.invalidate_event("factory_updated", factory_id)
+        new = _Loader({"name": "new"})
+        # 이벤트 전에는 메모리 캐시가 남아 있음
+        assert await reader.get_or_load(FACTORY, factory_id, {}, new) == {"name": "old"}
+
+        reader.apply_event(
+            "factory:events",
+            json.dumps({"event": "factory_updated", "data": {"id": str(factory_id)}}),
+        )
+        assert await reader.get_or_load(FACTORY, factory_id, {}, new) == {"name": "new"}
+
+    async def test_invalidation_during_load_is_not_stored(self):
+        """조회 중 무효화되면 옛 결과를 저장하지 않음"""
+        redis = _FakeRedis()
+        cache = _cache(redis)
+        factory_id = uuid4()
+
+        async def racing_loader():
+            await cache.invalidate(factory_id, (CCTV,))
+            return ["stale"]
+
+        assert await cache.get_or_load(CCTV, factory_id, {}, racing_loader) == ["stale"]
+        assert redis.values == {}
+        fresh = _Loader(["fresh"])
+        assert await cache.get_or_load(CCTV, factory_id, {}, fresh) == ["fresh"]
+        assert fresh.calls == 1
+
+    async def test_lru_capacity(self):
+        """메모리 캐시 최대 항목 수를 넘으면 가장 오래 쓰지 않은 항목 제거"""
+        cache = _cache(_FakeRedis(), local_max_entries=2)
+        factory_id = uuid4()
+        loaders = [_Loader(index) for index in range(3)]
+        await cache.get_or_load(FACTORY, factory_id, {"n": 0}, loaders[0])
+        await cache.get_or_load(FACTORY, factory_id, {"n": 1}, loaders[1])
+        await cache.get_or_load(FACTORY, factory_id, {"n": 0}, loaders[0])
+        await cache.get_or_load(FACTORY, factory_id, {"n": 2}, loaders[2])
+
+        assert len(cache._local) == 2
+        assert {entry[2] for entry in cache._local._entries.values()} == {0, 2}
+
+    async def test_redis_failure_falls_back_to_loader(self):
+        """Redis 오류 시 DB 조회로 응답하고 재시도 간격 동안 Redis 단계 생략"""
+        redis = _FakeRedis()
+        redis.fail = True
+        cache = _cache(redis, local_max_entries=0)
+        loader = _Loader({"ok": True})
+
+        assert await cache.get_or_load(FACTORY, uuid4(), {}, loader) == {"ok": True}
+        assert loader.calls == 1
+        assert not cache._redis_available()
+
+
+class TestCachedEndpoints:
+    """캐시 적용 API 테스트 클래스"""
+
+    async def test_mutations_invalidate_cached_reads(self, client: AsyncClient):
+        """공장 수정/CCTV 생성 직후 조회에 변경 내용이 반영되는지 확인"""
+        response = await client.post("/factories/", json={"name": "캐시 공장", "layout_json": {}})
+        factory_id = response.json()["id"]
+
+        assert (await client.get(f"/factories/{factory_id}")).json()["name"] == "캐시 공장"
+        assert (await client.get(f"/factories/{factory_id}/cctv-configs")).json() == []
+
+        await client.put(f"/factories/{factory_id}", json={"name": "변경된 공장"})
+        await client.post(
+            "/cctv-configs/",
+            json={"factory_id": factory_id, "name": "CAM-1", "position_x": 0, "position_y": 3, "position_z": 0},
+        )
+
+        assert (await client.get(f"/factories/{factory_id}")).json()["name"] == "변경된 공장"
+        cctvs = (await client.get(f"/factories/{factory_id}/cctv-configs")).json()
+        assert [cctv["name"] for cctv in cctvs] == ["CAM-1"]
@@ -0,0 +1,95 @@
+"""
+CCTV/설비 핫 쿼리 실행 계획 회귀 테스트
+시드 데이터에서 공장별 필터 쿼리가 순차 스캔으로 떨어지지 않는지 확인
+"""
+import random
+import uuid
+
+import pytest
+from sqlalchemy import insert, select, text
+
+from models import CCTVConfig, Equipment, EquipmentStatus, EquipmentType, Factory
+from tests.query_plan import assert_index_scan
+
+FACTORY_COUNT = 20
+ROWS_PER_FACTORY = 50
+
+
+@pytest.fixture
+async def factory_ids(test_session):
+    """공장 여러 개에 CCTV/설비를 분산 저장하고 통계를 갱신, 공장 ID 목록 반환"""
+    rng = random.Random(0)
+    ids = [uuid.uuid4() for _ in range(FACTORY_COUNT)]
+    await test_session.execute(
+        insert(Factory),
+        [{"id": factory_id, "name": f"factory-{index}"} for index, factory_id in enumerate(ids)],
+    )
+    await test_session.execute(
+        insert(CCTVConfig),
+        [
+            {
+                "id": uuid.uuid4(),
+                "factory_id": factory_id,
+                "name": f"cctv-{index}",
+                "position_x": 0.0,
+                "position_y": 0.0,
+                "position_z": 0.0,
+                "is_active": rng.random() < 0.9,
+            }
+            for factory_id in ids
+            for index in range(ROWS_PER_FACTORY)
+        ],
+    )
+    await test_session.execute(
+        insert(Equipment),
+        [
+            {
+                "id": uuid.uuid4(),
+                "factory_id": factory_id,
+                "name": f"equipment-{index}",
+                "type": rng.choice(list(EquipmentType)),
+                "status": rng.choice(list(EquipmentStatus)),
+                "is_active": rng.random() < 0.9,
+            }
+            for factory_id in ids
+            for index in range(ROWS_PER_FACTORY)
+        ],
+    )
+    await test_session.commit()
+    await test_session.execute(text("ANALYZE"))
+    return ids
+
+
+class TestFactoryQueryPlans:
+    """CCTV/설비 조회 실행 계획 테스트 클래스"""
+
+    async def test_active_cctvs_by_factory(self, test_session, factory_ids):
+        """공장별 활성 CCTV (공간 인덱스 로드)"""
+        query = (
+            select(CCTVConfig)
+            .where(CCTVConfig.factory_id == factory_ids[0])
+            .where(CCTVConfig.is_active == True)
+        )
+        await assert_index_scan(test_session, query)
+
+    async def test_equipment_filters(self, test_session, factory_ids):
+        """공장별 유형/상태/활성 설비 목록"""
+        query = (
+            select(Equipment)
+            .where(Equipment.factory_id == factory_ids[0])
+            .where(Equipment.type == EquipmentType.ROBOT_ARM)
+            .where(Equipment.status == EquipmentStatus.RUNNING)
+            .where(Equipment.is_active == True)
+            .limit(100)
+        )
+        await assert_index_scan(test_session, query)
+
+    async def test_equipment_cursor_page(self, test_session, factory_ids):
+        """공장별 설비 생성순 목록"""
+        query = (
+            select(Equipment)
+            .where(Equipment.factory_id == factory_ids[0])
+            .order_by(Equipment.created_at, Equipment.id)
+            .limit(100)
+        )
+        await assert_index_scan(test_session, query)
@@ -0,0 +1,131 @@
+"""
+공간 쿼리 배치 API 테스트
+"""
+from uuid import uuid4
+
+import pytest
+from httpx import AsyncClient
+
+from routers.spatial import MAX_BATCH_SIZE
+
+BATCH_ENDPOINTS = (
+    "/spatial/batch/nearest-cctvs",
+    "/spatial/batch/covering-cctvs",
+    "/spatial/batch/cctvs-in-area",
+)
+
+
+def _point(x: float, y: float, z: float) -> dict:
+    return {"x": x, "y": y, "z": z}
+
+
+def _box(low: tuple, high: tuple) -> dict:
+    return {"min_point": _point(*low), "max_point": _point(*high)}
+
+
+def _batch_body(endpoint: str, factory_id: str, count: int) -> dict:
+    """엔드포인트별 요청 본문 (지점/영역 count개)"""
+    if endpoint.endswith("cctvs-in-area"):
+        return {"factory_id": factory_id, "boxes": [_box((0, 0, 0), (1, 1, 1))] * count}
+    return {"factory_id": factory_id, "positions": [_point(0, 0, 0)] * count}
+
+
+async def _create_factory(client: AsyncClient, cctv_positions) -> tuple:
+    """공장과 기본 방향(+Z)을 바라보는 CCTV 생성 → (공장 ID, CCTV ID 리스트)"""
+    factory_id = (await client.post("/factories/", json={"name": "공간 쿼리 공장", "layout_json": {}})).json()["id"]
+    cctv_ids = []
+    for index, (x, y, z) in enumerate(cctv_positions):
+        response = await client.post(
+            "/cctv-configs/",
+            json={"factory_id": factory_id, "name": f"CAM-{index}", "position_x": x, "position_y": y, "position_z": z},
+        )
+        cctv_ids.append(response.json()["id"])
+    return factory_id, cctv_ids
+
+
+@pytest.mark.asyncio
+class TestSpatialBatchAPI:
+    """배치 공간 쿼리 API 테스트 클래스"""
+
+    async def test_nearest_batch_keeps_order_and_distances(self, client: AsyncClient):
+        """결과가 입력 순서와 같고, 같은 CCTV 응답을 재사용해도 지점별 거리가 유지되는지 확인"""
+        factory_id, (origin, far) = await _create_factory(client, [(0, 0, 0), (0, 0, 20)])
+
+        response = await client.post("/spatial/batch/nearest-cctvs", json={
+            "factory_id": factory_id,
+            "positions": [_point(0, 0, 10), _point(0, 0, 3), _point(0, 0, 18), _point(0, 0, 7)],
+            "limit": 1,
+        })
+
+        assert response.status_code == 200
+        results = response.json()
+        assert [[hit["cctv"]["id"] for hit in hits] for hits in results] == [[origin], [origin], [far], [origin]]
+        assert [[hit["distance"] for hit in hits] for hits in results] == [[10.0], [3.0], [2.0], [7.0]]
+
+        response = await client.post("/spatial/batch/nearest-cctvs", json={
+            "factory_id": factory_id,
+            "positions": [_point(0, 0, 12), _point(0, 0, 1)],
+            "limit": 2,
+        })
+        results = response.json()
+        assert [[(hit["cctv"]["id"], hit["distance"]) for hit in hits] for hits in results] == [
+            [(far, 8.0), (origin, 12.0)],
+            [(origin, 1.0), (far, 19.0)],
+        ]
+
+    async def test_covering_batch_keeps_order(self, client: AsyncClient):
+        """지점별 시야 포함 CCTV가 입력 순서대로 거리순 반환되는지 확인"""
+        factory_id, (far, near) = await _create_factory(client, [(0, 0, -20), (0, 0, -5)])
+
+        response = await client.post("/spatial/batch/covering-cctvs", json={
+            "factory_id": factory_id,
+            "positions": [_point(0, 0, 100), _point(0, 0, 0), _point(0, 0, -10)],
+            "max_distance": 50.0,
+            "check_occlusion": False,
+        })
+
+        assert response.status_code == 200
+        results = response.json()
+        assert [[(hit["cctv"]["id"], hit["distance"]) for hit in hits] for hits in results] == [
+            [],
+            [(near, 5.0), (far, 20.0)],
+            [(far, 10.0)],
+        ]
+
+    async def test_bounding_box_batch_keeps_order(self, client: AsyncClient):
+        """영역별 CCTV가 입력 순서대로 반환되는지 확인"""
+        factory_id, (first, second) = await _create_factory(client, [(0, 3, 0), (10, 3, 10)])
+
+        response = await client.post("/spatial/batch/cctvs-in-area", json={
+            "factory_id": factory_id,
+            "boxes": [
+                _box((9, 0, 9), (11, 5, 11)),
+                _box((-1, 0, -1), (1, 5, 1)),
+                _box((50, 0, 50), (60, 5, 60)),
+                _box((-1, 0, -1), (11, 5, 11)),
+            ],
+        })
+
+        assert response.status_code == 200
+        results = [[cctv["id"] for cctv in cctvs] for cctvs in response.json()]
+        assert results[:3] == [[second], [first], []]
+        assert sorted(results[3]) == sorted([first, second])
+
+    async def test_batch_size_limits(self, client: AsyncClient):
+        """빈 배치와 MAX_BATCH_SIZE 초과 배치는 422로 거부하는지 확인"""
+        factory_id, _ = await _create_factory(client, [])
+
+        for endpoint in BATCH_ENDPOINTS:
+            response = await client.post(endpoint, json=_batch_body(endpoint, factory_id, 0))
+            assert response.status_code == 422, endpoint
+            response = await client.post(endpoint, json=_batch_body(endpoint, factory_id, MAX_BATCH_SIZE + 1))
+            assert response.status_code == 422, endpoint
+            response = await client.post(endpoint, json=_batch_body(endpoint, factory_id, MAX_BATCH_SIZE))
+            assert response.status_code == 200, endpoint
+            assert len(response.json()) == MAX_BATCH_SIZE
+
+    async def test_unknown_factory(self, client: AsyncClient):
+        """존재하지 않는 공장은 404를 반환하는지 확인"""
+        for endpoint in BATCH_ENDPOINTS:
+            response = await client.post(endpoint, json=_batch_body(endpoint, str(uuid4()), 1))
+            assert response.status_code == 404, endpoint
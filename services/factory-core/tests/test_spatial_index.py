@@ -0,0 +1,502 @@
+"""
+공간 인덱스 단위 테스트
+"""
+import json
+import math
+import random
+import uuid
+from datetime import datetime
+
+import numpy as np
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from models import CCTVConfig, Factory
+from schemas import CCTVConfigResponse
+from services.coverage_grid import CoverageGrid
+from services.fov_engine import CameraArrays
+from services.occlusion import EquipmentBVH, EquipmentEntry
+from services.outbox import INSTANCE_ID
+from services.rtree import RTree3D, point_box
+from services.spatial_index import CCTVEntry, FactorySpatialIndex, SpatialIndexManager
+from services.spatial_service import SpatialService
+
+
+def _random_points(count: int, seed: int = 42) -> dict:
+    """테스트용 무작위 좌표 생성 (일부는 같은 높이에 배치)"""
+    rng = random.Random(seed)
+    return {
+        key: (rng.uniform(-100, 100), rng.choice([3.0, rng.uniform(0, 10)]), rng.uniform(-100, 100))
+        for key in range(count)
+    }
+
+
+def _make_cctv(factory_id, position, rotation=(0.0, 0.0, 0.0), fov=75.0, is_active=True):
+    """테스트용 CCTV 스냅샷 생성"""
+    now = datetime.utcnow()
+    return CCTVEntry(
+        id=uuid.uuid4(),
+        factory_id=factory_id,
+        name="CCTV",
+        position_x=position[0],
+        position_y=position[1],
+        position_z=position[2],
+        rotation_x=rotation[0],
+        rotation_y=rotation[1],
+        rotation_z=rotation[2],
+        fov=fov,
+        is_active=is_active,
+        created_at=now,
+        updated_at=now,
+    )
+
+
+def _make_equipment(factory_id, position, scale=(1.0, 1.0, 1.0), rotation=(0.0, 0.0, 0.0)):
+    """테스트용 설비 스냅샷 생성"""
+    return EquipmentEntry(
+        id=uuid.uuid4(),
+        factory_id=factory_id,
+        position_x=position[0],
+        position_y=position[1],
+        position_z=position[2],
+        rotation_x=rotation[0],
+        rotation_y=rotation[1],
+        rotation_z=rotation[2],
+        scale_x=scale[0],
+        scale_y=scale[1],
+        scale_z=scale[2],
+        is_active=True,
+    )
+
+
+class TestRTree3D:
+    """3D R-Tree 테스트 클래스"""
+
+    def test_bulk_load_knn_matches_brute_force(self):
+        """STR 벌크 로딩 후 k-NN 결과가 전수 탐색과 일치하는지 확인"""
+        points = _random_points(2000)
+        tree = RTree3D.bulk_load((key, point_box(p)) for key, p in points.items())
+
+        assert len(tree) == len(points)
+        assert tree.height > 1
+
+        query = (12.5, 1.0, -30.0)
+        expected = sorted(math.dist(query, p) for p in points.values())[:10]
+        result = tree.nearest(query, k=10)
+
+        assert [round(d, 9) for _, d in result] == [round(d, 9) for d in expected]
+
+    def test_radius_and_box_queries(self):
+        """반경 및 경계 상자 쿼리 검증"""
+        points = _random_points(1500, seed=7)
+        tree = RTree3D.bulk_load((key, point_box(p)) for key, p in points.items())
+
+        center = (0.0, 5.0, 0.0)
+        expected_radius = {k for k, p in points.items() if math.dist(center, p) <= 25.0}
+        assert {k for k, _ in tree.search_radius(center, 25.0)} == expected_radius
+
+        low, high = (-20.0, 0.0, -40.0), (30.0, 4.0, 10.0)
+        expected_box = {
+            k for k, p in points.items()
+            if all(low[i] <= p[i] <= high[i] for i in range(3))
+        }
+        assert set(tree.search_box(low, high)) == expected_box
+
+    def test_insert_and_delete(self):
+        """삽입/삭제 반복 후에도 쿼리 결과가 정확한지 확인"""
+        rng = random.Random(3)
+        tree = RTree3D(max_entries=8)
+        points = {}
+        for key in range(800):
+            points[key] = (rng.uniform(-50, 50), 3.0, rng.uniform(-50, 50))
+            tree.insert_point(key, points[key])
+
+        for key in rng.sample(sorted(points), 500):
+            assert tree.delete(key) is True
+            del points[key]
+        assert tree.delete(-1) is False
+
+        # 기존 키 재삽입은 위치 갱신으로 처리
+        moved_key = next(iter(points))
+        points[moved_key] = (100.0, 3.0, 100.0)
+        tree.insert_point(moved_key, points[moved_key])
+
+        assert len(tree) == len(points)
+        query = (10.0, 3.0, 10.0)
+        expected = sorted(points, key=lambda k: math.dist(query, points[k]))[:15]
+        assert [k for k, _ in tree.nearest(query, k=15)] == expected
+        assert tree.nearest(query, k=5, max_distance=0.0001) == []
+
+    def test_empty_tree(self):
+        """빈 트리 쿼리"""
+        tree = RTree3D.bulk_load([])
+        assert tree.nearest((0, 0, 0), k=3) == []
+        assert tree.search_radius((0, 0, 0), 10) == []
+        assert tree.search_box((0, 0, 0), (1, 1, 1)) == []
+
+
+class TestFactorySpatialIndex:
+    """공장 공간 인덱스 테스트 클래스"""
+
+    def test_index_tracks_active_cctvs(self):
+        """비활성 CCTV 제외 및 upsert/remove 동기화 확인"""
+        factory_id = uuid.uuid4()
+        active = _make_cctv(factory_id, (0.0, 3.0, 0.0))
+        inactive = _make_cctv(factory_id, (1.0, 3.0, 1.0), is_active=False)
+        index = FactorySpatialIndex(factory_id, [active, inactive])
+
+        assert len(index) == 1
+        assert index.nearest((0.0, 0.0, 0.0), 5)[0][0].id == active.id
+
+        active.is_active = False
+        index.upsert(active)
+        assert len(index) == 0
+
+        moved = _make_cctv(factory_id, (5.0, 3.0, 5.0))
+        index.upsert(moved)
+        assert [c.id for c in index.in_box((4, 0, 4), (6, 5, 6))] == [moved.id]
+        index.remove(moved.id)
+        assert index.within_radius((5.0, 3.0, 5.0), 1.0) == []
+
+    def test_entry_serializes_to_response(self):
+        """인덱스 스냅샷이 응답 스키마로 변환되는지 확인"""
+        entry = _make_cctv(uuid.uuid4(), (1.0, 2.0, 3.0))
+        response = CCTVConfigResponse.model_validate(entry)
+        assert response.id == entry.id
+        assert response.position_z == 3.0
+
+
+class TestSpatialIndexManager:
+    """공장별 인덱스 레지스트리 테스트 클래스"""
+
+    async def _add_factory(self, session, position=(0.0, 3.0, 0.0)):
+        factory = Factory(name="공장")
+        session.add(factory)
+        await session.flush()
+        session.add(CCTVConfig(
+            factory_id=factory.id, name="CCTV",
+            position_x=position[0], position_y=position[1], position_z=position[2],
+        ))
+        await session.commit()
+        return factory
+
+    @staticmethod
+    def _event(event: str, data: dict, origin: str = "other-instance") -> str:
+        return json.dumps({"event": event, "data": data, "origin": origin})
+
+    async def test_remote_events_apply_incrementally(self, test_session):
+        """다른 인스턴스의 CCTV/설비 이벤트를 인덱스를 버리지 않고 페이로드로 반영하는지 확인"""
+        manager = SpatialIndexManager()
+        factory = await self._add_factory(test_session)
+        index = await manager.get_index(test_session, factory.id)
+        cctv_id, equipment_id = uuid.uuid4(), uuid.uuid4()
+        cctv = {
+            "id": str(cctv_id), "factory_id": str(factory.id), "name": "CCTV",
+            "position_x": 10.0, "position_y": 3.0, "position_z": 10.0,
+            "rotation_x": None, "rotation_y": None, "rotation_z": None,
+            "fov": 90.0, "is_active": True, "created_at": None, "updated_at": datetime.now().isoformat(),
+        }
+
+        manager.apply_event("factory:cctv:events", self._event("cctv_created", cctv))
+        assert manager.is_loaded(factory.id)
+        assert await manager.get_index(test_session, factory.id) is index
+        assert len(index) == 2
+        assert [entry.id for entry, _ in index.within_radius((10.0, 3.0, 10.0), 1.0)] == [cctv_id]
+
+        manager.apply_event("factory:cctv:events", self._event("cctv_updated", {**cctv, "position_x": -10.0}))
+        assert [entry.id for entry, _ in index.within_radius((-10.0, 3.0, 10.0), 1.0)] == [cctv_id]
+        assert index.within_radius((10.0, 3.0, 10.0), 1.0) == []
+
+        equipment = {
+            "id": str(equipment_id), "factory_id": str(factory.id), "name": "설비",
+            "type": "robot_arm", "status": "normal",
+            "position_x": 0.0, "position_y": 1.0, "position_z": 0.0,
+            "rotation_x": 0.0, "rotation_y": 0.0, "rotation_z": 0.0,
+            "scale_x": 2.0, "scale_y": 2.0, "scale_z": 2.0, "is_active": True,
+        }
+        manager.apply_event("factory:equipment:events", self._event("equipment_created", equipment))
+        assert len(index.occluders) == 1
+        manager.apply_event("factory:equipment:events", self._event("equipment_deleted", equipment))
+        assert len(index.occluders) == 0
+
+        manager.apply_event("factory:cctv:events", self._event("cctv_deleted", cctv))
+        assert len(index) == 1
+
+    async def test_own_and_factory_events(self, test_session):
+        """자기 인스턴스 이벤트는 무시하고, 공장 삭제 이벤트는 해당 공장 인덱스만 버리는지 확인"""
+        manager = SpatialIndexManager()
+        first, second = await self._add_factory(test_session), await self._add_factory(test_session)
+        index = await manager.get_index(test_session, first.id)
+        await manager.get_index(test_session, second.id)
+
+        cctv = {
+            "id": str(uuid.uuid4()), "factory_id": str(first.id), "name": "CCTV",
+            "position_x": 10.0, "position_y": 3.0, "position_z": 10.0, "is_active": True,
+        }
+        manager.apply_event("factory:cctv:events", self._event("cctv_created", cctv, origin=INSTANCE_ID))
+        assert len(index) == 1
+
+        manager.apply_event("factory:events", self._event("factory_updated", {"id": str(first.id)}))
+        assert manager.is_loaded(first.id)
+
+        manager.apply_event("factory:events", self._event("factory_deleted", {"id": str(second.id)}))
+        assert manager.is_loaded(first.id)
+        assert not manager.is_loaded(second.id)
+
+    async def test_rebuild_swaps_in_fresh_index(self, test_engine, test_session):
+        """재구성이 끝날 때까지 기존 인덱스로 응답하고, 끝나면 DB 상태로 새로 만든 인덱스로 교체하는지 확인"""
+        session_factory = async_sessionmaker(test_engine, class_=AsyncSession, expire_on_commit=False)
+        manager = SpatialIndexManager(session_factory=session_factory)
+        factory = await self._add_factory(test_session)
+        old = await manager.get_index(test_session, factory.id)
+
+        # 이벤트 없이 DB에 반영된 변경 (유실된 이벤트)
+        test_session.add(CCTVConfig(factory_id=factory.id, name="CCTV", position_x=5.0, position_y=3.0, position_z=5.0))
+        await test_session.commit()
+        assert await manager.get_index(test_session, factory.id) is old
+        assert len(old) == 1
+
+        assert await manager.rebuild(factory.id)
+        new = await manager.get_index(test_session, factory.id)
+        assert new is not old
+        assert len(new) == 2
+
+
+class TestCameraArrays:
+    """벡터화 FOV 판정 테스트 클래스"""
+
+    def test_vectorized_matches_scalar(self):
+        """배치 판정 결과가 스칼라 is_point_in_fov와 동일한지 확인"""
+        rng = random.Random(11)
+        factory_id = uuid.uuid4()
+        cctvs = [
+            _make_cctv(
+                factory_id,
+                (rng.uniform(-40, 40), rng.uniform(0, 8), rng.uniform(-40, 40)),
+                # 정규화 범위를 벗어난 회전값도 스칼라 경로와 같은 방식으로 처리되어야 함
+                (rng.uniform(-1.5, 1.5), rng.uniform(-10, 10), 0.0),
+                rng.uniform(30, 120),
+            )
+            for _ in range(300)
+        ]
+        points = [(rng.uniform(-50, 50), rng.uniform(0, 5), rng.uniform(-50, 50)) for _ in range(200)]
+        # 카메라 바로 아래/위 지점 (수평 거리 0)
+        points.append((cctvs[0].position_x, 0.0, cctvs[0].position_z))
+
+        arrays = CameraArrays(cctvs)
+        mask, _ = arrays.evaluate(np.array(points), 30.0)
+
+        for p_idx, point in enumerate(points):
+            for c_idx, cctv in enumerate(cctvs):
+                expected = SpatialService.is_point_in_fov(
+                    cctv.position, cctv.rotation, cctv.fov, point, 30.0
+                )
+                assert bool(mask[p_idx, c_idx]) == expected
+
+    def test_covering_sorted_by_distance(self):
+        """지점별 결과가 거리순으로 정렬되는지 확인"""
+        factory_id = uuid.uuid4()
+        far = _make_cctv(factory_id, (0.0, 0.0, -20.0))
+        near = _make_cctv(factory_id, (0.0, 0.0, -5.0))
+        behind = _make_cctv(factory_id, (0.0, 0.0, 5.0))
+        arrays = CameraArrays([far, behind, near])
+
+        results = arrays.covering([(0.0, 0.0, 0.0), (0.0, 0.0, 100.0)], 50.0)
+
+        assert [c.id for c, _ in results[0]] == [near.id, far.id]
+        assert [d for _, d in results[0]] == [5.0, 20.0]
+        assert results[1] == []
+        assert CameraArrays([]).covering([(0.0, 0.0, 0.0)], 50.0) == [[]]
+
+
+class TestCoverageGrid:
+    """커버리지 복셀 그리드 테스트 클래스"""
+
+    @staticmethod
+    def _cameras(factory_id, count, seed):
+        rng = random.Random(seed)
+        return [
+            _make_cctv(
+                factory_id,
+                (rng.uniform(-60, 60), rng.uniform(0, 8), rng.uniform(-60, 60)),
+                (rng.uniform(-1.2, 1.2), rng.uniform(-math.pi, math.pi), 0.0),
+                rng.uniform(30, 120),
+            )
+            for _ in range(count)
+        ]
+
+    @staticmethod
+    def _assert_same(grid, cctvs, points, max_distance):
+        """그리드 후보 정밀 판정 결과가 전체 배치 판정과 동일한지 확인"""
+        arrays = CameraArrays(cctvs)
+        expected = arrays.covering(points, max_distance)
+        for point, hits in zip(points, expected):
+            candidates = grid.candidates(point, max_distance)
+            if candidates is None:
+                continue
+            assert arrays.covering_candidates(point, candidates, max_distance) == hits
+
+    def test_candidates_match_full_evaluation(self):
+        """그리드가 시야 포함 CCTV를 누락하지 않는지 확인"""
+        rng = random.Random(5)
+        factory_id = uuid.uuid4()
+        cctvs = self._cameras(factory_id, 150, seed=5)
+        grid = CoverageGrid(factory_id, voxel_size=2.0, max_distance=50.0, min_y=-5.0, max_y=20.0)
+        grid.rebuild(cctvs)
+        points = [(rng.uniform(-80, 80), rng.uniform(0, 5), rng.uniform(-80, 80)) for _ in range(300)]
+
+        self._assert_same(grid, cctvs, points, 50.0)
+        self._assert_same(grid, cctvs, points, 20.0)
+        # 그리드 기준 거리보다 먼 조회와 높이 범위 밖 지점은 판단 불가
+        assert grid.candidates((0.0, 1.0, 0.0), 80.0) is None
+        assert grid.candidates((0.0, 50.0, 0.0), 50.0) is None
+        assert grid.candidates((1000.0, 1.0, 1000.0), 50.0) == []
+        grid.close()
+
+    def test_incremental_update(self):
+        """이동/삭제/범위 밖 추가 후에도 결과가 일치하는지 확인"""
+        rng = random.Random(9)
+        factory_id = uuid.uuid4()
+        cctvs = self._cameras(factory_id, 60, seed=9)
+        grid = CoverageGrid(factory_id, voxel_size=2.0, max_distance=30.0, min_y=-5.0, max_y=20.0)
+        grid.rebuild(cctvs)
+        cells_before = grid.cell_count
+
+        cctvs[0].position_x, cctvs[0].rotation_y = -10.0, 2.5
+        grid.upsert(cctvs[0])
+        grid.remove(cctvs[1].id)
+        del cctvs[1]
+        assert grid.cell_count == cells_before
+
+        # 기존 그리드 범위를 벗어난 CCTV는 전체 재구성으로 처리
+        outside = _make_cctv(factory_id, (200.0, 3.0, 200.0), (0.0, 1.0, 0.0))
+        grid.upsert(outside)
+        cctvs.append(outside)
+        assert grid.cell_count > cells_before
+
+        # 메모리 상한을 넘는 그리드는 판단 불가(None)로 전체 판정에 위임
+        capped = CoverageGrid(factory_id, voxel_size=2.0, max_distance=30.0, min_y=-5.0, max_y=20.0, max_bytes=1024)
+        capped.rebuild(cctvs)
+        assert capped.oversized is True
+        assert capped.candidates((0.0, 1.0, 0.0), 30.0) is None
+        capped.close()
+
+        points = [(rng.uniform(-90, 230), rng.uniform(0, 5), rng.uniform(-90, 230)) for _ in range(300)]
+        self._assert_same(grid, cctvs, points, 30.0)
+        grid.close()
+
+    def test_index_covering_uses_grid(self):
+        """인덱스 커버리지 조회가 그리드 사용 여부와 무관하게 동일한지 확인"""
+        rng = random.Random(13)
+        factory_id = uuid.uuid4()
+        index = FactorySpatialIndex(factory_id, self._cameras(factory_id, 80, seed=13))
+        points = [(rng.uniform(-70, 70), rng.uniform(0, 5), rng.uniform(-70, 70)) for _ in range(100)]
+
+        expected = index.camera_arrays.covering(points, 40.0)
+        assert index.covering(points, 40.0) == expected
+        assert index.coverage_grid is not None
+
+        moved = next(iter(index.cctvs.values()))
+        moved.position_z += 15.0
+        index.upsert(moved)
+        assert index.covering(points, 40.0) == index.camera_arrays.covering(points, 40.0)
+        index.close()
+
+
+class TestEquipmentBVH:
+    """설비 BVH 가시선 판정 테스트 클래스"""
+
+    @staticmethod
+    def _equipment(factory_id, count, seed):
+        rng = random.Random(seed)
+        return [
+            _make_equipment(
+                factory_id,
+                (rng.uniform(-50, 50), rng.uniform(0, 4), rng.uniform(-50, 50)),
+                (rng.uniform(0.5, 6), rng.uniform(0.5, 5), rng.uniform(0.5, 6)),
+                (rng.uniform(-0.3, 0.3), rng.uniform(-math.pi, math.pi), rng.uniform(-0.3, 0.3)),
+            )
+            for _ in range(count)
+        ]
+
+    @staticmethod
+    def _brute_force(equipment, origins, targets):
+        """설비 단위 전수 판정 (BVH 결과 비교용)"""
+        single = EquipmentBVH()
+        blocked = np.zeros(len(origins), dtype=bool)
+        for item in equipment:
+            single.entries = {item.id: item}
+            single.build()
+            blocked |= single._obb_blocks(origins, targets - origins, np.zeros(len(origins), dtype=np.intp))
+        return blocked
+
+    def test_batched_traversal_matches_brute_force(self):
+        """BVH 배치 순회 결과가 설비 전수 판정과 동일한지 확인"""
+        rng = np.random.default_rng(21)
+        factory_id = uuid.uuid4()
+        equipment = self._equipment(factory_id, 400, seed=21)
+        bvh = EquipmentBVH(equipment)
+        origins = rng.uniform([-60, 4, -60], [60, 8, 60], size=(500, 3))
+        targets = rng.uniform([-60, 0, -60], [60, 3, 60], size=(500, 3))
+
+        blocked = bvh.occluded(origins, targets)
+
+        assert bvh.node_count > 1
+        assert blocked.any() and not blocked.all()
+        assert np.array_equal(blocked, self._brute_force(equipment, origins, targets))
+
+    def test_wall_blocks_only_when_passed_through(self):
+        """설비를 관통하는 경우만 가려짐 (대상/CCTV가 설비 내부면 가림 아님)"""
+        factory_id = uuid.uuid4()
+        wall = _make_equipment(factory_id, (0.0, 2.0, 0.0), (10.0, 4.0, 1.0))
+        bvh = EquipmentBVH([wall])
+
+        origins = np.array([[0.0, 2.0, -10.0]] * 3)
+        targets = np.array([[0.0, 1.0, 10.0], [0.0, 1.0, 0.2], [20.0, 1.0, -10.0]])
+        assert bvh.occluded(origins, targets).tolist() == [True, False, False]
+
+        # 90도 회전하면 벽이 시야선과 평행해져 같은 선분을 가림
+        wall.rotation_y = math.pi / 2
+        bvh.upsert(wall)
+        assert bvh.occluded(origins, targets).tolist() == [True, False, False]
+        assert bvh.occluded([[5.0, 2.0, -10.0]], [[5.0, 1.0, 10.0]]).tolist() == [False]
+
+    def test_incremental_updates(self):
+        """이동(refit)/추가(보류 목록)/삭제 후에도 전수 판정과 일치하는지 확인"""
+        rng = np.random.default_rng(4)
+        factory_id = uuid.uuid4()
+        equipment = self._equipment(factory_id, 200, seed=4)
+        bvh = EquipmentBVH(equipment)
+        nodes_before = bvh.node_count
+
+        for item in equipment[:10]:
+            item.position_x += 20.0
+            bvh.upsert(item)
+        for item in equipment[10:15]:
+            bvh.remove(item.id)
+        added = self._equipment(factory_id, 5, seed=99)
+        for item in added:
+            bvh.upsert(item)
+        assert bvh.node_count == nodes_before
+
+        remaining = equipment[:10] + equipment[15:] + added
+        origins = rng.uniform([-60, 4, -60], [80, 8, 60], size=(400, 3))
+        targets = rng.uniform([-60, 0, -60], [80, 3, 60], size=(400, 3))
+        assert np.array_equal(
+            bvh.occluded(origins, targets), self._brute_force(remaining, origins, targets)
+        )
+
+    def test_index_covering_excludes_occluded_cctvs(self):
+        """가려짐 판정 시 설비 뒤 CCTV만 결과에서 제외되는지 확인"""
+        factory_id = uuid.uuid4()
+        blocked_cam = _make_cctv(factory_id, (0.0, 2.0, -10.0))
+        clear_cam = _make_cctv(factory_id, (8.0, 2.0, -10.0), fov=100.0)
+        wall = _make_equipment(factory_id, (0.0, 2.0, -5.0), (4.0, 4.0, 1.0))
+        index = FactorySpatialIndex(factory_id, [blocked_cam, clear_cam], [wall])
+
+        target = (0.0, 1.0, 0.0)
+        assert {c.id for c, _ in index.covering([target], 50.0)[0]} == {blocked_cam.id, clear_cam.id}
+        assert [c.id for c, _ in index.covering([target], 50.0, check_occlusion=True)[0]] == [clear_cam.id]
+
+        index.remove_equipment(wall.id)
+        assert len(index.covering([target], 50.0, check_occlusion=True)[0]) == 2
+        index.close()
@@ -0,0 +1,94 @@
+"""
+V-Factory - HTTP 조건부 조회(ETag) 유틸리티
+응답 본문을 JSON으로 한 번 직렬화해 강한 ETag(updated_at + 본문 해시)를 계산하고,
+If-None-Match가 일치하면 본문 없이 304 반환
+직렬화 결과({"etag", "body"})는 조회 캐시에 그대로 저장하여 적중 시 재직렬화하지 않음
+"""
+import hashlib
+import json
+from datetime import datetime
+from typing import Any, Dict, Iterable, Optional, Sequence
+
+from fastapi import Response, status
+from fastapi.encoders import jsonable_encoder
+
+from config import settings
+from utils.pagination import build_page
+
+
+def render_json(content: Any) -> bytes:
+    """응답 데이터를 FastAPI JSONResponse와 같은 형식의 JSON 바이트로 직렬화"""
+    return json.dumps(
+        jsonable_encoder(content),
+        ensure_ascii=False,
+        allow_nan=False,
+        separators=(",", ":"),
+    ).encode("utf-8")
+
+
+def make_etag(body: bytes, updated_at: Optional[datetime]) -> str:
+    """강한 ETag 생성 ("수정 시각(마이크로초, 16진수)-본문 해시")"""
+    version = int(updated_at.timestamp() * 1_000_000) if updated_at else 0
+    digest = hashlib.blake2b(body, digest_size=16).hexdigest()
+    return f'"{version:x}-{digest}"'
+
+
+def last_modified(rows: Iterable[Any]) -> Optional[datetime]:
+    """행 목록의 가장 최근 수정 시각 (updated_at이 없으면 created_at)"""
+    values = [row.updated_at or row.created_at for row in rows]
+    values = [value for value in values if value is not None]
+    return max(values) if values else None
+
+
+def rendered(content: Any, updated_at: Optional[datetime]) -> Dict[str, str]:
+    """직렬화된 본문과 ETag ({"etag", "body"}, 조회 캐시에 저장 가능)"""
+    body = render_json(content)
+    return {"etag": make_etag(body, updated_at), "body": body.decode("utf-8")}
+
+
+def render_rows(rows: Sequence[Any], schema: Any, limit: Optional[int] = None) -> Dict[str, str]:
+    """
+    목록 조회 결과(ORM 행)를 응답 스키마로 직렬화한 본문과 ETag
+    limit을 지정하면 apply_keyset 조회 결과로 보고 build_page 형태({items, next_cursor})로 구성
+    """
+    if limit is None:
+        return rendered([schema.model_validate(row) for row in rows], last_modified(rows))
+    page = build_page(rows, limit, "created_at")
+    modified = last_modified(page["items"])
+    page["items"] = [schema.model_validate(row) for row in page["items"]]
+    return rendered(page, modified)
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """If-None-Match 헤더가 ETag와 일치하는지 (목록/"*" 지원, W/ 접두사는 약한 비교로 무시)"""
+    if not if_none_match:
+        return False
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*":
+            return True
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == etag:
+            return True
+    return False
+
+
+def conditional_response(entry: Dict[str, str], if_none_match: Optional[str]) -> Response:
+    """
+    조건부 조회 응답
+
+    Args:
+        entry: rendered() 결과
+        if_none_match: 요청의 If-None-Match 헤더
+
+    Returns:
+        ETag 일치 시 본문 없는 304, 아니면 직렬화된 본문의 200 (두 경우 모두 ETag/Cache-Control 포함)
+    """
+    headers = {
+        "ETag": entry["etag"],
+        "Cache-Control": f"private, max-age={settings.HTTP_CACHE_MAX_AGE}, must-revalidate",
+    }
+    if etag_matches(if_none_match, entry["etag"]):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(content=entry["body"], media_type="application/json", headers=headers)
@@ -0,0 +1,147 @@
+"""
+V-Factory - Factory Core Service Prometheus 메트릭
+Instrumentator가 노출하는 /metrics 엔드포인트에 함께 수집되는 서비스 메트릭 정의
+"""
+from prometheus_client import Counter, Gauge, Histogram
+
+# ===== Redis 연결 풀 =====
+
+REDIS_POOL_CONNECTIONS = Gauge(
+    "factory_core_redis_pool_connections",
+    "Redis 연결 풀 연결 수 (in_use: 사용 중, idle: 유휴)",
+    ["pool", "state"],
+)
+
+REDIS_POOL_MAX_CONNECTIONS = Gauge(
+    "factory_core_redis_pool_max_connections",
+    "Redis 연결 풀 최대 연결 수",
+    ["pool"],
+)
+
+# ===== 커버리지 그리드 =====
+
+COVERAGE_GRID_VOXEL_SIZE = Gauge(
+    "factory_core_coverage_grid_voxel_size_meters",
+    "커버리지 그리드 복셀 한 변의 길이 (m)",
+    ["factory_id"],
+)
+
+COVERAGE_GRID_CELLS = Gauge(
+    "factory_core_coverage_grid_cells",
+    "커버리지 그리드 전체 복셀 수",
+    ["factory_id"],
+)
+
+COVERAGE_GRID_MEMORY_BYTES = Gauge(
+    "factory_core_coverage_grid_memory_bytes",
+    "커버리지 그리드 비트셋 및 CCTV별 복셀 목록 메모리 사용량 (바이트)",
+    ["factory_id"],
+)
+
+COVERAGE_GRID_REBUILD_SECONDS = Histogram(
+    "factory_core_coverage_grid_rebuild_seconds",
+    "커버리지 그리드 재구성 소요 시간 (full: 전체, incremental: CCTV 단위)",
+    ["mode"],
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0),
+)
+
+# ===== 설비 가려짐 판정 (BVH) =====
+
+OCCLUSION_BVH_UPDATE_SECONDS = Histogram(
+    "factory_core_occlusion_bvh_update_seconds",
+    "설비 BVH 갱신 소요 시간 (full: 전체 재구성, refit: 설비 단위 경계 갱신)",
+    ["mode"],
+    buckets=(0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0),
+)
+
+OCCLUSION_RAYCAST_SECONDS = Histogram(
+    "factory_core_occlusion_raycast_seconds",
+    "CCTV 가시선 배치 레이 캐스팅 소요 시간",
+    buckets=(0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0),
+)
+
+# ===== SSE 팬아웃 허브 =====
+
+SSE_SUBSCRIBERS = Gauge(
+    "factory_core_sse_subscribers",
+    "채널별 SSE 구독 클라이언트 수",
+    ["channel"],
+)
+
+SSE_QUEUE_DEPTH = Gauge(
+    "factory_core_sse_queue_depth",
+    "채널별 SSE 클라이언트 버퍼 대기 메시지 합계",
+    ["channel"],
+)
+
+SSE_MESSAGES_RECEIVED = Counter(
+    "factory_core_sse_messages_received_total",
+    "채널별 Redis 수신 메시지 수",
+    ["channel"],
+)
+
+SSE_MESSAGES_DROPPED = Counter(
+    "factory_core_sse_messages_dropped_total",
+    "느린 클라이언트 버퍼 초과로 버린 메시지 수",
+    ["channel"],
+)
+
+SSE_MESSAGES_COALESCED = Counter(
+    "factory_core_sse_messages_coalesced_total",
+    "같은 엔티티의 갱신 이벤트로 대체된 메시지 수",
+    ["channel"],
+)
+
+SSE_REPLAYS = Counter(
+    "factory_core_sse_replays_total",
+    "Last-Event-ID 재접속 재전송 횟수 (memory: 메모리 이력, redis: XRANGE)",
+    ["channel", "source"],
+)
+
+# ===== Outbox 릴레이 =====
+
+OUTBOX_BATCH_SIZE = Histogram(
+    "factory_core_outbox_batch_size",
+    "Outbox 릴레이 1회 전달 이벤트 수",
+    buckets=(1, 2, 5, 10, 25, 50, 100, 250, 500),
+)
+
+OUTBOX_LAG_SECONDS = Histogram(
+    "factory_core_outbox_lag_seconds",
+    "Outbox 기록부터 Redis 전달까지 걸린 시간",
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0),
+)
+
+OUTBOX_OLDEST_PENDING_SECONDS = Gauge(
+    "factory_core_outbox_oldest_pending_seconds",
+    "마지막 조회 시점의 가장 오래된 미전달 이벤트 대기 시간 (없으면 0)",
+)
+
+OUTBOX_DELIVERY_FAILURES = Counter(
+    "factory_core_outbox_delivery_failures_total",
+    "Outbox 릴레이 전달 실패 횟수 (백오프 후 재시도)",
+)
+
+# ===== 조회 결과 캐시 =====
+
+QUERY_CACHE_REQUESTS = Counter(
+    "factory_core_query_cache_requests_total",
+    "조회 캐시 요청 수 (tier: local/redis, result: hit/miss)",
+    ["namespace", "tier", "result"],
+)
+
+QUERY_CACHE_EVICTIONS = Counter(
+    "factory_core_query_cache_evictions_total",
+    "조회 캐시에서 제거된 항목 수 (reason: capacity/expired/invalidated)",
+    ["tier", "reason"],
+)
+
+QUERY_CACHE_LOCAL_ENTRIES = Gauge(
+    "factory_core_query_cache_local_entries",
+    "프로세스 메모리 조회 캐시 항목 수",
+)
+
+QUERY_CACHE_ERRORS = Counter(
+    "factory_core_query_cache_redis_errors_total",
+    "조회 캐시 Redis 오류 수 (재시도 간격 동안 Redis 단계 생략)",
+)
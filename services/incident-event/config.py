@@ -25,10 +25,73 @@ class Settings(BaseSettings):
     # Redis 설정
     REDIS_URL: str = "redis://localhost:6379/0"
     REDIS_CHANNEL: str = "vfactory:incidents"
+    REDIS_POOL_MAX_CONNECTIONS: int = 20       # 명령용 연결 풀 최대 연결 수
+    REDIS_STREAM_MAX_CONNECTIONS: int = 10     # 스트림 대기 읽기용 연결 풀 최대 연결 수 (이벤트 허브가 스트림당 1개 사용)
+    REDIS_POOL_TIMEOUT: float = 5.0            # 풀이 가득 찼을 때 연결 대기 시간 (초)
+    REDIS_SOCKET_TIMEOUT: float = 5.0          # 명령 응답 대기 시간 (초)
+    REDIS_SOCKET_CONNECT_TIMEOUT: float = 2.0  # 연결 수립 대기 시간 (초)
+    REDIS_HEALTH_CHECK_INTERVAL: int = 30      # 유휴 연결 헬스체크 주기 (초)
+    REDIS_STREAM_MAXLEN: int = 10000           # 이벤트 스트림 보존 항목 수 (근사 MAXLEN 트리밍)
+    REDIS_STREAM_BLOCK_MS: int = 5000          # XREAD 대기 시간 (밀리초)
+    REDIS_STREAM_READ_COUNT: int = 100         # XREAD 1회 최대 항목 수
     
     # Factory Core Service URL (CCTV 매칭용)
     # Docker 컨테이너 내부에서는 서비스 이름 사용, 로컬에서는 localhost 사용
     FACTORY_CORE_URL: str = "http://factory-core:8000"  # Docker 네트워크 내부 주소
+    FACTORY_CORE_MAX_CONNECTIONS: int = 50            # 공유 클라이언트 최대 연결 수
+    FACTORY_CORE_MAX_KEEPALIVE_CONNECTIONS: int = 20  # 유지할 keep-alive 연결 수
+    FACTORY_CORE_KEEPALIVE_EXPIRY: float = 30.0       # 유휴 keep-alive 연결 만료 시간 (초)
+    FACTORY_CORE_HTTP2: bool = False                  # HTTP/2 사용 (TLS 업스트림 + h2 패키지 필요)
+    FACTORY_CORE_TIMEOUT: float = 5.0                 # 기본 호출 타임아웃 (초)
+    FACTORY_CORE_CONNECT_TIMEOUT: float = 1.0         # 연결 수립 타임아웃 (초)
+    FACTORY_CORE_LOOKUP_TIMEOUT: float = 2.0          # 공장 존재 확인 타임아웃 (초)
+    FACTORY_CORE_SPATIAL_TIMEOUT: float = 5.0         # CCTV 매칭(공간 쿼리) 타임아웃 (초)
+    FACTORY_CORE_RETRIES: int = 2                     # 연결 오류/502·503·504 재시도 횟수
+    FACTORY_CORE_RETRY_BACKOFF: float = 0.1           # 재시도 대기 기본값 (초, 시도마다 2배)
+    FACTORY_EVENTS_CHANNEL: str = "factory:events"    # Factory Core 공장 이벤트 스트림 (존재 캐시 무효화용)
+    FACTORY_CACHE_MAX_SIZE: int = 10000               # 공장 존재 캐시 최대 항목 수 (초과 시 LRU 제거)
+    FACTORY_CACHE_TTL: float = 300.0                  # 공장 존재 캐시 항목 유효 시간 (초, 이벤트 유실 대비)
+    
+    # 사고 보강 파이프라인 (CCTV 매칭 → 저장 → 발행)
+    ENRICHMENT_WORKERS: int = 4                # 보강 워커 태스크 수
+    ENRICHMENT_QUEUE_SIZE: int = 1000          # 대기 작업 상한 (가득 차면 요청 안에서 직접 보강)
+    ENRICHMENT_DRAIN_TIMEOUT: float = 10.0     # 종료 시 남은 작업 처리 대기 시간 (초)
+    ENRICHMENT_MAX_DISTANCE: float = 50.0      # CCTV 매칭 최대 감지 거리 (m)
+    ENRICHMENT_SWEEP_INTERVAL: float = 30.0    # 미보강 사고(enriched_at IS NULL) 재등록 주기 (초)
+    ENRICHMENT_SWEEP_MIN_AGE: float = 60.0     # 스윕 대상 최소 경과 시간 (초, 정상 처리 중인 사고 제외)
+    ENRICHMENT_SWEEP_LOOKBACK: float = 86400.0  # 스윕 대상 최대 경과 시간 (초, 이전 사고는 재발행하지 않음)
+    ENRICHMENT_SWEEP_BATCH_SIZE: int = 200     # 스윕 1회 최대 재등록 수
+    
+    # 사고 파티션/보존 설정 (PostgreSQL 월 단위 범위 파티션)
+    INCIDENT_PARTITION_PREMAKE_MONTHS: int = 3             # 미리 만들어 둘 이후 달 파티션 수
+    INCIDENT_PARTITION_MAINTENANCE_INTERVAL: float = 3600.0  # 파티션 생성/보존 작업 주기 (초)
+    INCIDENT_RETENTION_MONTHS: int = 12                    # 사고 원본 보존 개월 수 (0: 무제한, 이후 일 단위 집계만 유지)
+    INCIDENT_RETENTION_MODE: str = "detach"                # 만료 파티션 처리 (detach: 분리 후 보관, drop: 삭제)
+    
+    # 사고 통계 집계 설정 (incident_rollups)
+    ANALYTICS_AUTO_MAX_BUCKETS: int = 200                  # auto 단위 선택 시 목표 최대 버킷 수 (30일 → 일 단위)
+    ANALYTICS_MAX_BUCKETS: int = 1500                      # 단위 직접 지정 시 허용 최대 버킷 수
+    ANALYTICS_MINUTE_RETENTION_DAYS: int = 7               # 분 단위 집계 보존 일수
+    ANALYTICS_HOUR_RETENTION_DAYS: int = 90                # 시간 단위 집계 보존 일수 (일 단위는 무제한)
+    
+    # 사고 히트맵 설정
+    HEATMAP_MAX_CELLS: int = 262144                        # 응답 격자 최대 셀 수 (float32 1MB)
+    
+    # 사고 일괄 등록 설정
+    INCIDENT_BULK_MAX_ITEMS: int = 50000       # 요청당 최대 사고 수
+    INCIDENT_BULK_MAX_BYTES: int = 32 * 1024 * 1024  # 요청 본문 최대 크기 (바이트, 초과 시 읽는 도중 413)
+    
+    # Outbox 릴레이 설정 (DB에 기록된 이벤트를 Redis Stream으로 전달)
+    OUTBOX_BATCH_SIZE: int = 100               # 1회 전달 최대 이벤트 수 (파이프라인 XADD)
+    OUTBOX_POLL_INTERVAL: float = 1.0          # 새 이벤트 알림이 없을 때 조회 주기 (초)
+    OUTBOX_RETRY_MIN_DELAY: float = 0.5        # 전달 실패 시 재시도 대기 (초, 지수 백오프 시작값)
+    OUTBOX_RETRY_MAX_DELAY: float = 30.0       # 재시도 대기 상한 (초)
+    OUTBOX_RETENTION: float = 86400.0          # 전달 완료 행 보존 시간 (초, 이후 삭제)
+    OUTBOX_PURGE_INTERVAL: float = 600.0       # 전달 완료 행 정리 주기 (초)
+    
+    # SSE 스트림 설정
+    SSE_QUEUE_SIZE: int = 256                  # 클라이언트별 대기 메시지 상한 (초과 시 오래된 메시지부터 버림)
+    SSE_REPLAY_BUFFER_SIZE: int = 1000         # 재접속 재전송용 스트림별 최근 이벤트 메모리 보관 수
     
     # CORS 설정
     CORS_ORIGINS: List[str] = [
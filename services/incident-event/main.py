@@ -13,7 +13,13 @@ from sqlalchemy import text
 from config import settings
 from database import engine, Base
 from routers import incident_router
-from services.redis_service import RedisService
+from services.event_hub import event_hub
+from services.enrichment import close_enrichment_pipeline, get_enrichment_pipeline
+from services.factory_cache import close_factory_cache, get_factory_cache
+from services.factory_core_client import close_factory_core_client, get_factory_core_client
+from services.outbox import close_outbox_relay, get_outbox_relay
+from services.partitions import close_partition_manager, get_partition_manager
+from services.redis_service import close_redis_service, get_redis_service
 from utils.logging import logger
 
 
@@ -27,11 +33,31 @@ async def lifespan(app: FastAPI):
             await conn.run_sync(Base.metadata.create_all)
         logger.info("데이터베이스 테이블 생성 완료")
     
+    # 사고 월 파티션 준비 (기본/이번 달~이후 파티션) 및 주기적 생성/보존 작업 시작
+    await get_partition_manager().start()
+    # 프로세스 전역 Redis 연결 풀 준비 (연결은 첫 사용 시 수립)
+    get_redis_service()
+    # Outbox 릴레이 시작 (재시작 전 미전달 알림도 이어서 전달)
+    get_outbox_relay().start()
+    # Factory Core 호출용 공유 keep-alive HTTP 클라이언트 준비
+    get_factory_core_client()
+    # 공장 존재 캐시 워밍 및 factory:events 구독 시작 (백그라운드, 시작을 막지 않음)
+    get_factory_cache().start()
+    # 사고 보강(CCTV 매칭/알림 발행) 워커 시작
+    get_enrichment_pipeline().start()
+    
     logger.info("Incident Event Service 시작 완료")
     yield
     
     # 종료 시: 리소스 정리
     logger.info("Incident Event Service 종료 중...")
+    await close_enrichment_pipeline()
+    await close_factory_cache()
+    await close_outbox_relay()
+    await close_partition_manager()
+    await event_hub.close()
+    await close_factory_core_client()
+    await close_redis_service()
     await engine.dispose()
     logger.info("Incident Event Service 종료 완료")
 
@@ -91,11 +117,9 @@ async def health_check():
     
     # Redis 연결 상태 확인
     try:
-        redis_service = RedisService()
-        client = await redis_service._get_client()
+        client = await get_redis_service()._get_client()
         await client.ping()
         health_status["redis"] = "connected"
-        await redis_service.close()
     except Exception as e:
         health_status["status"] = "unhealthy"
         health_status["redis"] = "disconnected"
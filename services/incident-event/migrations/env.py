@@ -18,7 +18,7 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from config import settings
 from database import Base
-from models import Incident  # 모든 모델 임포트 필수
+from models import Incident, IncidentRollup, OutboxEvent  # 모든 모델 임포트 필수
 
 # Alembic Config 객체
 config = context.config
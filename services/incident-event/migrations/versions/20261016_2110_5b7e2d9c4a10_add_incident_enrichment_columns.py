@@ -0,0 +1,30 @@
+"""Add enrichment columns to incidents
+
+Revision ID: 5b7e2d9c4a10
+Revises: 1c0a13401529
+Create Date: 2026-10-16 21:10:00.000000+00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '5b7e2d9c4a10'
+down_revision: Union[str, None] = '1c0a13401529'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """마이그레이션 업그레이드"""
+    # 백그라운드 보강 결과 컬럼 추가 (기존 행은 NULL = 보강 정보 없음)
+    op.add_column('incidents', sa.Column('detected_cctv_ids', sa.JSON(), nullable=True))
+    op.add_column('incidents', sa.Column('enriched_at', sa.DateTime(timezone=True), nullable=True))
+
+
+def downgrade() -> None:
+    """마이그레이션 다운그레이드"""
+    op.drop_column('incidents', 'enriched_at')
+    op.drop_column('incidents', 'detected_cctv_ids')
@@ -0,0 +1,44 @@
+"""Add incident_outbox table
+
+Revision ID: 8d41f0c6e2b7
+Revises: 5b7e2d9c4a10
+Create Date: 2026-10-16 21:30:00.000000+00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '8d41f0c6e2b7'
+down_revision: Union[str, None] = '5b7e2d9c4a10'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """마이그레이션 업그레이드"""
+    # 사고 알림 Outbox 테이블 (보강 결과와 같은 트랜잭션에 기록, 릴레이가 Redis로 전달)
+    op.create_table(
+        'incident_outbox',
+        sa.Column('id', sa.BigInteger(), primary_key=True, autoincrement=True),
+        sa.Column('stream', sa.String(length=100), nullable=False),
+        sa.Column('payload', sa.Text(), nullable=False),
+        sa.Column('attempts', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('created_at', sa.DateTime(timezone=True), nullable=False, server_default=sa.func.now()),
+        sa.Column('delivered_at', sa.DateTime(timezone=True), nullable=True),
+    )
+    # 릴레이 조회용 부분 인덱스 (미전달 행만)
+    op.create_index(
+        'ix_incident_outbox_pending',
+        'incident_outbox',
+        ['id'],
+        postgresql_where=sa.text('delivered_at IS NULL'),
+    )
+
+
+def downgrade() -> None:
+    """마이그레이션 다운그레이드"""
+    op.drop_index('ix_incident_outbox_pending', table_name='incident_outbox')
+    op.drop_table('incident_outbox')
@@ -0,0 +1,30 @@
+"""Add keyset pagination indexes to incidents
+
+Revision ID: 3f9a6c1e7d52
+Revises: 8d41f0c6e2b7
+Create Date: 2026-10-16 22:00:00.000000+00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '3f9a6c1e7d52'
+down_revision: Union[str, None] = '8d41f0c6e2b7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """마이그레이션 업그레이드"""
+    # 커서 페이지네이션 (timestamp, id) 키셋 조회용
+    op.create_index('ix_incidents_timestamp_id', 'incidents', ['timestamp', 'id'])
+    op.create_index('ix_incidents_factory_id_timestamp_id', 'incidents', ['factory_id', 'timestamp', 'id'])
+
+
+def downgrade() -> None:
+    """마이그레이션 다운그레이드"""
+    op.drop_index('ix_incidents_factory_id_timestamp_id', table_name='incidents')
+    op.drop_index('ix_incidents_timestamp_id', table_name='incidents')
@@ -0,0 +1,40 @@
+"""Add composite and partial indexes for incident filters
+
+Revision ID: 6e2d8b47f1a3
+Revises: 3f9a6c1e7d52
+Create Date: 2026-10-16 22:30:00.000000+00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '6e2d8b47f1a3'
+down_revision: Union[str, None] = '3f9a6c1e7d52'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """마이그레이션 업그레이드"""
+    # 공장별 해결 여부 필터 + 최신순 목록
+    op.create_index(
+        'ix_incidents_factory_id_is_resolved_timestamp',
+        'incidents',
+        ['factory_id', 'is_resolved', sa.text('"timestamp" DESC')],
+    )
+    # 미해결 사고만 담는 부분 인덱스
+    op.create_index(
+        'ix_incidents_unresolved',
+        'incidents',
+        ['factory_id', sa.text('"timestamp" DESC')],
+        postgresql_where=sa.text('is_resolved = false'),
+    )
+
+
+def downgrade() -> None:
+    """마이그레이션 다운그레이드"""
+    op.drop_index('ix_incidents_unresolved', table_name='incidents')
+    op.drop_index('ix_incidents_factory_id_is_resolved_timestamp', table_name='incidents')
@@ -0,0 +1,152 @@
+"""Partition incidents by month and add incident_rollups
+
+Revision ID: 9b4e1a7c5d28
+Revises: 6e2d8b47f1a3
+Create Date: 2026-10-16 23:00:00.000000+00:00
+
+"""
+from datetime import datetime, timezone
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = '9b4e1a7c5d28'
+down_revision: Union[str, None] = '6e2d8b47f1a3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# 기존 테이블의 컬럼 순서 (데이터 복사용)
+COLUMNS = (
+    'id, factory_id, type, severity, description, position_x, position_y, position_z, '
+    'npc_id, detected_cctv_ids, enriched_at, is_resolved, "timestamp", resolved_at'
+)
+
+# 사고 테이블 인덱스 (부모 테이블에 만들면 모든 파티션에 적용)
+INDEXES = (
+    ('ix_incidents_timestamp_id', ['timestamp', 'id'], None),
+    ('ix_incidents_factory_id_timestamp_id', ['factory_id', 'timestamp', 'id'], None),
+    (
+        'ix_incidents_factory_id_is_resolved_timestamp',
+        ['factory_id', 'is_resolved', sa.text('"timestamp" DESC')],
+        None,
+    ),
+    ('ix_incidents_unresolved', ['factory_id', sa.text('"timestamp" DESC')], sa.text('is_resolved = false')),
+)
+
+# 파티션을 미리 만들어 둘 이후 달 수 (이후는 서비스의 파티션 관리 작업이 생성)
+PREMAKE_MONTHS = 3
+
+
+def _month_start(value: datetime) -> datetime:
+    value = value.astimezone(timezone.utc) if value.tzinfo else value.replace(tzinfo=timezone.utc)
+    return value.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+
+
+def _add_months(month: datetime, months: int) -> datetime:
+    index = month.year * 12 + month.month - 1 + months
+    return month.replace(year=index // 12, month=index % 12 + 1)
+
+
+def _incident_columns() -> list:
+    return [
+        sa.Column('id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('factory_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('type', postgresql.ENUM(name='incident_type', create_type=False), nullable=False),
+        sa.Column('severity', sa.Integer(), nullable=False),
+        sa.Column('description', sa.Text(), nullable=True),
+        sa.Column('position_x', sa.Float(), nullable=False),
+        sa.Column('position_y', sa.Float(), nullable=False),
+        sa.Column('position_z', sa.Float(), nullable=False),
+        sa.Column('npc_id', postgresql.UUID(as_uuid=True), nullable=True),
+        sa.Column('detected_cctv_ids', sa.JSON(), nullable=True),
+        sa.Column('enriched_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('is_resolved', sa.Boolean(), nullable=True),
+        sa.Column('timestamp', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('resolved_at', sa.DateTime(timezone=True), nullable=True),
+    ]
+
+
+def _drop_indexes(table: str) -> None:
+    for name, _, _ in INDEXES:
+        op.drop_index(name, table_name=table, if_exists=True)
+
+
+def _create_indexes() -> None:
+    for name, columns, where in INDEXES:
+        op.create_index(name, 'incidents', columns, postgresql_where=where)
+
+
+def upgrade() -> None:
+    """마이그레이션 업그레이드"""
+    bind = op.get_bind()
+
+    # 1. 기존 테이블을 옆으로 치우고 인덱스/PK 이름을 비움
+    op.rename_table('incidents', 'incidents_unpartitioned')
+    op.execute('ALTER TABLE incidents_unpartitioned RENAME CONSTRAINT incidents_pkey TO incidents_unpartitioned_pkey')
+    _drop_indexes('incidents_unpartitioned')
+
+    # 2. timestamp 기준 월 단위 범위 파티션 부모 테이블 (PK는 파티션 키 포함)
+    op.create_table(
+        'incidents',
+        *_incident_columns(),
+        sa.PrimaryKeyConstraint('id', 'timestamp', name='incidents_pkey'),
+        postgresql_partition_by='RANGE ("timestamp")',
+    )
+
+    # 3. 기존 데이터 범위 ~ 이후 PREMAKE_MONTHS개월 월 파티션 + 기본 파티션
+    oldest = bind.execute(sa.text('SELECT min("timestamp") FROM incidents_unpartitioned')).scalar()
+    current = _month_start(datetime.now(timezone.utc))
+    month = _month_start(oldest) if oldest is not None and oldest < current else current
+    last = _add_months(current, PREMAKE_MONTHS)
+    while month <= last:
+        op.execute(
+            f"CREATE TABLE incidents_p{month.year:04d}_{month.month:02d} PARTITION OF incidents "
+            f"FOR VALUES FROM ('{month.isoformat()}') TO ('{_add_months(month, 1).isoformat()}')"
+        )
+        month = _add_months(month, 1)
+    op.execute('CREATE TABLE incidents_default PARTITION OF incidents DEFAULT')
+
+    # 4. 데이터 이동 (timestamp가 비어 있던 행은 현재 시각으로)
+    select_columns = COLUMNS.replace('"timestamp"', 'coalesce("timestamp", now())')
+    op.execute(f'INSERT INTO incidents ({COLUMNS}) SELECT {select_columns} FROM incidents_unpartitioned')
+    op.drop_table('incidents_unpartitioned')
+    _create_indexes()
+
+    # 5. 보존 기간이 지나 삭제되는 파티션의 일 단위 집계 테이블
+    op.create_table(
+        'incident_rollups',
+        sa.Column('granularity', sa.String(length=10), nullable=False),
+        sa.Column('bucket_start', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('factory_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('type', postgresql.ENUM(name='incident_type', create_type=False), nullable=False),
+        sa.Column('count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('severity_1', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('severity_2', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('severity_3', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('severity_4', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('severity_5', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('resolved_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('resolve_seconds_sum', sa.Float(), nullable=False, server_default='0'),
+        sa.PrimaryKeyConstraint('granularity', 'bucket_start', 'factory_id', 'type'),
+    )
+
+
+def downgrade() -> None:
+    """마이그레이션 다운그레이드"""
+    op.drop_table('incident_rollups')
+
+    # 파티션 테이블 → 일반 테이블 (분리된 파티션의 데이터는 복구하지 않음)
+    op.rename_table('incidents', 'incidents_partitioned')
+    op.execute('ALTER TABLE incidents_partitioned RENAME CONSTRAINT incidents_pkey TO incidents_partitioned_pkey')
+    _drop_indexes('incidents_partitioned')
+    op.create_table(
+        'incidents',
+        *_incident_columns(),
+        sa.PrimaryKeyConstraint('id', name='incidents_pkey'),
+    )
+    op.execute(f'INSERT INTO incidents ({COLUMNS}) SELECT {COLUMNS} FROM incidents_partitioned')
+    op.execute('DROP TABLE incidents_partitioned CASCADE')
+    _create_indexes()
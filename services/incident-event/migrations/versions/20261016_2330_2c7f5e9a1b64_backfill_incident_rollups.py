@@ -0,0 +1,63 @@
+"""Backfill incident_rollups from existing incidents
+
+Revision ID: 2c7f5e9a1b64
+Revises: 9b4e1a7c5d28
+Create Date: 2026-10-16 23:30:00.000000+00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '2c7f5e9a1b64'
+down_revision: Union[str, None] = '9b4e1a7c5d28'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# 버킷 단위별 채울 기간 (서비스의 집계 보존 기간 기본값과 동일, None이면 전체)
+BACKFILL_WINDOWS = (
+    ('minute', '7 days'),
+    ('hour', '90 days'),
+    ('day', None),
+)
+
+# 이미 있는 버킷(보존 만료 파티션 집계)은 유지
+ROLLUP_SQL = """
+INSERT INTO incident_rollups (
+    granularity, bucket_start, factory_id, type, count,
+    severity_1, severity_2, severity_3, severity_4, severity_5,
+    resolved_count, resolve_seconds_sum
+)
+SELECT
+    '{granularity}',
+    date_trunc('{granularity}', "timestamp", 'UTC'),
+    factory_id,
+    type,
+    count(*),
+    count(*) FILTER (WHERE severity = 1),
+    count(*) FILTER (WHERE severity = 2),
+    count(*) FILTER (WHERE severity = 3),
+    count(*) FILTER (WHERE severity = 4),
+    count(*) FILTER (WHERE severity = 5),
+    count(resolved_at) FILTER (WHERE is_resolved),
+    coalesce(sum(greatest(extract(epoch FROM resolved_at - "timestamp"), 0)) FILTER (WHERE is_resolved), 0)
+FROM incidents
+{where}
+GROUP BY 2, 3, 4
+ON CONFLICT (granularity, bucket_start, factory_id, type) DO NOTHING
+"""
+
+
+def upgrade() -> None:
+    """마이그레이션 업그레이드"""
+    for granularity, window in BACKFILL_WINDOWS:
+        where = f"WHERE \"timestamp\" >= date_trunc('{granularity}', now() - interval '{window}', 'UTC')" if window else ''
+        op.execute(sa.text(ROLLUP_SQL.format(granularity=granularity, where=where)))
+
+
+def downgrade() -> None:
+    """마이그레이션 다운그레이드"""
+    # 일 단위 집계는 보존 만료 파티션의 유일한 기록일 수 있으므로 분/시간 집계만 삭제
+    op.execute("DELETE FROM incident_rollups WHERE granularity IN ('minute', 'hour')")
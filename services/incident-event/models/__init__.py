@@ -2,5 +2,7 @@
 V-Factory - Incident Event ORM 모델
 """
 from .incident import Incident, IncidentType
+from .outbox import OutboxEvent
+from .rollup import IncidentRollup
 
-__all__ = ["Incident", "IncidentType"]
+__all__ = ["Incident", "IncidentType", "IncidentRollup", "OutboxEvent"]
@@ -1,12 +1,13 @@
 """
 V-Factory - Incident ORM 모델
 사고 기록 엔티티 정의
+PostgreSQL에서는 timestamp 기준 월 단위 범위 파티션 테이블 (파티션 생성/보존은 services/partitions.py)
 """
 import enum
 import uuid
 from datetime import datetime
 
-from sqlalchemy import Column, String, Text, Integer, Float, Boolean, DateTime, Enum
+from sqlalchemy import Column, String, Text, Integer, Float, Boolean, DateTime, Enum, Index, JSON, text
 from sqlalchemy.dialects.postgresql import UUID
 
 from database import Base
@@ -23,11 +24,15 @@ class IncidentType(str, enum.Enum):
 
 
 class Incident(Base):
-    """사고 기록 테이블 ORM 모델"""
+    """
+    사고 기록 테이블 ORM 모델
+    PK가 (id, timestamp)이므로 session.get(Incident, id)는 사용할 수 없음 -
+    ID로 조회할 때는 select(Incident).where(Incident.id == ...)를 사용
+    """
     
     __tablename__ = "incidents"
     
-    # 기본 필드
+    # 기본 필드 (파티션 테이블의 PK는 파티션 키를 포함해야 하므로 (id, timestamp))
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     factory_id = Column(UUID(as_uuid=True), nullable=False)
     
@@ -44,12 +49,33 @@ class Incident(Base):
     # NPC 정보 (선택적)
     npc_id = Column(UUID(as_uuid=True), nullable=True)
     
+    # 보강 정보 (백그라운드 파이프라인이 채움, 보강 전에는 NULL)
+    detected_cctv_ids = Column(JSON, nullable=True)  # 사고 지점을 시야에 포함하는 CCTV ID 문자열 목록
+    enriched_at = Column(DateTime(timezone=True), nullable=True)
+    
     # 상태
     is_resolved = Column(Boolean, default=False)
     
-    # 타임스탬프
-    timestamp = Column(DateTime(timezone=True), default=datetime.utcnow)
+    # 타임스탬프 (파티션 키)
+    timestamp = Column(DateTime(timezone=True), primary_key=True, default=datetime.utcnow)
     resolved_at = Column(DateTime(timezone=True), nullable=True)
     
+    __table_args__ = (
+        # 커서 페이지네이션 (timestamp, id) 키셋 조회용
+        Index("ix_incidents_timestamp_id", "timestamp", "id"),
+        Index("ix_incidents_factory_id_timestamp_id", "factory_id", "timestamp", "id"),
+        # 공장별 해결 여부 필터 + 최신순 목록
+        Index("ix_incidents_factory_id_is_resolved_timestamp", factory_id, is_resolved, timestamp.desc()),
+        # 미해결 사고만 담는 부분 인덱스 (대시보드의 미해결 목록/집계)
+        Index(
+            "ix_incidents_unresolved",
+            factory_id,
+            timestamp.desc(),
+            postgresql_where=text("is_resolved = false"),
+        ),
+        # 월 단위 범위 파티션 (create_all 시 부모 테이블만 생성)
+        {"postgresql_partition_by": 'RANGE ("timestamp")'},
+    )
+    
     def __repr__(self):
         return f"<Incident(id={self.id}, type={self.type}, severity={self.severity})>"
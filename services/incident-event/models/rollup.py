@@ -0,0 +1,37 @@
+"""
+V-Factory - 사고 집계(롤업) ORM 모델
+분/시간/일 버킷 x 공장 x 사고 유형별 건수/심각도 분포/해결 시간 합계
+(사고 생성/해결/삭제 시 증감, 보존 기간이 지나 삭제되는 사고 파티션도 일 단위 집계는 남김)
+"""
+from sqlalchemy import Column, DateTime, Enum, Float, Integer, String
+from sqlalchemy.dialects.postgresql import UUID
+
+from database import Base
+from models.incident import IncidentType
+
+
+class IncidentRollup(Base):
+    """사고 집계 테이블 ORM 모델"""
+
+    __tablename__ = "incident_rollups"
+
+    # 집계 키
+    granularity = Column(String(10), primary_key=True)  # 버킷 단위 (minute/hour/day)
+    bucket_start = Column(DateTime(timezone=True), primary_key=True)
+    factory_id = Column(UUID(as_uuid=True), primary_key=True)
+    type = Column(Enum(IncidentType, name="incident_type"), primary_key=True)
+
+    # 건수 및 심각도 분포
+    count = Column(Integer, nullable=False, default=0)
+    severity_1 = Column(Integer, nullable=False, default=0)
+    severity_2 = Column(Integer, nullable=False, default=0)
+    severity_3 = Column(Integer, nullable=False, default=0)
+    severity_4 = Column(Integer, nullable=False, default=0)
+    severity_5 = Column(Integer, nullable=False, default=0)
+
+    # 해결 시간 (평균 = resolve_seconds_sum / resolved_count)
+    resolved_count = Column(Integer, nullable=False, default=0)
+    resolve_seconds_sum = Column(Float, nullable=False, default=0)
+
+    def __repr__(self):
+        return f"<IncidentRollup({self.granularity} {self.bucket_start}, factory={self.factory_id}, type={self.type})>"
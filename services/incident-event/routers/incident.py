@@ -3,46 +3,70 @@ V-Factory - Incident API 라우터
 사고 CRUD 및 실시간 스트림 엔드포인트
 """
 import json
-from datetime import datetime
-from typing import List, Optional
+from datetime import datetime, timedelta, timezone
+from typing import AsyncIterator, List, Literal, Optional, Union
 from uuid import UUID
 
 import httpx
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request, status
 from fastapi.responses import StreamingResponse
+from pydantic import TypeAdapter, ValidationError
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from config import settings
 from database import get_db
-from models import Incident
-from schemas import IncidentCreate, IncidentUpdate, IncidentResponse
-from services.redis_service import RedisService
+from models import Incident, IncidentType
+from schemas import (
+    IncidentCreate,
+    IncidentUpdate,
+    IncidentResponse,
+    IncidentBulkResponse,
+    IncidentHeatmapResponse,
+    IncidentStatsResponse,
+    IncidentTypeEnum,
+)
+from services.analytics import GRANULARITIES, RollupDelta, choose_granularity, query_stats
+from services.bulk_ingest import UnknownFactoriesError, bulk_create_incidents, bulk_stage
+from services.event_hub import SSE_RESET_FRAME, event_hub, format_sse
+from services.enrichment import get_enrichment_pipeline
+from services.factory_cache import get_factory_cache
+from services.heatmap import HeatmapWeight, build_heatmap
+from services.outbox import get_outbox_relay
+from utils.pagination import CursorPage, PaginationMode, apply_keyset, build_page, use_cursor
 
 
 router = APIRouter()
 
+# 일괄 등록 요청 본문 (JSON 배열) 검증기
+_bulk_adapter = TypeAdapter(List[IncidentCreate])
+
+# NDJSON 요청 Content-Type
+_NDJSON_TYPES = ("application/x-ndjson", "application/ndjson", "application/jsonl")
+
 
 @router.post("/", response_model=IncidentResponse, status_code=status.HTTP_201_CREATED)
 async def create_incident(
     incident_data: IncidentCreate,
+    wait_for_cctvs: bool = Query(False, description="True이면 CCTV 매칭/알림 발행까지 마친 뒤 응답"),
     db: AsyncSession = Depends(get_db)
 ):
     """
     사고 발생 트리거 API
-    사고 생성 후 Factory Core Service에서 가까운 CCTV 찾기
-    Redis Pub/Sub으로 실시간 알림 발행
+    공장 확인 후 사고를 저장하고 바로 응답
+    CCTV 매칭과 Redis Stream 알림 발행은 보강 파이프라인이 백그라운드로 처리
+    (wait_for_cctvs=true이면 요청 안에서 처리하여 detected_cctv_ids 포함)
     """
-    # Factory Core Service에서 factory_id 존재 여부 확인
-    factory_exists = False
+    # factory_id 존재 여부 확인 (로컬 캐시 적중 시 Factory Core 호출 생략)
     try:
-        async with httpx.AsyncClient(timeout=5.0) as client:
-            response = await client.get(
-                f"{settings.FACTORY_CORE_URL}/factories/{incident_data.factory_id}"
-            )
-            factory_exists = response.status_code == 200
-    except Exception as e:
-        print(f"[Incident] Factory 존재 확인 실패: {e}")
+        factory_exists = await get_factory_cache().exists(incident_data.factory_id)
+    except httpx.HTTPError as e:
+        # Factory Core 장애는 공장 없음(400)과 구분해 재시도 가능한 503으로 응답
+        print(f"[Incident] Factory 존재 확인 실패: {e!r}")
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Factory Core Service에 연결할 수 없어 공장을 확인하지 못했습니다. 잠시 후 다시 시도하세요."
+        )
     
     # Factory가 존재하지 않으면 에러 반환
     if not factory_exists:
@@ -61,85 +85,279 @@ async def create_incident(
         position_z=incident_data.position_z,
         npc_id=incident_data.npc_id,  # NPC ID 저장
     )
+    # enriched_at이 NULL인 사고 행이 보강 대기 표시 (워커가 유실돼도 보강 스윕이 다시 등록해 알림 발행)
     db.add(incident)
+    await db.flush()
+    # 통계 집계를 사고 저장과 같은 트랜잭션에서 증가
+    rollups = RollupDelta()
+    rollups.add_incident(incident)
+    await rollups.apply(db)
     await db.commit()
     await db.refresh(incident)
     
-    # Factory Core Service에서 가까운 CCTV 찾기
-    detected_cctv_ids: List[UUID] = []
+    # CCTV 매칭 및 알림 발행 (큐가 가득 찼거나 동기 요청이면 요청 안에서 수행)
+    pipeline = get_enrichment_pipeline()
+    if wait_for_cctvs or not pipeline.submit(incident):
+        await pipeline.enrich(incident, session=db)
+    
+    return incident
+
+
+@router.post("/bulk", response_model=IncidentBulkResponse, status_code=status.HTTP_201_CREATED)
+async def create_incidents_bulk(
+    request: Request,
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    사고 일괄 등록 API
+    본문은 IncidentCreate JSON 배열 또는 NDJSON(한 줄에 사고 1건, Content-Type: application/x-ndjson)
+    공장별로 존재 확인/CCTV 매칭을 한 번씩 수행하고 한 트랜잭션으로 저장 (알림은 Outbox 릴레이가 전달)
+    """
+    with bulk_stage("parse"):
+        items = await _parse_bulk_body(request)
+    if not items:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="등록할 사고가 없습니다."
+        )
+    
     try:
-        async with httpx.AsyncClient(timeout=5.0) as client:
-            # Factory Core Service의 spatial API 호출
-            # factory_id는 query parameter, position은 body로 전송
-            response = await client.post(
-                f"{settings.FACTORY_CORE_URL}/spatial/covering-cctvs",
-                params={
-                    "factory_id": str(incident_data.factory_id),
-                    "max_distance": 50.0
-                },
-                json={
-                    "x": incident_data.position_x,
-                    "y": incident_data.position_y,
-                    "z": incident_data.position_z
-                }
+        rows = await bulk_create_incidents(db, items)
+    except UnknownFactoriesError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Factories do not exist: {[str(factory_id) for factory_id in e.factory_ids]}. Please create a factory first."
+        )
+    except httpx.HTTPError as e:
+        print(f"[Incident] Factory 존재 확인 실패: {e!r}")
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Factory Core Service에 연결할 수 없어 공장을 확인하지 못했습니다. 잠시 후 다시 시도하세요."
+        )
+    get_outbox_relay().notify()
+    
+    return IncidentBulkResponse(
+        created=len(rows),
+        ids=[row["id"] for row in rows],
+        detected_cctv_ids=[row["detected_cctv_ids"] for row in rows],
+    )
+
+
+async def _parse_bulk_body(request: Request) -> List[IncidentCreate]:
+    """
+    일괄 등록 요청 본문 해석 (NDJSON은 스트림으로 한 줄씩 검증)
+    본문은 INCIDENT_BULK_MAX_BYTES까지만 읽음 (Content-Length가 크면 읽기 전에, 아니면 읽는 도중 413)
+    """
+    content_type = request.headers.get("content-type", "").split(";")[0].strip().lower()
+    max_items = settings.INCIDENT_BULK_MAX_ITEMS
+    max_bytes = settings.INCIDENT_BULK_MAX_BYTES
+    too_large = HTTPException(
+        status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+        detail=f"요청 본문은 최대 {max_bytes}바이트까지 허용됩니다."
+    )
+    
+    content_length = request.headers.get("content-length", "")
+    if content_length.isascii() and content_length.isdigit() and int(content_length) > max_bytes:
+        raise too_large
+    
+    async def read_body() -> AsyncIterator[bytes]:
+        received = 0
+        async for chunk in request.stream():
+            received += len(chunk)
+            if received > max_bytes:
+                raise too_large
+            yield chunk
+    
+    if content_type not in _NDJSON_TYPES:
+        body = b"".join([chunk async for chunk in read_body()])
+        try:
+            items = _bulk_adapter.validate_json(body)
+        except ValidationError as e:
+            raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=json.loads(e.json()))
+        if len(items) > max_items:
+            raise HTTPException(
+                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                detail=f"요청당 최대 {max_items}건까지 등록할 수 있습니다."
             )
-            
-            if response.status_code == 200:
-                cctv_data = response.json()
-                # 응답 형식: [{"cctv": {...}, "distance": ...}, ...]
-                detected_cctv_ids = [UUID(item["cctv"]["id"]) for item in cctv_data]
-                print(f"[Incident] 감지된 CCTV: {len(detected_cctv_ids)}개 - {[str(id) for id in detected_cctv_ids]}")
-            else:
-                print(f"[Incident] CCTV 매칭 실패: {response.status_code} - {response.text}")
-    except Exception as e:
-        # Factory Core Service 연결 실패해도 DB 저장은 유지
-        print(f"[Incident] Factory Core Service 호출 실패: {e}")
-    
-    # Redis로 사고 알림 발행
-    try:
-        redis_service = RedisService()
-        await redis_service.publish_incident(incident)
-    except Exception as e:
-        # Redis 연결 실패해도 DB 저장은 유지
-        print(f"[Incident] Redis 발행 실패: {e}")
+        return items
+    
+    items: List[IncidentCreate] = []
+    buffer = b""
+    line_number = 0
     
-    # 응답에 detected_cctv_ids 포함
-    response_data = IncidentResponse.model_validate(incident)
-    response_data.detected_cctv_ids = detected_cctv_ids
-    return response_data
+    def parse_line(line: bytes) -> None:
+        nonlocal line_number
+        line_number += 1
+        if not line.strip():
+            return
+        if len(items) >= max_items:
+            raise HTTPException(
+                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                detail=f"요청당 최대 {max_items}건까지 등록할 수 있습니다."
+            )
+        try:
+            items.append(IncidentCreate.model_validate_json(line))
+        except ValidationError as e:
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail={"line": line_number, "errors": json.loads(e.json())}
+            )
+    
+    async for chunk in read_body():
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            parse_line(line)
+    parse_line(buffer)
+    return items
 
 
-@router.get("/", response_model=List[IncidentResponse])
+@router.get("/", response_model=Union[List[IncidentResponse], CursorPage[IncidentResponse]])
 async def get_incidents(
     factory_id: UUID = None,
     is_resolved: bool = None,
+    start_time: Optional[datetime] = Query(None, description="조회 시작 시각 (포함)"),
+    end_time: Optional[datetime] = Query(None, description="조회 종료 시각 (미포함)"),
     skip: int = 0,
     limit: int = 100,
+    pagination: PaginationMode = Query("offset", description="offset: 목록 반환, cursor: {items, next_cursor} 반환"),
+    cursor: Optional[str] = Query(None, description="이전 페이지의 next_cursor (지정 시 커서 모드)"),
     db: AsyncSession = Depends(get_db)
 ):
-    """사고 목록 조회 API"""
+    """
+    사고 목록 조회 API (최신순)
+    커서 모드는 (timestamp, id) 키셋으로 조회하여 깊은 페이지도 OFFSET 비용 없음
+    시간 범위를 지정하면 해당 월 파티션만 조회 (partition pruning)
+    """
     query = select(Incident)
     
     if factory_id:
         query = query.where(Incident.factory_id == factory_id)
     if is_resolved is not None:
         query = query.where(Incident.is_resolved == is_resolved)
+    if start_time is not None:
+        query = query.where(Incident.timestamp >= start_time)
+    if end_time is not None:
+        query = query.where(Incident.timestamp < end_time)
+    
+    if use_cursor(pagination, cursor):
+        query = apply_keyset(query, Incident.timestamp, Incident.id, cursor, limit)
+        result = await db.execute(query)
+        return build_page(result.scalars().all(), limit, "timestamp")
     
     query = query.order_by(Incident.timestamp.desc()).offset(skip).limit(limit)
     result = await db.execute(query)
     return result.scalars().all()
 
 
+@router.get("/stats", response_model=IncidentStatsResponse)
+async def get_incident_stats(
+    factory_id: Optional[UUID] = None,
+    incident_type: Optional[List[IncidentTypeEnum]] = Query(None, alias="type", description="사고 유형 필터 (여러 개 가능)"),
+    start_time: Optional[datetime] = Query(None, description="집계 시작 시각 (기본값: 종료 30일 전)"),
+    end_time: Optional[datetime] = Query(None, description="집계 종료 시각 (미포함, 기본값: 현재)"),
+    granularity: Literal["auto", "minute", "hour", "day"] = Query(
+        "auto", description="버킷 단위 (auto: 범위에 맞춰 가장 세밀한 단위)"
+    ),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    사고 통계 API
+    분/시간/일 집계 테이블에서 건수, 심각도 분포, 평균 해결 시간(초)을
+    전체/유형별/공장별/버킷별로 반환 (원본 사고는 읽지 않음)
+    """
+    end_time = end_time or datetime.now(timezone.utc)
+    start_time = start_time or end_time - timedelta(days=30)
+    if start_time >= end_time:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="start_time은 end_time보다 이전이어야 합니다."
+        )
+    if granularity == "auto":
+        granularity = choose_granularity(start_time, end_time)
+    elif (end_time - start_time) / GRANULARITIES[granularity] > settings.ANALYTICS_MAX_BUCKETS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"버킷 수가 {settings.ANALYTICS_MAX_BUCKETS}개를 넘습니다. 더 큰 단위를 사용하세요."
+        )
+    
+    return await query_stats(
+        db,
+        start_time,
+        end_time,
+        granularity,
+        factory_id=factory_id,
+        types=[IncidentType(item.value) for item in incident_type or []],
+    )
+
+
+@router.get("/heatmap", response_model=IncidentHeatmapResponse)
+async def get_incident_heatmap(
+    factory_id: UUID,
+    incident_type: Optional[List[IncidentTypeEnum]] = Query(None, alias="type", description="사고 유형 필터 (여러 개 가능)"),
+    start_time: Optional[datetime] = Query(None, description="집계 시작 시각 (기본값: 종료 30일 전)"),
+    end_time: Optional[datetime] = Query(None, description="집계 종료 시각 (미포함, 기본값: 현재)"),
+    cell_size: float = Query(1.0, ge=0.01, description="셀 한 변 길이 (m, 0.01 이상)"),
+    include_y: bool = Query(False, description="True이면 XYZ 격자 (기본값: 바닥면 XZ 격자)"),
+    weight: HeatmapWeight = Query("count", description="셀 값 (count: 사고 수, severity: 심각도 합)"),
+    min_x: Optional[float] = None,
+    max_x: Optional[float] = None,
+    min_y: Optional[float] = None,
+    max_y: Optional[float] = None,
+    min_z: Optional[float] = None,
+    max_z: Optional[float] = None,
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    사고 히트맵 API
+    공장/기간 내 사고 위치를 격자 셀별로 DB에서 집계하여 float32 배열(base64)로 반환
+    범위(min/max)를 생략한 축은 기간 내 사고 위치 범위 사용
+    """
+    end_time = end_time or datetime.now(timezone.utc)
+    start_time = start_time or end_time - timedelta(days=30)
+    if start_time >= end_time:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="start_time은 end_time보다 이전이어야 합니다."
+        )
+    
+    return await build_heatmap(
+        db,
+        factory_id,
+        start_time,
+        end_time,
+        cell_size,
+        bounds={
+            "min_x": min_x, "max_x": max_x,
+            "min_y": min_y, "max_y": max_y,
+            "min_z": min_z, "max_z": max_z,
+        },
+        include_y=include_y,
+        weight=weight,
+        types=[IncidentType(item.value) for item in incident_type or []],
+    )
+
+
 @router.get("/stream")
-async def stream_incidents():
+async def stream_incidents(
+    last_event_id: Optional[str] = Header(None, alias="Last-Event-ID"),
+):
     """
     SSE (Server-Sent Events) 스트림 엔드포인트
-    실시간 사고 알림을 클라이언트에 푸시
+    실시간 사고 알림을 클라이언트에 푸시 (프로세스 공유 이벤트 허브에서 수신)
+    모든 프레임에 id를 포함하며, 재접속 시 Last-Event-ID 이후 알림을 재전송
     """
     async def event_generator():
-        redis_service = RedisService()
-        async for message in redis_service.subscribe_incidents():
-            yield f"data: {message}\n\n"
+        async with event_hub.subscribe(settings.REDIS_CHANNEL, last_event_id=last_event_id) as subscription:
+            if subscription.reset_required:
+                subscription.reset_required = False
+                yield SSE_RESET_FRAME
+            async for event_id, message in subscription:
+                if subscription.reset_required:
+                    # 느린 클라이언트 버퍼에서 버린 이벤트가 있으면 전체 상태를 다시 조회하도록 알림
+                    subscription.reset_required = False
+                    yield SSE_RESET_FRAME
+                yield format_sse(event_id, message)
     
     return StreamingResponse(
         event_generator(),
@@ -190,6 +408,7 @@ async def update_incident(
         )
     
     update_data = incident_data.model_dump(exclude_unset=True)
+    was_resolved = bool(incident.is_resolved)
     
     # 해결 처리 시 resolved_at 타임스탬프 설정
     if update_data.get("is_resolved") and not incident.is_resolved:
@@ -198,6 +417,12 @@ async def update_incident(
     for field, value in update_data.items():
         setattr(incident, field, value)
     
+    # 해결/해결 취소 시 통계 집계의 해결 건수/해결 시간 증감
+    if bool(incident.is_resolved) != was_resolved and incident.resolved_at is not None:
+        rollups = RollupDelta()
+        rollups.add_resolution(incident, 1 if incident.is_resolved else -1)
+        await rollups.apply(db)
+    
     await db.commit()
     await db.refresh(incident)
     return incident
@@ -221,4 +446,7 @@ async def delete_incident(
         )
     
     await db.delete(incident)
+    rollups = RollupDelta()
+    rollups.add_incident(incident, -1)
+    await rollups.apply(db)
     await db.commit()
@@ -5,6 +5,11 @@ from .incident import (
     IncidentCreate,
     IncidentUpdate,
     IncidentResponse,
+    IncidentBulkResponse,
+    IncidentHeatmapResponse,
+    IncidentStatsBucket,
+    IncidentStatsResponse,
+    IncidentStatsValues,
     IncidentTypeEnum,
 )
 
@@ -12,5 +17,10 @@ __all__ = [
     "IncidentCreate",
     "IncidentUpdate",
     "IncidentResponse",
+    "IncidentBulkResponse",
+    "IncidentHeatmapResponse",
+    "IncidentStatsBucket",
+    "IncidentStatsResponse",
+    "IncidentStatsValues",
     "IncidentTypeEnum",
 ]
@@ -49,7 +49,54 @@ class IncidentResponse(IncidentBase):
     is_resolved: bool
     timestamp: datetime
     resolved_at: Optional[datetime]
-    detected_cctv_ids: Optional[list[UUID]] = Field(None, description="감지된 CCTV ID 목록")
+    detected_cctv_ids: Optional[list[UUID]] = Field(None, description="감지된 CCTV ID 목록 (보강 전에는 null)")
+    enriched_at: Optional[datetime] = Field(None, description="CCTV 매칭 보강 완료 시각")
     
     class Config:
         from_attributes = True
+
+
+class IncidentBulkResponse(BaseModel):
+    """사고 일괄 등록 응답 스키마"""
+    created: int = Field(..., description="등록된 사고 수")
+    ids: list[UUID] = Field(..., description="등록된 사고 ID 목록 (요청 순서와 동일)")
+    detected_cctv_ids: list[list[UUID]] = Field(..., description="사고별 감지된 CCTV ID 목록 (요청 순서와 동일)")
+
+
+class IncidentStatsValues(BaseModel):
+    """사고 통계 값"""
+    count: int = Field(..., description="사고 건수")
+    severity: list[int] = Field(..., description="심각도 1~5별 건수")
+    resolved_count: int = Field(..., description="해결된 사고 수")
+    mean_time_to_resolve: Optional[float] = Field(None, description="평균 해결 시간 (초, 해결 건이 없으면 null)")
+
+
+class IncidentStatsBucket(IncidentStatsValues):
+    """기간 버킷별 사고 통계"""
+    bucket_start: datetime = Field(..., description="버킷 시작 시각")
+
+
+class IncidentStatsResponse(BaseModel):
+    """사고 통계 응답 스키마"""
+    granularity: str = Field(..., description="버킷 단위 (minute/hour/day)")
+    start_time: datetime = Field(..., description="집계 시작 시각 (버킷 경계로 내림)")
+    end_time: datetime = Field(..., description="집계 종료 시각 (미포함)")
+    total: IncidentStatsValues = Field(..., description="전체 합계")
+    by_type: dict[str, IncidentStatsValues] = Field(..., description="사고 유형별 합계")
+    by_factory: dict[UUID, IncidentStatsValues] = Field(..., description="공장별 합계")
+    series: list[IncidentStatsBucket] = Field(..., description="버킷별 합계 (사고가 있는 버킷만, 시간순)")
+
+
+class IncidentHeatmapResponse(BaseModel):
+    """사고 히트맵 응답 스키마"""
+    factory_id: UUID
+    start_time: datetime = Field(..., description="집계 시작 시각")
+    end_time: datetime = Field(..., description="집계 종료 시각 (미포함)")
+    axes: str = Field(..., description="배열 축 순서 (zx 또는 yzx, 마지막 축 x가 가장 빠르게 변함)")
+    shape: list[int] = Field(..., description="축별 셀 수 (axes 순서)")
+    origin: list[float] = Field(..., description="격자 시작 좌표 (axes 순서)")
+    cell_size: float = Field(..., description="셀 한 변 길이 (m)")
+    total: float = Field(..., description="전체 셀 값 합계")
+    max: float = Field(..., description="최대 셀 값 (색상 정규화용)")
+    dtype: str = Field("float32", description="data 원소 자료형")
+    data: str = Field(..., description="셀 값 배열 (little-endian float32, base64)")
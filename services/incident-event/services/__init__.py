@@ -1,6 +1,6 @@
 """
 V-Factory - Incident Event 비즈니스 로직 서비스
 """
-from .redis_service import RedisService
+from .redis_service import RedisService, get_redis_service
 
-__all__ = ["RedisService"]
+__all__ = ["RedisService", "get_redis_service"]
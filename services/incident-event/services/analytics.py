@@ -0,0 +1,236 @@
+"""
+V-Factory - 사고 통계 (집계 테이블)
+사고 생성/해결/삭제와 같은 트랜잭션에서 분/시간/일 버킷 x 공장 x 사고 유형별 집계(incident_rollups)를 증감하고,
+/incidents/stats는 원본 사고 대신 집계 행만 읽어 응답
+"""
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterable, Optional, Tuple
+from uuid import UUID
+
+from sqlalchemy import delete, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncSession
+
+from config import settings
+from models import IncidentRollup, IncidentType
+
+# 버킷 단위 (세밀한 순)
+GRANULARITIES: Dict[str, timedelta] = {
+    "minute": timedelta(minutes=1),
+    "hour": timedelta(hours=1),
+    "day": timedelta(days=1),
+}
+
+# 증감 대상 컬럼
+_COUNTER_COLUMNS = (
+    "count",
+    "severity_1",
+    "severity_2",
+    "severity_3",
+    "severity_4",
+    "severity_5",
+    "resolved_count",
+    "resolve_seconds_sum",
+)
+
+# 다중 행 UPSERT 1회당 최대 행 수 (PostgreSQL 바인드 파라미터 상한 대비)
+_UPSERT_CHUNK = 2000
+
+
+def _utc(value: datetime) -> datetime:
+    """DB 드라이버에 따라 naive/aware로 돌아오는 시각을 UTC aware로 통일"""
+    return value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value.astimezone(timezone.utc)
+
+
+def bucket_start(value: datetime, granularity: str) -> datetime:
+    """시각이 속한 버킷의 시작 시각 (UTC)"""
+    value = _utc(value)
+    if granularity == "minute":
+        return value.replace(second=0, microsecond=0)
+    if granularity == "hour":
+        return value.replace(minute=0, second=0, microsecond=0)
+    return value.replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+class RollupDelta:
+    """
+    집계 증감 모음 (같은 버킷/공장/유형은 합쳐서 행당 1번만 UPSERT)
+
+    사용 예:
+        delta = RollupDelta()
+        delta.add_incident(incident)
+        await delta.apply(session)   # 호출자의 commit과 함께 저장됨
+    """
+
+    def __init__(self):
+        # (버킷 단위, 버킷 시작, 공장 ID, 사고 유형) → 컬럼별 증감량
+        self._counters: Dict[Tuple[str, datetime, UUID, IncidentType], Dict[str, float]] = {}
+
+    def __bool__(self) -> bool:
+        return bool(self._counters)
+
+    def _add(self, incident: Any, values: Dict[str, float]) -> None:
+        incident_type = IncidentType(getattr(incident.type, "value", incident.type))
+        for granularity in GRANULARITIES:
+            key = (granularity, bucket_start(incident.timestamp, granularity), incident.factory_id, incident_type)
+            counters = self._counters.setdefault(key, dict.fromkeys(_COUNTER_COLUMNS, 0))
+            for column, value in values.items():
+                counters[column] += value
+
+    def add_incident(self, incident: Any, sign: int = 1) -> None:
+        """사고 생성(sign=1)/삭제(sign=-1) 반영 (해결된 사고면 해결 통계도 함께)"""
+        self._add(incident, {"count": sign, f"severity_{incident.severity}": sign})
+        if incident.is_resolved and incident.resolved_at is not None:
+            self.add_resolution(incident, sign)
+
+    def add_resolution(self, incident: Any, sign: int = 1) -> None:
+        """해결(sign=1)/해결 취소(sign=-1) 반영 - 사고 발생 버킷에 해결 시간을 누적"""
+        seconds = max((_utc(incident.resolved_at) - _utc(incident.timestamp)).total_seconds(), 0.0)
+        self._add(incident, {"resolved_count": sign, "resolve_seconds_sum": sign * seconds})
+
+    async def apply(self, session: AsyncSession) -> None:
+        """증감량을 집계 테이블에 UPSERT (키 순서로 정렬해 동시 트랜잭션 간 교착 방지)"""
+        if not self._counters:
+            return
+        rows = [
+            {
+                "granularity": granularity,
+                "bucket_start": start,
+                "factory_id": factory_id,
+                "type": incident_type,
+                **counters,
+            }
+            for (granularity, start, factory_id, incident_type), counters in sorted(
+                self._counters.items(), key=lambda item: (item[0][0], item[0][1], str(item[0][2]), item[0][3].value)
+            )
+        ]
+        connection = await session.connection()
+        insert = postgresql.insert if connection.dialect.name == "postgresql" else sqlite.insert
+        for offset in range(0, len(rows), _UPSERT_CHUNK):
+            statement = insert(IncidentRollup).values(rows[offset:offset + _UPSERT_CHUNK])
+            statement = statement.on_conflict_do_update(
+                index_elements=["granularity", "bucket_start", "factory_id", "type"],
+                set_={
+                    column: getattr(IncidentRollup, column) + getattr(statement.excluded, column)
+                    for column in _COUNTER_COLUMNS
+                },
+            )
+            await session.execute(statement)
+        self._counters.clear()
+
+
+def choose_granularity(start: datetime, end: datetime, now: Optional[datetime] = None) -> str:
+    """
+    조회 범위에 맞는 가장 세밀한 버킷 단위 선택
+    (버킷 수가 ANALYTICS_AUTO_MAX_BUCKETS 이하이고, 해당 단위 집계가 보존 기간 안에 있는 단위)
+    """
+    now = _utc(now or datetime.now(timezone.utc))
+    for granularity, width in GRANULARITIES.items():
+        retention = rollup_retention(granularity)
+        if retention is not None and _utc(start) < now - retention:
+            continue
+        if (end - start) / width <= settings.ANALYTICS_AUTO_MAX_BUCKETS:
+            return granularity
+    return "day"
+
+
+def rollup_retention(granularity: str) -> Optional[timedelta]:
+    """버킷 단위별 집계 보존 기간 (None이면 무제한)"""
+    if granularity == "minute":
+        return timedelta(days=settings.ANALYTICS_MINUTE_RETENTION_DAYS)
+    if granularity == "hour":
+        return timedelta(days=settings.ANALYTICS_HOUR_RETENTION_DAYS)
+    return None
+
+
+async def purge_rollups(conn: AsyncConnection, now: datetime) -> int:
+    """보존 기간이 지난 분/시간 집계 삭제 (일 집계는 유지, 삭제 행 수 반환)"""
+    deleted = 0
+    for granularity in GRANULARITIES:
+        retention = rollup_retention(granularity)
+        if retention is None:
+            continue
+        result = await conn.execute(
+            delete(IncidentRollup).where(
+                IncidentRollup.granularity == granularity,
+                IncidentRollup.bucket_start < _utc(now) - retention,
+            )
+        )
+        deleted += result.rowcount or 0
+    return deleted
+
+
+def _values(sums: Dict[str, float]) -> Dict[str, Any]:
+    """합계 → 응답 값 (심각도 분포 배열, 평균 해결 시간)"""
+    resolved = int(sums["resolved_count"])
+    return {
+        "count": int(sums["count"]),
+        "severity": [int(sums[f"severity_{level}"]) for level in range(1, 6)],
+        "resolved_count": resolved,
+        "mean_time_to_resolve": sums["resolve_seconds_sum"] / resolved if resolved > 0 else None,
+    }
+
+
+async def query_stats(
+    db: AsyncSession,
+    start: datetime,
+    end: datetime,
+    granularity: str,
+    factory_id: Optional[UUID] = None,
+    types: Iterable[IncidentType] = (),
+) -> Dict[str, Any]:
+    """
+    집계 테이블에서 기간 통계 조회
+
+    Args:
+        db: 데이터베이스 세션
+        start: 시작 시각 (버킷 경계로 내림)
+        end: 종료 시각 (미포함)
+        granularity: 버킷 단위
+        factory_id: 공장 필터 (None이면 전체)
+        types: 사고 유형 필터 (비어 있으면 전체)
+
+    Returns:
+        IncidentStatsResponse 형태의 딕셔너리
+    """
+    start = bucket_start(start, granularity)
+    # (버킷 단위, 버킷 시작) PK 범위 조회 - 30일 일 단위면 공장 x 유형 x 30행
+    query = (
+        select(IncidentRollup.__table__)
+        .where(IncidentRollup.granularity == granularity)
+        .where(IncidentRollup.bucket_start >= start)
+        .where(IncidentRollup.bucket_start < end)
+    )
+    if factory_id is not None:
+        query = query.where(IncidentRollup.factory_id == factory_id)
+    types = list(types)
+    if types:
+        query = query.where(IncidentRollup.type.in_(types))
+
+    def zero() -> Dict[str, float]:
+        return dict.fromkeys(_COUNTER_COLUMNS, 0)
+
+    total = zero()
+    by_type: Dict[str, Dict[str, float]] = {}
+    by_factory: Dict[UUID, Dict[str, float]] = {}
+    series: Dict[datetime, Dict[str, float]] = {}
+    for row in (await db.execute(query)).mappings():
+        incident_type = getattr(row["type"], "value", row["type"])
+        for sums in (
+            total,
+            by_type.setdefault(incident_type, zero()),
+            by_factory.setdefault(row["factory_id"], zero()),
+            series.setdefault(_utc(row["bucket_start"]), zero()),
+        ):
+            for column in _COUNTER_COLUMNS:
+                sums[column] += row[column] or 0
+
+    return {
+        "granularity": granularity,
+        "start_time": start,
+        "end_time": end,
+        "total": _values(total),
+        "by_type": {key: _values(sums) for key, sums in by_type.items()},
+        "by_factory": {key: _values(sums) for key, sums in by_factory.items()},
+        "series": [{"bucket_start": key, **_values(series[key])} for key in sorted(series)],
+    }
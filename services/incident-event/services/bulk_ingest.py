@@ -0,0 +1,202 @@
+"""
+V-Factory - 사고 일괄 등록
+공장별로 존재 확인과 CCTV 매칭(배치 공간 쿼리)을 한 번씩만 수행하고,
+사고는 COPY(PostgreSQL) 또는 다중 행 INSERT로, 알림(Outbox)/통계 집계와 한 트랜잭션으로 저장
+"""
+import asyncio
+import json
+import time
+import uuid
+from collections import defaultdict
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from types import SimpleNamespace
+from typing import Any, Dict, Iterator, List, Optional, Sequence
+from uuid import UUID
+
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from config import settings
+from models import Incident, IncidentType, OutboxEvent
+from schemas import IncidentCreate
+from services.analytics import RollupDelta
+from services.factory_cache import FactoryCache, get_factory_cache
+from services.factory_core_client import FactoryCoreClient, get_factory_core_client
+from services.redis_service import incident_to_dict
+from utils.logging import logger
+from utils.metrics import BULK_INGEST_ITEMS, BULK_INGEST_SECONDS
+
+# COPY 대상 컬럼 (레코드 튜플 순서)
+_COPY_COLUMNS = (
+    "id",
+    "factory_id",
+    "type",
+    "severity",
+    "description",
+    "position_x",
+    "position_y",
+    "position_z",
+    "npc_id",
+    "detected_cctv_ids",
+    "enriched_at",
+    "is_resolved",
+    "timestamp",
+)
+
+
+class UnknownFactoriesError(Exception):
+    """요청에 존재하지 않는(또는 확인할 수 없는) 공장 ID가 포함됨"""
+
+    def __init__(self, factory_ids: List[UUID]):
+        super().__init__(f"Unknown factories: {[str(factory_id) for factory_id in factory_ids]}")
+        self.factory_ids = factory_ids
+
+
+@contextmanager
+def bulk_stage(name: str) -> Iterator[None]:
+    """일괄 등록 단계 소요 시간 기록"""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        BULK_INGEST_SECONDS.labels(stage=name).observe(time.perf_counter() - started)
+
+
+async def bulk_create_incidents(
+    db: AsyncSession,
+    items: Sequence[IncidentCreate],
+    cache: Optional[FactoryCache] = None,
+    client: Optional[FactoryCoreClient] = None,
+) -> List[Dict[str, Any]]:
+    """
+    사고 일괄 등록
+
+    Args:
+        db: 데이터베이스 세션 (함수 안에서 commit)
+        items: 검증된 사고 생성 요청 목록
+        cache: 공장 존재 캐시 (기본값: 전역 캐시)
+        client: Factory Core 클라이언트 (기본값: 전역 클라이언트)
+
+    Returns:
+        저장된 사고 행 딕셔너리 리스트 (요청 순서와 동일)
+
+    Raises:
+        UnknownFactoriesError: 존재하지 않는 공장 ID 포함 (아무것도 저장하지 않음)
+        httpx.HTTPError: Factory Core 조회 실패 (아무것도 저장하지 않음)
+    """
+    cache = cache or get_factory_cache()
+    client = client or get_factory_core_client()
+    BULK_INGEST_ITEMS.observe(len(items))
+
+    # 공장별 요청 인덱스 (공장당 확인/매칭 1회)
+    by_factory: Dict[UUID, List[int]] = defaultdict(list)
+    for index, item in enumerate(items):
+        by_factory[item.factory_id].append(index)
+
+    with bulk_stage("validate"):
+        factory_ids = list(by_factory)
+        checks = await asyncio.gather(
+            *(cache.exists(factory_id) for factory_id in factory_ids), return_exceptions=True
+        )
+        for result in checks:
+            if isinstance(result, BaseException):
+                # Factory Core 장애는 공장 없음과 구분 (호출자가 503 응답)
+                raise result
+        missing = [factory_id for factory_id, exists in zip(factory_ids, checks) if not exists]
+        if missing:
+            raise UnknownFactoriesError(missing)
+
+    with bulk_stage("match"):
+        detected: List[List[UUID]] = [[] for _ in items]
+        matches = await asyncio.gather(
+            *(
+                client.find_covering_cctvs_batch(
+                    factory_id,
+                    [(items[i].position_x, items[i].position_y, items[i].position_z) for i in indexes],
+                    max_distance=settings.ENRICHMENT_MAX_DISTANCE,
+                )
+                for factory_id, indexes in by_factory.items()
+            ),
+            return_exceptions=True,
+        )
+        for (factory_id, indexes), result in zip(by_factory.items(), matches):
+            if isinstance(result, BaseException):
+                # CCTV 매칭 실패해도 사고 저장/알림은 유지 (단건 보강과 동일)
+                logger.warning(f"[BulkIngest] CCTV 매칭 실패: {factory_id} - {result!r}")
+                continue
+            for index, cctv_ids in zip(indexes, result):
+                detected[index] = cctv_ids
+
+    now = datetime.now(timezone.utc)
+    rows = [
+        {
+            "id": uuid.uuid4(),
+            "factory_id": item.factory_id,
+            "type": IncidentType(item.type.value),
+            "severity": item.severity,
+            "description": item.description,
+            "position_x": item.position_x,
+            "position_y": item.position_y,
+            "position_z": item.position_z,
+            "npc_id": item.npc_id,
+            "detected_cctv_ids": [str(cctv_id) for cctv_id in cctv_ids],
+            "enriched_at": now,
+            "is_resolved": False,
+            "timestamp": now,
+        }
+        for item, cctv_ids in zip(items, detected)
+    ]
+
+    with bulk_stage("insert"):
+        # 알림 Outbox를 먼저 기록 (트랜잭션 시작) → 같은 트랜잭션에서 사고 COPY
+        await db.execute(
+            insert(OutboxEvent),
+            [
+                {
+                    "stream": settings.REDIS_CHANNEL,
+                    "payload": json.dumps(incident_to_dict(SimpleNamespace(**row))),
+                    "created_at": now,
+                }
+                for row in rows
+            ],
+        )
+        await _insert_incidents(db, rows)
+        # 통계 집계 (버킷/공장/유형별로 합쳐 행당 1번 UPSERT)
+        rollups = RollupDelta()
+        for row in rows:
+            rollups.add_incident(SimpleNamespace(**row))
+        await rollups.apply(db)
+        await db.commit()
+
+    return rows
+
+
+async def _insert_incidents(db: AsyncSession, rows: List[Dict[str, Any]]) -> None:
+    """PostgreSQL(asyncpg)이면 COPY, 그 외(SQLite 테스트 등)는 다중 행 INSERT"""
+    connection = await db.connection()
+    if connection.dialect.name != "postgresql":
+        await db.execute(insert(Incident), rows)
+        return
+
+    raw = await connection.get_raw_connection()
+    await raw.driver_connection.copy_records_to_table(
+        Incident.__tablename__,
+        columns=_COPY_COLUMNS,
+        records=[
+            tuple(
+                _copy_value(column, row[column])
+                for column in _COPY_COLUMNS
+            )
+            for row in rows
+        ],
+    )
+
+
+def _copy_value(column: str, value: Any) -> Any:
+    """COPY 레코드 값 변환 (enum은 문자열, JSON 컬럼은 직렬화 문자열)"""
+    if column == "type":
+        return value.value
+    if column == "detected_cctv_ids":
+        return json.dumps(value)
+    return value
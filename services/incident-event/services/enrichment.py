@@ -0,0 +1,320 @@
+"""
+V-Factory - 사고 보강 파이프라인
+사고 생성 요청은 검증/저장 후 바로 응답하고, 크기 제한된 큐의 워커 태스크가
+CCTV 매칭 → detected_cctv_ids와 사고 알림(Outbox)을 한 트랜잭션으로 저장을 백그라운드로 수행
+(Redis 전달은 Outbox 릴레이가 담당)
+
+사고 행은 enriched_at이 NULL인 상태로 저장되어 그 자체가 보강 대기 표시가 되며,
+프로세스 종료/장애로 큐의 작업이 유실되어도 주기적인 스윕이 미보강 사고를 다시 큐에 넣음
+(보강 결과는 enriched_at이 NULL인 행에만 저장하므로 중복 처리되어도 알림은 한 번만 기록)
+"""
+import asyncio
+import time
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from typing import Iterator, List, Optional, Set
+from uuid import UUID
+
+import httpx
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from sqlalchemy.orm.attributes import set_committed_value
+
+from config import settings
+from database import async_session
+from models import Incident
+from services.factory_core_client import FactoryCoreClient, get_factory_core_client
+from services.outbox import OutboxRelay, add_outbox_event, get_outbox_relay
+from services.redis_service import incident_to_dict
+from utils.logging import logger
+from utils.metrics import (
+    ENRICHMENT_JOBS,
+    ENRICHMENT_QUEUE_DEPTH,
+    ENRICHMENT_STAGE_SECONDS,
+)
+
+
+@contextmanager
+def _stage(name: str) -> Iterator[None]:
+    """보강 단계 소요 시간 기록 (예외가 발생해도 기록)"""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        ENRICHMENT_STAGE_SECONDS.labels(stage=name).observe(time.perf_counter() - started)
+
+
+class _Job:
+    """대기 중인 보강 작업 (사고 + 큐 적재 시각)"""
+
+    __slots__ = ("incident", "enqueued_at")
+
+    def __init__(self, incident: Incident):
+        self.incident = incident
+        self.enqueued_at = time.perf_counter()
+
+
+class EnrichmentPipeline:
+    """
+    사고 보강 파이프라인 클래스
+
+    - 요청 경로는 submit()으로 작업을 넣기만 함 (대기 없음, 큐가 가득 차면 False)
+    - 워커 태스크 수와 큐 크기로 Factory Core/DB 동시 부하를 제한
+    - CCTV 매칭이 실패해도 빈 목록으로 저장하여 사고 알림은 유지
+    - 스윕 태스크가 보강되지 않은 채 남은 사고(enriched_at IS NULL)를 주기적으로 다시 등록
+    """
+
+    def __init__(
+        self,
+        client: Optional[FactoryCoreClient] = None,
+        session_factory: Optional[async_sessionmaker] = None,
+        relay: Optional[OutboxRelay] = None,
+        workers: Optional[int] = None,
+        queue_size: Optional[int] = None,
+    ):
+        self._client = client
+        self._session_factory = session_factory or async_session
+        self._relay = relay
+        self.worker_count = workers or settings.ENRICHMENT_WORKERS
+        self._queue: "asyncio.Queue[_Job]" = asyncio.Queue(maxsize=queue_size or settings.ENRICHMENT_QUEUE_SIZE)
+        self._workers: List[asyncio.Task] = []
+        self._sweeper: Optional[asyncio.Task] = None
+        # 큐에 있거나 처리 중인 사고 ID (스윕이 같은 사고를 중복 등록하지 않도록)
+        self._pending: Set[UUID] = set()
+        ENRICHMENT_QUEUE_DEPTH.set_function(lambda: self.queue_depth)
+
+    @property
+    def queue_depth(self) -> int:
+        return self._queue.qsize()
+
+    def start(self) -> None:
+        """워커 태스크 시작 (lifespan에서 호출)"""
+        if self._workers:
+            return
+        self._workers = [
+            asyncio.create_task(self._worker(index)) for index in range(self.worker_count)
+        ]
+        self._sweeper = asyncio.create_task(self._sweep_loop())
+
+    def submit(self, incident: Incident) -> bool:
+        """
+        보강 작업 등록 (대기 없음)
+
+        Returns:
+            등록되면 True, 워커가 없거나 큐가 가득 차면 False (호출자가 직접 보강)
+        """
+        if not self._workers:
+            return False
+        try:
+            self._queue.put_nowait(_Job(incident))
+        except asyncio.QueueFull:
+            logger.warning(f"[Enrichment] 보강 큐가 가득 참 ({self.queue_depth}), 요청 안에서 직접 보강: {incident.id}")
+            return False
+        self._pending.add(incident.id)
+        return True
+
+    async def sweep_once(self) -> int:
+        """
+        보강되지 않은 사고를 다시 큐에 등록 (큐 유실 복구)
+
+        ENRICHMENT_SWEEP_MIN_AGE보다 오래되고 ENRICHMENT_SWEEP_LOOKBACK 안에 생성된
+        enriched_at IS NULL 사고를 오래된 순으로 최대 ENRICHMENT_SWEEP_BATCH_SIZE개 조회
+        (큐가 가득 차면 나머지는 다음 스윕에서 처리)
+
+        Returns:
+            다시 등록한 사고 수
+        """
+        now = datetime.utcnow()
+        async with self._session_factory() as session:
+            result = await session.execute(
+                select(Incident)
+                .where(
+                    Incident.enriched_at.is_(None),
+                    Incident.timestamp >= now - timedelta(seconds=settings.ENRICHMENT_SWEEP_LOOKBACK),
+                    Incident.timestamp < now - timedelta(seconds=settings.ENRICHMENT_SWEEP_MIN_AGE),
+                )
+                .order_by(Incident.timestamp)
+                .limit(settings.ENRICHMENT_SWEEP_BATCH_SIZE)
+            )
+            incidents = result.scalars().all()
+
+        submitted = 0
+        for incident in incidents:
+            if incident.id in self._pending:
+                continue
+            if not self.submit(incident):
+                break
+            submitted += 1
+        return submitted
+
+    async def enrich(
+        self,
+        incident: Incident,
+        session: Optional[AsyncSession] = None,
+        mode: str = "inline",
+    ) -> List[UUID]:
+        """
+        사고 1건 보강 (CCTV 매칭 → 결과/알림 저장 후 Outbox 릴레이 깨움)
+
+        Args:
+            incident: 저장된 Incident ORM 인스턴스 (보강 결과가 속성에 반영됨)
+            session: 사고를 저장한 세션 (없으면 새 세션으로 갱신)
+            mode: 메트릭 라벨 (async: 워커, inline: 요청 안에서 수행)
+
+        Returns:
+            감지된 CCTV ID 리스트
+        """
+        outcome = "ok"
+
+        with _stage("match"):
+            try:
+                detected_cctv_ids = await self.client.find_covering_cctvs(
+                    incident.factory_id,
+                    (incident.position_x, incident.position_y, incident.position_z),
+                    max_distance=settings.ENRICHMENT_MAX_DISTANCE,
+                )
+                logger.debug(f"[Enrichment] 감지된 CCTV: {len(detected_cctv_ids)}개 - {incident.id}")
+            except httpx.HTTPStatusError as e:
+                logger.warning(f"[Enrichment] CCTV 매칭 실패: {e.response.status_code} - {e.response.text}")
+                detected_cctv_ids, outcome = [], "degraded"
+            except Exception as e:
+                # Factory Core Service 연결 실패해도 사고 알림은 발행
+                logger.warning(f"[Enrichment] Factory Core Service 호출 실패: {e!r}")
+                detected_cctv_ids, outcome = [], "degraded"
+
+        with _stage("persist"):
+            try:
+                if await self._persist(incident, detected_cctv_ids, session):
+                    self.relay.notify()
+                else:
+                    logger.debug(f"[Enrichment] 이미 보강된 사고, 결과 저장 생략: {incident.id}")
+                    outcome = "duplicate"
+            except Exception as e:
+                logger.error(f"[Enrichment] 보강 결과 저장 실패: {incident.id} - {e!r}")
+                outcome = "failed"
+
+        ENRICHMENT_JOBS.labels(mode=mode, outcome=outcome).inc()
+        return detected_cctv_ids
+
+    async def close(self, timeout: Optional[float] = None) -> None:
+        """남은 작업을 제한 시간 동안 처리한 뒤 워커 종료 (애플리케이션 종료 시)"""
+        if not self._workers:
+            return
+        if self._sweeper is not None:
+            self._sweeper.cancel()
+            await asyncio.gather(self._sweeper, return_exceptions=True)
+            self._sweeper = None
+        timeout = settings.ENRICHMENT_DRAIN_TIMEOUT if timeout is None else timeout
+        try:
+            await asyncio.wait_for(self._queue.join(), timeout)
+        except asyncio.TimeoutError:
+            # 남은 사고는 enriched_at이 NULL로 남아 다음 시작 시 스윕이 다시 등록
+            logger.warning(f"[Enrichment] 종료 대기 시간 초과, 미처리 보강 작업 {self.queue_depth}개")
+        workers, self._workers = self._workers, []
+        for task in workers:
+            task.cancel()
+        await asyncio.gather(*workers, return_exceptions=True)
+
+    @property
+    def client(self) -> FactoryCoreClient:
+        return self._client or get_factory_core_client()
+
+    @property
+    def relay(self) -> OutboxRelay:
+        return self._relay or get_outbox_relay()
+
+    # ===== 내부 구현 =====
+
+    async def _persist(
+        self,
+        incident: Incident,
+        detected_cctv_ids: List[UUID],
+        session: Optional[AsyncSession],
+    ) -> bool:
+        """
+        detected_cctv_ids/enriched_at과 사고 알림 Outbox 이벤트를 한 트랜잭션으로 저장
+        (요청 세션/워커 세션 모두 enriched_at이 NULL인 행에만 저장)
+
+        Returns:
+            저장하면 True, 다른 워커/프로세스가 먼저 보강했으면 False (알림 중복 기록 방지)
+        """
+        if session is not None:
+            return await self._persist_once(session, incident, detected_cctv_ids)
+        async with self._session_factory() as worker_session:
+            return await self._persist_once(worker_session, incident, detected_cctv_ids)
+
+    async def _persist_once(
+        self,
+        session: AsyncSession,
+        incident: Incident,
+        detected_cctv_ids: List[UUID],
+    ) -> bool:
+        """보강 결과 조건부 저장 후 Incident 인스턴스에 저장된 값을 반영"""
+        values = {
+            "detected_cctv_ids": [str(cctv_id) for cctv_id in detected_cctv_ids],
+            "enriched_at": datetime.utcnow(),
+        }
+        result = await session.execute(
+            update(Incident)
+            .where(Incident.id == incident.id, Incident.enriched_at.is_(None))
+            .values(**values)
+            .execution_options(synchronize_session=False)
+        )
+        if not result.rowcount:
+            await session.rollback()
+            # 요청 세션의 사고라면 먼저 저장된 보강 결과로 갱신 (응답에 반영)
+            if incident in session:
+                await session.refresh(incident)
+            return False
+        # 이미 저장한 값이므로 변경 이력 없이 반영 (commit 시 추가 UPDATE 없음)
+        for field, value in values.items():
+            set_committed_value(incident, field, value)
+        add_outbox_event(session, settings.REDIS_CHANNEL, incident_to_dict(incident))
+        await session.commit()
+        return True
+
+    async def _worker(self, index: int) -> None:
+        """큐에서 작업을 꺼내 보강 (개별 작업 실패가 워커를 멈추지 않음)"""
+        while True:
+            job = await self._queue.get()
+            try:
+                ENRICHMENT_STAGE_SECONDS.labels(stage="queue").observe(time.perf_counter() - job.enqueued_at)
+                await self.enrich(job.incident, mode="async")
+            except Exception as e:
+                logger.error(f"[Enrichment] 워커 {index} 보강 실패: {job.incident.id} - {e!r}")
+            finally:
+                self._pending.discard(job.incident.id)
+                self._queue.task_done()
+
+    async def _sweep_loop(self) -> None:
+        """시작 직후와 ENRICHMENT_SWEEP_INTERVAL마다 미보강 사고 스윕 (실패해도 다음 주기에 재시도)"""
+        while True:
+            try:
+                submitted = await self.sweep_once()
+                if submitted:
+                    logger.info(f"[Enrichment] 미보강 사고 {submitted}건 다시 등록")
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"[Enrichment] 미보강 사고 스윕 실패: {e!r}")
+            await asyncio.sleep(settings.ENRICHMENT_SWEEP_INTERVAL)
+
+
+# 프로세스 전역 보강 파이프라인 인스턴스
+_enrichment_pipeline: Optional[EnrichmentPipeline] = None
+
+
+def get_enrichment_pipeline() -> EnrichmentPipeline:
+    """프로세스 전역 EnrichmentPipeline 반환 (최초 호출 시 생성)"""
+    global _enrichment_pipeline
+    if _enrichment_pipeline is None:
+        _enrichment_pipeline = EnrichmentPipeline()
+    return _enrichment_pipeline
+
+
+async def close_enrichment_pipeline() -> None:
+    """전역 EnrichmentPipeline 종료 (남은 작업 처리 후 워커 정리)"""
+    global _enrichment_pipeline
+    if _enrichment_pipeline is not None:
+        await _enrichment_pipeline.close()
+        _enrichment_pipeline = None
@@ -0,0 +1,203 @@
+"""
+V-Factory - 공장 존재 캐시
+사고 생성 시 Factory Core 조회를 생략하기 위해 존재가 확인된 공장 ID를 TTL+LRU로 보관
+시작 시 전체 목록으로 워밍하고 factory:events 스트림(생성/삭제)을 구독하여 갱신
+"""
+import asyncio
+import json
+import time
+from collections import OrderedDict
+from typing import Callable, Optional
+from uuid import UUID
+
+from config import settings
+from services.event_hub import EventHub, event_hub
+from services.factory_core_client import FactoryCoreClient, get_factory_core_client
+from utils.logging import logger
+from utils.metrics import (
+    FACTORY_CACHE_EVENTS,
+    FACTORY_CACHE_HIT_RATIO,
+    FACTORY_CACHE_LOOKUPS,
+    FACTORY_CACHE_SIZE,
+)
+
+# Factory Core FactoryEventType 값 (캐시에 영향을 주는 이벤트만)
+FACTORY_CREATED = "factory_created"
+FACTORY_DELETED = "factory_deleted"
+
+
+class FactoryCache:
+    """
+    공장 존재 캐시 클래스
+
+    - 존재가 확인된 공장만 보관 (없는 공장은 매번 Factory Core에 확인)
+    - 항목은 TTL이 지나면 만료되어 다음 조회 시 다시 확인 (이벤트 유실 대비)
+    - 최대 크기를 넘으면 가장 오래 조회되지 않은 항목부터 제거
+    """
+
+    def __init__(
+        self,
+        client: Optional[FactoryCoreClient] = None,
+        hub: Optional[EventHub] = None,
+        max_size: Optional[int] = None,
+        ttl: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self._client = client
+        self._hub = hub or event_hub
+        self.max_size = max_size or settings.FACTORY_CACHE_MAX_SIZE
+        self.ttl = ttl if ttl is not None else settings.FACTORY_CACHE_TTL
+        self._clock = clock
+        # 공장 ID -> 만료 시각 (삽입/조회 순서 = LRU 순서)
+        self._entries: "OrderedDict[UUID, float]" = OrderedDict()
+        self._listener: Optional[asyncio.Task] = None
+        self.hits = 0
+        self.misses = 0
+        FACTORY_CACHE_SIZE.set_function(lambda: len(self._entries))
+        FACTORY_CACHE_HIT_RATIO.set_function(lambda: self.hit_ratio)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, factory_id: UUID) -> bool:
+        expires_at = self._entries.get(factory_id)
+        return expires_at is not None and expires_at > self._clock()
+
+    @property
+    def hit_ratio(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    @property
+    def client(self) -> FactoryCoreClient:
+        return self._client or get_factory_core_client()
+
+    async def exists(self, factory_id: UUID) -> bool:
+        """
+        공장 존재 여부 확인 (캐시 적중 시 네트워크 호출 없음)
+
+        Args:
+            factory_id: 공장 ID
+
+        Returns:
+            존재하면 True
+
+        Raises:
+            httpx.HTTPError: 캐시 미스 후 Factory Core 호출 실패
+        """
+        if self._lookup(factory_id):
+            self.hits += 1
+            FACTORY_CACHE_LOOKUPS.labels(result="hit").inc()
+            return True
+
+        self.misses += 1
+        FACTORY_CACHE_LOOKUPS.labels(result="miss").inc()
+        exists = await self.client.factory_exists(factory_id)
+        if exists:
+            self.add(factory_id)
+        return exists
+
+    def add(self, factory_id: UUID) -> None:
+        """공장 ID 등록 (TTL 갱신, 최대 크기 초과 시 LRU 제거)"""
+        self._entries[factory_id] = self._clock() + self.ttl
+        self._entries.move_to_end(factory_id)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def discard(self, factory_id: UUID) -> None:
+        """공장 ID 제거 (삭제 이벤트 수신 시)"""
+        self._entries.pop(factory_id, None)
+
+    def apply_event(self, message: str) -> None:
+        """factory:events 메시지 반영 (생성은 등록, 삭제는 제거, 나머지는 무시)"""
+        try:
+            payload = json.loads(message)
+            event = payload["event"]
+            factory_id = UUID(payload["data"]["id"])
+        except (ValueError, TypeError, KeyError) as e:
+            logger.warning(f"[FactoryCache] 공장 이벤트 해석 실패: {e!r}")
+            return
+
+        if event == FACTORY_CREATED:
+            self.add(factory_id)
+        elif event == FACTORY_DELETED:
+            self.discard(factory_id)
+        else:
+            return
+        FACTORY_CACHE_EVENTS.labels(event=event).inc()
+
+    async def warm(self) -> int:
+        """Factory Core 전체 공장 목록으로 캐시 채우기 (등록한 항목 수 반환, 실패 시 0)"""
+        try:
+            factory_ids = await self.client.list_factory_ids()
+        except Exception as e:
+            logger.warning(f"[FactoryCache] 캐시 워밍 실패 (조회 시 개별 확인으로 대체): {e!r}")
+            return 0
+        for factory_id in factory_ids[-self.max_size:]:
+            self.add(factory_id)
+        logger.info(f"[FactoryCache] 캐시 워밍 완료: 공장 {len(factory_ids)}개")
+        return len(factory_ids)
+
+    def start(self) -> None:
+        """이벤트 구독 및 워밍 태스크 시작 (lifespan에서 호출, 대기 없음)"""
+        if self._listener is None or self._listener.done():
+            self._listener = asyncio.create_task(self._listen())
+
+    async def close(self) -> None:
+        """이벤트 구독 종료 (애플리케이션 종료 시)"""
+        if self._listener is not None:
+            self._listener.cancel()
+            await asyncio.gather(self._listener, return_exceptions=True)
+            self._listener = None
+
+    def _lookup(self, factory_id: UUID) -> bool:
+        """유효한 항목이면 LRU 순서 갱신 후 True, 만료된 항목은 제거"""
+        expires_at = self._entries.get(factory_id)
+        if expires_at is None:
+            return False
+        if expires_at <= self._clock():
+            del self._entries[factory_id]
+            return False
+        self._entries.move_to_end(factory_id)
+        return True
+
+    async def _listen(self) -> None:
+        """
+        공장 이벤트 구독 루프
+        구독을 먼저 등록한 뒤 워밍하므로 워밍 중 삭제된 공장도 이후 이벤트로 제거됨
+        버퍼 초과/재전송 누락으로 이벤트를 놓쳤으면 어떤 공장이 삭제되었는지 알 수 없으므로 비우고 다시 워밍
+        """
+        async with self._hub.subscribe(settings.FACTORY_EVENTS_CHANNEL) as subscription:
+            await self.warm()
+            dropped = 0
+            while True:
+                _, _, message = await subscription.get()
+                if subscription.dropped != dropped or subscription.reset_required:
+                    dropped = subscription.dropped
+                    subscription.reset_required = False
+                    logger.warning("[FactoryCache] 공장 이벤트 유실, 캐시를 비우고 다시 워밍")
+                    self._entries.clear()
+                    # 워밍 결과가 이 메시지보다 최신이므로 메시지는 반영하지 않음
+                    await self.warm()
+                    continue
+                self.apply_event(message)
+
+
+# 프로세스 전역 공장 존재 캐시 인스턴스
+_factory_cache: Optional[FactoryCache] = None
+
+
+def get_factory_cache() -> FactoryCache:
+    """프로세스 전역 FactoryCache 반환 (최초 호출 시 생성)"""
+    global _factory_cache
+    if _factory_cache is None:
+        _factory_cache = FactoryCache()
+    return _factory_cache
+
+
+async def close_factory_cache() -> None:
+    """전역 FactoryCache 이벤트 구독 종료 (애플리케이션 종료 시)"""
+    global _factory_cache
+    if _factory_cache is not None:
+        await _factory_cache.close()
+        _factory_cache = None
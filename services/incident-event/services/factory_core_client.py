@@ -0,0 +1,294 @@
+"""
+V-Factory - Factory Core Service HTTP 클라이언트
+프로세스 전역 단일 httpx 클라이언트가 keep-alive 연결 풀을 공유 (lifespan에서 종료)
+호출별 타임아웃과 재시도, 업스트림 지연/연결 재사용 메트릭 기록
+"""
+import asyncio
+import importlib.util
+import time
+from typing import Any, List, Optional, Tuple
+from uuid import UUID
+
+import httpx
+
+from config import settings
+from utils.logging import logger
+from utils.metrics import (
+    UPSTREAM_CONNECTIONS,
+    UPSTREAM_REQUEST_SECONDS,
+    UPSTREAM_RETRIES,
+)
+
+# 재시도 대상 응답 상태 (업스트림 일시 장애)
+_RETRY_STATUS = {502, 503, 504}
+
+# 메트릭에 사용하는 업스트림 이름
+_UPSTREAM = "factory-core"
+
+# Factory Core 배치 공간 쿼리 1회 최대 지점 수 (spatial 라우터 MAX_BATCH_SIZE와 동일)
+SPATIAL_BATCH_SIZE = 1000
+
+
+class _ConnectionTrace:
+    """httpcore trace 훅 - 요청 중 새 TCP 연결을 수립했는지 기록"""
+
+    __slots__ = ("connected",)
+
+    def __init__(self):
+        self.connected = False
+
+    async def __call__(self, event_name: str, info: dict) -> None:
+        if event_name == "connection.connect_tcp.complete":
+            self.connected = True
+
+
+class FactoryCoreClient:
+    """Factory Core Service 호출 클라이언트 클래스"""
+
+    def __init__(
+        self,
+        base_url: Optional[str] = None,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+    ):
+        self.base_url = base_url or settings.FACTORY_CORE_URL
+        self.retries = settings.FACTORY_CORE_RETRIES
+        self.retry_backoff = settings.FACTORY_CORE_RETRY_BACKOFF
+        self._transport = transport
+        self._client: Optional[httpx.AsyncClient] = None
+
+    def _get_client(self) -> httpx.AsyncClient:
+        """공유 httpx 클라이언트 가져오기 (keep-alive 연결 풀 지연 초기화)"""
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                base_url=self.base_url,
+                timeout=httpx.Timeout(
+                    settings.FACTORY_CORE_TIMEOUT,
+                    connect=settings.FACTORY_CORE_CONNECT_TIMEOUT,
+                ),
+                limits=httpx.Limits(
+                    max_connections=settings.FACTORY_CORE_MAX_CONNECTIONS,
+                    max_keepalive_connections=settings.FACTORY_CORE_MAX_KEEPALIVE_CONNECTIONS,
+                    keepalive_expiry=settings.FACTORY_CORE_KEEPALIVE_EXPIRY,
+                ),
+                http2=_http2_enabled(),
+                transport=self._transport,
+            )
+        return self._client
+
+    async def factory_exists(self, factory_id: UUID) -> bool:
+        """
+        공장 존재 여부 확인
+
+        Args:
+            factory_id: 공장 ID
+
+        Returns:
+            존재하면 True, 404이면 False
+
+        Raises:
+            httpx.HTTPError: 연결 실패 또는 200/404 이외 응답 (재시도 후에도 장애면 존재 여부를 알 수 없음)
+        """
+        response = await self._request(
+            "get_factory",
+            "GET",
+            f"/factories/{factory_id}",
+            timeout=settings.FACTORY_CORE_LOOKUP_TIMEOUT,
+        )
+        if response.status_code == 404:
+            return False
+        response.raise_for_status()
+        return True
+
+    async def list_factory_ids(self, page_size: int = 500) -> List[UUID]:
+        """
+        전체 공장 ID 목록 조회 (공장 존재 캐시 워밍용, skip/limit 페이지 순회)
+
+        Args:
+            page_size: 페이지당 조회 수
+
+        Returns:
+            공장 ID 리스트
+
+        Raises:
+            httpx.HTTPError: 연결 실패 또는 200 이외 응답
+        """
+        factory_ids: List[UUID] = []
+        while True:
+            response = await self._request(
+                "list_factories",
+                "GET",
+                "/factories/",
+                timeout=settings.FACTORY_CORE_TIMEOUT,
+                params={"skip": len(factory_ids), "limit": page_size},
+            )
+            response.raise_for_status()
+            page = response.json()
+            factory_ids.extend(UUID(item["id"]) for item in page)
+            if len(page) < page_size:
+                return factory_ids
+
+    async def find_covering_cctvs(
+        self,
+        factory_id: UUID,
+        position: Tuple[float, float, float],
+        max_distance: float,
+    ) -> List[UUID]:
+        """
+        지점을 시야에 포함하는 CCTV ID 목록 조회 (거리순)
+
+        Args:
+            factory_id: 공장 ID
+            position: 대상 지점 (x, y, z)
+            max_distance: 최대 감지 거리 (m)
+
+        Returns:
+            CCTV ID 리스트
+
+        Raises:
+            httpx.HTTPError: 연결 실패 또는 200 이외 응답
+        """
+        x, y, z = position
+        response = await self._request(
+            "covering_cctvs",
+            "POST",
+            "/spatial/covering-cctvs",
+            timeout=settings.FACTORY_CORE_SPATIAL_TIMEOUT,
+            params={"factory_id": str(factory_id), "max_distance": max_distance},
+            json={"x": x, "y": y, "z": z},
+        )
+        response.raise_for_status()
+        # 응답 형식: [{"cctv": {...}, "distance": ...}, ...]
+        return [UUID(item["cctv"]["id"]) for item in response.json()]
+
+    async def find_covering_cctvs_batch(
+        self,
+        factory_id: UUID,
+        positions: List[Tuple[float, float, float]],
+        max_distance: float,
+    ) -> List[List[UUID]]:
+        """
+        여러 지점을 시야에 포함하는 CCTV ID 목록 일괄 조회 (SPATIAL_BATCH_SIZE 단위로 나눠 호출)
+
+        Args:
+            factory_id: 공장 ID
+            positions: 대상 지점 (x, y, z) 리스트
+            max_distance: 최대 감지 거리 (m)
+
+        Returns:
+            지점별 CCTV ID 리스트 (입력 순서와 동일)
+
+        Raises:
+            httpx.HTTPError: 연결 실패 또는 200 이외 응답
+        """
+        results: List[List[UUID]] = []
+        for start in range(0, len(positions), SPATIAL_BATCH_SIZE):
+            chunk = positions[start:start + SPATIAL_BATCH_SIZE]
+            response = await self._request(
+                "covering_cctvs_batch",
+                "POST",
+                "/spatial/batch/covering-cctvs",
+                timeout=settings.FACTORY_CORE_SPATIAL_TIMEOUT,
+                json={
+                    "factory_id": str(factory_id),
+                    "positions": [{"x": x, "y": y, "z": z} for x, y, z in chunk],
+                    "max_distance": max_distance,
+                },
+            )
+            response.raise_for_status()
+            results.extend(
+                [UUID(item["cctv"]["id"]) for item in items] for items in response.json()
+            )
+        return results
+
+    async def _request(
+        self,
+        operation: str,
+        method: str,
+        path: str,
+        timeout: Optional[float] = None,
+        retries: Optional[int] = None,
+        **kwargs: Any,
+    ) -> httpx.Response:
+        """
+        업스트림 호출 (연결 오류/일시 장애 응답은 지수 백오프로 재시도)
+
+        Args:
+            operation: 메트릭 라벨용 호출 이름
+            method: HTTP 메서드
+            path: 요청 경로
+            timeout: 호출별 전체 타임아웃 (초, None이면 클라이언트 기본값)
+            retries: 재시도 횟수 (None이면 설정값)
+        """
+        client = self._get_client()
+        if timeout is not None:
+            kwargs["timeout"] = httpx.Timeout(timeout, connect=settings.FACTORY_CORE_CONNECT_TIMEOUT)
+        attempts = 1 + (self.retries if retries is None else retries)
+
+        for attempt in range(attempts):
+            trace = _ConnectionTrace()
+            started = time.perf_counter()
+            try:
+                response = await client.request(method, path, extensions={"trace": trace}, **kwargs)
+            except httpx.TransportError as e:
+                _observe(operation, "error", started, None)
+                if attempt + 1 >= attempts:
+                    raise
+                logger.warning(f"[FactoryCore] {operation} 호출 실패, 재시도 {attempt + 1}/{attempts - 1}: {e!r}")
+            else:
+                _observe(operation, f"{response.status_code // 100}xx", started, trace)
+                if response.status_code not in _RETRY_STATUS or attempt + 1 >= attempts:
+                    return response
+                logger.warning(f"[FactoryCore] {operation} 응답 {response.status_code}, 재시도 {attempt + 1}/{attempts - 1}")
+
+            UPSTREAM_RETRIES.labels(upstream=_UPSTREAM, operation=operation).inc()
+            await asyncio.sleep(self.retry_backoff * (2 ** attempt))
+
+    async def close(self) -> None:
+        """클라이언트 종료 (keep-alive 연결 해제)"""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+
+# 프로세스 전역 Factory Core 클라이언트 인스턴스
+_factory_core_client: Optional[FactoryCoreClient] = None
+
+
+def get_factory_core_client() -> FactoryCoreClient:
+    """프로세스 전역 FactoryCoreClient 반환 (최초 호출 시 생성)"""
+    global _factory_core_client
+    if _factory_core_client is None:
+        _factory_core_client = FactoryCoreClient()
+    return _factory_core_client
+
+
+async def close_factory_core_client() -> None:
+    """전역 FactoryCoreClient 연결 풀 종료 (애플리케이션 종료 시)"""
+    global _factory_core_client
+    if _factory_core_client is not None:
+        await _factory_core_client.close()
+        _factory_core_client = None
+
+
+def _http2_enabled() -> bool:
+    """HTTP/2 사용 여부 (h2 패키지가 없으면 HTTP/1.1로 대체)"""
+    if not settings.FACTORY_CORE_HTTP2:
+        return False
+    if importlib.util.find_spec("h2") is None:
+        logger.warning("[FactoryCore] h2 패키지가 없어 HTTP/1.1로 연결합니다 (pip install 'httpx[http2]')")
+        return False
+    return True
+
+
+def _observe(operation: str, outcome: str, started: float, trace: Optional[_ConnectionTrace]) -> None:
+    """호출 1회 지연 시간 및 연결 재사용 여부 기록 (응답을 받지 못한 호출은 지연 시간만)"""
+    UPSTREAM_REQUEST_SECONDS.labels(upstream=_UPSTREAM, operation=operation, outcome=outcome).observe(
+        time.perf_counter() - started
+    )
+    if trace is None:
+        return
+    UPSTREAM_CONNECTIONS.labels(
+        upstream=_UPSTREAM,
+        operation=operation,
+        connection="new" if trace.connected else "reused",
+    ).inc()
@@ -0,0 +1,202 @@
+"""
+V-Factory - 사고 히트맵 (공간 격자 집계)
+공장/기간별 사고 위치를 XZ(선택 시 XYZ) 격자 셀로 DB에서 GROUP BY 집계하고,
+비어 있는 셀까지 채운 float32 배열(little-endian, base64)로 반환 (WebGPU 텍스처/버퍼에 바로 업로드)
+"""
+import base64
+import math
+import sys
+from array import array
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Literal, Optional, Tuple
+from uuid import UUID
+
+from fastapi import HTTPException, status
+from sqlalchemy import Integer, cast, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from config import settings
+from models import Incident, IncidentType
+
+# 셀 값 (count: 사고 수, severity: 심각도 합)
+HeatmapWeight = Literal["count", "severity"]
+
+# 축별 위치 컬럼
+_AXIS_COLUMNS = {"x": Incident.position_x, "y": Incident.position_y, "z": Incident.position_z}
+
+
+def _axis_range(lower: float, upper: float, cell_size: float, explicit: bool) -> Tuple[float, int]:
+    """
+    축의 (격자 시작, 셀 수)
+    - 지정 범위: min부터 max 직전까지
+    - 데이터 범위: 셀 경계에 맞춰 내림한 최솟값부터 최댓값이 들어가도록
+    """
+    if explicit:
+        return lower, max(math.ceil((upper - lower) / cell_size), 1)
+    start = math.floor(lower / cell_size) * cell_size
+    return start, math.floor((upper - start) / cell_size) + 1
+
+
+def _cell_index(column: Any, start: float, cells: int, cell_size: float, dialect: str) -> Any:
+    """위치 컬럼 → 0부터 시작하는 셀 인덱스 식 (범위 안 값만 대상)"""
+    if dialect == "postgresql":
+        # width_bucket(값, 하한, 상한, 개수)은 1..개수 반환
+        return func.width_bucket(column, start, start + cells * cell_size, cells) - 1
+    # 범위 조건으로 음수가 없으므로 정수 변환(버림) = floor
+    return cast((column - start) / cell_size, Integer)
+
+
+def _encode_float32(values: array) -> str:
+    """float32 배열 → little-endian base64 문자열"""
+    if sys.byteorder == "big":
+        values = array("f", values)
+        values.byteswap()
+    return base64.b64encode(values.tobytes()).decode("ascii")
+
+
+async def build_heatmap(
+    db: AsyncSession,
+    factory_id: UUID,
+    start: datetime,
+    end: datetime,
+    cell_size: float,
+    bounds: Dict[str, Optional[float]],
+    include_y: bool = False,
+    weight: HeatmapWeight = "count",
+    types: Iterable[IncidentType] = (),
+) -> Dict[str, Any]:
+    """
+    사고 히트맵 생성
+
+    Args:
+        db: 데이터베이스 세션
+        factory_id: 공장 ID
+        start: 시작 시각 (포함)
+        end: 종료 시각 (미포함)
+        cell_size: 셀 한 변 길이 (m)
+        bounds: 축별 범위 {"min_x": ..., "max_x": ..., ...} (None이면 데이터 범위 사용)
+        include_y: True이면 XYZ 격자, 아니면 XZ 격자
+        weight: 셀 값 (count: 사고 수, severity: 심각도 합)
+        types: 사고 유형 필터 (비어 있으면 전체)
+
+    Returns:
+        IncidentHeatmapResponse 형태의 딕셔너리 (data는 x가 가장 빠르게 변하는 row-major 순서)
+
+    Raises:
+        HTTPException: 셀 수가 HEATMAP_MAX_CELLS 초과 (400)
+    """
+    axes: List[str] = ["y", "z", "x"] if include_y else ["z", "x"]
+    filters = [
+        Incident.factory_id == factory_id,
+        Incident.timestamp >= start,
+        Incident.timestamp < end,
+    ]
+    types = list(types)
+    if types:
+        filters.append(Incident.type.in_(types))
+
+    # 범위가 지정되지 않은 축은 기간 내 사고 위치의 최소/최대 사용 (인덱스 조회 1회)
+    missing = [axis for axis in axes if bounds.get(f"min_{axis}") is None or bounds.get(f"max_{axis}") is None]
+    extents: Dict[str, Tuple[float, float]] = {}
+    if missing:
+        row = (await db.execute(
+            select(*(
+                aggregate(_AXIS_COLUMNS[axis])
+                for axis in missing
+                for aggregate in (func.min, func.max)
+            )).where(*filters)
+        )).one()
+        if row[0] is None:
+            return _empty(factory_id, start, end, cell_size, axes)
+        extents = {axis: (row[2 * index], row[2 * index + 1]) for index, axis in enumerate(missing)}
+
+    origin: Dict[str, float] = {}
+    shape: Dict[str, int] = {}
+    try:
+        for axis in axes:
+            if axis in extents:
+                lower, upper = extents[axis]
+                origin[axis], shape[axis] = _axis_range(lower, upper, cell_size, explicit=False)
+                continue
+            lower, upper = bounds[f"min_{axis}"], bounds[f"max_{axis}"]
+            if upper <= lower:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=f"max_{axis}는 min_{axis}보다 커야 합니다."
+                )
+            origin[axis], shape[axis] = _axis_range(lower, upper, cell_size, explicit=True)
+    except (OverflowError, ValueError):
+        # 범위/셀 크기 비율이 무한대이거나 NaN이면 셀 수를 셀 수 없음
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="격자 범위를 계산할 수 없습니다. 범위를 줄이거나 cell_size를 키우세요."
+        )
+
+    total_cells = math.prod(shape.values())
+    if total_cells > settings.HEATMAP_MAX_CELLS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"격자 셀 수({total_cells})가 {settings.HEATMAP_MAX_CELLS}개를 넘습니다. cell_size를 키우세요."
+        )
+
+    # 셀 인덱스별 GROUP BY 집계 (사고가 있는 셀만 반환)
+    dialect = (await db.connection()).dialect.name
+    indexes = [
+        _cell_index(_AXIS_COLUMNS[axis], origin[axis], shape[axis], cell_size, dialect).label(axis)
+        for axis in axes
+    ]
+    for axis in axes:
+        column = _AXIS_COLUMNS[axis]
+        filters.append(column >= origin[axis])
+        filters.append(column < origin[axis] + shape[axis] * cell_size)
+    value = func.count() if weight == "count" else func.sum(Incident.severity)
+    result = await db.execute(select(*indexes, value.label("value")).where(*filters).group_by(*indexes))
+
+    # 밀집 배열 채우기 (row-major, 마지막 축 x가 가장 빠름)
+    grid = array("f", bytes(4 * total_cells))
+    strides = []
+    stride = 1
+    for axis in reversed(axes):
+        strides.append(stride)
+        stride *= shape[axis]
+    strides.reverse()
+    total = 0.0
+    limits = [shape[axis] for axis in axes]
+    for row in result:
+        cell = [int(row[index]) for index in range(len(axes))]
+        # 부동소수점 경계 오차로 범위를 벗어난 인덱스는 버림
+        if not all(0 <= value < limit for value, limit in zip(cell, limits)):
+            continue
+        grid[sum(value * stride for value, stride in zip(cell, strides))] += float(row.value)
+        total += float(row.value)
+
+    return {
+        "factory_id": factory_id,
+        "start_time": start,
+        "end_time": end,
+        "axes": "".join(axes),
+        "shape": limits,
+        "origin": [origin[axis] for axis in axes],
+        "cell_size": cell_size,
+        "total": total,
+        "max": max(grid) if total_cells else 0.0,
+        "dtype": "float32",
+        "data": _encode_float32(grid),
+    }
+
+
+def _empty(factory_id: UUID, start: datetime, end: datetime, cell_size: float, axes: List[str]) -> Dict[str, Any]:
+    """기간 내 사고가 없을 때의 빈 히트맵"""
+    return {
+        "factory_id": factory_id,
+        "start_time": start,
+        "end_time": end,
+        "axes": "".join(axes),
+        "shape": [0 for _ in axes],
+        "origin": [0.0 for _ in axes],
+        "cell_size": cell_size,
+        "total": 0.0,
+        "max": 0.0,
+        "dtype": "float32",
+        "data": "",
+    }
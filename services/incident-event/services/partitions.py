@@ -0,0 +1,256 @@
+"""
+V-Factory - 사고 테이블 파티션 관리
+incidents는 timestamp 기준 월 단위 범위 파티션 테이블 (PostgreSQL)
+- 이번 달부터 INCIDENT_PARTITION_PREMAKE_MONTHS개월 뒤까지 파티션을 미리 생성
+- 범위 밖 행은 기본(DEFAULT) 파티션이 받아 삽입이 실패하지 않음
+- 보존 기간이 지난 파티션은 일 단위 집계(incident_rollups)를 남긴 뒤 분리(detach) 또는 삭제(drop)
+- 보존 기간이 지난 분/시간 단위 집계 삭제
+라우터는 부모 테이블만 조회하며, timestamp 범위 조건이 있으면 PostgreSQL이 파티션을 자동으로 제외(pruning)
+"""
+import asyncio
+import re
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
+
+from config import settings
+from database import engine as default_engine
+from models import Incident, IncidentRollup
+from services.analytics import purge_rollups
+from utils.logging import logger
+from utils.metrics import INCIDENT_PARTITION_ACTIONS
+
+PARENT_TABLE = Incident.__tablename__
+DEFAULT_PARTITION = f"{PARENT_TABLE}_default"
+
+# 월 파티션 이름 (incidents_p2026_10)
+_PARTITION_NAME = re.compile(rf"^{PARENT_TABLE}_p(\d{{4}})_(\d{{2}})$")
+
+# 여러 인스턴스가 동시에 DDL을 실행하지 않도록 하는 advisory lock 키
+_MAINTENANCE_LOCK_KEY = 0x56464950
+
+
+def month_start(value: datetime) -> datetime:
+    """해당 시각이 속한 달의 시작 (UTC)"""
+    value = value.astimezone(timezone.utc) if value.tzinfo else value.replace(tzinfo=timezone.utc)
+    return value.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+
+
+def add_months(month: datetime, months: int) -> datetime:
+    """달 시작 시각에 months개월 더하기 (음수 가능)"""
+    index = month.year * 12 + month.month - 1 + months
+    return month.replace(year=index // 12, month=index % 12 + 1)
+
+
+def partition_name(month: datetime) -> str:
+    """월 파티션 테이블 이름"""
+    return f"{PARENT_TABLE}_p{month.year:04d}_{month.month:02d}"
+
+
+def partition_month(name: str) -> Optional[datetime]:
+    """월 파티션 이름에서 달 시작 시각 추출 (월 파티션이 아니면 None)"""
+    match = _PARTITION_NAME.match(name)
+    if match is None:
+        return None
+    return datetime(int(match.group(1)), int(match.group(2)), 1, tzinfo=timezone.utc)
+
+
+def expired_partitions(names: List[str], now: datetime, retention_months: int) -> List[str]:
+    """보존 기간(retention_months)이 완전히 지난 월 파티션 이름 목록 (0이면 보존 무제한)"""
+    if retention_months <= 0:
+        return []
+    cutoff = add_months(month_start(now), -retention_months)
+    expired = []
+    for name in names:
+        month = partition_month(name)
+        if month is not None and add_months(month, 1) <= cutoff:
+            expired.append(name)
+    return sorted(expired)
+
+
+class IncidentPartitionManager:
+    """
+    사고 파티션 관리 클래스
+
+    - start()에서 1회 즉시 실행 후 interval마다 반복
+    - PostgreSQL이 아니면(SQLite 테스트 등) 아무것도 하지 않음
+    """
+
+    def __init__(
+        self,
+        engine: Optional[AsyncEngine] = None,
+        premake_months: Optional[int] = None,
+        retention_months: Optional[int] = None,
+        retention_mode: Optional[str] = None,
+        interval: Optional[float] = None,
+    ):
+        self._engine = engine or default_engine
+        self.premake_months = (
+            premake_months if premake_months is not None else settings.INCIDENT_PARTITION_PREMAKE_MONTHS
+        )
+        self.retention_months = (
+            retention_months if retention_months is not None else settings.INCIDENT_RETENTION_MONTHS
+        )
+        self.retention_mode = retention_mode or settings.INCIDENT_RETENTION_MODE
+        self.interval = interval or settings.INCIDENT_PARTITION_MAINTENANCE_INTERVAL
+        self._task: Optional[asyncio.Task] = None
+
+    async def start(self) -> None:
+        """파티션 즉시 준비 후 주기 작업 시작 (lifespan에서 호출, 실패해도 시작은 계속)"""
+        try:
+            await self.run_once()
+        except Exception as e:
+            logger.warning(f"[Partitions] 시작 시 파티션 관리 실패: {e!r}")
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def run_once(self, now: Optional[datetime] = None) -> Dict[str, List[str]]:
+        """
+        파티션 생성 + 보존 작업 1회 실행
+
+        Returns:
+            작업별 파티션 이름 목록 ({"created": [...], "detached": [...], "dropped": [...]})
+        """
+        summary: Dict[str, List[str]] = {"created": [], "detached": [], "dropped": []}
+        if self._engine.dialect.name != "postgresql":
+            return summary
+        now = now or datetime.now(timezone.utc)
+
+        async with self._engine.begin() as conn:
+            locked = await conn.scalar(
+                text("SELECT pg_try_advisory_xact_lock(:key)"), {"key": _MAINTENANCE_LOCK_KEY}
+            )
+            if not locked:
+                # 다른 인스턴스가 실행 중
+                return summary
+            summary["created"] = await self._ensure_partitions(conn, now)
+            detached, dropped = await self._apply_retention(conn, now)
+            summary["detached"], summary["dropped"] = detached, dropped
+            await purge_rollups(conn, now)
+
+        for action, names in summary.items():
+            if names:
+                INCIDENT_PARTITION_ACTIONS.labels(action=action).inc(len(names))
+                logger.info(f"[Partitions] {action}: {', '.join(names)}")
+        return summary
+
+    async def close(self) -> None:
+        """주기 작업 종료"""
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def _run(self) -> None:
+        """interval마다 파티션 관리 반복"""
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.run_once()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"[Partitions] 파티션 관리 실패: {e!r}")
+
+    async def _existing_partitions(self, conn: AsyncConnection) -> List[str]:
+        """현재 부모 테이블에 연결된 파티션 이름 목록"""
+        result = await conn.execute(
+            text(
+                "SELECT c.relname FROM pg_inherits i "
+                "JOIN pg_class c ON c.oid = i.inhrelid "
+                "WHERE i.inhparent = CAST(:parent AS regclass)"
+            ),
+            {"parent": PARENT_TABLE},
+        )
+        return [row[0] for row in result]
+
+    async def _ensure_partitions(self, conn: AsyncConnection, now: datetime) -> List[str]:
+        """기본 파티션과 이번 달~premake_months개월 뒤 월 파티션 생성 (이미 있으면 건너뜀)"""
+        existing = set(await self._existing_partitions(conn))
+        created = []
+        if DEFAULT_PARTITION not in existing:
+            await conn.execute(text(f"CREATE TABLE {DEFAULT_PARTITION} PARTITION OF {PARENT_TABLE} DEFAULT"))
+            created.append(DEFAULT_PARTITION)
+
+        current = month_start(now)
+        for offset in range(self.premake_months + 1):
+            month = add_months(current, offset)
+            name = partition_name(month)
+            if name in existing:
+                continue
+            try:
+                # 기본 파티션에 같은 범위 행이 있으면 생성이 실패하므로 세이브포인트로 격리
+                async with conn.begin_nested():
+                    await conn.execute(
+                        text(
+                            f"CREATE TABLE {name} PARTITION OF {PARENT_TABLE} "
+                            f"FOR VALUES FROM ('{month.isoformat()}') TO ('{add_months(month, 1).isoformat()}')"
+                        )
+                    )
+                created.append(name)
+            except Exception as e:
+                logger.warning(f"[Partitions] 파티션 생성 실패 ({name}): {e!r}")
+        return created
+
+    async def _apply_retention(self, conn: AsyncConnection, now: datetime):
+        """보존 기간이 지난 월 파티션을 일 단위로 집계한 뒤 분리/삭제"""
+        expired = expired_partitions(await self._existing_partitions(conn), now, self.retention_months)
+        detached, dropped = [], []
+        for name in expired:
+            await conn.execute(text(_ROLLUP_SQL.format(rollups=IncidentRollup.__tablename__, source=name)))
+            await conn.execute(text(f"ALTER TABLE {PARENT_TABLE} DETACH PARTITION {name}"))
+            if self.retention_mode == "drop":
+                await conn.execute(text(f"DROP TABLE {name}"))
+                dropped.append(name)
+            else:
+                # 분리된 테이블은 그대로 남아 백업/아카이브 후 수동 삭제
+                detached.append(name)
+        return detached, dropped
+
+
+# 보존 만료 파티션의 일 단위 집계 (이미 있는 버킷은 유지 - 반복 실행해도 중복 집계 없음)
+_ROLLUP_SQL = """
+INSERT INTO {rollups} (
+    granularity, bucket_start, factory_id, type, count,
+    severity_1, severity_2, severity_3, severity_4, severity_5,
+    resolved_count, resolve_seconds_sum
+)
+SELECT
+    'day',
+    date_trunc('day', "timestamp", 'UTC'),
+    factory_id,
+    type,
+    count(*),
+    count(*) FILTER (WHERE severity = 1),
+    count(*) FILTER (WHERE severity = 2),
+    count(*) FILTER (WHERE severity = 3),
+    count(*) FILTER (WHERE severity = 4),
+    count(*) FILTER (WHERE severity = 5),
+    count(resolved_at) FILTER (WHERE is_resolved),
+    coalesce(sum(greatest(extract(epoch FROM resolved_at - "timestamp"), 0)) FILTER (WHERE is_resolved), 0)
+FROM {source}
+GROUP BY 2, 3, 4
+ON CONFLICT (granularity, bucket_start, factory_id, type) DO NOTHING
+"""
+
+
+# 프로세스 전역 파티션 관리자 인스턴스
+_partition_manager: Optional[IncidentPartitionManager] = None
+
+
+def get_partition_manager() -> IncidentPartitionManager:
+    """프로세스 전역 IncidentPartitionManager 반환 (최초 호출 시 생성)"""
+    global _partition_manager
+    if _partition_manager is None:
+        _partition_manager = IncidentPartitionManager()
+    return _partition_manager
+
+
+async def close_partition_manager() -> None:
+    """전역 IncidentPartitionManager 종료 (애플리케이션 종료 시)"""
+    global _partition_manager
+    if _partition_manager is not None:
+        await _partition_manager.close()
+        _partition_manager = None
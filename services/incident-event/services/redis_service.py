@@ -1,76 +1,208 @@
 """
-V-Factory - Redis Pub/Sub 서비스
-실시간 사고 알림 발행/구독
+V-Factory - Redis 이벤트 서비스
+실시간 사고 알림 전달/구독 (Redis Streams, MAXLEN 제한)
+사고 알림은 보강 파이프라인이 Outbox 테이블에 기록하고 Outbox 릴레이가 일괄 전달
+프로세스 전역 단일 인스턴스가 크기 제한된 연결 풀을 공유 (lifespan에서 종료)
 """
-import json
-from typing import AsyncGenerator
+from typing import Any, AsyncGenerator, List, Optional, Tuple
 
 import redis.asyncio as redis
 
 from config import settings
+from utils.metrics import REDIS_POOL_CONNECTIONS, REDIS_POOL_MAX_CONNECTIONS
 
 
 class RedisService:
-    """Redis Pub/Sub 서비스 클래스"""
+    """Redis 이벤트 서비스 클래스"""
     
     def __init__(self):
         self.redis_url = settings.REDIS_URL
         self.channel = settings.REDIS_CHANNEL
-        self._client = None
+        self._client: Optional[redis.Redis] = None
+        self._pool: Optional[redis.BlockingConnectionPool] = None
+        # 스트림 대기 읽기는 연결을 장시간 점유하므로 명령용 풀과 분리 (발행을 막지 않도록)
+        self._stream_client: Optional[redis.Redis] = None
+        self._stream_pool: Optional[redis.BlockingConnectionPool] = None
     
     async def _get_client(self) -> redis.Redis:
-        """Redis 클라이언트 가져오기 (지연 초기화)"""
+        """Redis 명령용 클라이언트 가져오기 (공유 풀 지연 초기화)"""
         if self._client is None:
-            self._client = redis.from_url(self.redis_url)
+            self._pool = redis.BlockingConnectionPool.from_url(
+                self.redis_url,
+                max_connections=settings.REDIS_POOL_MAX_CONNECTIONS,
+                timeout=settings.REDIS_POOL_TIMEOUT,
+                socket_timeout=settings.REDIS_SOCKET_TIMEOUT,
+                socket_connect_timeout=settings.REDIS_SOCKET_CONNECT_TIMEOUT,
+                health_check_interval=settings.REDIS_HEALTH_CHECK_INTERVAL,
+            )
+            self._client = redis.Redis(connection_pool=self._pool)
+            _register_pool_metrics("command", self._pool)
         return self._client
     
-    async def publish_incident(self, incident) -> None:
+    async def _get_stream_client(self) -> redis.Redis:
+        """Redis 스트림 대기 읽기(XREAD BLOCK)용 클라이언트 가져오기 (읽기 타임아웃 없음)"""
+        if self._stream_client is None:
+            self._stream_pool = redis.BlockingConnectionPool.from_url(
+                self.redis_url,
+                max_connections=settings.REDIS_STREAM_MAX_CONNECTIONS,
+                timeout=settings.REDIS_POOL_TIMEOUT,
+                socket_connect_timeout=settings.REDIS_SOCKET_CONNECT_TIMEOUT,
+                health_check_interval=settings.REDIS_HEALTH_CHECK_INTERVAL,
+            )
+            self._stream_client = redis.Redis(connection_pool=self._stream_pool)
+            _register_pool_metrics("stream", self._stream_pool)
+        return self._stream_client
+    
+    async def append_events(self, events: List[Tuple[str, str]]) -> List[str]:
         """
-        사고 알림 Redis 채널로 발행
+        이벤트 여러 건을 Redis Stream에 추가 (파이프라인 1회 왕복, MAXLEN으로 길이 제한)
+        Outbox 릴레이가 DB에 기록된 이벤트를 전달할 때 사용
         
         Args:
-            incident: Incident ORM 모델 인스턴스
+            events: (스트림 키, 이벤트 JSON 문자열) 리스트 (기록 순서대로)
+            
+        Returns:
+            스트림 항목 ID 리스트 (SSE 이벤트 ID)
         """
         client = await self._get_client()
+        async with client.pipeline(transaction=False) as pipe:
+            for stream, payload in events:
+                pipe.xadd(
+                    stream,
+                    {"data": payload},
+                    maxlen=settings.REDIS_STREAM_MAXLEN,
+                    approximate=True,
+                )
+            entry_ids = await pipe.execute()
+        return [entry_id.decode("utf-8") for entry_id in entry_ids]
+    
+    async def read_stream(
+        self,
+        stream: str,
+        last_id: Optional[str] = None
+    ) -> AsyncGenerator[Tuple[str, Optional[str]], None]:
+        """
+        Redis Stream 신규 항목 대기 읽기 (이벤트 허브가 스트림당 하나씩 사용)
         
-        # 사고 데이터를 JSON으로 직렬화
-        incident_data = {
-            "id": str(incident.id),
-            "factory_id": str(incident.factory_id),
-            "type": incident.type.value,
-            "severity": incident.severity,
-            "description": incident.description,
-            "position": {
-                "x": incident.position_x,
-                "y": incident.position_y,
-                "z": incident.position_z,
-            },
-            "timestamp": incident.timestamp.isoformat(),
-        }
+        Args:
+            stream: 스트림 키
+            last_id: 이 ID 이후 항목부터 읽음 (None이면 현재 마지막 항목 이후)
+            
+        Yields:
+            (항목 ID, 이벤트 데이터 JSON 문자열)
+            시작 위치를 알리기 위해 처음 한 번 (시작 ID, None)을 내보냄
+        """
+        client = await self._get_stream_client()
         
-        await client.publish(self.channel, json.dumps(incident_data))
+        if last_id is None:
+            # "$"를 그대로 반복 사용하면 XREAD 호출 사이의 항목을 놓치므로 실제 ID로 고정
+            latest = await client.xrevrange(stream, count=1)
+            last_id = latest[0][0].decode("utf-8") if latest else "0-0"
+        yield last_id, None
+        
+        while True:
+            response = await client.xread(
+                {stream: last_id},
+                count=settings.REDIS_STREAM_READ_COUNT,
+                block=settings.REDIS_STREAM_BLOCK_MS,
+            )
+            for _, entries in response:
+                for entry_id, fields in entries:
+                    last_id = entry_id.decode("utf-8")
+                    yield last_id, fields[b"data"].decode("utf-8")
     
-    async def subscribe_incidents(self) -> AsyncGenerator[str, None]:
+    async def range_stream(
+        self,
+        stream: str,
+        after_id: str,
+        count: int
+    ) -> Tuple[List[Tuple[str, str]], bool]:
         """
-        사고 알림 Redis 채널 구독
+        특정 ID 이후의 스트림 항목 조회 (SSE Last-Event-ID 재전송용)
         
-        Yields:
-            사고 데이터 JSON 문자열
+        Args:
+            stream: 스트림 키
+            after_id: 마지막으로 수신한 항목 ID (이 ID는 제외)
+            count: 최대 조회 항목 수
+            
+        Returns:
+            ((항목 ID, 이벤트 데이터) 리스트, MAXLEN 트리밍으로 누락 구간이 있는지 여부)
         """
         client = await self._get_client()
-        pubsub = client.pubsub()
-        await pubsub.subscribe(self.channel)
+        entries = await client.xrange(stream, min=f"({after_id}", count=count)
+        oldest = await client.xrange(stream, count=1)
         
-        try:
-            async for message in pubsub.listen():
-                if message["type"] == "message":
-                    yield message["data"].decode("utf-8")
-        finally:
-            await pubsub.unsubscribe(self.channel)
-            await pubsub.close()
+        # 클라이언트가 마지막으로 본 항목이 이미 잘려나갔다면 그 사이 항목도 유실된 것
+        gap = bool(oldest) and parse_stream_id(oldest[0][0].decode("utf-8")) > parse_stream_id(after_id)
+        return (
+            [(entry_id.decode("utf-8"), fields[b"data"].decode("utf-8")) for entry_id, fields in entries],
+            gap,
+        )
     
     async def close(self) -> None:
-        """Redis 연결 종료"""
+        """Redis 연결 종료 (공유 풀의 모든 연결 해제)"""
         if self._client:
-            await self._client.close()
+            await self._client.aclose()
+            await self._pool.disconnect()
             self._client = None
+            self._pool = None
+        if self._stream_client:
+            await self._stream_client.aclose()
+            await self._stream_pool.disconnect()
+            self._stream_client = None
+            self._stream_pool = None
+
+
+# 프로세스 전역 Redis 서비스 인스턴스
+_redis_service: Optional[RedisService] = None
+
+
+def get_redis_service() -> RedisService:
+    """프로세스 전역 RedisService 반환 (최초 호출 시 생성)"""
+    global _redis_service
+    if _redis_service is None:
+        _redis_service = RedisService()
+    return _redis_service
+
+
+async def close_redis_service() -> None:
+    """전역 RedisService 연결 풀 종료 (애플리케이션 종료 시)"""
+    global _redis_service
+    if _redis_service is not None:
+        await _redis_service.close()
+        _redis_service = None
+
+
+def _register_pool_metrics(pool_name: str, pool: redis.BlockingConnectionPool) -> None:
+    """연결 풀 사용량 게이지 등록 (스크레이프 시점에 풀 상태를 읽음)"""
+    REDIS_POOL_MAX_CONNECTIONS.labels(pool=pool_name).set(pool.max_connections)
+    REDIS_POOL_CONNECTIONS.labels(pool=pool_name, state="in_use").set_function(
+        lambda: len(pool._in_use_connections)
+    )
+    REDIS_POOL_CONNECTIONS.labels(pool=pool_name, state="idle").set_function(
+        lambda: len(pool._available_connections)
+    )
+
+
+def parse_stream_id(entry_id: str) -> Tuple[int, int]:
+    """Redis Stream 항목 ID("밀리초-순번")를 비교 가능한 튜플로 변환"""
+    milliseconds, _, sequence = entry_id.partition("-")
+    return int(milliseconds), int(sequence or 0)
+
+
+def incident_to_dict(incident) -> dict[str, Any]:
+    """Incident ORM 모델을 사고 알림 데이터 딕셔너리로 변환"""
+    return {
+        "id": str(incident.id),
+        "factory_id": str(incident.factory_id),
+        "type": incident.type.value,
+        "severity": incident.severity,
+        "description": incident.description,
+        "position": {
+            "x": incident.position_x,
+            "y": incident.position_y,
+            "z": incident.position_z,
+        },
+        "timestamp": incident.timestamp.isoformat(),
+        "detected_cctv_ids": incident.detected_cctv_ids or [],
+    }
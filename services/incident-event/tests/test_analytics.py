@@ -0,0 +1,136 @@
+"""
+사고 통계 집계 테스트
+"""
+from datetime import datetime, timedelta, timezone
+from uuid import uuid4
+
+from httpx import AsyncClient
+from sqlalchemy import func, select
+
+from models import Incident, IncidentRollup, IncidentType
+from services.analytics import RollupDelta, bucket_start, choose_granularity, query_stats
+
+BASE = datetime(2026, 10, 1, 9, 30, tzinfo=timezone.utc)
+
+
+async def _add_incidents(session, factory_id, specs):
+    """(유형, 심각도, 발생 시각 오프셋(분)) 목록으로 사고와 집계를 함께 저장"""
+    rollups = RollupDelta()
+    incidents = []
+    for incident_type, severity, minutes in specs:
+        incident = Incident(
+            factory_id=factory_id,
+            type=incident_type,
+            severity=severity,
+            position_x=0.0,
+            position_y=0.0,
+            position_z=0.0,
+            is_resolved=False,
+            timestamp=BASE + timedelta(minutes=minutes),
+        )
+        session.add(incident)
+        rollups.add_incident(incident)
+        incidents.append(incident)
+    await rollups.apply(session)
+    await session.commit()
+    return incidents
+
+
+class TestRollups:
+    """집계 증감 테스트 클래스"""
+
+    def test_bucket_start(self):
+        """버킷 단위별 시작 시각 내림"""
+        value = datetime(2026, 10, 1, 9, 30, 45, tzinfo=timezone.utc)
+        assert bucket_start(value, "minute") == datetime(2026, 10, 1, 9, 30, tzinfo=timezone.utc)
+        assert bucket_start(value, "hour") == datetime(2026, 10, 1, 9, tzinfo=timezone.utc)
+        assert bucket_start(value, "day") == datetime(2026, 10, 1, tzinfo=timezone.utc)
+
+    def test_choose_granularity(self):
+        """범위가 넓어지면 더 큰 단위, 분 단위 보존 기간 밖이면 분 단위 제외"""
+        now = datetime(2026, 10, 16, tzinfo=timezone.utc)
+        assert choose_granularity(now - timedelta(hours=2), now, now=now) == "minute"
+        assert choose_granularity(now - timedelta(days=7), now, now=now) == "hour"
+        assert choose_granularity(now - timedelta(days=30), now, now=now) == "day"
+        old = now - timedelta(days=30)
+        assert choose_granularity(old, old + timedelta(hours=2), now=now) == "hour"
+
+    async def test_same_bucket_merges_into_one_row(self, test_session):
+        """같은 버킷/공장/유형 사고는 행 하나에 누적되고 심각도 분포가 맞는지 확인"""
+        factory_id = uuid4()
+        await _add_incidents(test_session, factory_id, [(IncidentType.FIRE, 2, 0), (IncidentType.FIRE, 5, 0)])
+        await _add_incidents(test_session, factory_id, [(IncidentType.FIRE, 5, 0)])
+
+        rows = (await test_session.execute(
+            select(IncidentRollup).where(IncidentRollup.granularity == "minute")
+        )).scalars().all()
+        assert len(rows) == 1
+        assert (rows[0].count, rows[0].severity_2, rows[0].severity_5) == (3, 1, 2)
+        assert (await test_session.execute(
+            select(func.count()).select_from(IncidentRollup)
+        )).scalar_one() == 3  # minute/hour/day 각 1행
+
+    async def test_query_stats(self, test_session):
+        """유형별/공장별/버킷별 합계와 평균 해결 시간"""
+        factory_id = uuid4()
+        incidents = await _add_incidents(
+            test_session,
+            factory_id,
+            [(IncidentType.FIRE, 3, 0), (IncidentType.FALL, 1, 90), (IncidentType.FIRE, 4, 24 * 60)],
+        )
+        resolved = incidents[0]
+        resolved.is_resolved = True
+        resolved.resolved_at = resolved.timestamp + timedelta(minutes=10)
+        rollups = RollupDelta()
+        rollups.add_resolution(resolved)
+        await rollups.apply(test_session)
+        await test_session.commit()
+
+        stats = await query_stats(test_session, BASE - timedelta(days=1), BASE + timedelta(days=2), "day")
+
+        assert stats["total"]["count"] == 3
+        assert stats["total"]["severity"] == [1, 0, 1, 1, 0]
+        assert stats["by_type"]["FIRE"]["count"] == 2
+        assert stats["by_type"]["FIRE"]["mean_time_to_resolve"] == 600
+        assert stats["by_factory"][factory_id]["resolved_count"] == 1
+        assert [bucket["count"] for bucket in stats["series"]] == [2, 1]
+
+
+class TestStatsAPI:
+    """통계 API 테스트 클래스"""
+
+    async def test_stats_follow_resolve_and_delete(self, client: AsyncClient, test_session):
+        """해결/삭제 API가 집계를 같이 갱신하는지 확인"""
+        factory_id = uuid4()
+        incidents = await _add_incidents(
+            test_session, factory_id, [(IncidentType.COLLISION, 4, 0), (IncidentType.COLLISION, 2, 5)]
+        )
+        params = {
+            "factory_id": str(factory_id),
+            "start_time": "2026-10-01T00:00:00Z",
+            "end_time": "2026-10-02T00:00:00Z",
+        }
+
+        response = await client.put(f"/incidents/{incidents[0].id}", json={"is_resolved": True})
+        assert response.status_code == 200
+        response = await client.delete(f"/incidents/{incidents[1].id}")
+        assert response.status_code == 204
+
+        response = await client.get("/incidents/stats", params=params)
+        assert response.status_code == 200
+        data = response.json()
+        assert data["total"]["count"] == 1
+        assert data["total"]["severity"] == [0, 0, 0, 1, 0]
+        assert data["total"]["resolved_count"] == 1
+
+    async def test_stats_rejects_too_many_buckets(self, client: AsyncClient):
+        """직접 지정한 단위의 버킷 수가 상한을 넘으면 400"""
+        response = await client.get(
+            "/incidents/stats",
+            params={
+                "start_time": "2026-01-01T00:00:00Z",
+                "end_time": "2026-10-01T00:00:00Z",
+                "granularity": "minute",
+            },
+        )
+        assert response.status_code == 400
@@ -0,0 +1,155 @@
+"""
+사고 일괄 등록 테스트
+"""
+import json
+from uuid import uuid4
+
+import httpx
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import func, select
+
+from config import settings
+from models import Incident, OutboxEvent
+from schemas import IncidentCreate
+from services.bulk_ingest import UnknownFactoriesError, bulk_create_incidents
+
+
+class _FakeCache:
+    """존재하는 공장 집합으로 공장 존재 캐시를 대신 (조회 기록)"""
+
+    def __init__(self, factory_ids):
+        self.factory_ids = set(factory_ids)
+        self.lookups = []
+
+    async def exists(self, factory_id):
+        self.lookups.append(factory_id)
+        return factory_id in self.factory_ids
+
+
+class _UnavailableCache:
+    """Factory Core 장애를 흉내 내는 공장 존재 캐시"""
+
+    async def exists(self, factory_id):
+        raise httpx.ConnectError("connection refused")
+
+
+class _FakeFactoryCore:
+    """지점마다 같은 CCTV를 반환하는 배치 공간 쿼리 대역 (호출 기록)"""
+
+    def __init__(self, cctv_id):
+        self.cctv_id = cctv_id
+        self.calls = []
+
+    async def find_covering_cctvs_batch(self, factory_id, positions, max_distance):
+        self.calls.append((factory_id, len(positions)))
+        return [[self.cctv_id] for _ in positions]
+
+
+def _item(factory_id, index: int = 0) -> dict:
+    return {
+        "factory_id": str(factory_id),
+        "type": "FIRE",
+        "severity": 3,
+        "position_x": float(index),
+        "position_y": 0.0,
+        "position_z": 1.0,
+    }
+
+
+class TestBulkIngest:
+    """일괄 등록 테스트 클래스"""
+
+    async def test_one_lookup_and_match_per_factory(self, test_session):
+        """공장별로 존재 확인/CCTV 매칭을 한 번만 하고 사고와 알림을 함께 저장하는지 확인"""
+        factories = [uuid4(), uuid4()]
+        cctv_id = uuid4()
+        cache = _FakeCache(factories)
+        core = _FakeFactoryCore(cctv_id)
+        items = [IncidentCreate(**_item(factories[index % 2], index)) for index in range(10)]
+
+        rows = await bulk_create_incidents(test_session, items, cache=cache, client=core)
+
+        assert len(rows) == 10
+        assert sorted(cache.lookups) == sorted(factories)
+        assert sorted(count for _, count in core.calls) == [5, 5]
+        assert all(row["detected_cctv_ids"] == [str(cctv_id)] for row in rows)
+        assert (await test_session.execute(select(func.count()).select_from(Incident))).scalar_one() == 10
+        payloads = [
+            json.loads(payload)
+            for payload in (await test_session.execute(select(OutboxEvent.payload).order_by(OutboxEvent.id))).scalars()
+        ]
+        assert [payload["id"] for payload in payloads] == [str(row["id"]) for row in rows]
+
+    async def test_unknown_factory_rejects_whole_batch(self, test_session):
+        """존재하지 않는 공장이 섞이면 아무것도 저장하지 않는지 확인"""
+        known, unknown = uuid4(), uuid4()
+        items = [IncidentCreate(**_item(known)), IncidentCreate(**_item(unknown))]
+
+        with pytest.raises(UnknownFactoriesError) as error:
+            await bulk_create_incidents(test_session, items, cache=_FakeCache([known]), client=_FakeFactoryCore(uuid4()))
+
+        assert error.value.factory_ids == [unknown]
+        assert (await test_session.execute(select(func.count()).select_from(Incident))).scalar_one() == 0
+
+    async def test_factory_core_failure_is_not_unknown_factory(self, test_session, client: AsyncClient, monkeypatch):
+        """Factory Core 조회 실패는 공장 없음(400)이 아니라 503으로 응답하는지 확인"""
+        items = [IncidentCreate(**_item(uuid4()))]
+
+        with pytest.raises(httpx.ConnectError):
+            await bulk_create_incidents(test_session, items, cache=_UnavailableCache(), client=_FakeFactoryCore(uuid4()))
+        assert (await test_session.execute(select(func.count()).select_from(Incident))).scalar_one() == 0
+
+        async def fake_bulk_create(db, items):
+            raise httpx.ConnectError("connection refused")
+
+        monkeypatch.setattr("routers.incident.bulk_create_incidents", fake_bulk_create)
+        response = await client.post("/incidents/bulk", json=[_item(uuid4())])
+        assert response.status_code == 503
+
+    async def test_ndjson_body(self, client: AsyncClient, monkeypatch):
+        """NDJSON 본문을 줄 단위로 해석하고 잘못된 줄은 줄 번호와 함께 거부하는지 확인"""
+        received = []
+
+        async def fake_bulk_create(db, items):
+            received.extend(items)
+            return [{"id": uuid4(), "detected_cctv_ids": []} for _ in items]
+
+        monkeypatch.setattr("routers.incident.bulk_create_incidents", fake_bulk_create)
+        factory_id = uuid4()
+        body = "\n".join(json.dumps(_item(factory_id, index)) for index in range(3)) + "\n"
+
+        response = await client.post(
+            "/incidents/bulk", content=body, headers={"Content-Type": "application/x-ndjson"}
+        )
+        assert response.status_code == 201
+        assert response.json()["created"] == 3
+        assert [item.position_x for item in received] == [0.0, 1.0, 2.0]
+
+        response = await client.post(
+            "/incidents/bulk",
+            content=json.dumps(_item(factory_id)) + "\n{\"severity\": 9}\n",
+            headers={"Content-Type": "application/x-ndjson"},
+        )
+        assert response.status_code == 422
+        assert response.json()["detail"]["line"] == 2
+
+    async def test_body_size_limit(self, client: AsyncClient, monkeypatch):
+        """본문 크기 상한을 넘으면 Content-Length로 바로, 길이를 모르면 읽는 도중 413으로 거부하는지 확인"""
+        async def fake_bulk_create(db, items):
+            raise AssertionError("상한을 넘은 본문은 등록하지 않아야 함")
+
+        monkeypatch.setattr("routers.incident.bulk_create_incidents", fake_bulk_create)
+        monkeypatch.setattr(settings, "INCIDENT_BULK_MAX_BYTES", 512)
+        body = json.dumps([_item(uuid4(), index) for index in range(10)]).encode("utf-8")
+
+        response = await client.post("/incidents/bulk", content=body, headers={"Content-Type": "application/json"})
+        assert response.status_code == 413
+
+        async def chunks():
+            for start in range(0, len(body), 100):
+                yield body[start:start + 100]
+
+        for content_type in ("application/json", "application/x-ndjson"):
+            response = await client.post("/incidents/bulk", content=chunks(), headers={"Content-Type": content_type})
+            assert response.status_code == 413
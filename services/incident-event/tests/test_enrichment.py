@@ -0,0 +1,168 @@
+"""
+사고 보강 파이프라인 단위 테스트
+"""
+import asyncio
+import json
+from datetime import datetime, timedelta
+from uuid import uuid4
+
+import httpx
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from models import Incident, IncidentType, OutboxEvent
+from services.enrichment import EnrichmentPipeline
+
+
+class _FakeFactoryCore:
+    """고정된 CCTV 목록을 반환하거나 연결 오류를 내는 클라이언트"""
+
+    def __init__(self, cctv_ids=None):
+        self.cctv_ids = cctv_ids
+        self.calls = 0
+
+    async def find_covering_cctvs(self, factory_id, position, max_distance):
+        self.calls += 1
+        if self.cctv_ids is None:
+            raise httpx.ConnectError("connection refused")
+        return self.cctv_ids
+
+
+class _FakeRelay:
+    """notify 호출 횟수를 기록하는 Outbox 릴레이 대역"""
+
+    def __init__(self):
+        self.notified = 0
+
+    def notify(self):
+        self.notified += 1
+
+
+async def _outbox_payloads(session: AsyncSession) -> list:
+    events = (await session.execute(select(OutboxEvent).order_by(OutboxEvent.id))).scalars().all()
+    return [json.loads(event.payload) for event in events]
+
+
+async def _create_incident(session: AsyncSession, **fields) -> Incident:
+    incident = Incident(
+        factory_id=uuid4(),
+        type=IncidentType.FIRE,
+        severity=3,
+        position_x=1.0,
+        position_y=0.0,
+        position_z=2.0,
+        **fields,
+    )
+    session.add(incident)
+    await session.commit()
+    await session.refresh(incident)
+    return incident
+
+
+class TestEnrichmentPipeline:
+    """보강 파이프라인 테스트 클래스"""
+
+    async def test_worker_persists_with_outbox_event(self, test_engine):
+        """워커가 CCTV 매칭 결과와 보강된 사고 알림을 함께 저장하는지 확인"""
+        session_factory = async_sessionmaker(test_engine, class_=AsyncSession, expire_on_commit=False)
+        cctv_id = uuid4()
+        relay = _FakeRelay()
+
+        pipeline = EnrichmentPipeline(
+            client=_FakeFactoryCore([cctv_id]),
+            session_factory=session_factory,
+            relay=relay,
+            workers=2,
+            queue_size=4,
+        )
+        async with session_factory() as session:
+            incident = await _create_incident(session)
+
+        assert not pipeline.submit(incident)  # 워커 시작 전에는 요청 안에서 처리
+        pipeline.start()
+        # 테스트 DB는 연결 하나를 공유하므로 시작 스윕 세션의 종료(rollback)가 워커 트랜잭션을 되돌리지 않도록 스윕 중지
+        pipeline._sweeper.cancel()
+        assert pipeline.submit(incident)
+        await asyncio.wait_for(pipeline._queue.join(), 1)
+
+        async with session_factory() as session:
+            stored = (await session.execute(select(Incident).where(Incident.id == incident.id))).scalar_one()
+            payloads = await _outbox_payloads(session)
+        assert stored.detected_cctv_ids == [str(cctv_id)]
+        assert stored.enriched_at is not None
+        assert [payload["detected_cctv_ids"] for payload in payloads] == [[str(cctv_id)]]
+        assert relay.notified == 1
+        await pipeline.close()
+
+    async def test_queue_full_rejects(self):
+        """큐가 가득 차면 submit이 False를 반환하는지 확인 (호출자가 직접 보강)"""
+        pipeline = EnrichmentPipeline(client=_FakeFactoryCore([]), relay=_FakeRelay(), workers=1, queue_size=1)
+        pipeline._workers = [asyncio.get_running_loop().create_future()]  # 큐를 비우지 않는 워커
+
+        assert pipeline.submit(Incident(id=uuid4()))
+        assert not pipeline.submit(Incident(id=uuid4()))
+        assert pipeline.queue_depth == 1
+
+    async def test_inline_degrades_when_factory_core_down(self, test_session):
+        """CCTV 매칭이 실패해도 빈 목록으로 저장하고 알림은 Outbox에 기록하는지 확인"""
+        pipeline = EnrichmentPipeline(client=_FakeFactoryCore(None), relay=_FakeRelay())
+        incident = await _create_incident(test_session)
+
+        assert await pipeline.enrich(incident, session=test_session) == []
+        assert incident.detected_cctv_ids == []
+        assert [payload["id"] for payload in await _outbox_payloads(test_session)] == [str(incident.id)]
+
+    async def test_worker_persists_once(self, test_engine):
+        """같은 사고를 두 번 보강해도 결과와 알림은 한 번만 저장하는지 확인 (스윕 중복 등록 대비)"""
+        session_factory = async_sessionmaker(test_engine, class_=AsyncSession, expire_on_commit=False)
+        relay = _FakeRelay()
+        pipeline = EnrichmentPipeline(client=_FakeFactoryCore([]), session_factory=session_factory, relay=relay)
+        async with session_factory() as session:
+            incident = await _create_incident(session)
+
+        await pipeline.enrich(incident, mode="async")
+        await pipeline.enrich(incident, mode="async")
+
+        async with session_factory() as session:
+            assert [payload["id"] for payload in await _outbox_payloads(session)] == [str(incident.id)]
+        assert relay.notified == 1
+
+    async def test_inline_skips_already_enriched(self, test_engine):
+        """워커가 먼저 보강한 사고를 요청 안에서 다시 보강하면 알림을 중복 기록하지 않고 저장된 결과로 갱신하는지 확인"""
+        session_factory = async_sessionmaker(test_engine, class_=AsyncSession, expire_on_commit=False)
+        relay = _FakeRelay()
+        first, second = uuid4(), uuid4()
+        worker = EnrichmentPipeline(client=_FakeFactoryCore([first]), session_factory=session_factory, relay=relay)
+        inline = EnrichmentPipeline(client=_FakeFactoryCore([second]), session_factory=session_factory, relay=relay)
+
+        async with session_factory() as session:
+            incident = await _create_incident(session)
+            # 스윕이 다시 등록한 같은 사고 (별도 세션에서 조회한 인스턴스)
+            async with session_factory() as sweep_session:
+                swept = (await sweep_session.execute(select(Incident).where(Incident.id == incident.id))).scalar_one()
+            await worker.enrich(swept, mode="async")
+            await inline.enrich(incident, session=session)
+
+            assert incident.detected_cctv_ids == [str(first)]
+            payloads = await _outbox_payloads(session)
+        assert [payload["detected_cctv_ids"] for payload in payloads] == [[str(first)]]
+        assert relay.notified == 1
+
+    async def test_sweep_resubmits_unenriched(self, test_engine):
+        """보강되지 않은 채 남은 사고만 다시 등록하고 큐에 있는 사고는 중복 등록하지 않는지 확인"""
+        session_factory = async_sessionmaker(test_engine, class_=AsyncSession, expire_on_commit=False)
+        pipeline = EnrichmentPipeline(
+            client=_FakeFactoryCore([]), session_factory=session_factory, relay=_FakeRelay(), queue_size=10
+        )
+        pipeline._workers = [asyncio.get_running_loop().create_future()]  # 큐를 비우지 않는 워커
+        old = datetime.utcnow() - timedelta(minutes=10)
+        async with session_factory() as session:
+            lost = await _create_incident(session, timestamp=old)
+            await _create_incident(session, timestamp=old, enriched_at=old)
+            await _create_incident(session)  # 아직 정상 처리 중일 수 있는 최근 사고
+            await _create_incident(session, timestamp=old - timedelta(days=2))  # 스윕 범위 밖
+
+        assert await pipeline.sweep_once() == 1
+        assert pipeline._pending == {lost.id}
+        assert await pipeline.sweep_once() == 0
+        assert pipeline.queue_depth == 1
@@ -0,0 +1,78 @@
+"""
+SSE 이벤트 허브 단위 테스트
+"""
+import asyncio
+import json
+
+from services.event_hub import EventHub
+
+
+class _FakeStream:
+    """큐와 항목 목록으로 Redis Stream을 대신하는 소스 (읽기/조회 횟수 기록)"""
+
+    def __init__(self):
+        self.queue = asyncio.Queue()
+        self.entries = []
+        self.read_calls = 0
+        self.range_calls = 0
+
+    def __call__(self, channel: str, last_id):
+        self.read_calls += 1
+
+        async def iterate():
+            yield (self.entries[-1][0] if self.entries else "0-0"), None
+            while True:
+                yield await self.queue.get()
+
+        return iterate()
+
+    async def replay(self, channel: str, after_id: str):
+        self.range_calls += 1
+        after = tuple(int(part) for part in after_id.split("-"))
+        return [entry for entry in self.entries if tuple(int(part) for part in entry[0].split("-")) > after], False
+
+
+class TestEventHub:
+    """팬아웃 허브 테스트 클래스"""
+
+    async def test_fan_out_with_single_subscription(self):
+        """여러 SSE 클라이언트가 하나의 스트림 읽기를 공유하는지 확인"""
+        source = _FakeStream()
+        hub = EventHub(source=source, replay_source=source.replay, queue_size=8)
+        message = json.dumps({"id": "1", "type": "FIRE"})
+
+        async with hub.subscribe("vfactory:incidents") as first, hub.subscribe("vfactory:incidents") as second:
+            await source.queue.put(("1-0", message))
+            assert await asyncio.wait_for(first.__anext__(), 1) == ("1-0", message)
+            assert await asyncio.wait_for(second.__anext__(), 1) == ("1-0", message)
+
+        assert source.read_calls == 1
+        await hub.close()
+
+    async def test_slow_consumer_drops_oldest(self):
+        """느린 클라이언트는 오래된 메시지만 잃고 다른 클라이언트는 영향이 없는지 확인"""
+        source = _FakeStream()
+        hub = EventHub(source=source, replay_source=source.replay, queue_size=2)
+
+        async with hub.subscribe("vfactory:incidents") as slow, hub.subscribe("vfactory:incidents") as fast:
+            for value in range(5):
+                hub.dispatch("vfactory:incidents", f"{value + 1}-0", str(value))
+                assert (await fast.__anext__())[1] == str(value)
+
+            assert slow.dropped == 3
+            assert slow.reset_required
+            assert [(await slow.__anext__())[1] for _ in range(2)] == ["3", "4"]
+        await hub.close()
+
+    async def test_reconnect_replays_missed_incidents(self):
+        """Last-Event-ID 이후 알림을 재전송하고 메모리 밖 구간은 XRANGE로 조회하는지 확인"""
+        source = _FakeStream()
+        source.entries = [(f"{seq}-0", f"m{seq}") for seq in range(1, 4)]
+        hub = EventHub(source=source, replay_source=source.replay, queue_size=8)
+
+        async with hub.subscribe("vfactory:incidents", last_event_id="1-0") as subscription:
+            received = [await subscription.__anext__() for _ in range(2)]
+
+        assert received == [("2-0", "m2"), ("3-0", "m3")]
+        assert source.range_calls == 1
+        await hub.close()
@@ -0,0 +1,148 @@
+"""
+공장 존재 캐시 단위 테스트
+"""
+import asyncio
+import json
+from contextlib import asynccontextmanager
+from uuid import uuid4
+
+from services.event_hub import EventHub, Subscription
+from services.factory_cache import FactoryCache
+
+
+class _FakeFactoryCore:
+    """존재하는 공장 집합으로 Factory Core를 대신하는 클라이언트 (조회 횟수 기록)"""
+
+    def __init__(self, factory_ids=()):
+        self.factory_ids = set(factory_ids)
+        self.lookups = 0
+
+    async def factory_exists(self, factory_id):
+        self.lookups += 1
+        return factory_id in self.factory_ids
+
+    async def list_factory_ids(self, page_size: int = 500):
+        return list(self.factory_ids)
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class _FakeHub:
+    """미리 만든 구독을 그대로 돌려주는 이벤트 허브 대역"""
+
+    def __init__(self, subscription: Subscription):
+        self.subscription = subscription
+
+    @asynccontextmanager
+    async def subscribe(self, *channels):
+        yield self.subscription
+
+
+async def _wait_until(condition) -> None:
+    for _ in range(50):
+        if condition():
+            return
+        await asyncio.sleep(0.01)
+
+
+def _event(event: str, factory_id) -> str:
+    return json.dumps({"event": event, "data": {"id": str(factory_id)}})
+
+
+class TestFactoryCache:
+    """공장 존재 캐시 테스트 클래스"""
+
+    async def test_hit_skips_network(self):
+        """한 번 확인된 공장은 다시 Factory Core를 호출하지 않는지 확인"""
+        factory_id = uuid4()
+        core = _FakeFactoryCore([factory_id])
+        cache = FactoryCache(client=core, max_size=10, ttl=60.0)
+
+        assert await cache.exists(factory_id)
+        assert await cache.exists(factory_id)
+        assert core.lookups == 1
+        assert cache.hit_ratio == 0.5
+
+    async def test_missing_factory_not_cached(self):
+        """존재하지 않는 공장은 캐시하지 않아 생성 후 바로 확인되는지 확인"""
+        factory_id = uuid4()
+        core = _FakeFactoryCore()
+        cache = FactoryCache(client=core, max_size=10, ttl=60.0)
+
+        assert not await cache.exists(factory_id)
+        core.factory_ids.add(factory_id)
+        assert await cache.exists(factory_id)
+        assert core.lookups == 2
+
+    async def test_ttl_and_lru_eviction(self):
+        """TTL이 지난 항목은 재확인하고, 크기 초과 시 가장 오래 조회되지 않은 항목을 제거하는지 확인"""
+        clock = _Clock()
+        first, second, third = uuid4(), uuid4(), uuid4()
+        cache = FactoryCache(client=_FakeFactoryCore(), max_size=2, ttl=10.0, clock=clock)
+
+        cache.add(first)
+        cache.add(second)
+        assert await cache.exists(first)
+        cache.add(third)
+        assert first in cache and third in cache and second not in cache
+
+        clock.now = 11.0
+        assert first not in cache
+
+    async def test_events_update_cache(self):
+        """구독 시작 시 워밍하고 factory:events 생성/삭제 이벤트를 반영하는지 확인"""
+        existing, created = uuid4(), uuid4()
+        queue = asyncio.Queue()
+
+        def source(channel, last_id):
+            async def iterate():
+                yield "0-0", None
+                while True:
+                    yield await queue.get()
+            return iterate()
+
+        async def replay(channel, after_id):
+            return [], False
+
+        hub = EventHub(source=source, replay_source=replay, queue_size=8)
+        cache = FactoryCache(client=_FakeFactoryCore([existing]), hub=hub, max_size=10, ttl=60.0)
+        cache.start()
+
+        await queue.put(("1-0", _event("factory_created", created)))
+        await queue.put(("2-0", _event("factory_deleted", existing)))
+        for _ in range(50):
+            if created in cache and existing not in cache:
+                break
+            await asyncio.sleep(0.01)
+        assert created in cache
+        assert existing not in cache
+
+        await cache.close()
+        await hub.close()
+
+    async def test_dropped_events_rewarm_cache(self):
+        """버퍼 초과로 삭제 이벤트를 놓치면 캐시를 비우고 다시 워밍하여 삭제된 공장을 남기지 않는지 확인"""
+        deleted, kept = uuid4(), uuid4()
+        core = _FakeFactoryCore([deleted, kept])
+        subscription = Subscription(("factory:events",), maxsize=1, positions={})
+        cache = FactoryCache(client=core, hub=_FakeHub(subscription), max_size=10, ttl=60.0)
+        cache.start()
+        await _wait_until(lambda: deleted in cache)
+        assert deleted in cache
+
+        # 삭제 이벤트가 다음 이벤트에 밀려 버려짐
+        core.factory_ids.discard(deleted)
+        subscription.put("factory:events", "1-0", _event("factory_deleted", deleted))
+        subscription.put("factory:events", "2-0", _event("factory_updated", kept))
+        await _wait_until(lambda: deleted not in cache)
+        assert deleted not in cache
+        assert kept in cache
+        assert not subscription.reset_required
+
+        await cache.close()
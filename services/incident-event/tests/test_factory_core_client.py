@@ -0,0 +1,74 @@
+"""
+Factory Core HTTP 클라이언트 단위 테스트
+"""
+from uuid import uuid4
+
+import httpx
+import pytest
+
+from services.factory_core_client import FactoryCoreClient
+
+
+def _client(handler) -> FactoryCoreClient:
+    """MockTransport로 응답을 흉내 내는 클라이언트 생성 (재시도 대기 없음)"""
+    client = FactoryCoreClient(base_url="http://factory-core", transport=httpx.MockTransport(handler))
+    client.retry_backoff = 0.0
+    return client
+
+
+class TestFactoryCoreClient:
+    """Factory Core 클라이언트 테스트 클래스"""
+
+    async def test_reuses_single_client(self):
+        """여러 호출이 같은 httpx 클라이언트(연결 풀)를 공유하는지 확인"""
+        client = _client(lambda request: httpx.Response(200, json={}))
+
+        assert await client.factory_exists(uuid4())
+        first = client._client
+        assert await client.factory_exists(uuid4())
+        assert client._client is first
+        await client.close()
+
+    async def test_retries_transient_status(self):
+        """502/503/504 응답은 재시도 후 성공 응답을 반환하는지 확인"""
+        cctv_id = uuid4()
+        statuses = iter([503, 502, 200])
+        calls = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            calls.append(request)
+            status_code = next(statuses)
+            if status_code != 200:
+                return httpx.Response(status_code)
+            return httpx.Response(200, json=[{"cctv": {"id": str(cctv_id)}, "distance": 1.0}])
+
+        client = _client(handler)
+        assert await client.find_covering_cctvs(uuid4(), (0.0, 1.0, 2.0), 50.0) == [cctv_id]
+        assert len(calls) == 3
+        assert calls[-1].url.params["max_distance"] == "50.0"
+        await client.close()
+
+    async def test_raises_after_retries_exhausted(self):
+        """연결 오류가 계속되면 설정된 횟수만 재시도한 뒤 예외를 전달하는지 확인"""
+        calls = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            calls.append(request)
+            raise httpx.ConnectError("connection refused", request=request)
+
+        client = _client(handler)
+        with pytest.raises(httpx.ConnectError):
+            await client.factory_exists(uuid4())
+        assert len(calls) == client.retries + 1
+        await client.close()
+
+    async def test_factory_exists_distinguishes_missing_from_failure(self):
+        """404만 공장 없음으로 보고 그 외 오류 응답은 예외로 전달하는지 확인"""
+        client = _client(lambda request: httpx.Response(404))
+        assert await client.factory_exists(uuid4()) is False
+        await client.close()
+
+        client = _client(lambda request: httpx.Response(503))
+        with pytest.raises(httpx.HTTPStatusError):
+            await client.factory_exists(uuid4())
+        await client.close()
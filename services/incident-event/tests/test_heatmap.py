@@ -0,0 +1,112 @@
+"""
+사고 히트맵 API 테스트
+"""
+import base64
+import sys
+from array import array
+from datetime import datetime, timedelta, timezone
+from uuid import uuid4
+
+from httpx import AsyncClient
+
+from models import Incident, IncidentType
+
+BASE = datetime(2026, 10, 1, tzinfo=timezone.utc)
+WINDOW = {"start_time": "2026-09-30T00:00:00Z", "end_time": "2026-10-02T00:00:00Z"}
+
+
+def _decode(data: str) -> list:
+    values = array("f", base64.b64decode(data))
+    if sys.byteorder == "big":
+        values.byteswap()
+    return values.tolist()
+
+
+async def _add(session, factory_id, positions, severity=1, timestamp=BASE):
+    for x, y, z in positions:
+        session.add(Incident(
+            factory_id=factory_id,
+            type=IncidentType.FALL,
+            severity=severity,
+            position_x=x,
+            position_y=y,
+            position_z=z,
+            timestamp=timestamp,
+        ))
+    await session.commit()
+
+
+class TestHeatmapAPI:
+    """히트맵 API 테스트 클래스"""
+
+    async def test_xz_grid_from_data_extent(self, client: AsyncClient, test_session):
+        """데이터 범위로 XZ 격자를 만들고 셀별 사고 수를 row-major(z, x)로 반환하는지 확인"""
+        factory_id = uuid4()
+        await _add(test_session, factory_id, [(0.5, 0.0, 0.5), (0.7, 3.0, 0.2), (2.5, 0.0, 1.5)])
+        # 기간 밖 사고는 제외
+        await _add(test_session, factory_id, [(0.5, 0.0, 0.5)], timestamp=BASE - timedelta(days=10))
+
+        response = await client.get("/incidents/heatmap", params={"factory_id": str(factory_id), **WINDOW})
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["axes"] == "zx"
+        assert data["shape"] == [2, 3]
+        assert data["origin"] == [0.0, 0.0]
+        assert _decode(data["data"]) == [2.0, 0.0, 0.0, 0.0, 0.0, 1.0]
+        assert data["total"] == 3.0
+        assert data["max"] == 2.0
+
+    async def test_explicit_bounds_and_severity_weight(self, client: AsyncClient, test_session):
+        """지정 범위 밖 사고는 제외하고 심각도 합을 셀 값으로 쓰는지 확인 (XYZ 격자)"""
+        factory_id = uuid4()
+        await _add(test_session, factory_id, [(1.0, 0.5, 1.0), (1.2, 0.5, 1.1), (9.0, 0.5, 9.0)], severity=3)
+
+        response = await client.get(
+            "/incidents/heatmap",
+            params={
+                "factory_id": str(factory_id),
+                "cell_size": 2.0,
+                "include_y": True,
+                "weight": "severity",
+                "min_x": 0, "max_x": 4,
+                "min_y": 0, "max_y": 2,
+                "min_z": 0, "max_z": 4,
+                **WINDOW,
+            },
+        )
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["axes"] == "yzx"
+        assert data["shape"] == [1, 2, 2]
+        assert _decode(data["data"]) == [6.0, 0.0, 0.0, 0.0]
+
+    async def test_too_many_cells(self, client: AsyncClient, test_session):
+        """셀 수 상한을 넘는 격자는 400"""
+        factory_id = uuid4()
+        await _add(test_session, factory_id, [(0.0, 0.0, 0.0), (1000.0, 0.0, 1000.0)])
+
+        response = await client.get(
+            "/incidents/heatmap",
+            params={"factory_id": str(factory_id), "cell_size": 0.1, **WINDOW},
+        )
+        assert response.status_code == 400
+
+    async def test_degenerate_cell_size_and_bounds(self, client: AsyncClient):
+        """너무 작은 cell_size는 422, 셀 수가 무한대가 되는 범위는 500 대신 400"""
+        params = {"factory_id": str(uuid4()), **WINDOW}
+        response = await client.get("/incidents/heatmap", params={**params, "cell_size": 1e-310})
+        assert response.status_code == 422
+
+        bounds = {"min_x": -1e308, "max_x": 1e308, "min_z": 0.0, "max_z": 1.0}
+        response = await client.get("/incidents/heatmap", params={**params, **bounds})
+        assert response.status_code == 400
+
+    async def test_empty(self, client: AsyncClient):
+        """사고가 없으면 빈 격자"""
+        response = await client.get("/incidents/heatmap", params={"factory_id": str(uuid4()), **WINDOW})
+
+        assert response.status_code == 200
+        assert response.json()["shape"] == [0, 0]
+        assert response.json()["data"] == ""
@@ -1,10 +1,15 @@
 """
 Incident API 단위 테스트
 """
+from datetime import datetime, timedelta, timezone
+
+import httpx
 import pytest
 from httpx import AsyncClient
 from uuid import UUID, uuid4
 
+from models import Incident, IncidentType
+
 
 @pytest.mark.asyncio
 class TestIncidentAPI:
@@ -38,6 +43,24 @@ class TestIncidentAPI:
         assert UUID(data["id"])
         assert data["is_resolved"] is False
     
+    async def test_create_incident_factory_core_unavailable(self, client: AsyncClient, sample_factory_id, monkeypatch):
+        """Factory Core 장애 시 공장 없음(400) 대신 503으로 응답하는지 확인"""
+        class _UnavailableCache:
+            async def exists(self, factory_id):
+                raise httpx.ConnectError("connection refused")
+
+        monkeypatch.setattr("routers.incident.get_factory_cache", lambda: _UnavailableCache())
+        response = await client.post("/incidents/", json={
+            "factory_id": sample_factory_id,
+            "type": "FIRE",
+            "severity": 3,
+            "position_x": 0.0,
+            "position_y": 0.0,
+            "position_z": 0.0
+        })
+
+        assert response.status_code == 503
+
     async def test_get_incidents(self, client: AsyncClient, sample_factory_id):
         """사고 목록 조회 API 테스트"""
         # 사고 생성
@@ -168,6 +191,42 @@ class TestIncidentAPI:
         get_response = await client.get(f"/incidents/{incident_id}")
         assert get_response.status_code == 404
     
+    async def test_get_incidents_cursor_pagination(self, client: AsyncClient, test_session, sample_factory_id):
+        """커서 모드로 중복/누락 없이 최신순 전체 목록을 순회하는지 확인"""
+        base = datetime(2026, 1, 1, tzinfo=timezone.utc)
+        for index in range(5):
+            test_session.add(Incident(
+                factory_id=UUID(sample_factory_id),
+                type=IncidentType.FIRE,
+                severity=1,
+                position_x=0.0,
+                position_y=0.0,
+                position_z=0.0,
+                # 같은 시각 2건씩 - id로 동률 정렬
+                timestamp=base + timedelta(minutes=index // 2),
+            ))
+        await test_session.commit()
+
+        seen, cursor = [], None
+        while True:
+            params = {"factory_id": sample_factory_id, "pagination": "cursor", "limit": 2}
+            if cursor:
+                params["cursor"] = cursor
+            response = await client.get("/incidents/", params=params)
+            assert response.status_code == 200
+            page = response.json()
+            seen.extend(page["items"])
+            cursor = page["next_cursor"]
+            if cursor is None:
+                break
+
+        assert len({item["id"] for item in seen}) == 5
+        timestamps = [item["timestamp"] for item in seen]
+        assert timestamps == sorted(timestamps, reverse=True)
+
+        response = await client.get("/incidents/", params={"cursor": "not-a-cursor"})
+        assert response.status_code == 400
+
     async def test_health_check(self, client: AsyncClient):
         """향상된 헬스체크 엔드포인트 테스트"""
         response = await client.get("/health")
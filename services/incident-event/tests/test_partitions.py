@@ -0,0 +1,81 @@
+"""
+사고 파티션 관리 단위 테스트
+"""
+from datetime import datetime, timedelta, timezone
+from uuid import uuid4
+
+from httpx import AsyncClient
+
+from models import Incident, IncidentType
+from services.partitions import (
+    IncidentPartitionManager,
+    add_months,
+    expired_partitions,
+    month_start,
+    partition_month,
+    partition_name,
+)
+
+
+class TestPartitionHelpers:
+    """파티션 이름/범위 계산 테스트 클래스"""
+
+    def test_month_arithmetic(self):
+        """달 시작/달 더하기가 연도 경계를 넘어도 맞는지 확인"""
+        month = month_start(datetime(2026, 12, 31, 23, 59, tzinfo=timezone.utc))
+        assert month == datetime(2026, 12, 1, tzinfo=timezone.utc)
+        assert add_months(month, 1) == datetime(2027, 1, 1, tzinfo=timezone.utc)
+        assert add_months(month, -12) == datetime(2025, 12, 1, tzinfo=timezone.utc)
+
+    def test_partition_name_round_trip(self):
+        """월 파티션 이름 생성/해석, 기본 파티션은 월 파티션이 아님"""
+        month = datetime(2026, 3, 1, tzinfo=timezone.utc)
+        assert partition_name(month) == "incidents_p2026_03"
+        assert partition_month("incidents_p2026_03") == month
+        assert partition_month("incidents_default") is None
+
+    def test_expired_partitions(self):
+        """보존 기간이 완전히 지난 월 파티션만 만료로 판단하는지 확인"""
+        names = ["incidents_default", "incidents_p2025_09", "incidents_p2025_10", "incidents_p2026_10"]
+        now = datetime(2026, 10, 16, tzinfo=timezone.utc)
+
+        assert expired_partitions(names, now, retention_months=12) == ["incidents_p2025_09"]
+        assert expired_partitions(names, now, retention_months=0) == []
+
+    async def test_noop_without_postgres(self, test_engine):
+        """PostgreSQL이 아니면 파티션 작업을 하지 않는지 확인"""
+        manager = IncidentPartitionManager(engine=test_engine)
+
+        assert await manager.run_once() == {"created": [], "detached": [], "dropped": []}
+
+
+class TestTimeRangeFilter:
+    """사고 목록 시간 범위 조건 테스트 클래스"""
+
+    async def test_get_incidents_time_range(self, client: AsyncClient, test_session):
+        """start_time 이상 end_time 미만 사고만 반환하는지 확인"""
+        factory_id = uuid4()
+        base = datetime(2026, 1, 31, tzinfo=timezone.utc)
+        for days in range(3):
+            test_session.add(Incident(
+                factory_id=factory_id,
+                type=IncidentType.FALL,
+                severity=2,
+                position_x=0.0,
+                position_y=0.0,
+                position_z=0.0,
+                timestamp=base + timedelta(days=days),
+            ))
+        await test_session.commit()
+
+        response = await client.get(
+            "/incidents/",
+            params={
+                "factory_id": str(factory_id),
+                "start_time": "2026-02-01T00:00:00Z",
+                "end_time": "2026-02-02T00:00:00Z",
+            },
+        )
+
+        assert response.status_code == 200
+        assert [item["timestamp"][:10] for item in response.json()] == ["2026-02-01"]
@@ -0,0 +1,78 @@
+"""
+사고 핫 쿼리 실행 계획 회귀 테스트
+시드 데이터에서 목록/필터 쿼리가 순차 스캔으로 떨어지지 않는지 확인
+"""
+import random
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import insert, select, text
+
+from models import Incident, IncidentType
+from tests.query_plan import assert_index_scan
+from utils.pagination import apply_keyset, encode_cursor
+
+FACTORY_COUNT = 20
+INCIDENTS_PER_FACTORY = 100
+
+
+@pytest.fixture
+async def factory_ids(test_session):
+    """공장 여러 개에 사고를 분산 저장하고 통계를 갱신, 공장 ID 목록 반환"""
+    rng = random.Random(0)
+    factory_ids = [uuid.uuid4() for _ in range(FACTORY_COUNT)]
+    base = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    await test_session.execute(
+        insert(Incident),
+        [
+            {
+                "id": uuid.uuid4(),
+                "factory_id": factory_id,
+                "type": rng.choice(list(IncidentType)),
+                "severity": rng.randint(1, 5),
+                "position_x": 0.0,
+                "position_y": 0.0,
+                "position_z": 0.0,
+                "is_resolved": rng.random() < 0.8,
+                "timestamp": base + timedelta(minutes=index),
+            }
+            for factory_id in factory_ids
+            for index in range(INCIDENTS_PER_FACTORY)
+        ],
+    )
+    await test_session.commit()
+    await test_session.execute(text("ANALYZE"))
+    return factory_ids
+
+
+class TestIncidentQueryPlans:
+    """사고 조회 실행 계획 테스트 클래스"""
+
+    async def test_factory_unresolved_list(self, test_session, factory_ids):
+        """공장별 미해결 사고 최신순 목록"""
+        query = (
+            select(Incident)
+            .where(Incident.factory_id == factory_ids[0])
+            .where(Incident.is_resolved == False)
+            .order_by(Incident.timestamp.desc())
+            .limit(100)
+        )
+        await assert_index_scan(test_session, query)
+
+    async def test_factory_cursor_page(self, test_session, factory_ids):
+        """공장별 커서 페이지 (키셋 조건 포함)"""
+        cursor = encode_cursor(datetime(2026, 1, 1, 1, tzinfo=timezone.utc), uuid.uuid4())
+        query = apply_keyset(
+            select(Incident).where(Incident.factory_id == factory_ids[0]),
+            Incident.timestamp,
+            Incident.id,
+            cursor,
+            limit=100,
+        )
+        await assert_index_scan(test_session, query)
+
+    async def test_latest_list(self, test_session, factory_ids):
+        """전체 최신순 목록"""
+        query = select(Incident).order_by(Incident.timestamp.desc()).limit(100)
+        await assert_index_scan(test_session, query)
@@ -0,0 +1,169 @@
+"""
+V-Factory - Incident Event Service Prometheus 메트릭
+Instrumentator가 노출하는 /metrics 엔드포인트에 함께 수집되는 서비스 메트릭 정의
+"""
+from prometheus_client import Counter, Gauge, Histogram
+
+# ===== Redis 연결 풀 =====
+
+REDIS_POOL_CONNECTIONS = Gauge(
+    "incident_event_redis_pool_connections",
+    "Redis 연결 풀 연결 수 (in_use: 사용 중, idle: 유휴)",
+    ["pool", "state"],
+)
+
+REDIS_POOL_MAX_CONNECTIONS = Gauge(
+    "incident_event_redis_pool_max_connections",
+    "Redis 연결 풀 최대 연결 수",
+    ["pool"],
+)
+
+# ===== SSE 팬아웃 허브 =====
+
+SSE_SUBSCRIBERS = Gauge(
+    "incident_event_sse_subscribers",
+    "채널별 SSE 구독 클라이언트 수",
+    ["channel"],
+)
+
+SSE_QUEUE_DEPTH = Gauge(
+    "incident_event_sse_queue_depth",
+    "채널별 SSE 클라이언트 버퍼 대기 메시지 합계",
+    ["channel"],
+)
+
+SSE_MESSAGES_RECEIVED = Counter(
+    "incident_event_sse_messages_received_total",
+    "채널별 Redis 수신 메시지 수",
+    ["channel"],
+)
+
+SSE_MESSAGES_DROPPED = Counter(
+    "incident_event_sse_messages_dropped_total",
+    "느린 클라이언트 버퍼 초과로 버린 메시지 수",
+    ["channel"],
+)
+
+SSE_MESSAGES_COALESCED = Counter(
+    "incident_event_sse_messages_coalesced_total",
+    "같은 엔티티의 갱신 이벤트로 대체된 메시지 수",
+    ["channel"],
+)
+
+SSE_REPLAYS = Counter(
+    "incident_event_sse_replays_total",
+    "Last-Event-ID 재접속 재전송 횟수 (memory: 메모리 이력, redis: XRANGE)",
+    ["channel", "source"],
+)
+
+# ===== 업스트림 HTTP 호출 =====
+
+UPSTREAM_REQUEST_SECONDS = Histogram(
+    "incident_event_upstream_request_seconds",
+    "업스트림 서비스 호출 지연 시간 (재시도는 시도별로 기록)",
+    ["upstream", "operation", "outcome"],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0),
+)
+
+UPSTREAM_CONNECTIONS = Counter(
+    "incident_event_upstream_connections_total",
+    "업스트림 호출별 연결 사용 (new: 새 TCP 연결, reused: keep-alive 연결 재사용)",
+    ["upstream", "operation", "connection"],
+)
+
+UPSTREAM_RETRIES = Counter(
+    "incident_event_upstream_retries_total",
+    "연결 오류/일시 장애 응답으로 인한 업스트림 재시도 횟수",
+    ["upstream", "operation"],
+)
+
+# ===== 사고 보강 파이프라인 =====
+
+ENRICHMENT_QUEUE_DEPTH = Gauge(
+    "incident_event_enrichment_queue_depth",
+    "보강 대기 중인 사고 수",
+)
+
+ENRICHMENT_STAGE_SECONDS = Histogram(
+    "incident_event_enrichment_stage_seconds",
+    "보강 단계별 소요 시간 (queue: 대기, match: CCTV 매칭, persist: 결과/Outbox 저장)",
+    ["stage"],
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0),
+)
+
+ENRICHMENT_JOBS = Counter(
+    "incident_event_enrichment_jobs_total",
+    "처리한 보강 작업 수 (mode: async/inline, outcome: ok/degraded/duplicate/failed)",
+    ["mode", "outcome"],
+)
+
+# ===== 사고 일괄 등록 =====
+
+BULK_INGEST_SECONDS = Histogram(
+    "incident_event_bulk_ingest_stage_seconds",
+    "일괄 등록 단계별 소요 시간 (parse: 요청 해석, validate: 공장 확인, match: CCTV 매칭, insert: 저장)",
+    ["stage"],
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0),
+)
+
+BULK_INGEST_ITEMS = Histogram(
+    "incident_event_bulk_ingest_items",
+    "일괄 등록 요청당 사고 수",
+    buckets=(1, 10, 100, 500, 1000, 5000, 10000, 50000),
+)
+
+# ===== 공장 존재 캐시 =====
+
+FACTORY_CACHE_LOOKUPS = Counter(
+    "incident_event_factory_cache_lookups_total",
+    "공장 존재 캐시 조회 수 (hit: 네트워크 호출 생략, miss: Factory Core 조회)",
+    ["result"],
+)
+
+FACTORY_CACHE_HIT_RATIO = Gauge(
+    "incident_event_factory_cache_hit_ratio",
+    "프로세스 시작 이후 공장 존재 캐시 적중률",
+)
+
+FACTORY_CACHE_SIZE = Gauge(
+    "incident_event_factory_cache_size",
+    "공장 존재 캐시 항목 수",
+)
+
+FACTORY_CACHE_EVENTS = Counter(
+    "incident_event_factory_cache_events_total",
+    "공장 이벤트로 인한 캐시 갱신 수",
+    ["event"],
+)
+
+# ===== Outbox 릴레이 =====
+
+OUTBOX_BATCH_SIZE = Histogram(
+    "incident_event_outbox_batch_size",
+    "Outbox 릴레이 1회 전달 이벤트 수",
+    buckets=(1, 2, 5, 10, 25, 50, 100, 250, 500),
+)
+
+OUTBOX_LAG_SECONDS = Histogram(
+    "incident_event_outbox_lag_seconds",
+    "Outbox 기록부터 Redis 전달까지 걸린 시간",
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0),
+)
+
+OUTBOX_OLDEST_PENDING_SECONDS = Gauge(
+    "incident_event_outbox_oldest_pending_seconds",
+    "마지막 조회 시점의 가장 오래된 미전달 이벤트 대기 시간 (없으면 0)",
+)
+
+OUTBOX_DELIVERY_FAILURES = Counter(
+    "incident_event_outbox_delivery_failures_total",
+    "Outbox 릴레이 전달 실패 횟수 (백오프 후 재시도)",
+)
+
+# ===== 사고 파티션 관리 =====
+
+INCIDENT_PARTITION_ACTIONS = Counter(
+    "incident_event_partition_actions_total",
+    "사고 파티션 관리 작업 수 (created/detached/dropped)",
+    ["action"],
+)
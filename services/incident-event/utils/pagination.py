@@ -0,0 +1,97 @@
+"""
+V-Factory - 커서(키셋) 페이지네이션
+(정렬 시각, id) 기준 마지막 위치를 불투명 커서 토큰으로 주고받아
+OFFSET 없이 인덱스 범위 조회만으로 깊은 페이지도 일정한 비용으로 조회
+"""
+import base64
+import json
+from datetime import datetime
+from typing import Any, Generic, List, Literal, Optional, Sequence, Tuple, TypeVar
+from uuid import UUID
+
+from fastapi import HTTPException, status
+from pydantic import BaseModel, Field
+from sqlalchemy import Select, tuple_
+
+T = TypeVar("T")
+
+# 목록 조회 방식 (offset: 기존 skip/limit 목록, cursor: 커서 페이지)
+PaginationMode = Literal["offset", "cursor"]
+
+
+class CursorPage(BaseModel, Generic[T]):
+    """커서 페이지 응답 스키마"""
+    items: List[T]
+    next_cursor: Optional[str] = Field(None, description="다음 페이지 커서 (마지막 페이지면 null)")
+
+
+def use_cursor(pagination: PaginationMode, cursor: Optional[str]) -> bool:
+    """커서 모드 여부 (커서를 전달하면 pagination 값과 관계없이 커서 모드)"""
+    return pagination == "cursor" or cursor is not None
+
+
+def encode_cursor(sort_value: datetime, row_id: UUID) -> str:
+    """(정렬 시각, id)를 URL 안전한 불투명 토큰으로 인코딩"""
+    raw = json.dumps([sort_value.isoformat(), str(row_id)], separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(token: str) -> Tuple[datetime, UUID]:
+    """
+    커서 토큰 해석
+
+    Raises:
+        HTTPException: 형식이 잘못된 커서 (400)
+    """
+    try:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+        sort_value, row_id = json.loads(raw)
+        return datetime.fromisoformat(sort_value), UUID(row_id)
+    except (ValueError, TypeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="잘못된 커서입니다."
+        )
+
+
+def apply_keyset(
+    query: Select,
+    sort_column: Any,
+    id_column: Any,
+    cursor: Optional[str],
+    limit: int,
+    descending: bool = True,
+) -> Select:
+    """
+    키셋 조건/정렬 적용 (다음 페이지 존재 여부 확인을 위해 limit + 1행 조회)
+
+    Args:
+        query: 필터가 적용된 조회 쿼리
+        sort_column: 정렬 시각 컬럼
+        id_column: 동률 정렬용 id 컬럼
+        cursor: 이전 페이지의 next_cursor (None이면 첫 페이지)
+        limit: 페이지 크기
+        descending: 최신순 여부
+    """
+    if cursor:
+        sort_value, row_id = decode_cursor(cursor)
+        position = tuple_(sort_column, id_column)
+        boundary = tuple_(sort_value, row_id)
+        query = query.where(position < boundary if descending else position > boundary)
+        # 행 값 비교와 같은 의미의 단일 컬럼 범위 조건 (범위 인덱스/파티션 pruning에 활용)
+        query = query.where(sort_column <= sort_value if descending else sort_column >= sort_value)
+    if descending:
+        query = query.order_by(sort_column.desc(), id_column.desc())
+    else:
+        query = query.order_by(sort_column.asc(), id_column.asc())
+    return query.limit(limit + 1)
+
+
+def build_page(rows: Sequence[Any], limit: int, sort_attr: str) -> dict:
+    """apply_keyset으로 조회한 행에서 페이지 응답 구성 (초과 1행이 있으면 next_cursor 생성)"""
+    items = list(rows[:limit])
+    next_cursor = None
+    if len(rows) > limit and items:
+        last = items[-1]
+        next_cursor = encode_cursor(getattr(last, sort_attr), last.id)
+    return {"items": items, "next_cursor": next_cursor}